@@ -5,9 +5,12 @@ This demonstrates how to programmatically invoke the agent and maintain
 conversation state across multiple turns.
 """
 
-from japanese_agent.graph import graph
+from japanese_agent.graph import get_persistent_graph
 from langchain_core.messages import HumanMessage
 
+# Checkpointed graph: the thread_id keeps the conversation, across runs too
+graph = get_persistent_graph()
+
 
 def main():
     """Run a basic chat session with the agent."""
@@ -4,9 +4,12 @@ Flashcard review session example.
 Demonstrates how to conduct a spaced repetition review session.
 """
 
-from japanese_agent.graph import graph
+from japanese_agent.graph import get_persistent_graph
 from langchain_core.messages import HumanMessage
 
+# Checkpointed graph: the thread_id keeps the conversation, across runs too
+graph = get_persistent_graph()
+
 
 def review_session(num_cards: int = 5, thread_id: str = "review-session"):
     """
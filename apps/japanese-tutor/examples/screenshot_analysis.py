@@ -4,9 +4,12 @@ Screenshot analysis example with the Japanese Learning Agent.
 Demonstrates how to analyze a game screenshot and extract vocabulary.
 """
 
-from japanese_agent.graph import graph
+from japanese_agent.graph import get_persistent_graph
 from langchain_core.messages import HumanMessage
 
+# Checkpointed graph: the thread_id keeps the conversation, across runs too
+graph = get_persistent_graph()
+
 
 def analyze_screenshot(image_path: str, thread_id: str = "screenshot-session"):
     """
@@ -20,10 +20,12 @@ import os
 import sys
 import time
 import asyncio
+import itertools
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler, FileCreatedEvent
+from watchdog.events import FileSystemEventHandler, FileCreatedEvent, FileMovedEvent
 from claude_code_sdk import ClaudeSDKClient, ClaudeCodeOptions
 from dotenv import load_dotenv
 from rich.console import Console
@@ -34,24 +36,95 @@ import yaml
 # Initialize Rich console for better output
 console = Console()
 
-
-class ScreenshotHandler(FileSystemEventHandler):
-    """Handles new screenshot files and triggers Japanese translation."""
+# Pipeline defaults (override in the "watcher" section of config.yaml)
+DEFAULT_WATCHER_SETTINGS = {
+    "workers": 2,                 # screenshots analyzed at the same time
+    "queue_size": 4,              # stable screenshots waiting for a worker
+    "overflow": "coalesce",       # full queue: "coalesce" drops the oldest waiting screenshot, "block" waits
+    "stable_checks": 2,           # unchanged size/mtime polls before a file counts as written
+    "stable_interval": 0.2,       # seconds between polls
+    "stable_timeout": 10.0,       # give up on files that never settle
+    "seen_size": 1024,            # recently seen paths remembered to skip duplicate events
+    "client_max_screenshots": 25, # reconnect a worker's client after this many screenshots
+    "reconnect_delay": 1.0,       # first wait before reconnecting a failed client (doubles per failure)
+    "reconnect_max_delay": 60.0,  # longest wait between reconnect attempts
+}
+
+
+class SeenPaths:
+    """LRU-bounded set of recently seen screenshot paths."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max(1, max_size)
+        self._paths: "OrderedDict[str, None]" = OrderedDict()
+
+    def add(self, path: str) -> bool:
+        """Remember a path; False if it was already seen."""
+        if path in self._paths:
+            self._paths.move_to_end(path)
+            return False
+        self._paths[path] = None
+        if len(self._paths) > self.max_size:
+            self._paths.popitem(last=False)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
+async def wait_until_stable(file_path: str, checks: int, interval: float, timeout: float) -> bool:
+    """
+    Wait until a file stops changing (size and mtime unchanged for `checks` polls).
+
+    Returns:
+        True once the file is stable and non-empty, False if it disappeared
+        or was still changing after `timeout` seconds
+    """
+    deadline = time.monotonic() + timeout
+    last = None
+    unchanged = 0
+    while time.monotonic() < deadline:
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return False
+        current = (stat.st_size, stat.st_mtime_ns)
+        if current == last and stat.st_size > 0:
+            unchanged += 1
+            if unchanged >= checks:
+                return True
+        else:
+            unchanged = 0
+        last = current
+        await asyncio.sleep(interval)
+    return False
+
+
+class ScreenshotPipeline:
+    """
+    Async screenshot processing: stability check -> bounded queue -> worker pool.
+
+    Watchdog events are handed over from the observer thread without blocking
+    it. Each worker keeps one Claude Code SDK client open across screenshots,
+    and reconnects (with exponential backoff) when the client fails.
+    When screenshots arrive faster than they are analyzed, the queue either
+    coalesces (drops the oldest waiting screenshot, keeping the latest
+    dialogue) or applies back-pressure, per the "overflow" setting.
+    """
 
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self.file_patterns = config.get('file_patterns', ['*.png', '*.jpg', '*.jpeg'])
-        self.processed_files = set()
+        self.settings = {**DEFAULT_WATCHER_SETTINGS, **(config.get("watcher") or {})}
         self.slash_command_path = Path(".claude/commands/japanese/analyze.md")
-        
-    def matches_pattern(self, filename: str) -> bool:
-        """Check if filename matches any of the configured patterns."""
-        for pattern in self.file_patterns:
-            if pattern.startswith('*.'):
-                extension = pattern[1:]  # Remove the *
-                if filename.lower().endswith(extension):
-                    return True
-        return False
+        self.seen = SeenPaths(int(self.settings["seen_size"]))
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=max(1, int(self.settings["queue_size"])))
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: set = set()
+        self._workers: List[asyncio.Task] = []
+        self._session_ids = itertools.count(1)
+        self.processed = 0
+        self.coalesced = 0
+        self.failed = 0
 
     def load_slash_command(self, file_path: str) -> str:
         """Load slash command content and replace $ARGUMENTS placeholder."""
@@ -67,97 +140,209 @@ class ScreenshotHandler(FileSystemEventHandler):
 
         return prompt_content
 
-    async def process_screenshot_async(self, file_path: str):
-        """Process a screenshot using Claude Code SDK (async)."""
-        try:
-            console.print(f"\n[bold cyan]{'='*60}[/bold cyan]")
-            console.print(f"[green]📸 New screenshot detected:[/green] {Path(file_path).name}")
-            console.print(f"[bold cyan]{'='*60}[/bold cyan]\n")
-
-            # Load the slash command content
-            console.print(f"[dim]   Loading slash command: {self.slash_command_path}[/dim]")
-            full_prompt = self.load_slash_command(file_path)
-
-            # Create SDK client options
-            options = ClaudeCodeOptions(
-                permission_mode="bypassPermissions",  # Auto-approve tool calls
-                model=self.config.get('model', 'sonnet')
-            )
+    # --------------------------------------------------------------------------
+    # Intake (observer thread -> event loop)
+    # --------------------------------------------------------------------------
+
+    def submit_threadsafe(self, file_path: str) -> None:
+        """Called from the watchdog thread; never blocks it."""
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.submit, file_path)
 
-            console.print(f"[cyan]ℹ️  Processing with Claude Code SDK...[/cyan]")
-            console.print(f"[dim]   Model: {self.config.get('model', 'sonnet')}[/dim]\n")
-
-            # Process with Claude Code SDK
-            async with ClaudeSDKClient(options=options) as client:
-                await client.query(full_prompt)
-
-                # Stream response
-                has_response = False
-                async for message in client.receive_response():
-                    if hasattr(message, "content"):
-                        for block in message.content:
-                            if hasattr(block, "text") and block.text.strip():
-                                has_response = True
-                                # Output in styled panel
-                                console.print(
-                                    Panel(
-                                        Text(block.text),
-                                        title="[bold cyan]🤖 Claude Code • Japanese Tutor[/bold cyan]",
-                                        subtitle=f"[dim]{Path(file_path).name}[/dim]",
-                                        border_style="cyan",
-                                        expand=False,
-                                        padding=(1, 2),
-                                    )
-                                )
-
-                # If no response received
-                if not has_response:
-                    console.print(
-                        Panel(
-                            Text("[yellow]No response received[/yellow]"),
-                            title="[bold yellow]🤖 Claude Code • Japanese Tutor[/bold yellow]",
-                            subtitle=f"[dim]{Path(file_path).name}[/dim]",
-                            border_style="yellow",
-                            expand=False,
-                            padding=(1, 2),
+    def submit(self, file_path: str) -> None:
+        """Admit a new screenshot once it has been fully written."""
+        if not self.seen.add(file_path):
+            return
+        task = asyncio.ensure_future(self._admit(file_path))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _admit(self, file_path: str) -> None:
+        stable = await wait_until_stable(
+            file_path,
+            int(self.settings["stable_checks"]),
+            float(self.settings["stable_interval"]),
+            float(self.settings["stable_timeout"]),
+        )
+        if not stable:
+            console.print(f"[yellow]⚠️  Skipping {Path(file_path).name}: file never finished writing[/yellow]")
+            return
+
+        if self.queue.full() and self.settings["overflow"] == "coalesce":
+            dropped = self.queue.get_nowait()
+            self.queue.task_done()
+            self.coalesced += 1
+            console.print(f"[yellow]⏩ Busy - skipping older screenshot {Path(dropped).name}[/yellow]")
+
+        # With overflow "block" this waits for a free slot (back-pressure)
+        await self.queue.put(file_path)
+
+    # --------------------------------------------------------------------------
+    # Workers
+    # --------------------------------------------------------------------------
+
+    def _client_options(self) -> ClaudeCodeOptions:
+        return ClaudeCodeOptions(
+            permission_mode="bypassPermissions",  # Auto-approve tool calls
+            model=self.config.get('model', 'sonnet')
+        )
+
+    def _reconnect_delay(self, failures: int) -> float:
+        """Exponential backoff after `failures` consecutive client failures."""
+        delay = float(self.settings["reconnect_delay"]) * 2 ** (failures - 1)
+        return min(delay, float(self.settings["reconnect_max_delay"]))
+
+    async def _worker(self, worker_id: int) -> None:
+        """Analyze queued screenshots with a long-lived SDK client."""
+        max_uses = max(1, int(self.settings["client_max_screenshots"]))
+        failures = 0
+        while True:
+            # Reconnect periodically so one client's context doesn't grow without bound
+            try:
+                async with ClaudeSDKClient(options=self._client_options()) as client:
+                    failures = 0
+                    for _ in range(max_uses):
+                        file_path = await self.queue.get()
+                        try:
+                            await self.process_screenshot(client, file_path)
+                            self.processed += 1
+                        except Exception as e:
+                            self.failed += 1
+                            console.print(f"[bold red]❌ Error processing screenshot: {e}[/bold red]")
+                            import traceback
+                            traceback.print_exc()
+                            # The client may be left mid-response; start the next screenshot on a fresh one
+                            break
+                        finally:
+                            self.queue.task_done()
+            except Exception as e:
+                # Connecting or disconnecting failed; the worker must survive it
+                failures += 1
+                delay = self._reconnect_delay(failures)
+                console.print(
+                    f"[bold red]❌ Worker {worker_id}: Claude Code SDK client failed: {e} "
+                    f"(retrying in {delay:.1f}s)[/bold red]"
+                )
+                await asyncio.sleep(delay)
+
+    async def process_screenshot(self, client: ClaudeSDKClient, file_path: str) -> None:
+        """Process a screenshot using a worker's Claude Code SDK client."""
+        console.print(f"\n[bold cyan]{'='*60}[/bold cyan]")
+        console.print(f"[green]📸 New screenshot detected:[/green] {Path(file_path).name}")
+        console.print(f"[bold cyan]{'='*60}[/bold cyan]\n")
+
+        # Load the slash command content
+        console.print(f"[dim]   Loading slash command: {self.slash_command_path}[/dim]")
+        full_prompt = self.load_slash_command(file_path)
+
+        console.print(f"[cyan]ℹ️  Processing with Claude Code SDK...[/cyan]")
+        console.print(f"[dim]   Model: {self.config.get('model', 'sonnet')}[/dim]\n")
+
+        # Separate session per screenshot on the shared client
+        await client.query(full_prompt, session_id=f"screenshot-{next(self._session_ids)}")
+
+        # Stream response
+        has_response = False
+        async for message in client.receive_response():
+            if hasattr(message, "content"):
+                for block in message.content:
+                    if hasattr(block, "text") and block.text.strip():
+                        has_response = True
+                        # Output in styled panel
+                        console.print(
+                            Panel(
+                                Text(block.text),
+                                title="[bold cyan]🤖 Claude Code • Japanese Tutor[/bold cyan]",
+                                subtitle=f"[dim]{Path(file_path).name}[/dim]",
+                                border_style="cyan",
+                                expand=False,
+                                padding=(1, 2),
+                            )
                         )
-                    )
 
-            console.print()
+        # If no response received
+        if not has_response:
+            console.print(
+                Panel(
+                    Text("[yellow]No response received[/yellow]"),
+                    title="[bold yellow]🤖 Claude Code • Japanese Tutor[/bold yellow]",
+                    subtitle=f"[dim]{Path(file_path).name}[/dim]",
+                    border_style="yellow",
+                    expand=False,
+                    padding=(1, 2),
+                )
+            )
+
+        console.print()
+
+    # --------------------------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the worker pool on the running event loop."""
+        self.loop = asyncio.get_running_loop()
+        workers = max(1, int(self.settings["workers"]))
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(workers)]
+
+    async def stop(self) -> None:
+        """Cancel pending admissions and workers."""
+        for task in [*self._pending, *self._workers]:
+            task.cancel()
+        await asyncio.gather(*self._pending, *self._workers, return_exceptions=True)
 
-        except Exception as e:
-            console.print(f"[bold red]❌ Error processing screenshot: {e}[/bold red]")
-            import traceback
-            traceback.print_exc()
 
-    def process_screenshot(self, file_path: str):
-        """Process a screenshot (sync wrapper for async method)."""
-        # Bridge from sync watchdog handler to async SDK call
-        asyncio.run(self.process_screenshot_async(file_path))
-    
+class ScreenshotHandler(FileSystemEventHandler):
+    """Forwards new screenshot files to the processing pipeline."""
+
+    def __init__(self, config: Dict[str, Any], pipeline: ScreenshotPipeline):
+        self.config = config
+        self.pipeline = pipeline
+        self.file_patterns = config.get('file_patterns', ['*.png', '*.jpg', '*.jpeg'])
+
+    def matches_pattern(self, filename: str) -> bool:
+        """Check if filename matches any of the configured patterns."""
+        for pattern in self.file_patterns:
+            if pattern.startswith('*.'):
+                extension = pattern[1:]  # Remove the *
+                if filename.lower().endswith(extension):
+                    return True
+        return False
+
+    def _handle(self, file_path: str) -> None:
+        if self.matches_pattern(Path(file_path).name):
+            self.pipeline.submit_threadsafe(file_path)
+
     def on_created(self, event: FileCreatedEvent):
         """Called when a file is created in the monitored directory."""
-        if event.is_directory:
-            return
-        
-        file_path = event.src_path
-        filename = Path(file_path).name
-        
-        # Check if file matches our patterns
-        if not self.matches_pattern(filename):
-            return
-        
-        # Avoid processing the same file twice
-        if file_path in self.processed_files:
-            return
-        
-        self.processed_files.add(file_path)
-        
-        # Give the file a moment to finish writing
-        time.sleep(0.5)
-        
-        # Process the screenshot
-        self.process_screenshot(file_path)
+        if not event.is_directory:
+            self._handle(event.src_path)
+
+    def on_moved(self, event: FileMovedEvent):
+        """Screenshots written to a temp name and renamed into place."""
+        if not event.is_directory:
+            self._handle(event.dest_path)
+
+
+async def run_watcher(config: Dict[str, Any], screenshot_dir: str) -> None:
+    """Watch the screenshot directory and process screenshots until cancelled."""
+    pipeline = ScreenshotPipeline(config)
+    pipeline.start()
+
+    observer = Observer()
+    observer.schedule(ScreenshotHandler(config, pipeline), screenshot_dir, recursive=False)
+    observer.start()
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        observer.stop()
+        await pipeline.stop()
+        observer.join()
+        console.print(
+            f"[dim]Processed {pipeline.processed}, skipped while busy {pipeline.coalesced}, "
+            f"failed {pipeline.failed}[/dim]"
+        )
 
 
 def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
@@ -208,24 +393,15 @@ def main():
     console.print(f"[green]📝 Using slash command:[/green] {slash_command_path}")
     console.print(f"[green]🤖 Model:[/green] {config.get('model', 'sonnet')}")
     console.print(f"[green]📋 File patterns:[/green] {config.get('file_patterns', ['*.png', '*.jpg'])}")
+    settings = {**DEFAULT_WATCHER_SETTINGS, **(config.get('watcher') or {})}
+    console.print(f"[green]⚙️  Workers:[/green] {settings['workers']} (queue {settings['queue_size']}, overflow: {settings['overflow']})")
     console.print("\n[cyan]Waiting for new screenshots...[/cyan]\n")
 
-    # Create event handler and observer
-    event_handler = ScreenshotHandler(config)
-    observer = Observer()
-    observer.schedule(event_handler, screenshot_dir, recursive=False)
-    
-    # Start monitoring
-    observer.start()
-    
     try:
-        while True:
-            time.sleep(1)
+        asyncio.run(run_watcher(config, screenshot_dir))
     except KeyboardInterrupt:
         console.print("\n\n[bold red]🛑 Stopping screenshot watcher...[/bold red]")
-        observer.stop()
 
-    observer.join()
     console.print("[bold cyan]👋 Goodbye![/bold cyan]")
 
 
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Simulation benchmark: daily review load of SM-2 vs. FSRS.
+
+Simulates a learner studying N cards for a year, introducing a fixed number
+of new cards per day, once per scheduler with the same random seed:
+- sm2: ``_calculate_sm2_batch`` (the review path for SM-2 decks)
+- fsrs: ``fsrs_step`` + ``next_interval`` with default parameters
+
+The learner's true memory follows the FSRS model with parameters randomly
+perturbed from the defaults, so FSRS is not scheduling with the learner's
+exact parameters (as before optimizing a deck). Recall at each review is
+drawn from the learner's true retrievability; a failed card is due the next
+day. All cards due on a day are reviewed that day.
+
+Usage:
+    python scripts/benchmark_schedulers.py [--cards 10000] [--days 365] [--new-per-day 100]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from japanese_agent.tools.flashcard_manager import _calculate_sm2_batch  # noqa: E402
+from japanese_agent.tools.fsrs_scheduler import (  # noqa: E402
+    DEFAULT_PARAMETERS,
+    DEFAULT_RETENTION,
+    PARAMETER_BOUNDS,
+    fsrs_step,
+    next_interval,
+    retrievability,
+)
+
+FIRST_GRADES = ([1, 2, 3, 4], [0.2, 0.1, 0.6, 0.1])  # first exposure
+RECALLED_GRADES = ([2, 3, 4], [0.15, 0.75, 0.1])     # Hard / Good / Easy when recalled
+
+
+def learner_parameters(rng: np.random.Generator) -> np.ndarray:
+    """Default FSRS parameters perturbed by ~20% (the simulated learner)."""
+    perturbed = DEFAULT_PARAMETERS * rng.lognormal(0.0, 0.2, DEFAULT_PARAMETERS.shape)
+    return np.clip(perturbed, PARAMETER_BOUNDS[:, 0], PARAMETER_BOUNDS[:, 1])
+
+
+def simulate(scheduler: str, cards: int, days: int, new_per_day: int, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    learner = learner_parameters(rng)
+
+    introduced = np.zeros(cards, dtype=bool)
+    due_day = np.zeros(cards, dtype=np.int64)
+    last_day = np.zeros(cards)
+    true_s = np.full(cards, np.nan)
+    true_d = np.full(cards, np.nan)
+
+    # Scheduler state
+    ease = np.full(cards, 2.5)
+    interval = np.zeros(cards)
+    reps = np.zeros(cards, dtype=np.int64)
+    est_s = np.full(cards, np.nan)
+    est_d = np.full(cards, np.nan)
+
+    daily = np.zeros(days, dtype=np.int64)
+    recalled_total = 0
+    review_total = 0
+
+    for day in range(days):
+        start = min(day * new_per_day, cards)
+        introduced[start:min(start + new_per_day, cards)] = True
+
+        due = np.flatnonzero(introduced & (due_day <= day))
+        daily[day] = len(due)
+        if not len(due):
+            continue
+
+        elapsed = day - last_day[due]
+        first = np.isnan(true_s[due])
+        grades = rng.choice(RECALLED_GRADES[0], size=len(due), p=RECALLED_GRADES[1])
+        recall = rng.random(len(due)) < retrievability(elapsed, np.where(first, 1.0, true_s[due]))
+        grades = np.where(recall, grades, 1)
+        grades = np.where(first, rng.choice(FIRST_GRADES[0], size=len(due), p=FIRST_GRADES[1]), grades)
+
+        recalled_total += int(recall[~first].sum())
+        review_total += int((~first).sum())
+
+        true_s[due], true_d[due] = fsrs_step(learner, true_s[due], true_d[due], elapsed, grades)
+
+        if scheduler == "sm2":
+            interval[due], ease[due], reps[due] = _calculate_sm2_batch(grades - 1, ease[due], interval[due], reps[due])
+            days_until = interval[due]
+        else:
+            est_s[due], est_d[due] = fsrs_step(DEFAULT_PARAMETERS, est_s[due], est_d[due], elapsed, grades)
+            days_until = np.where(grades > 1, next_interval(est_s[due], DEFAULT_RETENTION), 0.0)
+
+        last_day[due] = day
+        due_day[due] = day + np.maximum(1, np.rint(days_until)).astype(np.int64)
+
+    known = introduced & ~np.isnan(true_s)
+    remembered = retrievability(days - last_day[known], true_s[known]).sum()
+
+    return {
+        "reviews": int(daily.sum()),
+        "mean_daily": daily.mean(),
+        "p95_daily": np.percentile(daily, 95),
+        "max_daily": int(daily.max()),
+        "last_90_mean": daily[-90:].mean(),
+        "retention": recalled_total / max(review_total, 1),
+        "remembered": remembered,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--new-per-day", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{args.cards} cards, {args.new_per_day} new/day, {args.days} days (seed {args.seed})\n")
+    header = f"{'scheduler':<10}{'reviews':>10}{'mean/day':>10}{'p95/day':>10}{'max/day':>9}" \
+             f"{'last 90d':>10}{'recall':>8}{'remembered':>12}{'sim s':>8}"
+    print(header)
+    print("-" * len(header))
+
+    for scheduler in ("sm2", "fsrs"):
+        started = time.perf_counter()
+        result = simulate(scheduler, args.cards, args.days, args.new_per_day, args.seed)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{scheduler:<10}{result['reviews']:>10}{result['mean_daily']:>10.1f}{result['p95_daily']:>10.0f}"
+            f"{result['max_daily']:>9}{result['last_90_mean']:>10.1f}{result['retention']:>8.1%}"
+            f"{result['remembered']:>12.0f}{elapsed:>8.2f}"
+        )
+
+    print("\nrecall: share of reviews (not first exposures) the learner remembered")
+    print("remembered: expected number of cards the learner recalls on the last day")
+
+
+if __name__ == "__main__":
+    main()
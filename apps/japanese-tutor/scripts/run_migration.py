@@ -1,11 +1,17 @@
 #!/usr/bin/env python
 """Database migration runner for Japanese Tutor Agent.
 
+Migrations are applied in filename order. A migration is either a .sql script
+or a .py module defining ``migrate(conn)`` for steps that need Python (e.g.
+moving data out of the database).
+
 Usage:
     python scripts/run_migration.py
 """
+import importlib.util
 import os
 import sqlite3
+import sys
 from pathlib import Path
 
 # Get paths
@@ -13,6 +19,17 @@ PROJECT_ROOT = Path(__file__).parent.parent
 DB_PATH = PROJECT_ROOT / "src" / "data" / "japanese_agent.db"
 MIGRATIONS_DIR = PROJECT_ROOT / "src" / "japanese_agent" / "database" / "migrations"
 
+# Python migrations import the application package
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+
+def apply_python_migration(migration_file: Path, conn: sqlite3.Connection) -> None:
+    """Load a .py migration and run its migrate(conn)."""
+    spec = importlib.util.spec_from_file_location(f"migration_{migration_file.stem}", migration_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.migrate(conn)
+
 
 def run_migrations():
     """Run all pending migrations."""
@@ -46,7 +63,10 @@ def run_migrations():
         print(f"[INFO] No migrations directory found. Creating: {MIGRATIONS_DIR}")
         MIGRATIONS_DIR.mkdir(parents=True, exist_ok=True)
 
-    migration_files = sorted(MIGRATIONS_DIR.glob("*.sql"))
+    migration_files = sorted(
+        [*MIGRATIONS_DIR.glob("*.sql"), *MIGRATIONS_DIR.glob("*.py")],
+        key=lambda path: path.name
+    )
 
     if not migration_files:
         print("[INFO] No migration files found.")
@@ -65,10 +85,13 @@ def run_migrations():
         print(f"[APPLY] Applying migration: {migration_name}")
 
         try:
-            # Read and execute migration SQL
-            with open(migration_file, "r", encoding="utf-8") as f:
-                sql = f.read()
-                cursor.executescript(sql)
+            if migration_file.suffix == ".py":
+                apply_python_migration(migration_file, conn)
+            else:
+                # Read and execute migration SQL
+                with open(migration_file, "r", encoding="utf-8") as f:
+                    sql = f.read()
+                    cursor.executescript(sql)
 
             # Record migration as applied
             cursor.execute(
@@ -0,0 +1,32 @@
+"""
+Custom HTTP routes served alongside the LangGraph agent.
+
+Mounted by the LangGraph server through the "http" entry in langgraph.json,
+so the UI can read dashboard data without going through the agent.
+
+Routes:
+    GET /statistics/heatmap?days=365  Per-day review counts and streaks
+"""
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from japanese_agent.tools.study_statistics import get_review_heatmap
+
+
+async def review_heatmap(request: Request) -> JSONResponse:
+    """Calendar heatmap data; see get_review_heatmap."""
+    try:
+        days = int(request.query_params.get("days", 365))
+    except ValueError:
+        return JSONResponse({"success": False, "error": "days must be an integer"}, status_code=400)
+
+    result = await get_review_heatmap.coroutine(days=days)
+    return JSONResponse(result, status_code=200 if result["success"] else 400)
+
+
+app = Starlette(routes=[
+    Route("/statistics/heatmap", review_heatmap, methods=["GET"]),
+])
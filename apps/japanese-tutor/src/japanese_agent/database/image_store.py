@@ -0,0 +1,148 @@
+"""
+Content-addressed image store for screenshots.
+
+Images are written once as raw bytes under their SHA-256 hash
+(``<root>/<hash[:2]>/<hash><ext>``). Graph state and the ``screenshots``
+table only carry the hash, so checkpoints never serialize image data and
+identical screenshots share one file.
+"""
+
+import base64
+import hashlib
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional, Union
+
+from cernji_logging import get_logger
+
+from japanese_agent.database.connection import get_database_path
+
+logger = get_logger(__name__)
+
+
+MIME_EXTENSIONS = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/jpg": ".jpg",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+
+
+class StoredImage(NamedTuple):
+    """Reference to an image in the store."""
+    image_hash: str
+    mime_type: str
+    size: int
+    path: str
+
+
+def get_image_store_path(database_path: Optional[str] = None) -> Path:
+    """
+    Get the image store directory.
+
+    Args:
+        database_path: Database the store belongs to (defaults to get_database_path())
+
+    Returns:
+        Store root directory
+
+    Environment Variables:
+        IMAGE_STORE_PATH: Custom store location (default: "images" next to the database)
+    """
+    root = os.getenv("IMAGE_STORE_PATH")
+    if root:
+        return Path(root).resolve()
+    return Path(database_path or get_database_path()).parent / "images"
+
+
+def hash_image(data: Union[bytes, memoryview]) -> str:
+    """Content hash used as the image key."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def image_path(image_hash: str, mime_type: str = "image/png", root: Optional[Path] = None) -> Path:
+    """Location of an image in the store."""
+    extension = MIME_EXTENSIONS.get((mime_type or "").lower(), ".png")
+    root = root or get_image_store_path()
+    return root / image_hash[:2] / f"{image_hash}{extension}"
+
+
+def store_image(
+    data: Union[bytes, memoryview],
+    mime_type: str = "image/png",
+    root: Optional[Path] = None,
+) -> StoredImage:
+    """
+    Write image bytes to the store unless the same content is already there.
+
+    Args:
+        data: Raw image bytes
+        mime_type: MIME type of the image
+        root: Store root (defaults to get_image_store_path())
+
+    Returns:
+        StoredImage reference
+
+    Raises:
+        ValueError: If data is empty
+    """
+    if not len(data):
+        raise ValueError("Cannot store an empty image")
+
+    image_hash = hash_image(data)
+    path = image_path(image_hash, mime_type, root)
+
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write beside the target and rename so readers never see a partial file
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        logger.debug("Image stored", image_hash=image_hash, size=len(data))
+
+    return StoredImage(image_hash, mime_type, len(data), str(path))
+
+
+def store_base64_image(base64_data: str, mime_type: str = "image/png", root: Optional[Path] = None) -> StoredImage:
+    """
+    Decode base64 image data and write it to the store.
+
+    Raises:
+        ValueError: If the data is not valid base64 or is empty
+    """
+    return store_image(base64.b64decode(base64_data, validate=True), mime_type, root)
+
+
+@contextmanager
+def open_image(image_hash: str, mime_type: str = "image/png", root: Optional[Path] = None) -> Iterator[memoryview]:
+    """
+    Memory-map a stored image read-only.
+
+    The view is only valid inside the ``with`` block.
+
+    Raises:
+        FileNotFoundError: If the image is not in the store
+    """
+    with open(image_path(image_hash, mime_type, root), "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
+def read_image_base64(image_hash: str, mime_type: str = "image/png", root: Optional[Path] = None) -> str:
+    """Base64-encode a stored image straight from its memory map."""
+    with open_image(image_hash, mime_type, root) as view:
+        return base64.b64encode(view).decode("ascii")
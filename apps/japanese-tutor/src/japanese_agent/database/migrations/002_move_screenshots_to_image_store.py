@@ -0,0 +1,70 @@
+"""
+Migration: Move screenshot images from base64 TEXT to the image store
+Date: 2026-10-18
+Purpose: Keep raw image bytes on disk keyed by content hash; screenshots rows
+         (and graph state) only reference the hash
+
+Adds screenshots.image_hash / image_size, writes every base64_data value to the
+content-addressed image store, resets checksum to the content hash (so new
+uploads deduplicate against old rows) and clears base64_data. Rows whose
+base64_data is empty or not valid base64 are reported and cleared as well, so
+one bad row cannot abort the migration. Safe to re-run.
+"""
+
+import sqlite3
+from pathlib import Path
+
+from japanese_agent.database.image_store import get_image_store_path, store_base64_image
+
+BATCH_SIZE = 100
+
+
+def migrate(conn: sqlite3.Connection) -> None:
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(screenshots)")}
+    if "image_hash" not in columns:
+        conn.execute("ALTER TABLE screenshots ADD COLUMN image_hash TEXT")
+    if "image_size" not in columns:
+        conn.execute("ALTER TABLE screenshots ADD COLUMN image_size INTEGER")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_screenshots_image_hash ON screenshots(image_hash)")
+
+    database_file = conn.execute("PRAGMA database_list").fetchone()[2]
+    root = get_image_store_path(database_file or None)
+
+    moved = skipped = 0
+    while True:
+        rows = conn.execute(
+            """
+            SELECT id, base64_data, COALESCE(mime_type, 'image/png')
+            FROM screenshots WHERE base64_data IS NOT NULL LIMIT ?
+            """,
+            (BATCH_SIZE,)
+        ).fetchall()
+        if not rows:
+            break
+
+        updates, invalid = [], []
+        for screenshot_id, base64_data, mime_type in rows:
+            try:
+                stored = store_base64_image(base64_data, mime_type, root)
+            except (TypeError, ValueError) as e:
+                print(f"[WARN] Screenshot {screenshot_id} has no decodable image, clearing it: {e}")
+                invalid.append((screenshot_id,))
+                continue
+            updates.append((stored.image_hash, stored.size, stored.image_hash, stored.path, screenshot_id))
+
+        conn.executemany(
+            """
+            UPDATE screenshots
+            SET image_hash = ?, image_size = ?, checksum = ?, file_path = ?, base64_data = NULL
+            WHERE id = ?
+            """,
+            updates
+        )
+        # Cleared too, or the next batch would select them again
+        conn.executemany("UPDATE screenshots SET base64_data = NULL WHERE id = ?", invalid)
+        moved += len(updates)
+        skipped += len(invalid)
+
+    print(f"[INFO] Moved {moved} screenshot image(s) to {Path(root)}")
+    if skipped:
+        print(f"[WARN] Cleared {skipped} screenshot(s) with undecodable image data")
@@ -0,0 +1,39 @@
+"""
+Migration: Add decks and FSRS memory state to flashcards
+Date: 2026-10-18
+Purpose: Let each deck choose SM-2 or FSRS scheduling and keep fitted FSRS
+         parameters per deck
+
+Adds flashcards.deck (existing cards go to "default"), fsrs_stability and
+fsrs_difficulty, and the decks table. Decks without a row keep using SM-2.
+Safe to re-run.
+"""
+
+import sqlite3
+
+
+def migrate(conn: sqlite3.Connection) -> None:
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(flashcards)")}
+    if "deck" not in columns:
+        conn.execute("ALTER TABLE flashcards ADD COLUMN deck TEXT NOT NULL DEFAULT 'default'")
+    if "fsrs_stability" not in columns:
+        conn.execute("ALTER TABLE flashcards ADD COLUMN fsrs_stability REAL")
+    if "fsrs_difficulty" not in columns:
+        conn.execute("ALTER TABLE flashcards ADD COLUMN fsrs_difficulty REAL")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_flashcards_deck ON flashcards(deck)")
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS decks (
+            name TEXT PRIMARY KEY,
+            scheduler TEXT NOT NULL DEFAULT 'sm2' CHECK(scheduler IN ('sm2', 'fsrs')),
+            desired_retention REAL NOT NULL DEFAULT 0.9 CHECK(desired_retention > 0 AND desired_retention < 1),
+            fsrs_parameters TEXT,
+            optimized_at TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+
+    print("[INFO] Added decks table and FSRS columns to flashcards")
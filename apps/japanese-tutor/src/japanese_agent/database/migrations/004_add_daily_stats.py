@@ -0,0 +1,156 @@
+"""
+Migration: Add the daily_stats aggregates table
+Date: 2026-10-18
+Purpose: Keep per-day review counts, new cards/words and vocabulary status
+         transitions up to date with triggers (deletes included), so
+         statistics, streaks and the calendar heatmap read one row per day
+         instead of scanning history
+
+Creates daily_stats, its triggers and the (status, ease_factor) index on
+flashcards, then backfills reviews, new cards and new words from existing
+rows. Past status transitions were never recorded and start at zero. The
+backfill only runs while daily_stats is empty, so re-running is safe.
+"""
+
+import sqlite3
+
+TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS daily_stats_review
+    AFTER INSERT ON review_sessions
+    FOR EACH ROW
+    BEGIN
+        INSERT INTO daily_stats (day, reviews, correct, again, response_time_ms)
+        VALUES (DATE(COALESCE(NEW.reviewed_at, CURRENT_TIMESTAMP)), 1, NEW.correct != 0,
+                NEW.quality_rating < 3, COALESCE(NEW.response_time_ms, 0))
+        ON CONFLICT(day) DO UPDATE SET
+            reviews = reviews + 1,
+            correct = correct + excluded.correct,
+            again = again + excluded.again,
+            response_time_ms = response_time_ms + excluded.response_time_ms;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS daily_stats_new_card
+    AFTER INSERT ON flashcards
+    FOR EACH ROW
+    BEGIN
+        INSERT INTO daily_stats (day, new_cards)
+        VALUES (DATE(COALESCE(NEW.created_at, CURRENT_TIMESTAMP)), 1)
+        ON CONFLICT(day) DO UPDATE SET new_cards = new_cards + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS daily_stats_new_word
+    AFTER INSERT ON vocabulary
+    FOR EACH ROW
+    BEGIN
+        INSERT INTO daily_stats (day, new_words)
+        VALUES (DATE(COALESCE(NEW.first_seen_at, CURRENT_TIMESTAMP)), 1)
+        ON CONFLICT(day) DO UPDATE SET new_words = new_words + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS daily_stats_status_transition
+    AFTER UPDATE OF study_status ON vocabulary
+    FOR EACH ROW
+    WHEN OLD.study_status IS NOT NEW.study_status
+    BEGIN
+        INSERT INTO daily_stats (day, to_learning, to_reviewing, to_mastered, to_suspended)
+        VALUES (DATE('now'), NEW.study_status = 'learning', NEW.study_status = 'reviewing',
+                NEW.study_status = 'mastered', NEW.study_status = 'suspended')
+        ON CONFLICT(day) DO UPDATE SET
+            to_learning = to_learning + excluded.to_learning,
+            to_reviewing = to_reviewing + excluded.to_reviewing,
+            to_mastered = to_mastered + excluded.to_mastered,
+            to_suspended = to_suspended + excluded.to_suspended;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS daily_stats_review_deleted
+    AFTER DELETE ON review_sessions
+    FOR EACH ROW
+    BEGIN
+        UPDATE daily_stats SET
+            reviews = reviews - 1,
+            correct = correct - (OLD.correct != 0),
+            again = again - (OLD.quality_rating < 3),
+            response_time_ms = response_time_ms - COALESCE(OLD.response_time_ms, 0)
+        WHERE day = DATE(OLD.reviewed_at);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS daily_stats_card_deleted
+    AFTER DELETE ON flashcards
+    FOR EACH ROW
+    BEGIN
+        UPDATE daily_stats SET new_cards = new_cards - 1 WHERE day = DATE(OLD.created_at);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS daily_stats_word_deleted
+    AFTER DELETE ON vocabulary
+    FOR EACH ROW
+    BEGIN
+        UPDATE daily_stats SET new_words = new_words - 1 WHERE day = DATE(OLD.first_seen_at);
+    END
+    """,
+]
+
+
+def migrate(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS daily_stats (
+            day TEXT PRIMARY KEY,
+            reviews INTEGER NOT NULL DEFAULT 0,
+            correct INTEGER NOT NULL DEFAULT 0,
+            again INTEGER NOT NULL DEFAULT 0,
+            response_time_ms INTEGER NOT NULL DEFAULT 0,
+            new_cards INTEGER NOT NULL DEFAULT 0,
+            new_words INTEGER NOT NULL DEFAULT 0,
+            to_learning INTEGER NOT NULL DEFAULT 0,
+            to_reviewing INTEGER NOT NULL DEFAULT 0,
+            to_mastered INTEGER NOT NULL DEFAULT 0,
+            to_suspended INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_flashcards_status_ease ON flashcards(status, ease_factor)")
+
+    if conn.execute("SELECT COUNT(*) FROM daily_stats").fetchone()[0] == 0:
+        conn.execute(
+            """
+            INSERT INTO daily_stats (day, reviews, correct, again, response_time_ms)
+            SELECT DATE(reviewed_at), COUNT(*), SUM(correct != 0), SUM(quality_rating < 3),
+                   COALESCE(SUM(response_time_ms), 0)
+            FROM review_sessions
+            WHERE reviewed_at IS NOT NULL
+            GROUP BY DATE(reviewed_at)
+            """
+        )
+        conn.execute(
+            """
+            INSERT INTO daily_stats (day, new_cards)
+            SELECT DATE(created_at), COUNT(*) FROM flashcards
+            WHERE created_at IS NOT NULL
+            GROUP BY DATE(created_at)
+            ON CONFLICT(day) DO UPDATE SET new_cards = excluded.new_cards
+            """
+        )
+        conn.execute(
+            """
+            INSERT INTO daily_stats (day, new_words)
+            SELECT DATE(first_seen_at), COUNT(*) FROM vocabulary
+            WHERE first_seen_at IS NOT NULL
+            GROUP BY DATE(first_seen_at)
+            ON CONFLICT(day) DO UPDATE SET new_words = excluded.new_words
+            """
+        )
+
+    # Triggers last, so the backfill isn't counted twice
+    for trigger in TRIGGERS:
+        conn.execute(trigger)
+
+    days = conn.execute("SELECT COUNT(*) FROM daily_stats").fetchone()[0]
+    print(f"[INFO] Added daily_stats with {days} day(s) of history")
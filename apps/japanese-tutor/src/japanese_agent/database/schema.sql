@@ -83,7 +83,9 @@ CREATE TABLE IF NOT EXISTS sources (
 CREATE TABLE IF NOT EXISTS screenshots (
     id INTEGER PRIMARY KEY,
     file_path TEXT,  -- Optional: temp file path for OCR processing
-    base64_data TEXT,  -- Base64-encoded image data for reliable storage/retrieval
+    base64_data TEXT,  -- Legacy: base64 image data, moved to the image store by migration 002
+    image_hash TEXT,  -- SHA-256 key of the raw image in the content-addressed image store
+    image_size INTEGER,  -- Image size in bytes
     mime_type TEXT DEFAULT 'image/png',  -- MIME type (e.g., "image/png", "image/jpeg")
     source_id INTEGER,
     processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -137,6 +139,9 @@ CREATE TABLE IF NOT EXISTS flashcards (
     consecutive_correct INTEGER DEFAULT 0 CHECK(consecutive_correct >= 0),
     lapses INTEGER DEFAULT 0 CHECK(lapses >= 0),
     difficulty_rating INTEGER CHECK(difficulty_rating BETWEEN 1 AND 5 OR difficulty_rating IS NULL),
+    deck TEXT NOT NULL DEFAULT 'default',
+    fsrs_stability REAL,   -- FSRS memory state (NULL until first review)
+    fsrs_difficulty REAL,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (vocabulary_id) REFERENCES vocabulary(id) ON DELETE CASCADE,
     FOREIGN KEY (screenshot_id) REFERENCES screenshots(id) ON DELETE SET NULL
@@ -159,6 +164,18 @@ CREATE TABLE IF NOT EXISTS review_sessions (
     FOREIGN KEY (flashcard_id) REFERENCES flashcards(id) ON DELETE CASCADE
 );
 
+-- 7b. DECKS TABLE
+-- Per-deck scheduler choice (SM-2 or FSRS) and fitted FSRS parameters
+CREATE TABLE IF NOT EXISTS decks (
+    name TEXT PRIMARY KEY,
+    scheduler TEXT NOT NULL DEFAULT 'sm2' CHECK(scheduler IN ('sm2', 'fsrs')),
+    desired_retention REAL NOT NULL DEFAULT 0.9 CHECK(desired_retention > 0 AND desired_retention < 1),
+    fsrs_parameters TEXT,  -- JSON array of 17 weights (NULL = defaults)
+    optimized_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- 8. STUDY GOALS TABLE
 -- User-defined learning objectives with progress tracking
 CREATE TABLE IF NOT EXISTS study_goals (
@@ -236,6 +253,50 @@ CREATE TABLE IF NOT EXISTS _migration_backup (
     version TEXT
 );
 
+-- 14. SCREENSHOT ANALYSIS CACHE
+-- Analysis results keyed by perceptual fingerprint (see tools/screenshot_cache.py,
+-- which also creates these tables in databases initialized before they existed)
+CREATE TABLE IF NOT EXISTS screenshot_analysis_cache (
+    id INTEGER PRIMARY KEY,
+    ocr_method TEXT NOT NULL,
+    dhash BLOB NOT NULL,  -- 256-bit difference hash
+    phash BLOB NOT NULL,  -- 64-bit DCT hash
+    thumbnail BLOB NOT NULL,  -- 160x120 grayscale pixels
+    result_json TEXT NOT NULL,
+    analysis_seconds REAL NOT NULL DEFAULT 0,
+    cost_usd REAL NOT NULL DEFAULT 0,  -- Estimated Claude Vision cost
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    last_hit_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 15. SCREENSHOT HASH BANDS
+-- 16-bit bands of each dHash, for near-duplicate lookup by exact band match
+CREATE TABLE IF NOT EXISTS screenshot_hash_bands (
+    band INTEGER NOT NULL,
+    value INTEGER NOT NULL,
+    cache_id INTEGER NOT NULL,
+    PRIMARY KEY (band, value, cache_id),
+    FOREIGN KEY (cache_id) REFERENCES screenshot_analysis_cache(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- 16. DAILY STATS
+-- Per-day study aggregates (UTC days), maintained by the triggers below so
+-- streaks, heatmaps and dashboards read one row per day
+CREATE TABLE IF NOT EXISTS daily_stats (
+    day TEXT PRIMARY KEY,  -- YYYY-MM-DD
+    reviews INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    again INTEGER NOT NULL DEFAULT 0,  -- reviews rated below quality 3
+    response_time_ms INTEGER NOT NULL DEFAULT 0,  -- sum over reviews
+    new_cards INTEGER NOT NULL DEFAULT 0,
+    new_words INTEGER NOT NULL DEFAULT 0,
+    to_learning INTEGER NOT NULL DEFAULT 0,  -- vocabulary status transitions
+    to_reviewing INTEGER NOT NULL DEFAULT 0,
+    to_mastered INTEGER NOT NULL DEFAULT 0,
+    to_suspended INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
 -- ============================================================================
 -- INDEXES FOR PERFORMANCE
 -- ============================================================================
@@ -258,6 +319,7 @@ CREATE INDEX IF NOT EXISTS idx_sources_name ON sources(name);
 CREATE INDEX IF NOT EXISTS idx_screenshots_source_id ON screenshots(source_id);
 CREATE INDEX IF NOT EXISTS idx_screenshots_checksum ON screenshots(checksum);
 CREATE INDEX IF NOT EXISTS idx_screenshots_processed_at ON screenshots(processed_at);
+CREATE INDEX IF NOT EXISTS idx_screenshots_image_hash ON screenshots(image_hash);
 
 -- Example sentences indexes
 CREATE INDEX IF NOT EXISTS idx_example_sentences_vocabulary_id ON example_sentences(vocabulary_id);
@@ -269,6 +331,9 @@ CREATE INDEX IF NOT EXISTS idx_flashcards_status ON flashcards(status);
 CREATE INDEX IF NOT EXISTS idx_flashcards_vocabulary_id ON flashcards(vocabulary_id);
 -- Composite index for due flashcards query (status + next_review_at)
 CREATE INDEX IF NOT EXISTS idx_flashcards_status_next_review ON flashcards(status, next_review_at);
+CREATE INDEX IF NOT EXISTS idx_flashcards_deck ON flashcards(deck);
+-- Covering index for active card count and average ease
+CREATE INDEX IF NOT EXISTS idx_flashcards_status_ease ON flashcards(status, ease_factor);
 
 -- Review sessions indexes
 CREATE INDEX IF NOT EXISTS idx_review_sessions_flashcard_id ON review_sessions(flashcard_id);
@@ -344,6 +409,90 @@ BEGIN
     UPDATE study_goals SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
 END;
 
+-- ============================================================================
+-- TRIGGERS FOR DAILY STATS
+-- ============================================================================
+
+-- Count every review on the day it happened
+CREATE TRIGGER IF NOT EXISTS daily_stats_review
+AFTER INSERT ON review_sessions
+FOR EACH ROW
+BEGIN
+    INSERT INTO daily_stats (day, reviews, correct, again, response_time_ms)
+    VALUES (DATE(COALESCE(NEW.reviewed_at, CURRENT_TIMESTAMP)), 1, NEW.correct != 0,
+            NEW.quality_rating < 3, COALESCE(NEW.response_time_ms, 0))
+    ON CONFLICT(day) DO UPDATE SET
+        reviews = reviews + 1,
+        correct = correct + excluded.correct,
+        again = again + excluded.again,
+        response_time_ms = response_time_ms + excluded.response_time_ms;
+END;
+
+-- Count new flashcards
+CREATE TRIGGER IF NOT EXISTS daily_stats_new_card
+AFTER INSERT ON flashcards
+FOR EACH ROW
+BEGIN
+    INSERT INTO daily_stats (day, new_cards)
+    VALUES (DATE(COALESCE(NEW.created_at, CURRENT_TIMESTAMP)), 1)
+    ON CONFLICT(day) DO UPDATE SET new_cards = new_cards + 1;
+END;
+
+-- Count new vocabulary
+CREATE TRIGGER IF NOT EXISTS daily_stats_new_word
+AFTER INSERT ON vocabulary
+FOR EACH ROW
+BEGIN
+    INSERT INTO daily_stats (day, new_words)
+    VALUES (DATE(COALESCE(NEW.first_seen_at, CURRENT_TIMESTAMP)), 1)
+    ON CONFLICT(day) DO UPDATE SET new_words = new_words + 1;
+END;
+
+-- Count vocabulary status transitions by target status
+CREATE TRIGGER IF NOT EXISTS daily_stats_status_transition
+AFTER UPDATE OF study_status ON vocabulary
+FOR EACH ROW
+WHEN OLD.study_status IS NOT NEW.study_status
+BEGIN
+    INSERT INTO daily_stats (day, to_learning, to_reviewing, to_mastered, to_suspended)
+    VALUES (DATE('now'), NEW.study_status = 'learning', NEW.study_status = 'reviewing',
+            NEW.study_status = 'mastered', NEW.study_status = 'suspended')
+    ON CONFLICT(day) DO UPDATE SET
+        to_learning = to_learning + excluded.to_learning,
+        to_reviewing = to_reviewing + excluded.to_reviewing,
+        to_mastered = to_mastered + excluded.to_mastered,
+        to_suspended = to_suspended + excluded.to_suspended;
+END;
+
+-- Take deleted reviews (including cascades from deleted cards) back out
+CREATE TRIGGER IF NOT EXISTS daily_stats_review_deleted
+AFTER DELETE ON review_sessions
+FOR EACH ROW
+BEGIN
+    UPDATE daily_stats SET
+        reviews = reviews - 1,
+        correct = correct - (OLD.correct != 0),
+        again = again - (OLD.quality_rating < 3),
+        response_time_ms = response_time_ms - COALESCE(OLD.response_time_ms, 0)
+    WHERE day = DATE(OLD.reviewed_at);
+END;
+
+-- Uncount deleted flashcards
+CREATE TRIGGER IF NOT EXISTS daily_stats_card_deleted
+AFTER DELETE ON flashcards
+FOR EACH ROW
+BEGIN
+    UPDATE daily_stats SET new_cards = new_cards - 1 WHERE day = DATE(OLD.created_at);
+END;
+
+-- Uncount deleted vocabulary
+CREATE TRIGGER IF NOT EXISTS daily_stats_word_deleted
+AFTER DELETE ON vocabulary
+FOR EACH ROW
+BEGIN
+    UPDATE daily_stats SET new_words = new_words - 1 WHERE day = DATE(OLD.first_seen_at);
+END;
+
 -- ============================================================================
 -- INITIAL MIGRATION RECORD
 -- ============================================================================
@@ -5,13 +5,12 @@ Implements OCR, vocabulary tracking, and flashcard review workflows.
 """
 from __future__ import annotations
 
-import atexit
-import base64
 import os
-import tempfile
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any, Dict, List
 
+from cernji_checkpoint import get_checkpointer
 from cernji_logging import get_logger
 from dotenv import load_dotenv
 from langchain.chat_models import init_chat_model
@@ -20,6 +19,8 @@ from langgraph.graph import END, START, StateGraph
 from langgraph.prebuilt import ToolNode
 
 # Import nodes
+from japanese_agent.database.connection import get_database_path
+from japanese_agent.database.image_store import StoredImage, store_base64_image
 from japanese_agent.nodes import emit_screenshot_ui, save_screenshot_to_db
 
 # Import state schema
@@ -30,16 +31,27 @@ from japanese_agent.tools import (
     # Screenshot analysis
     analyze_screenshot_claude,
     analyze_screenshot_manga_ocr,
+    analyze_screenshots_manga_ocr,
+    answer_card,
     create_flashcard,
+    end_review_session,
     # Flashcard management
     get_due_flashcards,
+    get_review_heatmap,
     get_review_statistics,
+    get_screenshot_cache_statistics,
     get_vocabulary_statistics,
     hybrid_screenshot_analysis,
     list_vocabulary_by_status,
+    next_card,
+    optimize_fsrs_parameters,
     record_flashcard_review,
+    record_flashcard_reviews,
     # Vocabulary management
     search_vocabulary,
+    set_deck_scheduler,
+    start_ocr_preload,
+    start_review_session,
     update_vocabulary_status,
 )
 
@@ -52,30 +64,6 @@ os.environ.setdefault('LOG_FILE', 'logs/app.json.log')
 logger = get_logger(__name__)
 
 
-# ==============================================================================
-# Temporary File Management
-# ==============================================================================
-
-# Track temporary files for cleanup
-_temp_files: List[str] = []
-
-
-def cleanup_temp_files():
-    """Clean up temporary image files on exit."""
-    for file_path in _temp_files:
-        try:
-            if os.path.exists(file_path):
-                os.unlink(file_path)
-                logger.debug("Cleaned up temp file", file_path=file_path)
-        except Exception as e:
-            # Log but don't fail - temp files will be cleaned by OS eventually
-            logger.warning("Could not delete temp file", file_path=file_path, error=str(e))
-
-
-# Register cleanup handler
-atexit.register(cleanup_temp_files)
-
-
 # ==============================================================================
 # Image Preprocessing Helpers
 # ==============================================================================
@@ -111,75 +99,6 @@ def extract_base64_from_data_url(data_url: str) -> tuple[str, str]:
         raise ValueError(f"Failed to parse data URL: {e}")
 
 
-def determine_file_extension(mime_type: str) -> str:
-    """
-    Determine file extension from MIME type.
-
-    Args:
-        mime_type: MIME type string (e.g., "image/jpeg")
-
-    Returns:
-        File extension with dot (e.g., ".jpg")
-    """
-    mime_to_ext = {
-        "image/png": ".png",
-        "image/jpeg": ".jpg",
-        "image/jpg": ".jpg",
-        "image/gif": ".gif",
-        "image/webp": ".webp",
-    }
-
-    return mime_to_ext.get(mime_type.lower(), ".png")  # Default to .png
-
-
-def save_image_to_temp_file(base64_data: str, mime_type: str) -> str:
-    """
-    Save base64-encoded image data to a temporary file.
-
-    Args:
-        base64_data: Base64-encoded image data
-        mime_type: MIME type of the image
-
-    Returns:
-        Absolute path to the created temporary file
-
-    Raises:
-        ValueError: If base64 data is invalid
-    """
-    try:
-        # Decode base64 to bytes
-        image_bytes = base64.b64decode(base64_data)
-
-        # Determine file extension
-        extension = determine_file_extension(mime_type)
-
-        # Create temporary file
-        temp_file = tempfile.NamedTemporaryFile(
-            delete=False,
-            suffix=extension,
-            prefix="japanese_agent_screenshot_"
-        )
-
-        try:
-            # Write image bytes
-            temp_file.write(image_bytes)
-            temp_file.flush()
-
-            # Get absolute path
-            temp_path = os.path.abspath(temp_file.name)
-
-            # Track for cleanup
-            _temp_files.append(temp_path)
-
-            return temp_path
-
-        finally:
-            temp_file.close()
-
-    except Exception as e:
-        raise ValueError(f"Failed to save image to temp file: {e}")
-
-
 # ==============================================================================
 # Tool Definitions
 # ==============================================================================
@@ -189,7 +108,9 @@ tools = [
     # Screenshot Analysis Tools
     analyze_screenshot_claude,
     analyze_screenshot_manga_ocr,
+    analyze_screenshots_manga_ocr,
     hybrid_screenshot_analysis,
+    get_screenshot_cache_statistics,
 
     # Vocabulary Tools
     search_vocabulary,
@@ -200,8 +121,18 @@ tools = [
     # Flashcard Tools
     get_due_flashcards,
     record_flashcard_review,
+    record_flashcard_reviews,
     create_flashcard,
     get_review_statistics,
+    get_review_heatmap,
+    set_deck_scheduler,
+    optimize_fsrs_parameters,
+
+    # Review Session Tools
+    start_review_session,
+    next_card,
+    answer_card,
+    end_review_session,
 ]
 
 
@@ -227,19 +158,39 @@ llm = init_chat_model(model_string)
 # Node Functions
 # ==============================================================================
 
+def _stored_image_update(stored: StoredImage) -> Dict[str, Any]:
+    """State update pointing current_screenshot at a stored image."""
+    return {
+        "current_screenshot": {
+            "file_path": stored.path,
+            "image_hash": stored.image_hash,
+            "image_size": stored.size,
+            "mime_type": stored.mime_type,
+            "processed_at": datetime.now(timezone.utc).isoformat(),
+            "ocr_method": "pending",
+        },
+        "messages": [
+            AIMessage(
+                content=f"I've received the image and saved it for analysis. The file is ready at: {stored.path}"
+            )
+        ]
+    }
+
+
 def preprocess_images(state: JapaneseAgentState) -> Dict[str, Any]:
     """
     Extract images from message content and save as temporary files.
 
     When users attach images in LangGraph Studio, they come as base64-encoded
     content blocks in HumanMessage objects. This node extracts them and saves
-    to temp files so screenshot analysis tools can access them via file paths.
+    them to the content-addressed image store so screenshot analysis tools can
+    access them via file paths. Only the image reference goes into state.
 
     Args:
         state: Current graph state
 
     Returns:
-        State update dict with file path in current_screenshot, or empty dict if no images
+        State update dict with image reference in current_screenshot, or empty dict if no images
     """
     # Get the last message
     if not state.get("messages"):
@@ -271,28 +222,15 @@ def preprocess_images(state: JapaneseAgentState) -> Dict[str, Any]:
                     # Extract base64 data from data URL
                     base64_data, mime_type = extract_base64_from_data_url(url)
 
-                    # Save to temp file for OCR tools
-                    temp_file_path = save_image_to_temp_file(base64_data, mime_type)
+                    # Save to the image store for OCR tools
+                    stored = store_base64_image(base64_data, mime_type)
 
-                    logger.info("Image saved to temp file",
-                               file_path=temp_file_path,
+                    logger.info("Image saved to image store",
+                               file_path=stored.path,
+                               image_hash=stored.image_hash,
                                mime_type=mime_type)
 
-                    # Update state with file path AND base64 data for reliable retrieval
-                    return {
-                        "current_screenshot": {
-                            "file_path": temp_file_path,
-                            "base64_data": base64_data,  # Store for UI display
-                            "mime_type": mime_type,
-                            "processed_at": datetime.now(timezone.utc).isoformat(),
-                            "ocr_method": "pending",
-                        },
-                        "messages": [
-                            AIMessage(
-                                content=f"I've received the image and saved it for analysis. The file is ready at: {temp_file_path}"
-                            )
-                        ]
-                    }
+                    return _stored_image_update(stored)
                 # Could also handle http/https URLs here if needed
 
             except Exception as e:
@@ -308,28 +246,15 @@ def preprocess_images(state: JapaneseAgentState) -> Dict[str, Any]:
                 mime_type = block.get("mime_type", "image/png")
 
                 if base64_data:
-                    # Save to temp file for OCR tools
-                    temp_file_path = save_image_to_temp_file(base64_data, mime_type)
+                    # Save to the image store for OCR tools
+                    stored = store_base64_image(base64_data, mime_type)
 
-                    logger.info("Image saved to temp file",
-                               file_path=temp_file_path,
+                    logger.info("Image saved to image store",
+                               file_path=stored.path,
+                               image_hash=stored.image_hash,
                                mime_type=mime_type)
 
-                    # Update state with file path AND base64 data for reliable retrieval
-                    return {
-                        "current_screenshot": {
-                            "file_path": temp_file_path,
-                            "base64_data": base64_data,  # Store for UI display
-                            "mime_type": mime_type,
-                            "processed_at": datetime.now(timezone.utc).isoformat(),
-                            "ocr_method": "pending",
-                        },
-                        "messages": [
-                            AIMessage(
-                                content=f"I've received the image and saved it for analysis. The file is ready at: {temp_file_path}"
-                            )
-                        ]
-                    }
+                    return _stored_image_update(stored)
                 else:
                     logger.warning("Empty 'data' field in image block")
 
@@ -438,10 +363,35 @@ graph_builder.add_edge("emit_screenshot_ui", "chatbot")
 # automatically by the server - no need to pass a checkpointer here!
 graph = graph_builder.compile()
 
+# Load manga-ocr while the server starts instead of on the first screenshot
+start_ocr_preload()
+
+# Graph with durable checkpointing, created on first use
+_persistent_graph = None
+
+
+def get_persistent_graph():
+    """
+    Get the agent graph compiled with the durable SQLite checkpointer.
+
+    Use this when running the graph outside `langgraph dev` (FastAPI server,
+    scripts), so conversation threads survive restarts. Checkpoints are stored
+    in checkpoints.db next to the agent database (override with
+    CHECKPOINT_DB_PATH).
+
+    Returns:
+        Compiled graph sharing one checkpointer across callers
+    """
+    global _persistent_graph
+    if _persistent_graph is None:
+        db_path = Path(get_database_path()).with_name("checkpoints.db")
+        _persistent_graph = graph_builder.compile(checkpointer=get_checkpointer(db_path))
+    return _persistent_graph
+
 
 # ==============================================================================
 # Graph Export
 # ==============================================================================
 
 # This allows the graph to be loaded by LangGraph server
-__all__ = ["graph"]
+__all__ = ["graph", "get_persistent_graph"]
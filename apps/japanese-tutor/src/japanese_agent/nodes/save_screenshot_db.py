@@ -2,19 +2,19 @@
 from __future__ import annotations
 
 import json
-import hashlib
 from datetime import datetime, timezone
 from typing import Dict, Any
 
 from japanese_agent.state.schemas import JapaneseAgentState
 from japanese_agent.database.connection import execute_insert, get_connection
+from japanese_agent.database.image_store import store_base64_image
 
 
 async def save_screenshot_to_db(state: JapaneseAgentState) -> Dict[str, Any]:
     """Save screenshot analysis results to database.
 
     This node runs after screenshot analysis tools complete and persists:
-    - Base64 image data for reliable retrieval
+    - Image store reference (content hash) for reliable retrieval
     - OCR extracted text (JSON array)
     - Metadata (confidence, method, timestamps)
 
@@ -49,16 +49,22 @@ async def save_screenshot_to_db(state: JapaneseAgentState) -> Dict[str, Any]:
                     screenshot_info = state["current_screenshot"]
 
                     # Get required fields
-                    base64_data = screenshot_info.get("base64_data")
+                    image_hash = screenshot_info.get("image_hash")
+                    image_size = screenshot_info.get("image_size")
                     mime_type = screenshot_info.get("mime_type", "image/png")
                     file_path = screenshot_info.get("file_path")  # Optional
 
-                    if not base64_data:
-                        print(f"[WARN] No base64_data in screenshot_info, cannot save to database")
+                    # Checkpoints from before the image store carry base64 data instead
+                    if not image_hash and screenshot_info.get("base64_data"):
+                        stored = store_base64_image(screenshot_info["base64_data"], mime_type)
+                        image_hash, image_size, file_path = stored.image_hash, stored.size, stored.path
+
+                    if not image_hash:
+                        print(f"[WARN] No image_hash in screenshot_info, cannot save to database")
                         break
 
-                    # Calculate checksum for duplicate detection
-                    checksum = hashlib.sha256(base64_data.encode()).hexdigest()
+                    # The content hash doubles as the checksum for duplicate detection
+                    checksum = image_hash
 
                     # Extract OCR data
                     extracted_text = tool_result.get("extracted_text", [])
@@ -88,14 +94,15 @@ async def save_screenshot_to_db(state: JapaneseAgentState) -> Dict[str, Any]:
                         screenshot_id = await execute_insert(
                             """
                             INSERT INTO screenshots (
-                                file_path, base64_data, mime_type, processed_at,
+                                file_path, image_hash, image_size, mime_type, processed_at,
                                 ocr_confidence, extracted_text_json, checksum,
                                 language_detected, has_furigana
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                             """,
                             (
                                 file_path,
-                                base64_data,
+                                image_hash,
+                                image_size,
                                 mime_type,
                                 datetime.now(timezone.utc).isoformat(),
                                 ocr_confidence,
@@ -109,9 +116,15 @@ async def save_screenshot_to_db(state: JapaneseAgentState) -> Dict[str, Any]:
                         print(f"[SUCCESS] Screenshot saved to database (ID: {screenshot_id})")
 
                     # Update state with database ID
+                    screenshot_info = {
+                        key: value for key, value in screenshot_info.items() if key != "base64_data"
+                    }
                     return {
                         "current_screenshot": {
                             **screenshot_info,
+                            "file_path": file_path,
+                            "image_hash": image_hash,
+                            "image_size": image_size,
                             "id": screenshot_id,
                             "screenshot_id": screenshot_id,
                         }
@@ -11,6 +11,7 @@ from typing import Any, Dict
 from langchain_core.messages import AIMessage
 from langgraph.graph.ui import push_ui_message
 
+from japanese_agent.database.image_store import read_image_base64
 from japanese_agent.state.schemas import JapaneseAgentState
 
 
@@ -19,6 +20,7 @@ def emit_screenshot_ui(state: JapaneseAgentState) -> Dict[str, Any]:
 
     Checks if the last tool message contains screenshot analysis results and
     emits a screenshot_card UI component with the OCR results and base64-encoded image.
+    The image is read from the image store, so state only carries its hash.
 
     Args:
         state: Current graph state
@@ -61,40 +63,42 @@ def emit_screenshot_ui(state: JapaneseAgentState) -> Dict[str, Any]:
                             content="Screenshot analysis complete!"
                         )
 
-                    # Get base64 image data from state if available
+                    # Get the image for the card from the image store
                     image_data = ""
                     media_type = "image/png"
 
                     # Try to get image from current_screenshot in state
                     if "current_screenshot" in state and state["current_screenshot"]:
                         screenshot_info = state["current_screenshot"]
+                        media_type = screenshot_info.get("mime_type") or media_type
 
-                        # First, try to use base64_data from state (most reliable)
-                        if "base64_data" in screenshot_info and screenshot_info["base64_data"]:
-                            image_data = screenshot_info["base64_data"]
-                            media_type = screenshot_info.get("mime_type", "image/png")
-                            print(f"✅ Using base64 image data from state")
+                        try:
+                            # First, encode straight from the stored file's memory map (most reliable)
+                            if screenshot_info.get("image_hash"):
+                                image_data = read_image_base64(screenshot_info["image_hash"], media_type)
+                                print(f"✅ Using image {screenshot_info['image_hash'][:12]} from image store")
 
-                        # Fallback: try to read from file_path if base64_data not available
-                        elif "file_path" in screenshot_info:
-                            try:
-                                # Read and encode the image file
+                            # Checkpoints from before the image store
+                            elif screenshot_info.get("base64_data"):
+                                image_data = screenshot_info["base64_data"]
+
+                            # Fallback: read from file_path
+                            elif "file_path" in screenshot_info:
                                 with open(screenshot_info["file_path"], "rb") as f:
-                                    image_bytes = f.read()
-                                    image_data = base64.b64encode(image_bytes).decode("utf-8")
-
-                                    # Determine media type from file extension
-                                    file_ext = Path(screenshot_info["file_path"]).suffix.lower()
-                                    media_type_map = {
-                                        ".png": "image/png",
-                                        ".jpg": "image/jpeg",
-                                        ".jpeg": "image/jpeg",
-                                        ".webp": "image/webp",
-                                    }
-                                    media_type = media_type_map.get(file_ext, "image/png")
-                                    print(f"✅ Read image from file: {screenshot_info['file_path']}")
-                            except Exception as e:
-                                print(f"⚠️ Warning: Could not read screenshot file: {e}")
+                                    image_data = base64.b64encode(f.read()).decode("utf-8")
+
+                                # Determine media type from file extension
+                                file_ext = Path(screenshot_info["file_path"]).suffix.lower()
+                                media_type_map = {
+                                    ".png": "image/png",
+                                    ".jpg": "image/jpeg",
+                                    ".jpeg": "image/jpeg",
+                                    ".webp": "image/webp",
+                                }
+                                media_type = media_type_map.get(file_ext, "image/png")
+                                print(f"✅ Read image from file: {screenshot_info['file_path']}")
+                        except Exception as e:
+                            print(f"⚠️ Warning: Could not read screenshot image: {e}")
 
                     # Format extracted text for UI
                     extracted_text_formatted = []
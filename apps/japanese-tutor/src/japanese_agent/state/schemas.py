@@ -154,8 +154,9 @@ class ScreenshotDict(TypedDict, total=False):
     """Screenshot metadata and OCR results."""
     id: Optional[int]
     screenshot_id: Optional[int]
-    file_path: str
-    base64_data: Optional[str]  # Base64-encoded image data for reliable retrieval
+    file_path: str  # Path of the image in the image store
+    image_hash: Optional[str]  # SHA-256 key of the image in the image store
+    image_size: Optional[int]  # Image size in bytes
     mime_type: Optional[str]  # MIME type of the image (e.g., "image/png")
     processed_at: str  # ISO timestamp
     extracted_text: List[ExtractedTextDict]
@@ -3,7 +3,10 @@
 from .screenshot_analyzer import (
     analyze_screenshot_claude,
     analyze_screenshot_manga_ocr,
+    analyze_screenshots_manga_ocr,
     hybrid_screenshot_analysis,
+    get_screenshot_cache_statistics,
+    start_ocr_preload,
 )
 from .vocabulary_manager import (
     search_vocabulary,
@@ -14,15 +17,32 @@ from .vocabulary_manager import (
 from .flashcard_manager import (
     get_due_flashcards,
     record_flashcard_review,
+    record_flashcard_reviews,
     create_flashcard,
     get_review_statistics,
 )
+from .fsrs_scheduler import (
+    set_deck_scheduler,
+    optimize_fsrs_parameters,
+)
+from .review_scheduler import (
+    start_review_session,
+    next_card,
+    answer_card,
+    end_review_session,
+)
+from .study_statistics import (
+    get_review_heatmap,
+)
 
 __all__ = [
     # Screenshot analysis
     "analyze_screenshot_claude",
     "analyze_screenshot_manga_ocr",
+    "analyze_screenshots_manga_ocr",
     "hybrid_screenshot_analysis",
+    "get_screenshot_cache_statistics",
+    "start_ocr_preload",
 
     # Vocabulary management
     "search_vocabulary",
@@ -33,6 +53,16 @@ __all__ = [
     # Flashcard management
     "get_due_flashcards",
     "record_flashcard_review",
+    "record_flashcard_reviews",
     "create_flashcard",
     "get_review_statistics",
+    "get_review_heatmap",
+    "set_deck_scheduler",
+    "optimize_fsrs_parameters",
+
+    # Review sessions
+    "start_review_session",
+    "next_card",
+    "answer_card",
+    "end_review_session",
 ]
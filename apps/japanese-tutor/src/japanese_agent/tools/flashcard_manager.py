@@ -5,10 +5,45 @@ Implements SM-2 spaced repetition algorithm for optimal learning.
 All functions use async SQLite database operations.
 """
 
+import json
 from typing import Dict, Any, List, Literal
 from datetime import datetime, timedelta
+
+import numpy as np
 from langchain_core.tools import tool
 from japanese_agent.database.connection import get_connection
+from japanese_agent.tools.fsrs_scheduler import (
+    DEFAULT_RETENTION,
+    fsrs_step,
+    grade_from_rating,
+    next_interval,
+    parse_parameters,
+)
+from japanese_agent.tools.study_statistics import get_streaks
+
+# Rating 0-3 (Again/Hard/Medium/Easy) to SM-2 quality 0-5
+QUALITY_MAP = {0: 0, 1: 3, 2: 4, 3: 5}
+_QUALITY = np.array([QUALITY_MAP[rating] for rating in range(4)])
+
+# Updated flashcard as returned by the review tools
+_FLASHCARD_SELECT = """
+    SELECT
+        f.id as flashcard_id,
+        f.vocabulary_id as vocab_id,
+        f.deck,
+        f.ease_factor,
+        f.interval_days as interval,
+        f.review_count,
+        f.consecutive_correct,
+        f.lapses,
+        f.next_review_at as next_review,
+        f.last_reviewed_at as last_reviewed,
+        v.kanji_form as word,
+        v.hiragana_reading as reading,
+        v.english_meaning as meaning
+    FROM flashcards f
+    INNER JOIN vocabulary v ON f.vocabulary_id = v.id
+"""
 
 
 def _row_to_dict(row) -> Dict[str, Any]:
@@ -43,8 +78,7 @@ def _calculate_sm2_next_interval(
         Tuple of (new_interval_days, new_ease_factor, new_repetitions)
     """
     # Map rating 0-3 to quality 0-5
-    quality_map = {0: 0, 1: 3, 2: 4, 3: 5}
-    quality = quality_map.get(rating, 3)
+    quality = QUALITY_MAP.get(rating, 3)
 
     # Calculate new ease factor
     # Formula: EF' = EF + (0.1 - (5-q)*(0.08+(5-q)*0.02))
@@ -75,6 +109,38 @@ def _calculate_sm2_next_interval(
     return new_interval, new_ease, new_repetitions
 
 
+def _calculate_sm2_batch(
+    ratings: np.ndarray,
+    eases: np.ndarray,
+    intervals: np.ndarray,
+    repetitions: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized _calculate_sm2_next_interval for one review of many cards.
+
+    Args:
+        ratings: User ratings (0-3)
+        eases: Current ease factors
+        intervals: Current intervals in days
+        repetitions: Current repetition counts
+
+    Returns:
+        Tuple of arrays (new_interval_days, new_ease_factor, new_repetitions)
+    """
+    missed = 5 - _QUALITY[ratings]
+    new_ease = np.maximum(eases + (0.1 - missed * (0.08 + missed * 0.02)), 1.3)
+
+    passed = missed <= 2
+    new_interval = np.select(
+        [~passed, repetitions == 0, repetitions == 1],
+        [0.0, 1.0, 6.0],
+        default=intervals * new_ease
+    )
+    new_repetitions = np.where(passed, repetitions + 1, 0)
+
+    return new_interval, new_ease, new_repetitions
+
+
 @tool
 async def get_due_flashcards(limit: int = 10) -> List[Dict[str, Any]]:
     """
@@ -125,7 +191,7 @@ async def get_due_flashcards(limit: int = 10) -> List[Dict[str, Any]]:
 
 
 @tool
-async def create_flashcard(vocab_id: int) -> Dict[str, Any]:
+async def create_flashcard(vocab_id: int, deck: str = "default") -> Dict[str, Any]:
     """
     Create a new flashcard from a vocabulary entry.
 
@@ -138,6 +204,7 @@ async def create_flashcard(vocab_id: int) -> Dict[str, Any]:
 
     Args:
         vocab_id: Vocabulary entry ID to create flashcard from
+        deck: Deck the flashcard belongs to (default: "default")
 
     Returns:
         Newly created flashcard data, or error dict if vocab doesn't exist
@@ -168,10 +235,11 @@ async def create_flashcard(vocab_id: int) -> Dict[str, Any]:
             review_count,
             consecutive_correct,
             lapses,
+            deck,
             next_review_at
-        ) VALUES (?, 'recognition', 'active', 2.5, 0.0, 0, 0, 0, datetime('now'))
+        ) VALUES (?, 'recognition', 'active', 2.5, 0.0, 0, 0, 0, ?, datetime('now'))
         """,
-        (vocab_id,)
+        (vocab_id, deck)
     ) as cursor:
         await conn.commit()
         flashcard_id = cursor.lastrowid
@@ -183,6 +251,7 @@ async def create_flashcard(vocab_id: int) -> Dict[str, Any]:
             f.id as flashcard_id,
             f.vocabulary_id as vocab_id,
             f.card_type,
+            f.deck,
             f.status,
             f.ease_factor,
             f.interval_days as interval,
@@ -210,146 +279,271 @@ async def create_flashcard(vocab_id: int) -> Dict[str, Any]:
             }
 
 
-@tool
-async def record_flashcard_review(
-    flashcard_id: int,
-    rating: Literal[0, 1, 2, 3]
+def _invalid_review(reviews: List[Dict[str, Any]]) -> str | None:
+    """Error message for the first malformed review, or None if all are valid."""
+    for position, review in enumerate(reviews):
+        if not isinstance(review, dict):
+            return f"Review {position} must be an object with flashcard_id and rating. Got: {review!r}"
+        if review.get("flashcard_id") is None:
+            return f"Review {position} is missing flashcard_id"
+        try:
+            int(review["flashcard_id"])
+        except (TypeError, ValueError):
+            return f"Invalid flashcard_id in review {position}: {review['flashcard_id']!r}"
+        # Exact ints only: 2.0 or True would turn the rating arrays into floats/bools
+        if type(review.get("rating")) is not int or review["rating"] not in {0, 1, 2, 3}:
+            return f"Invalid rating. Must be 0, 1, 2, or 3. Got: {review.get('rating')!r}"
+    return None
+
+
+async def apply_flashcard_reviews(
+    reviews: List[Dict[str, Any]],
+    session_id: str | None = None
 ) -> Dict[str, Any]:
     """
-    Record a flashcard review and update SM-2 algorithm parameters.
+    Apply a batch of flashcard reviews in a single transaction.
 
-    Rating scale:
-        0 = Again (didn't remember)
-        1 = Hard (struggled to remember)
-        2 = Medium (remembered with some effort)
-        3 = Easy (remembered easily)
+    Scheduling updates are computed in memory for all cards at once (a card
+    reviewed more than once is updated in review order), then written with
+    one executemany per table and a single commit. Cards in decks set to
+    FSRS get their interval from the FSRS memory state; all other cards use
+    SM-2. Nothing is written if any review is malformed (missing or
+    non-numeric flashcard_id, invalid rating) or any flashcard doesn't exist.
 
     Args:
-        flashcard_id: ID of the flashcard being reviewed
-        rating: Review rating (0-3)
+        reviews: Reviews in the order they happened, each with
+            flashcard_id, rating (0-3) and optionally response_time_ms
+            and user_answer
+        session_id: Study session the reviews belong to
 
     Returns:
-        Updated flashcard data with new interval and next review date
+        Dictionary with success, reviewed (count) and flashcards (updated
+        cards in order of first review), or success False and error
     """
-    # Validate rating
-    if rating not in {0, 1, 2, 3}:
-        return {
-            "success": False,
-            "error": f"Invalid rating. Must be 0, 1, 2, or 3. Got: {rating}"
-        }
+    if not reviews:
+        return {"success": True, "reviewed": 0, "flashcards": []}
+
+    error = _invalid_review(reviews)
+    if error:
+        return {"success": False, "error": error}
+
+    flashcard_ids = list(dict.fromkeys(int(r["flashcard_id"]) for r in reviews))
+    ids_param = json.dumps(flashcard_ids)
 
     conn = await get_connection()
 
-    # Fetch current flashcard state
+    # Fetch current state of every reviewed card
     async with conn.execute(
         """
         SELECT
-            id, ease_factor, interval_days, review_count,
-            consecutive_correct, lapses
-        FROM flashcards
-        WHERE id = ?
+            f.id, f.ease_factor, f.interval_days, f.consecutive_correct, f.lapses,
+            f.fsrs_stability, f.fsrs_difficulty,
+            julianday('now') - julianday(f.last_reviewed_at) AS elapsed_days,
+            d.scheduler, d.desired_retention, d.fsrs_parameters
+        FROM flashcards f
+        LEFT JOIN decks d ON d.name = f.deck
+        WHERE f.id IN (SELECT value FROM json_each(?))
         """,
-        (flashcard_id,)
+        (ids_param,)
     ) as cursor:
-        flashcard_row = await cursor.fetchone()
+        current = {row["id"]: row for row in await cursor.fetchall()}
 
-        if not flashcard_row:
-            return {
-                "success": False,
-                "error": f"Flashcard ID {flashcard_id} not found"
-            }
+    missing = [fid for fid in flashcard_ids if fid not in current]
+    if missing:
+        return {
+            "success": False,
+            "error": f"Flashcard ID {missing[0]} not found" if len(missing) == 1
+                     else f"Flashcard IDs not found: {missing}"
+        }
 
-        flashcard = dict(flashcard_row)
+    index = {fid: i for i, fid in enumerate(flashcard_ids)}
+    eases = np.array([current[fid]["ease_factor"] for fid in flashcard_ids], dtype=float)
+    intervals = np.array([current[fid]["interval_days"] for fid in flashcard_ids], dtype=float)
+    repetitions = np.array([current[fid]["consecutive_correct"] for fid in flashcard_ids], dtype=int)
+    lapses = np.array([current[fid]["lapses"] for fid in flashcard_ids], dtype=int)
+    stability = np.array([np.nan if current[fid]["fsrs_stability"] is None else current[fid]["fsrs_stability"]
+                          for fid in flashcard_ids], dtype=float)
+    difficulty = np.array([np.nan if current[fid]["fsrs_difficulty"] is None else current[fid]["fsrs_difficulty"]
+                           for fid in flashcard_ids], dtype=float)
+    elapsed = np.array([current[fid]["elapsed_days"] or 0.0 for fid in flashcard_ids], dtype=float)
+    use_fsrs = np.array([current[fid]["scheduler"] == "fsrs" for fid in flashcard_ids])
+    retention = np.array([current[fid]["desired_retention"] or DEFAULT_RETENTION for fid in flashcard_ids])
+    parameters = np.array([parse_parameters(current[fid]["fsrs_parameters"]) for fid in flashcard_ids])
+    review_counts = np.zeros(len(flashcard_ids), dtype=int)
+
+    # Group reviews into rounds: round k holds each card's k-th review in this batch
+    rounds: List[List[int]] = []
+    for position, review in enumerate(reviews):
+        card = index[int(review["flashcard_id"])]
+        occurrence = review_counts[card]
+        review_counts[card] += 1
+        if occurrence == len(rounds):
+            rounds.append([])
+        rounds[occurrence].append(position)
+
+    session_rows = [None] * len(reviews)
+    for positions in rounds:
+        cards = np.array([index[int(reviews[p]["flashcard_id"])] for p in positions])
+        ratings = np.array([reviews[p]["rating"] for p in positions])
+
+        new_interval, new_ease, new_repetitions = _calculate_sm2_batch(
+            ratings, eases[cards], intervals[cards], repetitions[cards]
+        )
+
+        # FSRS memory state is kept for every card; FSRS decks also take its interval
+        new_stability, new_difficulty = fsrs_step(
+            parameters[cards], stability[cards], difficulty[cards], elapsed[cards], grade_from_rating(ratings)
+        )
+        fsrs = use_fsrs[cards]
+        new_interval = np.where(
+            fsrs,
+            np.where(ratings == 0, 0.0, next_interval(new_stability, retention[cards])),
+            new_interval
+        )
+        new_ease = np.where(fsrs, eases[cards], new_ease)
+
+        for p, card, rating, ease_after in zip(positions, cards, ratings, new_ease):
+            review = reviews[p]
+            session_rows[p] = (
+                flashcard_ids[card], session_id, QUALITY_MAP[int(rating)], bool(rating >= 2),
+                review.get("response_time_ms"), review.get("user_answer"),
+                float(intervals[card]), float(eases[card]), float(ease_after),
+            )
+
+        intervals[cards] = new_interval
+        eases[cards] = new_ease
+        repetitions[cards] = new_repetitions
+        lapses[cards] += ratings < 2
+        stability[cards] = new_stability
+        difficulty[cards] = new_difficulty
+        elapsed[cards] = 0.0  # later reviews in the batch happen now
+
+    now = datetime.now()
+    card_rows = [
+        (float(eases[i]), float(intervals[i]), int(review_counts[i]), int(repetitions[i]),
+         int(lapses[i]), float(stability[i]), float(difficulty[i]),
+         (now + timedelta(days=float(intervals[i]))).isoformat(), fid)
+        for i, fid in enumerate(flashcard_ids)
+    ]
+
+    try:
+        await conn.executemany(
+            """
+            UPDATE flashcards
+            SET ease_factor = ?,
+                interval_days = ?,
+                review_count = review_count + ?,
+                consecutive_correct = ?,
+                lapses = ?,
+                fsrs_stability = ?,
+                fsrs_difficulty = ?,
+                last_reviewed_at = datetime('now'),
+                next_review_at = ?
+            WHERE id = ?
+            """,
+            card_rows
+        )
+        await conn.executemany(
+            """
+            INSERT INTO review_sessions (
+                flashcard_id,
+                session_id,
+                quality_rating,
+                correct,
+                response_time_ms,
+                user_answer,
+                interval_before_days,
+                ease_factor_before,
+                ease_factor_after
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            session_rows
+        )
+        await conn.commit()
+    except Exception:
+        await conn.rollback()
+        raise
 
-    # Store values before SM-2 calculation (for review_sessions record)
-    ease_before = flashcard['ease_factor']
-    interval_before = flashcard['interval_days']
+    # Fetch all updated flashcards at once
+    async with conn.execute(
+        _FLASHCARD_SELECT + "WHERE f.id IN (SELECT value FROM json_each(?))",
+        (ids_param,)
+    ) as cursor:
+        updated = {row["flashcard_id"]: _row_to_dict(row) for row in await cursor.fetchall()}
 
-    # Calculate new values using SM-2 algorithm
-    new_interval, new_ease, new_repetitions = _calculate_sm2_next_interval(
-        rating=rating,
-        current_ease=flashcard['ease_factor'],
-        current_interval=flashcard['interval_days'],
-        repetitions=flashcard['consecutive_correct']
-    )
+    return {
+        "success": True,
+        "reviewed": len(reviews),
+        "flashcards": [updated[fid] for fid in flashcard_ids if fid in updated],
+    }
 
-    # Calculate next review date
-    next_review = datetime.now() + timedelta(days=new_interval)
 
-    # Update lapse count if failed
-    new_lapses = flashcard['lapses'] + (1 if rating < 2 else 0)
+@tool
+async def record_flashcard_reviews(
+    reviews: List[Dict[str, Any]],
+    session_id: str | None = None
+) -> Dict[str, Any]:
+    """
+    Record many flashcard reviews at once (e.g. a finished study session).
 
-    # Update flashcard
-    async with conn.execute(
-        """
-        UPDATE flashcards
-        SET ease_factor = ?,
-            interval_days = ?,
-            review_count = review_count + 1,
-            consecutive_correct = ?,
-            lapses = ?,
-            last_reviewed_at = datetime('now'),
-            next_review_at = ?
-        WHERE id = ?
-        """,
-        (new_ease, new_interval, new_repetitions, new_lapses,
-         next_review.isoformat(), flashcard_id)
-    ) as cursor:
-        await conn.commit()
+    All SM-2 updates and review history are written in one transaction,
+    so submitting a session costs a few statements instead of several per card.
 
-    # Create review session record
-    quality_rating = {0: 0, 1: 3, 2: 4, 3: 5}[rating]
-    correct = rating >= 2
+    Rating scale:
+        0 = Again (didn't remember)
+        1 = Hard (struggled to remember)
+        2 = Medium (remembered with some effort)
+        3 = Easy (remembered easily)
 
-    async with conn.execute(
-        """
-        INSERT INTO review_sessions (
-            flashcard_id,
-            quality_rating,
-            correct,
-            interval_before_days,
-            ease_factor_before,
-            ease_factor_after
-        ) VALUES (?, ?, ?, ?, ?, ?)
-        """,
-        (flashcard_id, quality_rating, correct,
-         interval_before, ease_before, new_ease)
-    ) as cursor:
-        await conn.commit()
+    Args:
+        reviews: List of {"flashcard_id": int, "rating": 0-3} in review order,
+            optionally with "response_time_ms" and "user_answer"
+        session_id: Optional study session ID to group the reviews
 
-    # Fetch and return updated flashcard
-    async with conn.execute(
-        """
-        SELECT
-            f.id as flashcard_id,
-            f.vocabulary_id as vocab_id,
-            f.ease_factor,
-            f.interval_days as interval,
-            f.review_count,
-            f.consecutive_correct,
-            f.lapses,
-            f.next_review_at as next_review,
-            f.last_reviewed_at as last_reviewed,
-            v.kanji_form as word,
-            v.hiragana_reading as reading,
-            v.english_meaning as meaning
-        FROM flashcards f
-        INNER JOIN vocabulary v ON f.vocabulary_id = v.id
-        WHERE f.id = ?
-        """,
-        (flashcard_id,)
-    ) as cursor:
-        row = await cursor.fetchone()
-        if row:
-            result = _row_to_dict(row)
-            result["success"] = True
-            result["rating_submitted"] = rating
-            return result
-        else:
-            return {
-                "success": False,
-                "error": "Failed to fetch updated flashcard"
-            }
+    Returns:
+        Dictionary containing:
+            - success: Whether the reviews were recorded
+            - reviewed: Number of reviews recorded
+            - flashcards: Updated flashcards with new intervals and next review dates
+            - error: Error message if nothing was recorded
+    """
+    return await apply_flashcard_reviews(reviews, session_id=session_id)
+
+
+@tool
+async def record_flashcard_review(
+    flashcard_id: int,
+    rating: Literal[0, 1, 2, 3]
+) -> Dict[str, Any]:
+    """
+    Record a flashcard review and update SM-2 algorithm parameters.
+
+    Rating scale:
+        0 = Again (didn't remember)
+        1 = Hard (struggled to remember)
+        2 = Medium (remembered with some effort)
+        3 = Easy (remembered easily)
+
+    Args:
+        flashcard_id: ID of the flashcard being reviewed
+        rating: Review rating (0-3)
+
+    Returns:
+        Updated flashcard data with new interval and next review date
+    """
+    result = await apply_flashcard_reviews([{"flashcard_id": flashcard_id, "rating": rating}])
+    if not result["success"]:
+        return result
+    if not result["flashcards"]:
+        return {
+            "success": False,
+            "error": "Failed to fetch updated flashcard"
+        }
+
+    flashcard = result["flashcards"][0]
+    flashcard["success"] = True
+    flashcard["rating_submitted"] = rating
+    return flashcard
 
 
 @tool
@@ -362,57 +556,37 @@ async def get_review_statistics() -> Dict[str, Any]:
     - Due today count
     - Reviewed today count
     - Average ease factor
-    - Longest streak (consecutive days with reviews)
+    - Current and longest streak (consecutive days with reviews)
+
+    Counts come from the flashcards indexes and the daily_stats aggregates,
+    so this doesn't scan the review history.
 
     Returns:
         Dictionary containing comprehensive review statistics
     """
     conn = await get_connection()
 
-    # Total flashcards
-    async with conn.execute("SELECT COUNT(*) as count FROM flashcards") as cursor:
-        total_row = await cursor.fetchone()
-        total_flashcards = total_row['count'] if total_row else 0
-
-    # Due today
-    async with conn.execute(
-        """
-        SELECT COUNT(*) as count
-        FROM flashcards
-        WHERE status = 'active'
-          AND next_review_at <= datetime('now')
-        """
-    ) as cursor:
-        due_row = await cursor.fetchone()
-        due_today = due_row['count'] if due_row else 0
-
-    # Reviewed today
     async with conn.execute(
         """
-        SELECT COUNT(*) as count
-        FROM review_sessions
-        WHERE DATE(reviewed_at) = DATE('now')
+        SELECT
+            (SELECT COUNT(*) FROM flashcards) as total_flashcards,
+            (SELECT COUNT(*) FROM flashcards
+             WHERE status = 'active' AND next_review_at <= datetime('now')) as due_today,
+            (SELECT reviews FROM daily_stats WHERE day = DATE('now')) as reviewed_today,
+            (SELECT AVG(ease_factor) FROM flashcards WHERE status = 'active') as avg_ease
         """
     ) as cursor:
-        reviewed_row = await cursor.fetchone()
-        reviewed_today = reviewed_row['count'] if reviewed_row else 0
-
-    # Average ease factor
-    async with conn.execute(
-        "SELECT AVG(ease_factor) as avg_ease FROM flashcards WHERE status = 'active'"
-    ) as cursor:
-        ease_row = await cursor.fetchone()
-        average_ease = round(ease_row['avg_ease'], 2) if ease_row and ease_row['avg_ease'] else 2.5
+        row = await cursor.fetchone()
 
-    # TODO: Implement longest streak calculation (requires day-by-day analysis)
-    longest_streak = 0
+    streaks = await get_streaks(conn)
 
     return {
-        "total_flashcards": total_flashcards,
-        "due_today": due_today,
-        "reviewed_today": reviewed_today,
-        "average_ease": average_ease,
-        "longest_streak": longest_streak,
+        "total_flashcards": row['total_flashcards'],
+        "due_today": row['due_today'],
+        "reviewed_today": row['reviewed_today'] or 0,
+        "average_ease": round(row['avg_ease'], 2) if row['avg_ease'] else 2.5,
+        "longest_streak": streaks['longest_streak'],
+        "current_streak": streaks['current_streak'],
     }
 
 
@@ -420,6 +594,7 @@ async def get_review_statistics() -> Dict[str, Any]:
 __all__ = [
     "get_due_flashcards",
     "record_flashcard_review",
+    "record_flashcard_reviews",
     "create_flashcard",
     "get_review_statistics",
 ]
@@ -0,0 +1,487 @@
+"""
+FSRS scheduler for Japanese Learning Agent.
+
+An alternative to SM-2 that models each card's memory as stability (days
+until recall probability drops to 90%) and difficulty, using the FSRS-4.5
+formulas. The scheduler is chosen per deck (``decks`` table); FSRS decks
+schedule the next review when predicted recall falls to the deck's desired
+retention.
+
+Parameters are fitted per deck from the review_sessions log. Every card's
+history is replayed as padded NumPy arrays, and the loss (log loss of the
+predicted recall probability at each review) is evaluated for a whole batch
+of parameter vectors in one pass. That makes the finite-difference gradient
+a single vectorized evaluation per optimizer step. After fitting, all cards
+of the deck are rescheduled in one bulk update. Replays and fitting run in
+a worker thread so the event loop keeps serving other requests meanwhile.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Literal, Optional, Tuple
+
+import numpy as np
+from cernji_logging import get_logger
+from langchain_core.tools import tool
+
+from japanese_agent.database.connection import get_connection
+
+# Configure logging
+logger = get_logger(__name__)
+
+
+# ==============================================================================
+# Configuration
+# ==============================================================================
+
+# FSRS-4.5 default parameters
+DEFAULT_PARAMETERS = np.array([
+    0.4872, 1.4003, 3.7145, 13.8206, 5.1618, 1.2298, 0.8975, 0.031, 1.6474,
+    0.1367, 1.0461, 2.1072, 0.0793, 0.3246, 1.587, 0.2272, 2.8755,
+])
+
+# Parameter bounds used while optimizing
+PARAMETER_BOUNDS = np.array([
+    (0.1, 100.0), (0.1, 100.0), (0.1, 100.0), (0.1, 100.0), (1.0, 10.0),
+    (0.1, 5.0), (0.1, 5.0), (0.0, 0.75), (0.0, 4.0), (0.0, 0.8), (0.01, 3.0),
+    (0.5, 5.0), (0.01, 0.2), (0.01, 0.9), (0.01, 3.0), (0.0, 1.0), (1.0, 6.0),
+])
+
+DEFAULT_RETENTION = 0.9
+DECAY = -0.5
+FACTOR = 0.9 ** (1 / DECAY) - 1  # R(S) = 0.9 at t = S
+MIN_STABILITY = 0.01
+MAX_INTERVAL_DAYS = 36500.0
+MIN_REVIEWS_TO_OPTIMIZE = 50  # predicted reviews (second review of a card onwards)
+
+
+def grade_from_rating(rating: np.ndarray) -> np.ndarray:
+    """User rating 0-3 (Again/Hard/Medium/Easy) to FSRS grade 1-4."""
+    return np.asarray(rating) + 1
+
+
+def grade_from_quality(quality: np.ndarray) -> np.ndarray:
+    """Stored SM-2 quality 0-5 to FSRS grade 1-4 (below 3 is a failure)."""
+    quality = np.asarray(quality)
+    return np.where(quality < 3, 1, quality - 1)
+
+
+def parse_parameters(value: Optional[str]) -> np.ndarray:
+    """Parameters stored as JSON in decks.fsrs_parameters (defaults when NULL)."""
+    if not value:
+        return DEFAULT_PARAMETERS
+    parameters = np.asarray(json.loads(value), dtype=float)
+    return parameters if parameters.shape == DEFAULT_PARAMETERS.shape else DEFAULT_PARAMETERS
+
+
+# ==============================================================================
+# Memory Model
+# ==============================================================================
+
+def retrievability(elapsed_days: np.ndarray, stability: np.ndarray) -> np.ndarray:
+    """Probability of recall after elapsed_days for cards with the given stability."""
+    return (1 + FACTOR * np.maximum(elapsed_days, 0) / stability) ** DECAY
+
+
+def next_interval(stability: np.ndarray, desired_retention: np.ndarray) -> np.ndarray:
+    """Days until predicted recall falls to desired_retention."""
+    interval = stability / FACTOR * (desired_retention ** (1 / DECAY) - 1)
+    return np.clip(interval, 1.0, MAX_INTERVAL_DAYS)
+
+
+def fsrs_step(
+    w: np.ndarray,
+    stability: np.ndarray,
+    difficulty: np.ndarray,
+    elapsed_days: np.ndarray,
+    grades: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Update memory state after one review of many cards.
+
+    Args:
+        w: Parameters with shape (..., 17); w[..., i] must broadcast against
+            the card arrays (e.g. (17,), (cards, 17) or (candidates, 1, 17))
+        stability: Current stability, NaN for cards never reviewed
+        difficulty: Current difficulty (ignored where stability is NaN)
+        elapsed_days: Days since the previous review
+        grades: FSRS grades 1-4 (Again/Hard/Good/Easy)
+
+    Returns:
+        Tuple of arrays (new_stability, new_difficulty)
+    """
+    new_card = np.isnan(stability)
+    s = np.where(new_card, 1.0, stability)
+    d = np.where(new_card, 5.0, difficulty)
+
+    initial_stability = np.choose(grades - 1, [w[..., 0], w[..., 1], w[..., 2], w[..., 3]])
+    initial_difficulty = np.clip(w[..., 4] - (grades - 3) * w[..., 5], 1, 10)
+
+    r = retrievability(elapsed_days, s)
+    hard_penalty = np.where(grades == 2, w[..., 15], 1.0)
+    easy_bonus = np.where(grades == 4, w[..., 16], 1.0)
+    recalled = s * (1 + np.exp(w[..., 8]) * (11 - d) * s ** -w[..., 9]
+                    * (np.exp(w[..., 10] * (1 - r)) - 1) * hard_penalty * easy_bonus)
+    forgotten = np.minimum(
+        w[..., 11] * d ** -w[..., 12] * ((s + 1) ** w[..., 13] - 1) * np.exp(w[..., 14] * (1 - r)),
+        s
+    )
+
+    next_stability = np.where(grades > 1, recalled, forgotten)
+    next_difficulty = np.clip(w[..., 7] * w[..., 4] + (1 - w[..., 7]) * (d - w[..., 6] * (grades - 3)), 1, 10)
+
+    return (
+        np.maximum(np.where(new_card, initial_stability, next_stability), MIN_STABILITY),
+        np.where(new_card, initial_difficulty, next_difficulty),
+    )
+
+
+# ==============================================================================
+# Review History and Optimizer
+# ==============================================================================
+
+class ReviewHistory:
+    """
+    Review log of many cards as padded (cards, reviews) arrays.
+
+    Built from flat arrays sorted by flashcard, then review time.
+
+    Attributes:
+        flashcard_ids: Card of each row
+        elapsed: Days since the card's previous review (0 for the first)
+        grades: FSRS grades 1-4 (3 in padding)
+        mask: True for real reviews
+        since_last: Days from each card's last review until the log was read
+    """
+
+    def __init__(self, flashcard_ids: np.ndarray, days: np.ndarray, grades: np.ndarray, now_day: float):
+        ids, starts, counts = np.unique(flashcard_ids, return_index=True, return_counts=True)
+        length = int(counts.max()) if len(counts) else 0
+        positions = np.arange(len(flashcard_ids)) - np.repeat(starts, counts)
+        rows = np.repeat(np.arange(len(ids)), counts)
+
+        elapsed = np.diff(days, prepend=days[:1] if len(days) else days)
+        elapsed[starts] = 0.0
+
+        self.flashcard_ids = ids
+        self.elapsed = np.zeros((len(ids), length))
+        self.grades = np.full((len(ids), length), 3)
+        self.mask = np.zeros((len(ids), length), dtype=bool)
+        self.elapsed[rows, positions] = elapsed
+        self.grades[rows, positions] = grades
+        self.mask[rows, positions] = True
+        last = starts + counts - 1
+        self.last_grades = np.asarray(grades)[last]
+        self.since_last = now_day - days[last]
+
+    @property
+    def predicted_reviews(self) -> int:
+        """Reviews whose recall is predicted (not a card's first, at least a day later)."""
+        return int((self.mask[:, 1:] & (self.elapsed[:, 1:] >= 1)).sum())
+
+
+def replay(w: np.ndarray, history: ReviewHistory) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Replay every card's history under one or many parameter vectors.
+
+    Args:
+        w: Parameters, shape (17,) or (candidates, 17)
+        history: Review log
+
+    Returns:
+        Tuple of (log_loss_sum, stability, difficulty); the loss has one value
+        per candidate, the state one value per (candidate,) card
+    """
+    w = w[..., None, :]
+    cards = len(history.flashcard_ids)
+    shape = np.broadcast_shapes(w[..., 0].shape, (cards,))
+    stability = np.full(shape, np.nan)
+    difficulty = np.full(shape, np.nan)
+    loss = np.zeros(shape)
+
+    for k in range(history.mask.shape[1]):
+        valid = history.mask[:, k]
+        elapsed = history.elapsed[:, k]
+        grades = history.grades[:, k]
+
+        # Same-day reviews (relearning) aren't predictions of long-term recall
+        predicted = valid & (elapsed >= 1) if k else np.zeros(cards, dtype=bool)
+        if predicted.any():
+            r = np.clip(retrievability(elapsed, np.where(np.isnan(stability), 1.0, stability)), 1e-6, 1 - 1e-6)
+            bce = -np.where(grades > 1, np.log(r), np.log(1 - r))
+            loss += np.where(predicted, bce, 0.0)
+
+        new_stability, new_difficulty = fsrs_step(w, stability, difficulty, elapsed, grades)
+        stability = np.where(valid, new_stability, stability)
+        difficulty = np.where(valid, new_difficulty, difficulty)
+
+    return loss.sum(axis=-1), stability, difficulty
+
+
+def optimize_parameters(
+    history: ReviewHistory,
+    initial: np.ndarray = DEFAULT_PARAMETERS,
+    iterations: int = 150,
+    learning_rate: float = 0.02,
+    step: float = 1e-3
+) -> Tuple[np.ndarray, float, float]:
+    """
+    Fit FSRS parameters to a review log.
+
+    Adam on parameters scaled to [0, 1] by PARAMETER_BOUNDS. Each step
+    evaluates the current parameters and all 34 central-difference
+    perturbations in one vectorized replay.
+
+    Returns:
+        Tuple of (parameters, mean_log_loss_before, mean_log_loss_after)
+    """
+    low, high = PARAMETER_BOUNDS[:, 0], PARAMETER_BOUNDS[:, 1]
+    span = high - low
+    count = max(history.predicted_reviews, 1)
+    n = len(initial)
+
+    x = np.clip((initial - low) / span, 0, 1)
+    offsets = np.vstack([np.zeros(n), np.eye(n) * step, -np.eye(n) * step])
+    m = np.zeros(n)
+    v = np.zeros(n)
+    initial_loss = float(replay(low + x * span, history)[0] / count)
+    best_x, best_loss = x, initial_loss
+
+    for t in range(1, iterations + 1):
+        candidates = low + np.clip(x + offsets, 0, 1) * span
+        losses = replay(candidates, history)[0] / count
+        if losses[0] < best_loss:
+            best_x, best_loss = x, float(losses[0])
+
+        gradient = (losses[1:n + 1] - losses[n + 1:]) / (2 * step)
+        m = 0.9 * m + 0.1 * gradient
+        v = 0.999 * v + 0.001 * gradient ** 2
+        x = np.clip(x - learning_rate * (m / (1 - 0.9 ** t)) / (np.sqrt(v / (1 - 0.999 ** t)) + 1e-8), 0, 1)
+
+    final_loss = float(replay(low + x * span, history)[0] / count)
+    if final_loss < best_loss:
+        best_x, best_loss = x, final_loss
+
+    return low + best_x * span, initial_loss, best_loss
+
+
+# ==============================================================================
+# Deck Settings and Bulk Rescheduling
+# ==============================================================================
+
+async def get_deck_settings(deck: str) -> Dict[str, Any]:
+    """Scheduler settings of a deck (SM-2 with default retention if unset)."""
+    conn = await get_connection()
+    async with conn.execute(
+        "SELECT scheduler, desired_retention, fsrs_parameters FROM decks WHERE name = ?",
+        (deck,)
+    ) as cursor:
+        row = await cursor.fetchone()
+    if row is None:
+        return {"deck": deck, "scheduler": "sm2", "desired_retention": DEFAULT_RETENTION,
+                "parameters": DEFAULT_PARAMETERS}
+    return {
+        "deck": deck,
+        "scheduler": row["scheduler"],
+        "desired_retention": row["desired_retention"],
+        "parameters": parse_parameters(row["fsrs_parameters"]),
+    }
+
+
+async def load_review_history(deck: str) -> ReviewHistory:
+    """Full review log of a deck's cards, in one query."""
+    conn = await get_connection()
+    async with conn.execute(
+        """
+        SELECT rs.flashcard_id, julianday(rs.reviewed_at) AS day, rs.quality_rating,
+               julianday('now') AS now_day
+        FROM review_sessions rs
+        INNER JOIN flashcards f ON f.id = rs.flashcard_id
+        WHERE f.deck = ?
+        ORDER BY rs.flashcard_id, rs.reviewed_at, rs.id
+        """,
+        (deck,)
+    ) as cursor:
+        rows = await cursor.fetchall()
+
+    now_day = rows[0]["now_day"] if rows else 0.0
+    return ReviewHistory(
+        np.array([row["flashcard_id"] for row in rows], dtype=np.int64),
+        np.array([row["day"] for row in rows], dtype=float),
+        grade_from_quality(np.array([row["quality_rating"] for row in rows], dtype=int)),
+        now_day,
+    )
+
+
+async def reschedule_deck(deck: str, history: Optional[ReviewHistory] = None) -> int:
+    """
+    Recompute memory state and next review of every reviewed card in a deck.
+
+    Replays the review log with the deck's parameters and writes all cards
+    with one executemany in a single transaction. Cards whose last review was
+    "Again" are due immediately.
+
+    Returns:
+        Number of cards rescheduled
+    """
+    settings = await get_deck_settings(deck)
+    if history is None:
+        history = await load_review_history(deck)
+    if not len(history.flashcard_ids):
+        return 0
+
+    _, stability, difficulty = await asyncio.to_thread(replay, settings["parameters"], history)
+    interval = np.where(history.last_grades > 1,
+                        next_interval(stability, settings["desired_retention"]), 0.0)
+    now = datetime.now()
+    rows = [
+        (float(s), float(d), float(i), (now + timedelta(days=float(i - elapsed))).isoformat(), int(fid))
+        for fid, s, d, i, elapsed in zip(history.flashcard_ids, stability, difficulty, interval,
+                                         np.minimum(history.since_last, interval))
+    ]
+
+    conn = await get_connection()
+    try:
+        await conn.executemany(
+            """
+            UPDATE flashcards
+            SET fsrs_stability = ?,
+                fsrs_difficulty = ?,
+                interval_days = ?,
+                next_review_at = ?
+            WHERE id = ?
+            """,
+            rows
+        )
+        await conn.commit()
+    except Exception:
+        await conn.rollback()
+        raise
+
+    logger.info("Deck rescheduled", deck=deck, cards=len(rows))
+    return len(rows)
+
+
+# ==============================================================================
+# Tools
+# ==============================================================================
+
+@tool
+async def set_deck_scheduler(
+    deck: str,
+    scheduler: Literal["sm2", "fsrs"],
+    desired_retention: float = DEFAULT_RETENTION
+) -> Dict[str, Any]:
+    """
+    Choose the spaced repetition scheduler of a flashcard deck.
+
+    Switching to FSRS reschedules every reviewed card of the deck from its
+    review history. Switching back to SM-2 keeps the current due dates and
+    continues with SM-2 from the next review.
+
+    Args:
+        deck: Deck name (flashcards default to "default")
+        scheduler: "sm2" or "fsrs"
+        desired_retention: FSRS target recall probability (0.7-0.97)
+
+    Returns:
+        Dictionary containing deck, scheduler, desired_retention and
+        rescheduled (number of cards)
+    """
+    if scheduler not in ("sm2", "fsrs"):
+        return {"success": False, "error": f"Invalid scheduler. Must be 'sm2' or 'fsrs'. Got: {scheduler}"}
+    if not 0.7 <= desired_retention <= 0.97:
+        return {"success": False, "error": f"desired_retention must be between 0.7 and 0.97. Got: {desired_retention}"}
+
+    conn = await get_connection()
+    await conn.execute(
+        """
+        INSERT INTO decks (name, scheduler, desired_retention) VALUES (?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET
+            scheduler = excluded.scheduler,
+            desired_retention = excluded.desired_retention,
+            updated_at = CURRENT_TIMESTAMP
+        """,
+        (deck, scheduler, desired_retention)
+    )
+    await conn.commit()
+
+    rescheduled = await reschedule_deck(deck) if scheduler == "fsrs" else 0
+    return {
+        "success": True,
+        "deck": deck,
+        "scheduler": scheduler,
+        "desired_retention": desired_retention,
+        "rescheduled": rescheduled,
+    }
+
+
+@tool
+async def optimize_fsrs_parameters(deck: str = "default", iterations: int = 150) -> Dict[str, Any]:
+    """
+    Fit a deck's FSRS parameters to its review history.
+
+    The fitted parameters are saved for the deck; if the deck uses FSRS, all
+    its cards are rescheduled with them.
+
+    Args:
+        deck: Deck name (default: "default")
+        iterations: Optimizer steps (default: 150)
+
+    Returns:
+        Dictionary containing:
+            - reviews: Reviews used for fitting
+            - log_loss_before / log_loss_after: Mean log loss of recall predictions
+            - parameters: Fitted parameters
+            - rescheduled: Cards rescheduled (0 unless the deck uses FSRS)
+    """
+    if iterations < 1:
+        return {"success": False, "error": f"iterations must be at least 1. Got: {iterations}"}
+
+    history = await load_review_history(deck)
+    if history.predicted_reviews < MIN_REVIEWS_TO_OPTIMIZE:
+        return {
+            "success": False,
+            "error": f"Need at least {MIN_REVIEWS_TO_OPTIMIZE} repeat reviews to optimize; "
+                     f"deck '{deck}' has {history.predicted_reviews}"
+        }
+
+    settings = await get_deck_settings(deck)
+    parameters, loss_before, loss_after = await asyncio.to_thread(
+        optimize_parameters, history, settings["parameters"], iterations
+    )
+
+    conn = await get_connection()
+    await conn.execute(
+        """
+        INSERT INTO decks (name, fsrs_parameters, optimized_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(name) DO UPDATE SET
+            fsrs_parameters = excluded.fsrs_parameters,
+            optimized_at = excluded.optimized_at,
+            updated_at = CURRENT_TIMESTAMP
+        """,
+        (deck, json.dumps([round(float(p), 4) for p in parameters]))
+    )
+    await conn.commit()
+
+    rescheduled = await reschedule_deck(deck, history) if settings["scheduler"] == "fsrs" else 0
+    logger.info("FSRS parameters optimized", deck=deck, reviews=history.predicted_reviews,
+                log_loss_before=round(loss_before, 4), log_loss_after=round(loss_after, 4))
+
+    return {
+        "success": True,
+        "deck": deck,
+        "reviews": history.predicted_reviews,
+        "log_loss_before": round(loss_before, 4),
+        "log_loss_after": round(loss_after, 4),
+        "parameters": [round(float(p), 4) for p in parameters],
+        "rescheduled": rescheduled,
+    }
+
+
+# Export all tools
+__all__ = [
+    "set_deck_scheduler",
+    "optimize_fsrs_parameters",
+]
@@ -0,0 +1,350 @@
+"""
+Session-scoped flashcard review scheduler for Japanese Learning Agent.
+
+A study session loads the due cards (joined with their vocabulary) once and
+keeps them in a heap ordered by next_review_at, so each card costs no
+queries. "Again" answers put the card back a few cards later in the same
+session. Answers are written back in batches through apply_flashcard_reviews
+(one transaction per batch), and whatever is left is flushed when the session
+ends.
+"""
+
+import heapq
+import itertools
+import os
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Literal, Optional
+
+from cernji_logging import get_logger
+from langchain_core.tools import tool
+
+from japanese_agent.database.connection import get_connection
+from japanese_agent.tools.flashcard_manager import apply_flashcard_reviews
+
+# Configure logging
+logger = get_logger(__name__)
+
+
+# ==============================================================================
+# Configuration
+# ==============================================================================
+
+DEFAULT_SESSION_LIMIT = 50
+DEFAULT_FLUSH_SIZE = 10   # answers written back per transaction
+DEFAULT_AGAIN_GAP = 3     # cards shown before an "Again" card comes back
+MAX_SESSIONS = 8          # open sessions kept in memory
+
+
+def _flush_size() -> int:
+    return max(1, int(os.getenv("REVIEW_FLUSH_SIZE", str(DEFAULT_FLUSH_SIZE))))
+
+
+def _again_gap() -> int:
+    return max(0, int(os.getenv("REVIEW_AGAIN_GAP", str(DEFAULT_AGAIN_GAP))))
+
+
+# ==============================================================================
+# Scheduler
+# ==============================================================================
+
+class ReviewSession:
+    """
+    Due cards of one study session, ordered by next_review_at.
+
+    Heap entries are (due_key, sequence, card). Loaded cards use their
+    next_review_at; an "Again" card gets the key of the card `again_gap`
+    places ahead, and the larger sequence number puts it right after that
+    card.
+    """
+
+    def __init__(self, cards: List[Dict[str, Any]], flush_size: int, again_gap: int):
+        self.session_id = uuid.uuid4().hex
+        self.flush_size = flush_size
+        self.again_gap = again_gap
+        self._sequence = itertools.count()
+        self._heap = [(card["next_review"], next(self._sequence), card) for card in cards]
+        heapq.heapify(self._heap)
+        self.current: Optional[Dict[str, Any]] = None
+        self.pending: List[Dict[str, Any]] = []
+        self.loaded = len(cards)
+        self.answered = 0
+        self.again = 0
+        self.written = 0
+
+    @property
+    def remaining(self) -> int:
+        return len(self._heap) + (1 if self.current else 0)
+
+    def next_card(self) -> Optional[Dict[str, Any]]:
+        """Card to show now (the same card until it is answered)."""
+        if self.current is None and self._heap:
+            self.current = heapq.heappop(self._heap)[2]
+        return self.current
+
+    def answer(self, rating: int, response_time_ms: Optional[int] = None) -> Dict[str, Any]:
+        """Record the answer to the current card; "Again" re-inserts it."""
+        card = self.current
+        self.current = None
+        self.answered += 1
+        self.pending.append({
+            "flashcard_id": card["flashcard_id"],
+            "rating": rating,
+            "response_time_ms": response_time_ms,
+        })
+
+        if rating == 0:
+            self.again += 1
+            ahead = heapq.nsmallest(self.again_gap, self._heap)
+            key = ahead[-1][0] if ahead else card["next_review"]
+            heapq.heappush(self._heap, (key, next(self._sequence), card))
+        return card
+
+    async def flush(self) -> Dict[str, Any]:
+        """
+        Write pending answers back in one transaction.
+
+        Answers added while the write is in flight stay pending; on failure
+        nothing is dropped and an error dict is returned.
+        """
+        if not self.pending:
+            return {"success": True, "reviewed": 0, "flashcards": []}
+        batch = list(self.pending)
+        try:
+            result = await apply_flashcard_reviews(batch, session_id=self.session_id)
+        except Exception as e:
+            logger.error("Failed to save review session answers", session_id=self.session_id, error=str(e))
+            return {"success": False, "error": f"Failed to save answers: {str(e)}"}
+        if result["success"]:
+            self.written += result["reviewed"]
+            del self.pending[:len(batch)]
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "loaded": self.loaded,
+            "answered": self.answered,
+            "again": self.again,
+            "remaining": self.remaining,
+            "written": self.written,
+            "pending": len(self.pending),
+        }
+
+
+_sessions: "OrderedDict[str, ReviewSession]" = OrderedDict()
+
+
+def _get_session(session_id: str) -> Optional[ReviewSession]:
+    session = _sessions.get(session_id)
+    if session is not None:
+        _sessions.move_to_end(session_id)
+    return session
+
+
+async def _load_due_cards(limit: int) -> List[Dict[str, Any]]:
+    """Due cards with their vocabulary, in one query."""
+    conn = await get_connection()
+
+    async with conn.execute(
+        """
+        SELECT
+            f.id as flashcard_id,
+            f.vocabulary_id as vocab_id,
+            f.interval_days as interval,
+            f.ease_factor,
+            f.review_count,
+            f.next_review_at as next_review,
+            v.kanji_form as word,
+            v.hiragana_reading as reading,
+            v.english_meaning as meaning
+        FROM flashcards f
+        INNER JOIN vocabulary v ON f.vocabulary_id = v.id
+        WHERE f.status = 'active'
+          AND f.next_review_at <= datetime('now')
+        ORDER BY f.next_review_at ASC
+        LIMIT ?
+        """,
+        (limit,)
+    ) as cursor:
+        return [dict(row) for row in await cursor.fetchall()]
+
+
+# ==============================================================================
+# Tools
+# ==============================================================================
+
+@tool
+async def start_review_session(limit: int = DEFAULT_SESSION_LIMIT) -> Dict[str, Any]:
+    """
+    Start a flashcard study session.
+
+    Loads the due flashcards once; use next_card and answer_card to study
+    them without further lookups. Starting a session saves and closes the
+    least recently used ones beyond the open-session limit; sessions whose
+    answers can't be saved stay open.
+
+    Args:
+        limit: Maximum number of due flashcards in the session (default: 50)
+
+    Returns:
+        Dictionary containing:
+            - success: Whether the session was started
+            - session_id: ID to pass to next_card and answer_card
+            - due_cards: Number of cards loaded into the session
+            - error: Error message if no open session could be closed
+    """
+    # Write back and drop the least recently used sessions beyond the limit,
+    # keeping any whose pending answers fail to save
+    for stale_id in list(_sessions):
+        if len(_sessions) < MAX_SESSIONS:
+            break
+        result = await _sessions[stale_id].flush()
+        if result["success"]:
+            del _sessions[stale_id]
+        else:
+            logger.warning("Kept review session with unsaved answers", session_id=stale_id, error=result["error"])
+
+    if len(_sessions) >= MAX_SESSIONS:
+        return {
+            "success": False,
+            "error": f"All {len(_sessions)} open review sessions have answers that could not be saved; "
+                     "end one with end_review_session first"
+        }
+
+    session = ReviewSession(await _load_due_cards(limit), _flush_size(), _again_gap())
+    _sessions[session.session_id] = session
+
+    logger.info("Review session started", session_id=session.session_id, due_cards=session.loaded)
+    return {
+        "success": True,
+        "session_id": session.session_id,
+        "due_cards": session.loaded,
+    }
+
+
+@tool
+async def next_card(session_id: str) -> Dict[str, Any]:
+    """
+    Get the next flashcard to review in a study session.
+
+    Args:
+        session_id: Session ID from start_review_session
+
+    Returns:
+        Dictionary containing:
+            - success: Whether the session exists
+            - card: Flashcard to show (flashcard_id, word, reading, meaning,
+              interval, ease_factor, review_count), or None when finished
+            - remaining: Cards left in the session, including this one
+    """
+    session = _get_session(session_id)
+    if session is None:
+        return {"success": False, "error": f"Review session {session_id} not found"}
+
+    card = session.next_card()
+    return {
+        "success": True,
+        "card": card,
+        "remaining": session.remaining,
+    }
+
+
+@tool
+async def answer_card(
+    session_id: str,
+    flashcard_id: int,
+    rating: Literal[0, 1, 2, 3],
+    response_time_ms: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Answer the current flashcard of a study session.
+
+    "Again" (0) shows the card again a few cards later. Answers are saved
+    in batches, and all remaining answers are saved when the last card is
+    answered.
+
+    Rating scale:
+        0 = Again (didn't remember)
+        1 = Hard (struggled to remember)
+        2 = Medium (remembered with some effort)
+        3 = Easy (remembered easily)
+
+    Args:
+        session_id: Session ID from start_review_session
+        flashcard_id: ID of the card returned by next_card
+        rating: Review rating (0-3)
+        response_time_ms: Optional time taken to answer
+
+    Returns:
+        Dictionary containing:
+            - success: Whether the answer was recorded
+            - remaining: Cards left in the session
+            - finished: True once every card has been answered and saved
+            - session: Session summary (answered, again, written, pending)
+    """
+    if type(rating) is not int or rating not in {0, 1, 2, 3}:
+        return {
+            "success": False,
+            "error": f"Invalid rating. Must be 0, 1, 2, or 3. Got: {rating!r}"
+        }
+
+    session = _get_session(session_id)
+    if session is None:
+        return {"success": False, "error": f"Review session {session_id} not found"}
+
+    if session.current is None or session.current["flashcard_id"] != flashcard_id:
+        return {
+            "success": False,
+            "error": f"Flashcard {flashcard_id} is not the current card; call next_card first"
+        }
+
+    session.answer(rating, response_time_ms)
+
+    finished = session.remaining == 0
+    if finished or len(session.pending) >= session.flush_size:
+        result = await session.flush()
+        if not result["success"]:
+            return {"success": False, "error": result["error"], "session": session.summary()}
+
+    if finished:
+        logger.info("Review session finished", **session.summary())
+
+    return {
+        "success": True,
+        "remaining": session.remaining,
+        "finished": finished,
+        "session": session.summary(),
+    }
+
+
+@tool
+async def end_review_session(session_id: str) -> Dict[str, Any]:
+    """
+    End a study session early and save its answers.
+
+    Args:
+        session_id: Session ID from start_review_session
+
+    Returns:
+        Session summary with the number of answers written
+    """
+    session = _sessions.pop(session_id, None)
+    if session is None:
+        return {"success": False, "error": f"Review session {session_id} not found"}
+
+    result = await session.flush()
+    if not result["success"]:
+        _sessions[session_id] = session  # keep the answers for a retry
+        return {"success": False, "error": result["error"], "session": session.summary()}
+
+    return {"success": True, "session": session.summary()}
+
+
+# Export all tools
+__all__ = [
+    "start_review_session",
+    "next_card",
+    "answer_card",
+    "end_review_session",
+]
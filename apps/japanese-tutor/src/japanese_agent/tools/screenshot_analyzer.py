@@ -4,11 +4,18 @@ Screenshot analysis tools for Japanese Learning Agent.
 Provides OCR and translation capabilities using Claude Vision API and manga-ocr.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List, NamedTuple, Tuple
 from langchain_core.tools import tool
 import os
+import asyncio
 import base64
+import contextvars
+import io
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, timezone
 from anthropic import Anthropic
@@ -18,6 +25,14 @@ import numpy as np
 from manga_ocr import MangaOcr
 from cernji_logging import get_logger
 
+from japanese_agent.tools.ocr_service import OcrService, load_image_array
+from japanese_agent.tools.screenshot_cache import (
+    get_cache_statistics,
+    lookup_screenshot,
+    remember_screenshot,
+)
+from japanese_agent.tools.text_regions import crop_regions, find_text_regions
+
 # Configure logging
 logger = get_logger(__name__)
 
@@ -26,8 +41,9 @@ logger = get_logger(__name__)
 # Module-level Model Cache
 # ==============================================================================
 
-# Global manga-ocr model instance (lazy loaded on first use)
+# Global manga-ocr model instance (preloaded at startup or lazy loaded on first use)
 _manga_ocr_model: Optional[MangaOcr] = None
+_manga_ocr_lock = threading.Lock()
 
 
 def get_manga_ocr_model() -> MangaOcr:
@@ -35,7 +51,8 @@ def get_manga_ocr_model() -> MangaOcr:
     Get or initialize the manga-ocr model.
 
     Uses lazy loading pattern - model is only loaded on first call.
-    Subsequent calls return the cached instance.
+    Subsequent calls return the cached instance. A call made while the
+    startup preload is running waits for it instead of loading twice.
 
     Returns:
         MangaOcr: Initialized manga-ocr model
@@ -46,13 +63,108 @@ def get_manga_ocr_model() -> MangaOcr:
     global _manga_ocr_model
 
     if _manga_ocr_model is None:
-        logger.info("Initializing manga-ocr model (first time - may download ~1GB)")
-        _manga_ocr_model = MangaOcr()
-        logger.info("manga-ocr model initialized successfully")
+        with _manga_ocr_lock:
+            if _manga_ocr_model is None:
+                logger.info("Initializing manga-ocr model (first time - may download ~1GB)")
+                _manga_ocr_model = MangaOcr()
+                logger.info("manga-ocr model initialized successfully")
 
     return _manga_ocr_model
 
 
+# Shared OCR service: preloading, reusable preprocessing buffers, batching
+ocr_service = OcrService(lambda: get_manga_ocr_model())
+
+
+def start_ocr_preload() -> None:
+    """
+    Preload the manga-ocr model at server startup.
+
+    Environment Variables:
+        MANGA_OCR_PRELOAD: "background" (default) loads in a daemon thread,
+            "blocking" loads before returning, "off" loads on first use
+    """
+    mode = os.getenv("MANGA_OCR_PRELOAD", "background").lower()
+    if mode == "off":
+        return
+    try:
+        ocr_service.start(background=mode != "blocking")
+    except Exception as e:
+        # The first screenshot retries the load
+        logger.error("manga-ocr preload failed", error=str(e))
+
+
+# ==============================================================================
+# Shared Screenshot Buffer
+# ==============================================================================
+
+# Supported media types for Claude Vision, by file extension
+VISION_MEDIA_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+}
+
+
+class LoadedScreenshot(NamedTuple):
+    """A screenshot read and decoded once for every analysis step."""
+    path: str
+    base64_data: Optional[str]  # None if Claude Vision doesn't accept the format
+    media_type: Optional[str]
+    pixels: np.ndarray  # decoded RGB, RGBA or grayscale pixels
+
+    @property
+    def gray(self) -> np.ndarray:
+        if self.pixels.ndim == 2:
+            return self.pixels
+        code = cv2.COLOR_RGBA2GRAY if self.pixels.shape[2] == 4 else cv2.COLOR_RGB2GRAY
+        return cv2.cvtColor(self.pixels, code)
+
+
+# Screenshot shared by the analysis steps of the current hybrid analysis
+_loaded_screenshot: contextvars.ContextVar[Optional[LoadedScreenshot]] = contextvars.ContextVar(
+    "loaded_screenshot", default=None
+)
+
+
+def load_screenshot(image_path: str) -> LoadedScreenshot:
+    """
+    Read an image file once: base64 for Claude Vision and decoded pixels for OCR.
+
+    Raises:
+        FileNotFoundError: If image file doesn't exist
+        ValueError: If the image cannot be decoded
+    """
+    data = Path(image_path).read_bytes()
+    media_type = VISION_MEDIA_TYPES.get(Path(image_path).suffix.lower())
+
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            if img.mode not in ("L", "RGB", "RGBA"):
+                img = img.convert("RGB")
+            pixels = np.asarray(img)
+    except Exception as e:
+        raise ValueError(f"Failed to decode image {image_path}: {str(e)}")
+
+    base64_data = base64.b64encode(data).decode("utf-8") if media_type else None
+    return LoadedScreenshot(image_path, base64_data, media_type, pixels)
+
+
+@contextmanager
+def sharing_screenshot(screenshot: Optional[LoadedScreenshot]) -> Iterator[None]:
+    """Let encode_image_to_base64/preprocess_image_for_ocr reuse a loaded screenshot."""
+    token = _loaded_screenshot.set(screenshot)
+    try:
+        yield
+    finally:
+        _loaded_screenshot.reset(token)
+
+
+def _shared_screenshot(image_path: str) -> Optional[LoadedScreenshot]:
+    screenshot = _loaded_screenshot.get()
+    return screenshot if screenshot is not None and screenshot.path == image_path else None
+
+
 # ==============================================================================
 # Helper Functions
 # ==============================================================================
@@ -71,6 +183,10 @@ def encode_image_to_base64(image_path: str) -> tuple[str, str]:
         FileNotFoundError: If image file doesn't exist
         ValueError: If image format is not supported
     """
+    shared = _shared_screenshot(image_path)
+    if shared is not None and shared.base64_data is not None:
+        return shared.base64_data, shared.media_type
+
     path = Path(image_path)
 
     if not path.exists():
@@ -78,16 +194,11 @@ def encode_image_to_base64(image_path: str) -> tuple[str, str]:
 
     # Determine media type from extension
     extension = path.suffix.lower()
-    media_type_map = {
-        ".png": "image/png",
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-    }
 
-    if extension not in media_type_map:
+    if extension not in VISION_MEDIA_TYPES:
         raise ValueError(f"Unsupported image format: {extension}. Supported: PNG, JPG, JPEG")
 
-    media_type = media_type_map[extension]
+    media_type = VISION_MEDIA_TYPES[extension]
 
     # Read and encode image
     with open(image_path, "rb") as image_file:
@@ -116,45 +227,84 @@ def preprocess_image_for_ocr(image_path: str) -> Image.Image:
         FileNotFoundError: If image file doesn't exist
         ValueError: If image cannot be loaded
     """
+    shared = _shared_screenshot(image_path)
     path = Path(image_path)
 
-    if not path.exists():
+    if shared is None and not path.exists():
         raise FileNotFoundError(f"Image not found: {image_path}")
 
     try:
-        # Load image with PIL
-        img = Image.open(image_path)
+        # Grayscale, CLAHE (clipLimit 2.0, 8x8 tiles) and 2x bicubic upscale
+        # into the OCR service's reusable buffers
+        return ocr_service.preprocess(shared.pixels if shared is not None else image_path)
+
+    except Exception as e:
+        raise ValueError(f"Failed to preprocess image {image_path}: {str(e)}")
 
-        # Convert to numpy array for OpenCV processing
-        img_array = np.array(img)
 
-        # Convert to grayscale if image is color
-        if len(img_array.shape) == 3:
-            gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-        else:
-            gray = img_array
-
-        # Apply CLAHE for contrast enhancement
-        # clipLimit: threshold for contrast limiting
-        # tileGridSize: size of grid for histogram equalization
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        enhanced = clahe.apply(gray)
-
-        # Upscale 2x using bicubic interpolation for better small text recognition
-        height, width = enhanced.shape
-        upscaled = cv2.resize(
-            enhanced,
-            (width * 2, height * 2),
-            interpolation=cv2.INTER_CUBIC
-        )
+def recognize_text_regions(image_path: str) -> Optional[Dict[str, Any]]:
+    """
+    OCR only the text regions of a screenshot, as one batch.
 
-        # Convert back to PIL Image
-        processed_img = Image.fromarray(upscaled)
+    Regions come from a per-game template in config.yaml, the regions
+    detected earlier for the same game, or text detection. Cached regions
+    that yield no text are detected again.
 
-        return processed_img
+    Args:
+        image_path: Path to the image file
 
+    Returns:
+        manga-ocr result with one segment per region (with its position),
+        or None if no regions were found or region OCR failed; the caller
+        then runs OCR on the whole frame
+    """
+    try:
+        shared = _shared_screenshot(image_path)
+        pixels = shared.pixels if shared is not None else load_image_array(image_path)
+
+        regions, source = find_text_regions(image_path, pixels)
+        if not regions:
+            return None
+        recognized = ocr_service.recognize(crop_regions(pixels, regions))
+
+        if source == "cached" and not any(ocr.text.strip() for ocr in recognized):
+            # The dialogue box moved since the game's regions were cached
+            regions, source = find_text_regions(image_path, pixels, refresh=True)
+            if not regions:
+                return None
+            recognized = ocr_service.recognize(crop_regions(pixels, regions))
     except Exception as e:
-        raise ValueError(f"Failed to preprocess image {image_path}: {str(e)}")
+        logger.warning("Text-region OCR failed, using full frame", image_path=image_path, error=str(e))
+        return None
+
+    segments = [
+        {
+            "text": ocr.text.strip(),
+            "reading": None,  # manga-ocr doesn't provide readings
+            "confidence": 0.95,
+            "position": region.as_dict(),
+        }
+        for region, ocr in zip(regions, recognized)
+        if ocr.text and ocr.text.strip()
+    ]
+
+    logger.info("manga-ocr region analysis completed",
+               image_path=image_path,
+               region_source=source,
+               regions=len(regions),
+               segments_count=len(segments))
+
+    return {
+        "file_path": image_path,
+        "processed_at": datetime.now(timezone.utc).isoformat(),
+        "extracted_text": segments,
+        "ocr_method": "manga-ocr",
+        "text_regions": {
+            "source": source,
+            "count": len(regions),
+            "latency_ms": round(sum(ocr.latency_ms for ocr in recognized), 1),
+        },
+    }
 
 
 def create_vision_prompt() -> str:
@@ -407,7 +557,9 @@ def analyze_screenshot_manga_ocr(image_path: str) -> Dict[str, Any]:
 
     This tool uses manga-ocr (specialized for Japanese game/manga text) to
     extract text with high accuracy. Best used in combination with Claude
-    for translation and context understanding.
+    for translation and context understanding. Only the detected text
+    regions (e.g. the dialogue box) are recognized; the whole frame is used
+    when no text regions are found.
 
     Args:
         image_path: Path to the screenshot image file
@@ -431,10 +583,21 @@ def analyze_screenshot_manga_ocr(image_path: str) -> Dict[str, Any]:
             "ocr_method": "manga-ocr",
         }
 
+    # OCR only the dialogue text when it can be located
+    region_result = recognize_text_regions(image_path)
+    if region_result is not None:
+        return region_result
+
     try:
-        # Preprocess image for better OCR accuracy
+        # Whole-frame OCR through the shared service (preprocessing buffers,
+        # preloaded model, latency stats)
+        shared = _shared_screenshot(image_path)
         try:
-            preprocessed_img = preprocess_image_for_ocr(image_path)
+            ocr = ocr_service.recognize([shared.pixels if shared is not None else image_path])[0]
+            extracted_text_raw = ocr.text
+            logger.debug("manga-ocr extraction successful",
+                        image_path=image_path,
+                        text_length=len(extracted_text_raw) if extracted_text_raw else 0)
         except FileNotFoundError as e:
             return {
                 "error": str(e),
@@ -443,34 +606,23 @@ def analyze_screenshot_manga_ocr(image_path: str) -> Dict[str, Any]:
                 "extracted_text": [],
                 "ocr_method": "manga-ocr",
             }
-        except ValueError as e:
-            return {
-                "error": f"Image preprocessing failed: {str(e)}",
-                "file_path": image_path,
-                "processed_at": datetime.now(timezone.utc).isoformat(),
-                "extracted_text": [],
-                "ocr_method": "manga-ocr",
-            }
-
-        # Initialize manga-ocr model (lazy loading)
-        try:
-            mocr = get_manga_ocr_model()
-        except Exception as e:
-            return {
-                "error": f"Failed to initialize manga-ocr model: {str(e)}",
-                "file_path": image_path,
-                "processed_at": datetime.now(timezone.utc).isoformat(),
-                "extracted_text": [],
-                "ocr_method": "manga-ocr",
-            }
-
-        # Extract text using manga-ocr
-        try:
-            extracted_text_raw = mocr(preprocessed_img)
-            logger.debug("manga-ocr extraction successful",
-                        image_path=image_path,
-                        text_length=len(extracted_text_raw) if extracted_text_raw else 0)
         except Exception as e:
+            if ocr_service.load_error is not None:
+                return {
+                    "error": f"Failed to initialize manga-ocr model: {str(e)}",
+                    "file_path": image_path,
+                    "processed_at": datetime.now(timezone.utc).isoformat(),
+                    "extracted_text": [],
+                    "ocr_method": "manga-ocr",
+                }
+            if isinstance(e, (ValueError, OSError)):
+                return {
+                    "error": f"Image preprocessing failed: {str(e)}",
+                    "file_path": image_path,
+                    "processed_at": datetime.now(timezone.utc).isoformat(),
+                    "extracted_text": [],
+                    "ocr_method": "manga-ocr",
+                }
             logger.error("OCR extraction failed", image_path=image_path, error=str(e))
             return {
                 "error": f"OCR extraction failed: {str(e)}",
@@ -523,6 +675,221 @@ def analyze_screenshot_manga_ocr(image_path: str) -> Dict[str, Any]:
         }
 
 
+@tool
+def analyze_screenshots_manga_ocr(image_paths: List[str]) -> Dict[str, Any]:
+    """
+    Extract Japanese text from several screenshots or text-region crops with manga-ocr.
+
+    All images are recognized in batched forward passes of the preloaded
+    model, which is much faster than analyzing them one at a time.
+
+    Args:
+        image_paths: Paths to the image files
+
+    Returns:
+        Dictionary containing:
+            - results: Per image, in order: file_path, extracted_text and
+              latency_ms (preprocessing plus its share of batched inference),
+              or error if the image could not be read
+            - ocr_method: Always "manga-ocr"
+            - total_ms: Wall time of the whole call
+    """
+    logger.info("Starting batched manga-ocr analysis", image_count=len(image_paths))
+    started = time.perf_counter()
+
+    readable = [path for path in image_paths if os.path.exists(path)]
+    try:
+        recognized = dict(zip(readable, ocr_service.recognize(readable)))
+    except Exception as e:
+        logger.error("Batched manga-ocr analysis failed", error=str(e), exc_info=True)
+        return {
+            "error": f"Batched OCR extraction failed: {str(e)}",
+            "processed_at": datetime.now(timezone.utc).isoformat(),
+            "results": [],
+            "ocr_method": "manga-ocr",
+        }
+
+    results = []
+    for path in image_paths:
+        if path not in recognized:
+            results.append({"file_path": path, "error": f"Image not found: {path}", "extracted_text": []})
+            continue
+        ocr = recognized[path]
+        text = ocr.text.strip() if ocr.text else ""
+        results.append({
+            "file_path": path,
+            "extracted_text": [
+                {"text": text, "reading": None, "confidence": 0.95, "position": None}
+            ] if text else [],
+            "latency_ms": round(ocr.latency_ms, 1),
+        })
+
+    total_ms = (time.perf_counter() - started) * 1000
+    logger.info("Batched manga-ocr analysis completed",
+               image_count=len(image_paths),
+               total_ms=round(total_ms, 1))
+
+    return {
+        "processed_at": datetime.now(timezone.utc).isoformat(),
+        "results": results,
+        "ocr_method": "manga-ocr",
+        "total_ms": round(total_ms, 1),
+    }
+
+
+# Runs the manga-ocr and Claude Vision steps of hybrid analyses side by side
+_hybrid_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hybrid-analysis")
+
+
+def _hybrid_error(image_path: str, error: str) -> Dict[str, Any]:
+    return {
+        "error": error,
+        "file_path": image_path,
+        "processed_at": datetime.now(timezone.utc).isoformat(),
+        "extracted_text": [],
+        "translation": "",
+        "context": "",
+        "vocabulary": [],
+        "ocr_method": "hybrid",
+    }
+
+
+def _timed(func, *args) -> Tuple[Any, float]:
+    """Call func and return (result, elapsed milliseconds)."""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def _prepare_hybrid_analysis(
+    image_path: str,
+) -> Tuple[Optional[Dict[str, Any]], Any, Optional[LoadedScreenshot], float]:
+    """
+    Validate, load and cache-check a screenshot before hybrid analysis.
+
+    Returns:
+        Tuple of (result to return immediately or None, cache fingerprint,
+        shared screenshot or None if it could not be decoded, load ms)
+    """
+    # Validate image path
+    if not os.path.exists(image_path):
+        logger.error("Image file not found for hybrid analysis", image_path=image_path)
+        return _hybrid_error(image_path, f"Image not found: {image_path}"), None, None, 0.0
+
+    # Read and decode once for the cache, manga-ocr and Claude Vision
+    try:
+        screenshot, load_ms = _timed(load_screenshot, image_path)
+    except Exception as e:
+        # Each analysis step reports its own error for unreadable files
+        logger.warning("Could not preload screenshot", image_path=image_path, error=str(e))
+        screenshot, load_ms = None, 0.0
+
+    # Reuse the analysis of a near-duplicate screenshot
+    gray = screenshot.gray if screenshot is not None else None
+    cached_result, fingerprint = lookup_screenshot(image_path, "hybrid", gray)
+    return cached_result, fingerprint, screenshot, load_ms
+
+
+def _merge_hybrid_results(
+    image_path: str,
+    manga_result: Dict[str, Any],
+    claude_result: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Merge manga-ocr and Claude Vision results.
+
+    Prefers manga-ocr for text extraction (more accurate for game text) and
+    Claude for translation, context, and vocabulary (better contextual
+    understanding).
+    """
+    # Check if either method had errors
+    manga_has_error = "error" in manga_result
+    claude_has_error = "error" in claude_result
+
+    # If both failed, return error
+    if manga_has_error and claude_has_error:
+        return _hybrid_error(
+            image_path,
+            f"Both OCR methods failed. manga-ocr: {manga_result.get('error', 'Unknown')}; Claude: {claude_result.get('error', 'Unknown')}"
+        )
+
+    # Merge extracted text (prefer manga-ocr if available, fall back to Claude)
+    extracted_text = []
+    if not manga_has_error and manga_result.get("extracted_text"):
+        extracted_text = manga_result["extracted_text"]
+    elif not claude_has_error and claude_result.get("extracted_text"):
+        extracted_text = claude_result["extracted_text"]
+
+    # Use Claude's translation, context, and vocabulary (if available)
+    translation = claude_result.get("translation", "") if not claude_has_error else ""
+    context = claude_result.get("context", "") if not claude_has_error else ""
+    vocabulary = claude_result.get("vocabulary", []) if not claude_has_error else []
+
+    # Return merged result
+    result = {
+        "file_path": image_path,
+        "processed_at": datetime.now(timezone.utc).isoformat(),
+        "extracted_text": extracted_text,
+        "translation": translation,
+        "context": context,
+        "vocabulary": vocabulary,
+        "ocr_method": "hybrid",
+    }
+
+    # Add notes about which methods were used
+    notes = []
+    if not manga_has_error:
+        notes.append("Text extraction: manga-ocr")
+    if not claude_has_error:
+        notes.append("Translation/Context: Claude Vision")
+
+    if notes:
+        result["processing_notes"] = ", ".join(notes)
+
+    logger.info("Hybrid OCR analysis completed",
+               image_path=image_path,
+               extracted_text_count=len(extracted_text),
+               vocabulary_count=len(vocabulary),
+               processing_notes=result.get("processing_notes", ""))
+
+    # Add partial error information if one method failed
+    if manga_has_error or claude_has_error:
+        errors = []
+        if manga_has_error:
+            errors.append(f"manga-ocr: {manga_result.get('error')}")
+        if claude_has_error:
+            errors.append(f"Claude Vision: {claude_result.get('error')}")
+        result["partial_errors"] = errors
+
+    return result
+
+
+def _finish_hybrid_analysis(
+    image_path: str,
+    manga: Tuple[Dict[str, Any], float],
+    claude: Tuple[Dict[str, Any], float],
+    fingerprint: Any,
+    load_ms: float,
+    started: float,
+) -> Dict[str, Any]:
+    """Merge the timed results, cache complete analyses and attach timing."""
+    (manga_result, manga_ms), (claude_result, claude_ms) = manga, claude
+    result = _merge_hybrid_results(image_path, manga_result, claude_result)
+    total_ms = (time.perf_counter() - started) * 1000 + load_ms
+
+    # Only complete analyses are reused
+    if "error" not in result and "partial_errors" not in result:
+        remember_screenshot(fingerprint, "hybrid", result, total_ms / 1000)
+
+    result["timing"] = {
+        "load_ms": round(load_ms, 1),
+        "manga_ocr_ms": round(manga_ms, 1),
+        "claude_vision_ms": round(claude_ms, 1),
+        "total_ms": round(total_ms, 1),
+    }
+    return result
+
+
 @tool
 def hybrid_screenshot_analysis(image_path: str) -> Dict[str, Any]:
     """
@@ -530,6 +897,12 @@ def hybrid_screenshot_analysis(image_path: str) -> Dict[str, Any]:
 
     This combines the contextual understanding of Claude Vision with the
     specialized Japanese text extraction of manga-ocr for best results.
+    Both run at the same time on one decoded copy of the image, so the
+    analysis takes as long as the slower of the two.
+
+    Near-duplicates of an already analyzed screenshot (same dialogue, a few
+    pixels different) return the stored result without running either
+    method; such results carry a "cache" entry with the match details.
 
     Args:
         image_path: Path to the screenshot image file
@@ -541,122 +914,109 @@ def hybrid_screenshot_analysis(image_path: str) -> Dict[str, Any]:
             - vocabulary: Key vocabulary with readings and meanings
             - context: Game scene description
             - ocr_confidence: Confidence scores per text segment
+            - timing: load_ms, manga_ocr_ms, claude_vision_ms and total_ms
     """
     logger.info("Starting hybrid OCR analysis", image_path=image_path)
 
-    # Validate image path
-    if not os.path.exists(image_path):
-        logger.error("Image file not found for hybrid analysis", image_path=image_path)
-        return {
-            "error": f"Image not found: {image_path}",
-            "file_path": image_path,
-            "processed_at": datetime.now(timezone.utc).isoformat(),
-            "extracted_text": [],
-            "translation": "",
-            "context": "",
-            "vocabulary": [],
-            "ocr_method": "hybrid",
-        }
+    early_result, fingerprint, screenshot, load_ms = _prepare_hybrid_analysis(image_path)
+    if early_result is not None:
+        return early_result
 
     try:
-        # Step 1: Use manga-ocr for accurate text extraction
-        manga_result = analyze_screenshot_manga_ocr.func(image_path)
-
-        # Step 2: Use Claude Vision for translation, context, and vocabulary
-        claude_result = analyze_screenshot_claude.func(image_path)
+        started = time.perf_counter()
+
+        # Step 1 + 2: manga-ocr text extraction while Claude Vision translates
+        with sharing_screenshot(screenshot):
+            manga_future = _hybrid_executor.submit(
+                contextvars.copy_context().run, _timed, analyze_screenshot_manga_ocr.func, image_path
+            )
+            claude_future = _hybrid_executor.submit(
+                contextvars.copy_context().run, _timed, analyze_screenshot_claude.func, image_path
+            )
+            manga, claude = manga_future.result(), claude_future.result()
 
         # Step 3: Merge results
-        # Prefer manga-ocr for text extraction (more accurate for game text)
-        # Use Claude for translation, context, and vocabulary (better contextual understanding)
+        return _finish_hybrid_analysis(image_path, manga, claude, fingerprint, load_ms, started)
 
-        # Check if either method had errors
-        manga_has_error = "error" in manga_result
-        claude_has_error = "error" in claude_result
+    except Exception as e:
+        # Catch-all error handling
+        logger.error("Unexpected error in hybrid analysis",
+                    image_path=image_path,
+                    error=str(e),
+                    exc_info=True)
+        return _hybrid_error(image_path, f"Unexpected error during hybrid analysis: {str(e)}")
 
-        # If both failed, return error
-        if manga_has_error and claude_has_error:
-            return {
-                "error": f"Both OCR methods failed. manga-ocr: {manga_result.get('error', 'Unknown')}; Claude: {claude_result.get('error', 'Unknown')}",
-                "file_path": image_path,
-                "processed_at": datetime.now(timezone.utc).isoformat(),
-                "extracted_text": [],
-                "translation": "",
-                "context": "",
-                "vocabulary": [],
-                "ocr_method": "hybrid",
-            }
 
-        # Merge extracted text (prefer manga-ocr if available, fall back to Claude)
-        extracted_text = []
-        if not manga_has_error and manga_result.get("extracted_text"):
-            extracted_text = manga_result["extracted_text"]
-        elif not claude_has_error and claude_result.get("extracted_text"):
-            extracted_text = claude_result["extracted_text"]
+async def ahybrid_screenshot_analysis(image_path: str) -> Dict[str, Any]:
+    """
+    Async hybrid analysis: manga-ocr runs in a worker thread while the
+    Claude Vision request is in flight, without blocking the event loop.
 
-        # Use Claude's translation, context, and vocabulary (if available)
-        translation = claude_result.get("translation", "") if not claude_has_error else ""
-        context = claude_result.get("context", "") if not claude_has_error else ""
-        vocabulary = claude_result.get("vocabulary", []) if not claude_has_error else []
+    Used by hybrid_screenshot_analysis.ainvoke (async graph runs).
+    """
+    logger.info("Starting hybrid OCR analysis", image_path=image_path)
 
-        # Return merged result
-        result = {
-            "file_path": image_path,
-            "processed_at": datetime.now(timezone.utc).isoformat(),
-            "extracted_text": extracted_text,
-            "translation": translation,
-            "context": context,
-            "vocabulary": vocabulary,
-            "ocr_method": "hybrid",
-        }
+    early_result, fingerprint, screenshot, load_ms = await asyncio.to_thread(
+        _prepare_hybrid_analysis, image_path
+    )
+    if early_result is not None:
+        return early_result
 
-        # Add notes about which methods were used
-        notes = []
-        if not manga_has_error:
-            notes.append("Text extraction: manga-ocr")
-        if not claude_has_error:
-            notes.append("Translation/Context: Claude Vision")
+    try:
+        started = time.perf_counter()
 
-        if notes:
-            result["processing_notes"] = ", ".join(notes)
+        # to_thread copies the context, so both steps see the shared screenshot
+        with sharing_screenshot(screenshot):
+            manga, claude = await asyncio.gather(
+                asyncio.to_thread(_timed, analyze_screenshot_manga_ocr.func, image_path),
+                asyncio.to_thread(_timed, analyze_screenshot_claude.func, image_path),
+            )
 
-        logger.info("Hybrid OCR analysis completed",
-                   image_path=image_path,
-                   extracted_text_count=len(extracted_text),
-                   vocabulary_count=len(vocabulary),
-                   processing_notes=result.get("processing_notes", ""))
-
-        # Add partial error information if one method failed
-        if manga_has_error or claude_has_error:
-            errors = []
-            if manga_has_error:
-                errors.append(f"manga-ocr: {manga_result.get('error')}")
-            if claude_has_error:
-                errors.append(f"Claude Vision: {claude_result.get('error')}")
-            result["partial_errors"] = errors
-
-        return result
+        return _finish_hybrid_analysis(image_path, manga, claude, fingerprint, load_ms, started)
 
     except Exception as e:
-        # Catch-all error handling
         logger.error("Unexpected error in hybrid analysis",
                     image_path=image_path,
                     error=str(e),
                     exc_info=True)
-        return {
-            "error": f"Unexpected error during hybrid analysis: {str(e)}",
-            "file_path": image_path,
-            "processed_at": datetime.now(timezone.utc).isoformat(),
-            "extracted_text": [],
-            "translation": "",
-            "context": "",
-            "vocabulary": [],
-            "ocr_method": "hybrid",
-        }
+        return _hybrid_error(image_path, f"Unexpected error during hybrid analysis: {str(e)}")
+
+
+hybrid_screenshot_analysis.coroutine = ahybrid_screenshot_analysis
+
+
+@tool
+def get_screenshot_cache_statistics() -> Dict[str, Any]:
+    """
+    Get hit rate and savings of the screenshot analysis cache.
+
+    Repeated screenshots of the same dialogue reuse the first analysis
+    instead of running OCR and Claude Vision again.
+
+    Returns:
+        Dictionary containing:
+            - analyses: Screenshots analyzed and cached
+            - hits: Near-duplicate screenshots answered from the cache
+            - hit_rate: hits / (hits + analyses)
+            - seconds_saved: Analysis time the hits avoided
+            - cost_saved_usd: Estimated Claude Vision cost the hits avoided
+    """
+    try:
+        return get_cache_statistics()
+    except Exception as e:
+        logger.error("Failed to read screenshot cache statistics", error=str(e))
+        return {"error": f"Failed to read screenshot cache statistics: {str(e)}"}
 
 
 # Export all tools
 __all__ = [
     "analyze_screenshot_claude",
     "analyze_screenshot_manga_ocr",
+    "analyze_screenshots_manga_ocr",
     "hybrid_screenshot_analysis",
+    "ahybrid_screenshot_analysis",
+    "get_screenshot_cache_statistics",
+    "load_screenshot",
+    "ocr_service",
+    "start_ocr_preload",
 ]
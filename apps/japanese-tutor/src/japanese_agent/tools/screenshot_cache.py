@@ -0,0 +1,439 @@
+"""
+Perceptual-hash cache of screenshot analysis results.
+
+Screenshots of the same dialogue box differ by a few pixels (compression,
+noise, re-captures of the same frame), so an exact checksum rarely matches.
+Each analyzed screenshot is stored with a fingerprint:
+
+- a 256-bit difference hash (dHash), split into 16 bands of 16 bits that are
+  indexed in `screenshot_hash_bands`. Two hashes within 15 bits of each other
+  share at least one band, so near-duplicates are found with an index lookup
+  instead of a table scan.
+- a 64-bit DCT hash (pHash), a second cheap filter on the candidates.
+- a 160x120 grayscale thumbnail. Whole-frame hashes barely change when one
+  character of dialogue changes, so a candidate only counts as a match if no
+  4x4 tile of its thumbnail differs from the new one by more than a few
+  gray levels.
+
+A new screenshot matching a stored one reuses that analysis instead of
+running OCR and Claude Vision.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+from cernji_logging import get_logger
+
+from japanese_agent.database.connection import get_database_path
+
+# Configure logging
+logger = get_logger(__name__)
+
+
+# ==============================================================================
+# Configuration
+# ==============================================================================
+
+DHASH_SIZE = 16  # 16x16 gradient bits = 256-bit hash
+PHASH_SIZE = 8   # 8x8 low-frequency DCT coefficients = 64-bit hash
+HASH_BANDS = 16  # dHash bands of 16 bits; finds every match within 15 bits
+THUMBNAIL_SIZE = (160, 120)  # width, height
+TILE_SIZE = 4
+
+# OCR methods whose analysis makes a billed Claude Vision call
+ANALYSIS_COST_METHODS = {"claude", "hybrid"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS screenshot_analysis_cache (
+    id INTEGER PRIMARY KEY,
+    ocr_method TEXT NOT NULL,
+    dhash BLOB NOT NULL,
+    phash BLOB NOT NULL,
+    thumbnail BLOB NOT NULL,
+    result_json TEXT NOT NULL,
+    analysis_seconds REAL NOT NULL DEFAULT 0,
+    cost_usd REAL NOT NULL DEFAULT 0,
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    last_hit_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS screenshot_hash_bands (
+    band INTEGER NOT NULL,
+    value INTEGER NOT NULL,
+    cache_id INTEGER NOT NULL,
+    PRIMARY KEY (band, value, cache_id),
+    FOREIGN KEY (cache_id) REFERENCES screenshot_analysis_cache(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+"""
+
+# Database paths whose cache tables exist (created on first use)
+_initialized_paths: set = set()
+_schema_lock = threading.Lock()
+
+
+def is_cache_enabled() -> bool:
+    """Whether screenshot analyses are cached (SCREENSHOT_CACHE_ENABLED, default true)."""
+    return os.getenv("SCREENSHOT_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+
+
+def _match_limits() -> Tuple[int, int, float]:
+    """Largest dHash / pHash Hamming distances and thumbnail tile difference of a match."""
+    return (
+        int(os.getenv("SCREENSHOT_CACHE_MAX_DHASH_DISTANCE", "15")),
+        int(os.getenv("SCREENSHOT_CACHE_MAX_PHASH_DISTANCE", "10")),
+        float(os.getenv("SCREENSHOT_CACHE_MAX_TILE_DIFFERENCE", "10")),
+    )
+
+
+def _analysis_cost(ocr_method: str) -> float:
+    """Estimated cost of running an analysis (VISION_ANALYSIS_COST_USD per Claude call)."""
+    if ocr_method not in ANALYSIS_COST_METHODS:
+        return 0.0
+    return float(os.getenv("VISION_ANALYSIS_COST_USD", "0.01"))
+
+
+# ==============================================================================
+# Perceptual Hashing
+# ==============================================================================
+
+class ScreenshotFingerprint(NamedTuple):
+    """Perceptual hashes and thumbnail of one screenshot."""
+    dhash: bytes      # 32 bytes
+    phash: bytes      # 8 bytes
+    thumbnail: bytes  # THUMBNAIL_SIZE uint8 grayscale pixels
+
+
+def load_grayscale(image_path: str) -> np.ndarray:
+    """
+    Load an image file as a 2-D uint8 grayscale array.
+
+    Raises:
+        FileNotFoundError: If the image file doesn't exist
+        ValueError: If the image cannot be decoded
+    """
+    if not os.path.exists(image_path):
+        raise FileNotFoundError(f"Image not found: {image_path}")
+
+    # np.fromfile + imdecode also handles non-ASCII paths on Windows
+    gray = cv2.imdecode(np.fromfile(image_path, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        raise ValueError(f"Failed to decode image: {image_path}")
+    return gray
+
+
+def difference_hash(gray: np.ndarray, hash_size: int = DHASH_SIZE) -> bytes:
+    """
+    Horizontal gradient hash: 1 bit per cell, set where a cell is brighter
+    than its right-hand neighbour on a (hash_size + 1) x hash_size thumbnail.
+    """
+    thumbnail = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = thumbnail[:, 1:] > thumbnail[:, :-1]
+    return np.packbits(bits).tobytes()
+
+
+def perceptual_hash(gray: np.ndarray, hash_size: int = PHASH_SIZE) -> bytes:
+    """
+    DCT hash: 1 bit per low-frequency coefficient of a 32x32 thumbnail, set
+    where the coefficient is above the median (the DC term is excluded).
+    """
+    side = hash_size * 4
+    thumbnail = cv2.resize(gray, (side, side), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(thumbnail)[:hash_size, :hash_size]
+    bits = low > np.median(low.ravel()[1:])
+    return np.packbits(bits).tobytes()
+
+
+def thumbnail(gray: np.ndarray) -> bytes:
+    """Grayscale thumbnail of THUMBNAIL_SIZE pixels."""
+    return cv2.resize(gray, THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA).tobytes()
+
+
+def compute_fingerprint(image: Any) -> ScreenshotFingerprint:
+    """
+    Compute the perceptual hashes and thumbnail of a screenshot.
+
+    Args:
+        image: Image file path, or a grayscale uint8 array
+
+    Returns:
+        ScreenshotFingerprint
+    """
+    gray = load_grayscale(image) if isinstance(image, str) else image
+    return ScreenshotFingerprint(difference_hash(gray), perceptual_hash(gray), thumbnail(gray))
+
+
+def hamming_distances(query: bytes, candidates: List[bytes]) -> np.ndarray:
+    """Bit differences between `query` and each candidate hash (same length)."""
+    if not candidates:
+        return np.zeros(0, dtype=np.int64)
+    stacked = np.frombuffer(b"".join(candidates), dtype=np.uint8).reshape(len(candidates), -1)
+    differing = np.bitwise_xor(stacked, np.frombuffer(query, dtype=np.uint8))
+    return np.unpackbits(differing, axis=1).sum(axis=1)
+
+
+def max_tile_differences(query: bytes, candidates: List[bytes]) -> np.ndarray:
+    """
+    Largest mean absolute difference of any TILE_SIZE x TILE_SIZE tile
+    between the `query` thumbnail and each candidate thumbnail.
+    """
+    width, height = THUMBNAIL_SIZE
+    if not candidates:
+        return np.zeros(0, dtype=np.float32)
+    stacked = np.frombuffer(b"".join(candidates), dtype=np.uint8).reshape(len(candidates), height, width)
+    differences = np.abs(stacked.astype(np.int16) - np.frombuffer(query, dtype=np.uint8).reshape(height, width))
+    tiles = differences.reshape(
+        len(candidates), height // TILE_SIZE, TILE_SIZE, width // TILE_SIZE, TILE_SIZE
+    ).mean(axis=(2, 4))
+    return tiles.max(axis=(1, 2))
+
+
+def hash_bands(dhash: bytes) -> List[int]:
+    """Split a dHash into HASH_BANDS integer band values."""
+    return np.frombuffer(dhash, dtype=">u2").astype(np.int64).tolist()
+
+
+# ==============================================================================
+# Cache Storage
+# ==============================================================================
+
+def _connect() -> sqlite3.Connection:
+    """Open the agent database and create the cache tables on first use."""
+    db_path = get_database_path()
+    conn = sqlite3.connect(db_path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+
+    if db_path not in _initialized_paths:
+        with _schema_lock:
+            if db_path not in _initialized_paths:
+                conn.executescript(_SCHEMA)
+                _initialized_paths.add(db_path)
+    return conn
+
+
+def find_cached_analysis(fingerprint: ScreenshotFingerprint, ocr_method: str) -> Optional[Dict[str, Any]]:
+    """
+    Find the stored analysis of a near-duplicate screenshot.
+
+    Candidates sharing a dHash band are fetched with one indexed query and
+    filtered by dHash/pHash distance; the thumbnails of the survivors are
+    compared tile by tile. The closest match is returned and its hit counted.
+
+    Args:
+        fingerprint: Fingerprint of the new screenshot
+        ocr_method: Analysis method the result must come from
+
+    Returns:
+        Dict with the cache row id, stored result, distances and the time/cost
+        the original analysis took, or None on a miss
+    """
+    max_dhash, max_phash, max_tile = _match_limits()
+    bands = hash_bands(fingerprint.dhash)
+    band_filter = " OR ".join(["(band = ? AND value = ?)"] * len(bands))
+    params: List[Any] = [ocr_method]
+    for band, value in enumerate(bands):
+        params.extend((band, value))
+
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            f"""
+            SELECT id, dhash, phash
+            FROM screenshot_analysis_cache
+            WHERE ocr_method = ?
+              AND id IN (SELECT cache_id FROM screenshot_hash_bands WHERE {band_filter})
+            """,
+            params,
+        ).fetchall()
+        if not rows:
+            return None
+
+        dhash_distances = hamming_distances(fingerprint.dhash, [row["dhash"] for row in rows])
+        phash_distances = hamming_distances(fingerprint.phash, [row["phash"] for row in rows])
+        close = np.flatnonzero((dhash_distances <= max_dhash) & (phash_distances <= max_phash))
+        if close.size == 0:
+            return None
+
+        ids = [rows[i]["id"] for i in close]
+        placeholders = ", ".join("?" * len(ids))
+        thumbnails = dict(conn.execute(
+            f"SELECT id, thumbnail FROM screenshot_analysis_cache WHERE id IN ({placeholders})", ids
+        ).fetchall())
+        tile_differences = max_tile_differences(fingerprint.thumbnail, [thumbnails[i] for i in ids])
+        matches = np.flatnonzero(tile_differences <= max_tile)
+        if matches.size == 0:
+            return None
+
+        best = int(matches[np.argmin(tile_differences[matches])])
+        cache_id, candidate = ids[best], int(close[best])
+        row = conn.execute(
+            "SELECT result_json, analysis_seconds, cost_usd FROM screenshot_analysis_cache WHERE id = ?",
+            (cache_id,),
+        ).fetchone()
+        conn.execute(
+            "UPDATE screenshot_analysis_cache SET hit_count = hit_count + 1, last_hit_at = ? WHERE id = ?",
+            (datetime.now(timezone.utc).isoformat(), cache_id),
+        )
+        conn.commit()
+
+        return {
+            "cache_id": cache_id,
+            "result": json.loads(row["result_json"]),
+            "dhash_distance": int(dhash_distances[candidate]),
+            "phash_distance": int(phash_distances[candidate]),
+            "tile_difference": round(float(tile_differences[best]), 2),
+            "saved_seconds": row["analysis_seconds"],
+            "saved_cost_usd": row["cost_usd"],
+        }
+    finally:
+        conn.close()
+
+
+def save_cached_analysis(
+    fingerprint: ScreenshotFingerprint,
+    ocr_method: str,
+    result: Dict[str, Any],
+    analysis_seconds: float,
+) -> int:
+    """
+    Store an analysis result under the screenshot's fingerprint.
+
+    Returns:
+        ID of the cache row
+    """
+    conn = _connect()
+    try:
+        with conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO screenshot_analysis_cache (
+                    ocr_method, dhash, phash, thumbnail, result_json, analysis_seconds, cost_usd
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    ocr_method,
+                    fingerprint.dhash,
+                    fingerprint.phash,
+                    fingerprint.thumbnail,
+                    json.dumps(result, ensure_ascii=False),
+                    analysis_seconds,
+                    _analysis_cost(ocr_method),
+                ),
+            )
+            cache_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT OR IGNORE INTO screenshot_hash_bands (band, value, cache_id) VALUES (?, ?, ?)",
+                [(band, value, cache_id) for band, value in enumerate(hash_bands(fingerprint.dhash))],
+            )
+        return cache_id
+    finally:
+        conn.close()
+
+
+def get_cache_statistics() -> Dict[str, Any]:
+    """
+    Hit rate and savings of the screenshot analysis cache.
+
+    Every cache row is one analysis that ran (a miss); each hit reused one.
+
+    Returns:
+        Dict with analyses, hits, hit_rate, seconds_saved and cost_saved_usd
+    """
+    conn = _connect()
+    try:
+        row = conn.execute(
+            """
+            SELECT COUNT(*) AS analyses,
+                   COALESCE(SUM(hit_count), 0) AS hits,
+                   COALESCE(SUM(hit_count * analysis_seconds), 0) AS seconds_saved,
+                   COALESCE(SUM(hit_count * cost_usd), 0) AS cost_saved_usd
+            FROM screenshot_analysis_cache
+            """
+        ).fetchone()
+    finally:
+        conn.close()
+
+    lookups = row["analyses"] + row["hits"]
+    return {
+        "analyses": row["analyses"],
+        "hits": row["hits"],
+        "hit_rate": round(row["hits"] / lookups, 3) if lookups else 0.0,
+        "seconds_saved": round(row["seconds_saved"], 1),
+        "cost_saved_usd": round(row["cost_saved_usd"], 4),
+    }
+
+
+# ==============================================================================
+# Analysis Tool Helpers
+# ==============================================================================
+
+def lookup_screenshot(
+    image_path: str, ocr_method: str, gray: Optional[np.ndarray] = None
+) -> Tuple[Optional[Dict[str, Any]], Optional[ScreenshotFingerprint]]:
+    """
+    Look up a screenshot before analyzing it.
+
+    Cache failures are logged and treated as a miss, so analysis always
+    proceeds. Pass the already decoded grayscale image as gray to skip
+    reading the file again.
+
+    Returns:
+        Tuple of (cached result for this image_path or None, fingerprint to
+        pass to remember_screenshot() or None if caching is off/failed)
+    """
+    if not is_cache_enabled():
+        return None, None
+
+    try:
+        fingerprint = compute_fingerprint(gray if gray is not None else image_path)
+        cached = find_cached_analysis(fingerprint, ocr_method)
+    except Exception as e:
+        logger.warning("Screenshot cache lookup failed", image_path=image_path, error=str(e))
+        return None, None
+
+    if cached is None:
+        return None, fingerprint
+
+    logger.info("Screenshot analysis cache hit",
+               image_path=image_path,
+               cache_id=cached["cache_id"],
+               dhash_distance=cached["dhash_distance"],
+               tile_difference=cached["tile_difference"])
+
+    result = {
+        **cached["result"],
+        "file_path": image_path,
+        "processed_at": datetime.now(timezone.utc).isoformat(),
+        "cache": {
+            "hit": True,
+            "cache_id": cached["cache_id"],
+            "dhash_distance": cached["dhash_distance"],
+            "phash_distance": cached["phash_distance"],
+            "tile_difference": cached["tile_difference"],
+            "saved_seconds": round(cached["saved_seconds"], 3),
+            "saved_cost_usd": cached["saved_cost_usd"],
+        },
+    }
+    return result, fingerprint
+
+
+def remember_screenshot(
+    fingerprint: Optional[ScreenshotFingerprint],
+    ocr_method: str,
+    result: Dict[str, Any],
+    analysis_seconds: float,
+) -> None:
+    """Cache a successful analysis (no-op without a fingerprint; failures are logged)."""
+    if fingerprint is None:
+        return
+    try:
+        save_cached_analysis(fingerprint, ocr_method, result, analysis_seconds)
+    except Exception as e:
+        logger.warning("Failed to cache screenshot analysis", error=str(e))
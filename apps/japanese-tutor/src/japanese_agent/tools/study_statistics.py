@@ -0,0 +1,122 @@
+"""
+Study statistics for Japanese Learning Agent.
+
+Reads the daily_stats aggregates (one row per UTC day, kept up to date by
+triggers on review_sessions, flashcards and vocabulary) instead of scanning
+the review history: streaks and the calendar heatmap are range reads on the
+daily_stats primary key.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+
+import aiosqlite
+from cernji_logging import get_logger
+from langchain_core.tools import tool
+
+from japanese_agent.database.connection import get_connection
+
+# Configure logging
+logger = get_logger(__name__)
+
+MAX_HEATMAP_DAYS = 3660
+
+
+# ==============================================================================
+# Queries
+# ==============================================================================
+
+# Consecutive review days share julianday(day) - row_number, so each group
+# is one streak. The current streak is the one ending today or yesterday
+# (today's reviews may not have happened yet).
+_STREAKS_QUERY = """
+    WITH review_days AS (
+        SELECT day, julianday(day) - ROW_NUMBER() OVER (ORDER BY day) AS streak
+        FROM daily_stats
+        WHERE reviews > 0
+    ),
+    streaks AS (
+        SELECT MAX(day) AS last_day, COUNT(*) AS length
+        FROM review_days
+        GROUP BY streak
+    )
+    SELECT
+        COALESCE(MAX(length), 0) AS longest_streak,
+        COALESCE(MAX(CASE WHEN last_day >= DATE('now', '-1 day') THEN length END), 0) AS current_streak
+    FROM streaks
+"""
+
+
+async def get_streaks(conn: aiosqlite.Connection) -> Dict[str, int]:
+    """Current and longest streak of consecutive days with reviews."""
+    async with conn.execute(_STREAKS_QUERY) as cursor:
+        row = await cursor.fetchone()
+    return {"current_streak": row['current_streak'], "longest_streak": row['longest_streak']}
+
+
+# ==============================================================================
+# Tools
+# ==============================================================================
+
+@tool
+async def get_review_heatmap(days: int = 365) -> Dict[str, Any]:
+    """
+    Get per-day review activity for a calendar heatmap.
+
+    Only days with activity are listed; missing days had no reviews.
+
+    Args:
+        days: Number of days to cover, ending today (default: 365)
+
+    Returns:
+        Dictionary containing:
+            - success: Whether the range was valid
+            - start / end: First and last day of the range (YYYY-MM-DD, UTC)
+            - days: List of {date, reviews, correct, again, new_cards, new_words}
+            - max_reviews: Highest daily review count in the range (for scaling)
+            - total_reviews: Reviews in the range
+            - active_days: Days with at least one review
+            - current_streak / longest_streak: Consecutive review days
+    """
+    if not 1 <= days <= MAX_HEATMAP_DAYS:
+        return {
+            "success": False,
+            "error": f"days must be between 1 and {MAX_HEATMAP_DAYS}. Got: {days}"
+        }
+
+    # daily_stats days are UTC dates
+    end = datetime.now(timezone.utc).date()
+    start = end - timedelta(days=days - 1)
+
+    conn = await get_connection()
+
+    async with conn.execute(
+        """
+        SELECT day as date, reviews, correct, again, new_cards, new_words
+        FROM daily_stats
+        WHERE day BETWEEN ? AND ?
+        ORDER BY day
+        """,
+        (start.isoformat(), end.isoformat())
+    ) as cursor:
+        entries = [dict(row) for row in await cursor.fetchall()]
+
+    streaks = await get_streaks(conn)
+
+    logger.debug("Review heatmap loaded", days=days, active_entries=len(entries))
+    return {
+        "success": True,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "days": entries,
+        "max_reviews": max((e['reviews'] for e in entries), default=0),
+        "total_reviews": sum(e['reviews'] for e in entries),
+        "active_days": sum(1 for e in entries if e['reviews'] > 0),
+        **streaks,
+    }
+
+
+# Export all tools
+__all__ = [
+    "get_review_heatmap",
+]
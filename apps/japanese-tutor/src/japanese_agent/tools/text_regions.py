@@ -0,0 +1,297 @@
+"""
+Text-region detection for manga-ocr.
+
+Full game frames are mostly scenery; OCR on the whole (2x upscaled) frame is
+slow and picks up noise. This module finds the dialogue text first so only
+those crops are upscaled and recognized:
+
+- Per-game templates from the ``text_regions`` section of config.yaml give
+  fixed dialogue boxes (fractions of the frame) for screenshots whose file
+  name matches the game.
+- Otherwise text is detected with OpenCV: a morphological gradient picks out
+  glyph strokes, a horizontal close joins them into lines, and neighbouring
+  lines are merged into blocks.
+- Detected regions are cached per game (screenshot name without its
+  timestamp, plus frame size), so later screenshots of the same game skip
+  detection entirely. Generic capture names ("Screenshot 2025-10-18 ...",
+  "IMG_0042") don't identify a game and are never cached.
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+import yaml
+from cernji_logging import get_logger
+
+# Configure logging
+logger = get_logger(__name__)
+
+
+# ==============================================================================
+# Configuration
+# ==============================================================================
+
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parents[3] / "config.yaml"
+DEFAULT_CACHE_SIZE = 32
+MAX_REGIONS = 8
+REGION_PADDING = 6  # pixels around each detected block
+MIN_TEXT_HEIGHT = 8
+MIN_STROKE_DENSITY = 0.1  # share of stroke pixels inside a text line
+
+# Trailing capture timestamp/counter, e.g. "Game (Japan)-241018-101112" or "shot_0042"
+_NAME_SUFFIX = re.compile(r"[\s_\-.]*[\d\s_\-.]+$")
+
+# Default names of OS, phone and clipboard captures, whatever the game
+_GENERIC_NAMES = {
+    "screenshot", "screen shot", "screen", "capture", "snapshot", "snip", "clipboard",
+    "image", "img", "photo", "pxl", "dsc", "dscn", "dscf", "untitled",
+    "bildschirmfoto", "スクリーンショット",
+}
+_FILLER_WORDS = {"at", "from", "am", "pm"}
+
+
+class TextRegion(NamedTuple):
+    """Pixel rectangle of a text block."""
+    x: int
+    y: int
+    width: int
+    height: int
+
+    def as_dict(self) -> Dict[str, int]:
+        return self._asdict()
+
+
+class RegionSettings(NamedTuple):
+    enabled: bool
+    cache_size: int
+    games: Dict[str, Dict[str, Any]]
+
+
+_settings_cache: Dict[Tuple[str, float], RegionSettings] = {}
+
+
+def get_region_settings() -> RegionSettings:
+    """
+    Read the ``text_regions`` section of config.yaml (re-read when the file changes).
+
+    Environment Variables:
+        JAPANESE_TUTOR_CONFIG: Path to config.yaml (default: the app's config.yaml)
+        OCR_TEXT_REGIONS: "false" disables region detection
+    """
+    config_path = os.getenv("JAPANESE_TUTOR_CONFIG", str(DEFAULT_CONFIG_PATH))
+    try:
+        mtime = os.path.getmtime(config_path)
+    except OSError:
+        mtime = -1.0
+
+    key = (config_path, mtime)
+    settings = _settings_cache.get(key)
+    if settings is None:
+        section: Dict[str, Any] = {}
+        if mtime >= 0:
+            try:
+                with open(config_path, "r", encoding="utf-8") as f:
+                    section = (yaml.safe_load(f) or {}).get("text_regions") or {}
+            except Exception as e:
+                logger.warning("Could not read text_regions config", config_path=config_path, error=str(e))
+        settings = RegionSettings(
+            enabled=bool(section.get("enabled", True)),
+            cache_size=int(section.get("cache_size", DEFAULT_CACHE_SIZE)),
+            games=section.get("games") or {},
+        )
+        _settings_cache.clear()
+        _settings_cache[key] = settings
+
+    if os.getenv("OCR_TEXT_REGIONS", "true").lower() in ("0", "false", "no"):
+        return settings._replace(enabled=False)
+    return settings
+
+
+# ==============================================================================
+# Detection
+# ==============================================================================
+
+def _merge_lines(lines: List[TextRegion]) -> List[TextRegion]:
+    """Merge text lines that are stacked within a line height of each other."""
+    blocks: List[List[int]] = []
+    for x, y, w, h in sorted(lines, key=lambda line: (line.y, line.x)):
+        for block in blocks:
+            bx, by, bx2, by2 = block
+            line_gap = y - by2
+            overlaps = x < bx2 and x + w > bx
+            if overlaps and line_gap <= h:
+                block[:] = [min(bx, x), by, max(bx2, x + w), max(by2, y + h)]
+                break
+        else:
+            blocks.append([x, y, x + w, y + h])
+    return [TextRegion(x, y, x2 - x, y2 - y) for x, y, x2, y2 in blocks]
+
+
+def detect_text_regions(gray: np.ndarray, max_regions: int = MAX_REGIONS) -> List[TextRegion]:
+    """
+    Detect blocks of text in a grayscale frame.
+
+    Args:
+        gray: 2-D uint8 grayscale image
+        max_regions: Largest blocks to keep
+
+    Returns:
+        Text blocks in reading order (top to bottom, left to right);
+        empty if no text-like areas were found
+    """
+    height, width = gray.shape
+
+    # Glyph strokes have strong local contrast; flat scenery and gradients don't
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, np.ones((3, 3), np.uint8))
+    _, strokes = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+
+    # Join the glyphs of a line
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(3, width // 40), max(3, height // 60)))
+    joined = cv2.morphologyEx(strokes, cv2.MORPH_CLOSE, kernel)
+    contours, _ = cv2.findContours(joined, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    lines = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if h < MIN_TEXT_HEIGHT or w < MIN_TEXT_HEIGHT or w * h > 0.9 * width * height:
+            continue
+        # Shape outlines are strokes only at their border; text lines are dense inside
+        inner = strokes[y + h // 6:y + h - h // 6, x + w // 6:x + w - w // 6]
+        if inner.size and inner.mean() / 255 >= MIN_STROKE_DENSITY:
+            lines.append(TextRegion(x, y, w, h))
+
+    blocks = sorted(_merge_lines(lines), key=lambda r: r.width * r.height, reverse=True)[:max_regions]
+
+    padded = []
+    for x, y, w, h in blocks:
+        x0, y0 = max(0, x - REGION_PADDING), max(0, y - REGION_PADDING)
+        x1, y1 = min(width, x + w + REGION_PADDING), min(height, y + h + REGION_PADDING)
+        padded.append(TextRegion(x0, y0, x1 - x0, y1 - y0))
+    return sorted(padded, key=lambda r: (r.y, r.x))
+
+
+def crop_regions(pixels: np.ndarray, regions: List[TextRegion]) -> List[np.ndarray]:
+    """Crop regions out of an image (views, no copies)."""
+    return [pixels[r.y:r.y + r.height, r.x:r.x + r.width] for r in regions]
+
+
+# ==============================================================================
+# Per-Game Templates
+# ==============================================================================
+
+def game_key(image_path: str, shape: Tuple[int, ...]) -> Optional[str]:
+    """
+    Screenshots of one game share a name (minus timestamp) and frame size.
+
+    Returns None for generic capture names, which say nothing about the game.
+    """
+    stem = Path(image_path).stem
+    words = [w for w in re.findall(r"[^\W\d_]+", stem.lower()) if w not in _FILLER_WORDS]
+    if not words or " ".join(words) in _GENERIC_NAMES:
+        return None
+    name = _NAME_SUFFIX.sub("", stem) or stem
+    return f"{name}@{shape[1]}x{shape[0]}"
+
+
+def _template_regions(image_path: str, shape: Tuple[int, ...], games: Dict[str, Dict[str, Any]]) -> Optional[Tuple[str, List[TextRegion]]]:
+    """Configured dialogue boxes of the game whose "match" is in the file name."""
+    height, width = shape[:2]
+    file_name = Path(image_path).name.lower()
+    for name, game in games.items():
+        match = str(game.get("match", name)).lower()
+        if match and match in file_name:
+            regions = []
+            for fx, fy, fw, fh in game.get("regions", []):
+                x, y = int(fx * width), int(fy * height)
+                regions.append(TextRegion(x, y, min(width - x, int(fw * width)), min(height - y, int(fh * height))))
+            return name, regions
+    return None
+
+
+class RegionTemplateCache:
+    """LRU of detected text regions per game key."""
+
+    def __init__(self):
+        self._regions: "OrderedDict[str, List[TextRegion]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.detections = 0
+
+    def get(self, key: str) -> Optional[List[TextRegion]]:
+        with self._lock:
+            regions = self._regions.get(key)
+            if regions is not None:
+                self._regions.move_to_end(key)
+                self.hits += 1
+            return regions
+
+    def put(self, key: str, regions: List[TextRegion], max_size: int) -> None:
+        with self._lock:
+            self.detections += 1
+            self._regions[key] = regions
+            self._regions.move_to_end(key)
+            while len(self._regions) > max(1, max_size):
+                self._regions.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._regions.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._regions.clear()
+            self.hits = self.detections = 0
+
+
+region_cache = RegionTemplateCache()
+
+
+def find_text_regions(image_path: str, pixels: np.ndarray, refresh: bool = False) -> Tuple[List[TextRegion], str]:
+    """
+    Find the text regions of a screenshot.
+
+    Args:
+        image_path: Screenshot path (identifies the game)
+        pixels: Decoded RGB, RGBA or grayscale image
+        refresh: Ignore cached regions for this game and detect again
+
+    Returns:
+        Tuple of (regions, source) where source is "template" (config.yaml),
+        "cached" (earlier detection for this game), "detected" or "disabled".
+        Screenshots with generic names are always detected.
+        No regions means OCR should run on the whole frame.
+    """
+    settings = get_region_settings()
+    if not settings.enabled:
+        return [], "disabled"
+
+    template = _template_regions(image_path, pixels.shape, settings.games)
+    if template is not None:
+        return template[1], "template"
+
+    key = game_key(image_path, pixels.shape)
+    if key is not None:
+        if refresh:
+            region_cache.invalidate(key)
+        else:
+            cached = region_cache.get(key)
+            if cached is not None:
+                return cached, "cached"
+
+    if pixels.ndim == 2:
+        gray = pixels
+    else:
+        code = cv2.COLOR_RGBA2GRAY if pixels.shape[2] == 4 else cv2.COLOR_RGB2GRAY
+        gray = cv2.cvtColor(pixels, code)
+
+    regions = detect_text_regions(gray)
+    if regions and key is not None:
+        region_cache.put(key, regions, settings.cache_size)
+    logger.debug("Text regions detected", game_key=key, regions=len(regions))
+    return regions, "detected"
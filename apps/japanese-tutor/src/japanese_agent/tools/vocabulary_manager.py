@@ -189,54 +189,23 @@ async def get_vocabulary_statistics() -> Dict[str, Any]:
     """
     conn = await get_connection()
 
-    # Get total count
-    async with conn.execute("SELECT COUNT(*) as count FROM vocabulary") as cursor:
-        total_row = await cursor.fetchone()
-        total_words = total_row['count'] if total_row else 0
-
-    # Get counts by status
+    # One pass over vocabulary for all counts
     async with conn.execute(
         """
         SELECT
-            study_status,
-            COUNT(*) as count
+            COUNT(*) as total_words,
+            COALESCE(SUM(study_status = 'new'), 0) as new_words,
+            COALESCE(SUM(study_status = 'learning'), 0) as learning_words,
+            COALESCE(SUM(study_status = 'reviewing'), 0) as reviewing_words,
+            COALESCE(SUM(study_status = 'mastered'), 0) as mastered_words,
+            COALESCE(SUM(study_status = 'suspended'), 0) as suspended_words,
+            COALESCE(SUM(encounter_count), 0) as total_encounters
         FROM vocabulary
-        GROUP BY study_status
         """
     ) as cursor:
-        status_rows = await cursor.fetchall()
-
-    # Build status counts dictionary
-    status_counts = {
-        "new": 0,
-        "learning": 0,
-        "reviewing": 0,
-        "mastered": 0,
-        "suspended": 0,
-    }
-
-    for row in status_rows:
-        status = row['study_status']
-        count = row['count']
-        if status in status_counts:
-            status_counts[status] = count
-
-    # Get total encounters
-    async with conn.execute(
-        "SELECT SUM(encounter_count) as total FROM vocabulary"
-    ) as cursor:
-        encounter_row = await cursor.fetchone()
-        total_encounters = encounter_row['total'] if encounter_row and encounter_row['total'] else 0
-
-    return {
-        "total_words": total_words,
-        "new_words": status_counts["new"],
-        "learning_words": status_counts["learning"],
-        "reviewing_words": status_counts["reviewing"],
-        "mastered_words": status_counts["mastered"],
-        "suspended_words": status_counts["suspended"],
-        "total_encounters": total_encounters,
-    }
+        row = await cursor.fetchone()
+
+    return dict(row)
 
 
 # Export all tools
@@ -1,8 +1,13 @@
 """Pytest configuration and fixtures for Japanese Learning Agent tests."""
 
+import os
+
 import pytest
 from typing import Dict, Any
 
+# Importing the graph must not start loading the real manga-ocr model
+os.environ.setdefault("MANGA_OCR_PRELOAD", "off")
+
 
 @pytest.fixture
 def sample_screenshot_dict() -> Dict[str, Any]:
@@ -54,3 +59,17 @@ def sample_flashcard_dict() -> Dict[str, Any]:
         "repetitions": 0,
         "next_review": "2025-11-01T00:00:00Z",
     }
+
+
+@pytest.fixture(autouse=True)
+def disable_screenshot_cache(monkeypatch):
+    """Analysis tests run uncached; screenshot cache tests enable it on a temp database."""
+    monkeypatch.setenv("SCREENSHOT_CACHE_ENABLED", "false")
+
+
+@pytest.fixture(autouse=True)
+def image_store_path(monkeypatch, tmp_path):
+    """Keep images written by tests out of the real image store."""
+    store_path = tmp_path / "images"
+    monkeypatch.setenv("IMAGE_STORE_PATH", str(store_path))
+    return store_path
@@ -7,6 +7,7 @@ review recording, and statistics calculation.
 
 import pytest
 import os
+import numpy as np
 import tempfile
 from datetime import datetime, timedelta
 
@@ -19,7 +20,9 @@ from japanese_agent.tools.flashcard_manager import (
     get_due_flashcards,
     create_flashcard,
     record_flashcard_review,
+    record_flashcard_reviews,
     get_review_statistics,
+    _calculate_sm2_batch,
     _calculate_sm2_next_interval
 )
 
@@ -391,3 +394,104 @@ async def test_flashcard_ordering_by_due_date(test_db_with_flashcards):
         current = datetime.fromisoformat(results[i]['next_review'])
         next_card = datetime.fromisoformat(results[i + 1]['next_review'])
         assert current <= next_card, f"Cards not properly ordered. {current} should be <= {next_card}"
+
+
+@pytest.mark.asyncio
+async def test_calculate_sm2_batch_matches_single_card():
+    """Unit test: vectorized SM-2 equals the per-card calculation."""
+    cases = [
+        (rating, ease, interval, reps)
+        for rating in range(4)
+        for ease in (1.3, 2.5, 2.8)
+        for interval, reps in ((0.0, 0), (1.0, 1), (6.0, 2), (15.0, 3))
+    ]
+    ratings, eases, intervals, reps = (np.array(column) for column in zip(*cases))
+
+    batch = _calculate_sm2_batch(ratings, eases, intervals, reps)
+
+    for i, (rating, ease, interval, rep) in enumerate(cases):
+        expected = _calculate_sm2_next_interval(rating, ease, interval, rep)
+        actual = (batch[0][i], batch[1][i], batch[2][i])
+        assert actual == pytest.approx(expected), f"Mismatch for {cases[i]}"
+
+
+@pytest.mark.asyncio
+async def test_record_flashcard_reviews_batch(test_db_with_flashcards):
+    """Test a batch gives the same cards as reviewing one at a time."""
+    single = [(await create_flashcard.coroutine(vocab_id=v))['flashcard_id'] for v in (1, 2)]
+    batched = [(await create_flashcard.coroutine(vocab_id=v))['flashcard_id'] for v in (1, 2)]
+
+    # Card 0 is reviewed twice in the batch: Easy, then Again
+    sequence = [(0, 3), (1, 2), (0, 0)]
+    for card, rating in sequence:
+        await record_flashcard_review.coroutine(single[card], rating=rating)
+
+    result = await record_flashcard_reviews.coroutine(
+        reviews=[{"flashcard_id": batched[card], "rating": rating, "response_time_ms": 1200}
+                 for card, rating in sequence],
+        session_id="session-1"
+    )
+
+    assert result['success'] is True, f"Batch review failed: {result}"
+    assert result['reviewed'] == 3
+    assert [card['flashcard_id'] for card in result['flashcards']] == batched
+
+    conn = await get_connection()
+    for single_id, batch_card in zip(single, result['flashcards']):
+        async with conn.execute(
+            "SELECT ease_factor, interval_days, review_count, consecutive_correct, lapses "
+            "FROM flashcards WHERE id = ?", (single_id,)
+        ) as cursor:
+            expected = dict(await cursor.fetchone())
+        assert batch_card['ease_factor'] == pytest.approx(expected['ease_factor'])
+        assert batch_card['interval'] == expected['interval_days']
+        assert batch_card['review_count'] == expected['review_count']
+        assert batch_card['consecutive_correct'] == expected['consecutive_correct']
+        assert batch_card['lapses'] == expected['lapses']
+
+    async with conn.execute(
+        "SELECT quality_rating, session_id, response_time_ms, interval_before_days "
+        "FROM review_sessions WHERE flashcard_id = ? ORDER BY id", (batched[0],)
+    ) as cursor:
+        history = [tuple(row) for row in await cursor.fetchall()]
+    assert history == [(5, "session-1", 1200, 0.0), (0, "session-1", 1200, 1.0)]
+
+
+@pytest.mark.asyncio
+async def test_record_flashcard_reviews_rejects_whole_batch(test_db_with_flashcards):
+    """Test an invalid or non-int rating, malformed flashcard_id or unknown card writes nothing."""
+    flashcard = await create_flashcard.coroutine(vocab_id=1)
+    flashcard_id = flashcard['flashcard_id']
+
+    bad_rating = await record_flashcard_reviews.coroutine(
+        reviews=[{"flashcard_id": flashcard_id, "rating": 3}, {"flashcard_id": flashcard_id, "rating": 7}]
+    )
+    unknown_card = await record_flashcard_reviews.coroutine(
+        reviews=[{"flashcard_id": flashcard_id, "rating": 3}, {"flashcard_id": 9999, "rating": 3}]
+    )
+
+    missing_id = await record_flashcard_reviews.coroutine(
+        reviews=[{"flashcard_id": flashcard_id, "rating": 3}, {"rating": 3}]
+    )
+    non_numeric_id = await record_flashcard_reviews.coroutine(
+        reviews=[{"flashcard_id": flashcard_id, "rating": 3}, {"flashcard_id": "abc", "rating": 3}]
+    )
+
+    for rating in (2.0, True):
+        non_int_rating = await record_flashcard_reviews.coroutine(
+            reviews=[{"flashcard_id": flashcard_id, "rating": 3}, {"flashcard_id": flashcard_id, "rating": rating}]
+        )
+        assert non_int_rating == {
+            "success": False, "error": f"Invalid rating. Must be 0, 1, 2, or 3. Got: {rating!r}"
+        }
+
+    assert bad_rating['success'] is False and 'error' in bad_rating
+    assert unknown_card['success'] is False and '9999' in unknown_card['error']
+    assert missing_id == {"success": False, "error": "Review 1 is missing flashcard_id"}
+    assert non_numeric_id['success'] is False and "'abc'" in non_numeric_id['error']
+
+    conn = await get_connection()
+    async with conn.execute("SELECT COUNT(*) FROM review_sessions") as cursor:
+        assert (await cursor.fetchone())[0] == 0, "No reviews should be recorded"
+    async with conn.execute("SELECT review_count FROM flashcards WHERE id = ?", (flashcard_id,)) as cursor:
+        assert (await cursor.fetchone())[0] == 0, "Flashcard should be unchanged"
@@ -0,0 +1,248 @@
+"""
+Integration tests for the FSRS scheduler and per-deck scheduler selection.
+
+Tests the FSRS memory model, parameter fitting on a synthetic review log,
+FSRS intervals on the review path and bulk rescheduling of a deck.
+"""
+
+import asyncio
+import time
+
+import pytest
+import numpy as np
+from datetime import datetime, timedelta, timezone
+
+from japanese_agent.database.connection import (
+    get_connection,
+    initialize_database,
+    close_connection
+)
+from japanese_agent.tools.flashcard_manager import create_flashcard, record_flashcard_reviews
+import japanese_agent.tools.fsrs_scheduler as fsrs_scheduler
+from japanese_agent.tools.fsrs_scheduler import (
+    DEFAULT_PARAMETERS,
+    ReviewHistory,
+    fsrs_step,
+    next_interval,
+    optimize_fsrs_parameters,
+    optimize_parameters,
+    replay,
+    retrievability,
+    set_deck_scheduler,
+)
+
+
+@pytest.fixture
+async def test_db(monkeypatch, tmp_path):
+    """Test database with three vocabulary entries."""
+    await close_connection()
+    monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "test.db"))
+    await initialize_database()
+    conn = await get_connection()
+
+    for kanji, hiragana, meaning in [('日本語', 'にほんご', 'Japanese language'),
+                                     ('勉強', 'べんきょう', 'study'),
+                                     ('本', 'ほん', 'book')]:
+        await conn.execute(
+            """INSERT INTO vocabulary (kanji_form, hiragana_reading, english_meaning)
+               VALUES (?, ?, ?)""",
+            (kanji, hiragana, meaning)
+        )
+    await conn.commit()
+
+    yield conn
+
+    await close_connection()
+
+
+def synthetic_history(parameters: np.ndarray, cards: int = 150, reviews: int = 6, seed: int = 0) -> ReviewHistory:
+    """Review log of a learner whose memory follows the given parameters."""
+    rng = np.random.default_rng(seed)
+    stability = np.full(cards, np.nan)
+    difficulty = np.full(cards, np.nan)
+    day = np.zeros(cards)
+    gap = np.zeros(cards)
+    ids, days, grades = [], [], []
+
+    for k in range(reviews):
+        if k:
+            recalled = rng.random(cards) < retrievability(gap, stability)
+            grade = np.where(recalled, 3, 1)
+        else:
+            grade = np.full(cards, 3)
+        stability, difficulty = fsrs_step(parameters, stability, difficulty, gap, grade)
+        ids.append(np.arange(cards))
+        days.append(day.copy())
+        grades.append(grade)
+        gap = np.where(grade > 1, np.rint(next_interval(stability, 0.9) * rng.uniform(0.5, 2.5, cards)), 1.0)
+        day = day + gap
+
+    order = np.lexsort((np.concatenate(days), np.concatenate(ids)))
+    return ReviewHistory(np.concatenate(ids)[order], np.concatenate(days)[order],
+                         np.concatenate(grades)[order], float(day.max()))
+
+
+@pytest.mark.asyncio
+async def test_fsrs_memory_model_unit():
+    """Unit test for FSRS state updates and intervals."""
+    new = np.full(4, np.nan)
+    stability, difficulty = fsrs_step(DEFAULT_PARAMETERS, new, new, np.zeros(4), np.array([1, 2, 3, 4]))
+
+    np.testing.assert_allclose(stability, DEFAULT_PARAMETERS[:4])
+    assert difficulty[0] > difficulty[3], "Again should start harder than Easy"
+    assert next_interval(np.array([10.0]), 0.9)[0] == pytest.approx(10.0)
+    assert next_interval(np.array([10.0]), 0.8)[0] > 10.0
+
+    recalled, _ = fsrs_step(DEFAULT_PARAMETERS, np.array([5.0]), np.array([5.0]), np.array([5.0]), np.array([3]))
+    forgotten, _ = fsrs_step(DEFAULT_PARAMETERS, np.array([5.0]), np.array([5.0]), np.array([5.0]), np.array([1]))
+    assert recalled[0] > 5.0 > forgotten[0]
+
+
+@pytest.mark.asyncio
+async def test_replay_evaluates_parameter_batches():
+    """Test a batch of parameter vectors gives the same loss as one at a time."""
+    history = synthetic_history(DEFAULT_PARAMETERS, cards=20)
+    candidates = np.vstack([DEFAULT_PARAMETERS, DEFAULT_PARAMETERS * 1.1])
+
+    batched = replay(candidates, history)[0]
+
+    assert batched.shape == (2,)
+    assert batched[0] == pytest.approx(replay(candidates[0], history)[0])
+    assert batched[1] == pytest.approx(replay(candidates[1], history)[0])
+
+
+@pytest.mark.asyncio
+async def test_optimize_parameters_reduces_loss():
+    """Test fitting to a learner with different memory lowers the log loss."""
+    learner = DEFAULT_PARAMETERS.copy()
+    learner[2] *= 2.5   # initial stability after Good
+    learner[8] = 2.2    # faster stability growth
+    history = synthetic_history(learner)
+
+    parameters, loss_before, loss_after = optimize_parameters(history, iterations=40)
+
+    assert loss_after < loss_before
+    assert parameters[2] > DEFAULT_PARAMETERS[2]
+
+
+@pytest.mark.asyncio
+async def test_optimize_parameters_without_iterations_keeps_initial():
+    """Test zero iterations returns the initial parameters and their loss."""
+    history = synthetic_history(DEFAULT_PARAMETERS, cards=20)
+
+    parameters, loss_before, loss_after = optimize_parameters(history, iterations=0)
+
+    assert parameters == pytest.approx(DEFAULT_PARAMETERS)
+    assert loss_after == loss_before
+
+
+@pytest.mark.asyncio
+async def test_optimize_fsrs_parameters_rejects_non_positive_iterations(test_db):
+    """Test the tool refuses to run the optimizer for less than one step."""
+    result = await optimize_fsrs_parameters.coroutine(iterations=0)
+
+    assert result == {"success": False, "error": "iterations must be at least 1. Got: 0"}
+
+
+@pytest.mark.asyncio
+async def test_fsrs_deck_uses_fsrs_intervals(test_db):
+    """Test cards in an FSRS deck get FSRS intervals; other decks keep SM-2."""
+    fsrs_card = await create_flashcard.coroutine(vocab_id=1, deck="kana")
+    sm2_card = await create_flashcard.coroutine(vocab_id=2)
+    await set_deck_scheduler.coroutine(deck="kana", scheduler="fsrs")
+
+    result = await record_flashcard_reviews.coroutine(reviews=[
+        {"flashcard_id": fsrs_card['flashcard_id'], "rating": 2},
+        {"flashcard_id": sm2_card['flashcard_id'], "rating": 2},
+    ])
+
+    fsrs_result, sm2_result = result['flashcards']
+    assert fsrs_result['deck'] == "kana"
+    assert fsrs_result['interval'] == pytest.approx(DEFAULT_PARAMETERS[2])
+    assert fsrs_result['ease_factor'] == 2.5, "FSRS reviews leave the SM-2 ease untouched"
+    assert sm2_result['interval'] == 1.0
+
+    conn = await get_connection()
+    async with conn.execute("SELECT fsrs_stability FROM flashcards ORDER BY id") as cursor:
+        stabilities = [row[0] for row in await cursor.fetchall()]
+    assert stabilities == pytest.approx([DEFAULT_PARAMETERS[2]] * 2)
+
+
+@pytest.mark.asyncio
+async def test_switching_deck_to_fsrs_reschedules_from_history(test_db):
+    """Test switching a deck to FSRS rewrites due dates from the review log."""
+    card = await create_flashcard.coroutine(vocab_id=1)
+    conn = await get_connection()
+    start = datetime.now(timezone.utc) - timedelta(days=20)
+    await conn.executemany(
+        """INSERT INTO review_sessions (flashcard_id, reviewed_at, quality_rating, correct)
+           VALUES (?, ?, ?, ?)""",
+        [(card['flashcard_id'], (start + timedelta(days=d)).strftime('%Y-%m-%d %H:%M:%S'), 4, True)
+         for d in (0, 4, 14)]
+    )
+    await conn.commit()
+
+    result = await set_deck_scheduler.coroutine(deck="default", scheduler="fsrs", desired_retention=0.9)
+
+    assert result['rescheduled'] == 1
+    async with conn.execute(
+        "SELECT fsrs_stability, interval_days, next_review_at FROM flashcards WHERE id = ?",
+        (card['flashcard_id'],)
+    ) as cursor:
+        stability, interval, next_review = await cursor.fetchone()
+    assert interval == pytest.approx(stability)
+    # Last review 6 days ago, so due `interval - 6` days from now
+    expected = datetime.now() + timedelta(days=interval - 6)
+    assert abs((datetime.fromisoformat(next_review) - expected).total_seconds()) < 60
+
+
+@pytest.mark.asyncio
+async def test_set_deck_scheduler_and_optimizer_validation(test_db):
+    """Test invalid settings and too little history are rejected."""
+    bad_scheduler = await set_deck_scheduler.coroutine(deck="default", scheduler="leitner")
+    bad_retention = await set_deck_scheduler.coroutine(deck="default", scheduler="fsrs", desired_retention=0.5)
+    no_history = await optimize_fsrs_parameters.coroutine(deck="default")
+
+    assert bad_scheduler['success'] is False
+    assert bad_retention['success'] is False
+    assert no_history['success'] is False and 'at least' in no_history['error']
+
+
+async def test_optimizer_runs_off_the_event_loop(test_db, monkeypatch):
+    """Test fitting and rescheduling leave the event loop free for other work."""
+    await set_deck_scheduler.coroutine(deck="default", scheduler="fsrs")
+    history = synthetic_history(DEFAULT_PARAMETERS, cards=20)
+    beats = 0
+    progress = {}
+
+    def blocking(name, func):
+        def run(*args):
+            before = beats
+            time.sleep(0.1)   # CPU-bound work holds its thread like this
+            progress[name] = beats - before
+            return func(*args)
+        return run
+
+    async def load_history(deck):
+        return history
+
+    monkeypatch.setattr(fsrs_scheduler, "load_review_history", load_history)
+    monkeypatch.setattr(fsrs_scheduler, "optimize_parameters",
+                        blocking("optimize", lambda h, parameters, iterations: (parameters, 0.6, 0.5)))
+    monkeypatch.setattr(fsrs_scheduler, "replay", blocking("replay", replay))
+
+    async def heartbeat():
+        nonlocal beats
+        while True:
+            await asyncio.sleep(0.005)
+            beats += 1
+
+    ticker = asyncio.create_task(heartbeat())
+    try:
+        result = await optimize_fsrs_parameters.coroutine(deck="default")
+    finally:
+        ticker.cancel()
+
+    assert result['success'] is True and result['rescheduled'] == 20
+    # The loop kept running while each CPU-bound step was in progress
+    assert progress['optimize'] > 5 and progress['replay'] > 5
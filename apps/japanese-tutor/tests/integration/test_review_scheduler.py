@@ -0,0 +1,220 @@
+"""
+Integration tests for the session-scoped review scheduler.
+
+Tests due-card ordering, "Again" re-insertion, batched write-back and the
+number of statements a session costs.
+"""
+
+import asyncio
+
+import pytest
+from datetime import datetime, timedelta
+
+from japanese_agent.database.connection import (
+    get_connection,
+    initialize_database,
+    close_connection
+)
+import japanese_agent.tools.review_scheduler as review_scheduler
+from japanese_agent.tools.review_scheduler import (
+    start_review_session,
+    next_card,
+    answer_card,
+    end_review_session,
+)
+
+
+@pytest.fixture
+async def test_db_with_due_cards(monkeypatch, tmp_path):
+    """Test database with five due flashcards, oldest first by vocabulary ID."""
+    await close_connection()
+    monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "test.db"))
+    monkeypatch.setenv("REVIEW_FLUSH_SIZE", "4")
+    monkeypatch.setenv("REVIEW_AGAIN_GAP", "2")
+
+    await initialize_database()
+    conn = await get_connection()
+
+    for i in range(1, 6):
+        await conn.execute(
+            """INSERT INTO vocabulary (kanji_form, hiragana_reading, english_meaning)
+               VALUES (?, ?, ?)""",
+            (f"語{i}", f"ご{i}", f"word {i}")
+        )
+        await conn.execute(
+            """INSERT INTO flashcards (vocabulary_id, next_review_at, interval_days)
+               VALUES (?, ?, 0.0)""",
+            (i, (datetime.now() - timedelta(days=10 - i)).isoformat())
+        )
+    await conn.commit()
+
+    yield conn
+
+    await close_connection()
+    review_scheduler._sessions.clear()
+
+
+async def review_count() -> int:
+    conn = await get_connection()
+    async with conn.execute("SELECT COUNT(*) FROM review_sessions") as cursor:
+        return (await cursor.fetchone())[0]
+
+
+@pytest.mark.asyncio
+async def test_review_session_order_and_again(test_db_with_due_cards):
+    """Test cards come in due order and "Again" returns two cards later."""
+    session_id = (await start_review_session.coroutine(limit=10))["session_id"]
+
+    shown = []
+    while True:
+        card = (await next_card.coroutine(session_id))["card"]
+        if card is None:
+            break
+        shown.append(card["flashcard_id"])
+        # Fail card 1 the first time it is shown
+        rating = 0 if shown.count(1) == 1 and card["flashcard_id"] == 1 else 3
+        result = await answer_card.coroutine(session_id, card["flashcard_id"], rating)
+        assert result["success"] is True, f"Answer failed: {result}"
+
+    assert shown == [1, 2, 3, 1, 4, 5]
+    assert result["finished"] is True
+    assert result["session"]["written"] == 6
+    assert await review_count() == 6
+
+
+@pytest.mark.asyncio
+async def test_review_session_writes_in_batches(test_db_with_due_cards):
+    """Test answers are written per flush batch, with few statements per session."""
+    statements = []
+    await test_db_with_due_cards.set_trace_callback(statements.append)
+
+    session_id = (await start_review_session.coroutine(limit=10))["session_id"]
+    for expected_written in (0, 0, 0, 4):
+        card = (await next_card.coroutine(session_id))["card"]
+        await answer_card.coroutine(session_id, card["flashcard_id"], 2)
+        assert await review_count() == expected_written
+
+    card = (await next_card.coroutine(session_id))["card"]
+    result = await answer_card.coroutine(session_id, card["flashcard_id"], 2)
+    await test_db_with_due_cards.set_trace_callback(None)
+
+    assert result["finished"] is True
+    assert await review_count() == 5
+    # One load, then two batches of read + two executemany + commit + read
+    queries = [s for s in statements if not s.startswith("SELECT COUNT")]
+    assert len([s for s in queries if s.lstrip().startswith("SELECT")]) == 5
+
+
+@pytest.mark.asyncio
+async def test_answer_card_validation(test_db_with_due_cards):
+    """Test unknown sessions, wrong cards and invalid ratings are rejected."""
+    session_id = (await start_review_session.coroutine(limit=10))["session_id"]
+    card = (await next_card.coroutine(session_id))["card"]
+
+    unknown = await answer_card.coroutine("missing", card["flashcard_id"], 3)
+    wrong_card = await answer_card.coroutine(session_id, card["flashcard_id"] + 1, 3)
+    bad_rating = await answer_card.coroutine(session_id, card["flashcard_id"], 9)
+    float_rating = await answer_card.coroutine(session_id, card["flashcard_id"], 2.0)
+
+    assert unknown["success"] is False
+    assert wrong_card["success"] is False
+    assert bad_rating["success"] is False
+    assert float_rating["success"] is False
+    assert (await next_card.coroutine(session_id))["card"] == card
+
+
+@pytest.mark.asyncio
+async def test_end_review_session_saves_pending(test_db_with_due_cards):
+    """Test ending a session early writes the answers so far."""
+    session_id = (await start_review_session.coroutine(limit=10))["session_id"]
+    for _ in range(2):
+        card = (await next_card.coroutine(session_id))["card"]
+        await answer_card.coroutine(session_id, card["flashcard_id"], 1)
+
+    result = await end_review_session.coroutine(session_id)
+
+    assert result["success"] is True
+    assert result["session"]["written"] == 2
+    assert await review_count() == 2
+    assert (await next_card.coroutine(session_id))["success"] is False
+
+
+@pytest.mark.asyncio
+async def test_eviction_keeps_session_with_unsaved_answers(test_db_with_due_cards, monkeypatch):
+    """Test a session whose flush fails is not evicted and its answers survive."""
+    monkeypatch.setattr(review_scheduler, "MAX_SESSIONS", 2)
+    unsaved_id = (await start_review_session.coroutine(limit=10))["session_id"]
+    card = (await next_card.coroutine(unsaved_id))["card"]
+    await answer_card.coroutine(unsaved_id, card["flashcard_id"], 3)
+    idle_id = (await start_review_session.coroutine(limit=10))["session_id"]
+
+    # The pending answer can no longer be written
+    await test_db_with_due_cards.execute("DELETE FROM flashcards WHERE id = ?", (card["flashcard_id"],))
+    await test_db_with_due_cards.commit()
+
+    started = await start_review_session.coroutine(limit=10)
+
+    assert started["success"] is True
+    assert set(review_scheduler._sessions) == {unsaved_id, started["session_id"]}
+    assert review_scheduler._sessions[unsaved_id].pending == [
+        {"flashcard_id": card["flashcard_id"], "rating": 3, "response_time_ms": None}
+    ]
+    assert (await next_card.coroutine(idle_id))["success"] is False
+
+    # With every open session holding unsaved answers, nothing is dropped
+    monkeypatch.setattr(review_scheduler, "MAX_SESSIONS", 1)
+    del review_scheduler._sessions[started["session_id"]]
+    refused = await start_review_session.coroutine(limit=10)
+
+    assert refused["success"] is False and "end_review_session" in refused["error"]
+    assert list(review_scheduler._sessions) == [unsaved_id]
+
+
+@pytest.mark.asyncio
+async def test_flush_error_keeps_pending_answers(test_db_with_due_cards, monkeypatch):
+    """Test an exception while saving is returned as an error and loses no answers."""
+    session_id = (await start_review_session.coroutine(limit=10))["session_id"]
+    card = (await next_card.coroutine(session_id))["card"]
+    await answer_card.coroutine(session_id, card["flashcard_id"], 3)
+
+    async def broken(reviews, session_id=None):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(review_scheduler, "apply_flashcard_reviews", broken)
+    session = review_scheduler._sessions[session_id]
+    result = await session.flush()
+
+    assert result == {"success": False, "error": "Failed to save answers: database is locked"}
+    assert len(session.pending) == 1
+    assert session.written == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_keeps_answers_added_while_saving(test_db_with_due_cards, monkeypatch):
+    """Test an answer recorded during a flush is not dropped with the saved batch."""
+    session_id = (await start_review_session.coroutine(limit=10))["session_id"]
+    session = review_scheduler._sessions[session_id]
+    first = (await next_card.coroutine(session_id))["card"]
+    await answer_card.coroutine(session_id, first["flashcard_id"], 3)
+
+    apply = review_scheduler.apply_flashcard_reviews
+    saving = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_apply(reviews, session_id=None):
+        saving.set()
+        await release.wait()
+        return await apply(reviews, session_id=session_id)
+
+    monkeypatch.setattr(review_scheduler, "apply_flashcard_reviews", slow_apply)
+    flush = asyncio.create_task(session.flush())
+    await saving.wait()
+
+    second = (await next_card.coroutine(session_id))["card"]
+    session.answer(1, None)
+    release.set()
+    result = await flush
+
+    assert result["success"] is True and result["reviewed"] == 1
+    assert session.pending == [{"flashcard_id": second["flashcard_id"], "rating": 1, "response_time_ms": None}]
+    assert session.written == 1
@@ -0,0 +1,239 @@
+"""
+Integration tests for the daily_stats aggregates and study statistics.
+
+Tests the daily_stats triggers, streak calculation, the review heatmap,
+single-query statistics and the daily_stats migration backfill.
+"""
+
+import importlib.util
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from japanese_agent.database.connection import (
+    get_connection,
+    initialize_database,
+    close_connection
+)
+from japanese_agent.tools.flashcard_manager import (
+    create_flashcard,
+    get_review_statistics,
+    record_flashcard_reviews,
+)
+from japanese_agent.tools.study_statistics import get_review_heatmap
+from japanese_agent.tools.vocabulary_manager import (
+    get_vocabulary_statistics,
+    update_vocabulary_status,
+)
+
+MIGRATION_PATH = (
+    Path(__file__).parents[2] / "src" / "japanese_agent" / "database" / "migrations" / "004_add_daily_stats.py"
+)
+
+
+@pytest.fixture
+async def test_db(monkeypatch, tmp_path):
+    """Test database with two vocabulary entries."""
+    await close_connection()
+    monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "test.db"))
+    await initialize_database()
+    conn = await get_connection()
+
+    for kanji, hiragana, meaning in [('日本語', 'にほんご', 'Japanese language'),
+                                     ('勉強', 'べんきょう', 'study')]:
+        await conn.execute(
+            """INSERT INTO vocabulary (kanji_form, hiragana_reading, english_meaning, encounter_count)
+               VALUES (?, ?, ?, 3)""",
+            (kanji, hiragana, meaning)
+        )
+    await conn.commit()
+
+    yield conn
+
+    await close_connection()
+
+
+def utc_day(days_ago: int) -> str:
+    return (datetime.now(timezone.utc).date() - timedelta(days=days_ago)).isoformat()
+
+
+async def insert_review_days(conn, days_ago: list[int]) -> None:
+    await conn.executemany(
+        """INSERT INTO daily_stats (day, reviews, correct) VALUES (?, 4, 3)
+           ON CONFLICT(day) DO UPDATE SET reviews = 4, correct = 3""",
+        [(utc_day(d),) for d in days_ago]
+    )
+    await conn.commit()
+
+
+@pytest.mark.asyncio
+async def test_triggers_maintain_daily_stats(test_db):
+    """Test reviews, new cards, new words and status changes update today's row."""
+    card = await create_flashcard.coroutine(vocab_id=1)
+    await record_flashcard_reviews.coroutine(reviews=[
+        {"flashcard_id": card['flashcard_id'], "rating": 0, "response_time_ms": 1500},
+        {"flashcard_id": card['flashcard_id'], "rating": 3, "response_time_ms": 500},
+    ])
+    await update_vocabulary_status.coroutine(vocab_id=1, new_status="learning")
+    await update_vocabulary_status.coroutine(vocab_id=1, new_status="learning")
+
+    async with test_db.execute("SELECT * FROM daily_stats") as cursor:
+        rows = [dict(row) for row in await cursor.fetchall()]
+
+    assert rows == [{
+        "day": utc_day(0),
+        "reviews": 2,
+        "correct": 1,
+        "again": 1,
+        "response_time_ms": 2000,
+        "new_cards": 1,
+        "new_words": 2,
+        "to_learning": 1,
+        "to_reviewing": 0,
+        "to_mastered": 0,
+        "to_suspended": 0,
+    }]
+
+
+@pytest.mark.asyncio
+async def test_deletes_are_taken_out_of_daily_stats(test_db):
+    """Test deleting a review, and cascading deletes of a word, undo its counts."""
+    first = await create_flashcard.coroutine(vocab_id=1)
+    second = await create_flashcard.coroutine(vocab_id=2)
+    await record_flashcard_reviews.coroutine(reviews=[
+        {"flashcard_id": first['flashcard_id'], "rating": 0, "response_time_ms": 1500},
+        {"flashcard_id": first['flashcard_id'], "rating": 3, "response_time_ms": 500},
+        {"flashcard_id": second['flashcard_id'], "rating": 2, "response_time_ms": 700},
+    ])
+
+    await test_db.execute(
+        "DELETE FROM review_sessions WHERE flashcard_id = ? AND quality_rating < 3", (first['flashcard_id'],)
+    )
+    await test_db.commit()
+
+    async with test_db.execute("SELECT reviews, correct, again, response_time_ms, new_cards, new_words "
+                               "FROM daily_stats") as cursor:
+        assert [tuple(row) for row in await cursor.fetchall()] == [(2, 2, 0, 1200, 2, 2)]
+
+    # Deleting the word cascades to its flashcard and that card's review
+    await test_db.execute("DELETE FROM vocabulary WHERE id = 2")
+    await test_db.commit()
+
+    async with test_db.execute("SELECT reviews, correct, again, response_time_ms, new_cards, new_words "
+                               "FROM daily_stats") as cursor:
+        assert [tuple(row) for row in await cursor.fetchall()] == [(1, 1, 0, 500, 1, 1)]
+    stats = await get_review_statistics.coroutine()
+    assert stats['reviewed_today'] == 1
+
+
+@pytest.mark.asyncio
+async def test_review_statistics_streaks(test_db):
+    """Test current and longest streaks from daily_stats."""
+    # Current streak: yesterday and the two days before (none yet today)
+    # Longest streak: five days ending ten days ago
+    await insert_review_days(test_db, [1, 2, 3, 10, 11, 12, 13, 14, 20])
+
+    stats = await get_review_statistics.coroutine()
+
+    assert stats['current_streak'] == 3
+    assert stats['longest_streak'] == 5
+    assert stats['reviewed_today'] == 0
+
+    await insert_review_days(test_db, [5])   # day 4 missing: still a separate streak
+    stats = await get_review_statistics.coroutine()
+    assert stats['current_streak'] == 3
+
+
+@pytest.mark.asyncio
+async def test_review_streak_broken(test_db):
+    """Test the current streak is zero when the last review was two days ago."""
+    await insert_review_days(test_db, [2, 3])
+
+    stats = await get_review_statistics.coroutine()
+
+    assert stats['current_streak'] == 0
+    assert stats['longest_streak'] == 2
+
+
+@pytest.mark.asyncio
+async def test_review_heatmap(test_db):
+    """Test the heatmap covers the requested range and rejects bad ranges."""
+    await insert_review_days(test_db, [0, 1, 6, 7, 40])
+
+    heatmap = await get_review_heatmap.coroutine(days=7)
+
+    assert heatmap['success'] is True
+    assert heatmap['start'] == utc_day(6)
+    assert heatmap['end'] == utc_day(0)
+    assert [entry['date'] for entry in heatmap['days']] == [utc_day(6), utc_day(1), utc_day(0)]
+    assert heatmap['total_reviews'] == 12
+    assert heatmap['active_days'] == 3
+    assert heatmap['max_reviews'] == 4
+    assert heatmap['current_streak'] == 2
+
+    invalid = await get_review_heatmap.coroutine(days=0)
+    assert invalid['success'] is False
+
+
+@pytest.mark.asyncio
+async def test_statistics_are_single_queries(test_db):
+    """Test vocabulary statistics take one statement and review statistics two."""
+    await update_vocabulary_status.coroutine(vocab_id=2, new_status="mastered")
+    statements = []
+    await test_db.set_trace_callback(statements.append)
+
+    vocab_stats = await get_vocabulary_statistics.coroutine()
+    vocab_statements = len(statements)
+    await get_review_statistics.coroutine()
+    await test_db.set_trace_callback(None)
+
+    assert vocab_stats == {
+        "total_words": 2,
+        "new_words": 1,
+        "learning_words": 0,
+        "reviewing_words": 0,
+        "mastered_words": 1,
+        "suspended_words": 0,
+        "total_encounters": 6,
+    }
+    assert vocab_statements == 1
+    assert len(statements) == 3
+
+
+@pytest.mark.asyncio
+async def test_migration_backfills_daily_stats(test_db, tmp_path):
+    """Test the migration rebuilds daily_stats from existing history."""
+    card = await create_flashcard.coroutine(vocab_id=1)
+    await test_db.executemany(
+        """INSERT INTO review_sessions (flashcard_id, reviewed_at, quality_rating, correct)
+           VALUES (?, ?, ?, ?)""",
+        [(card['flashcard_id'], f"{utc_day(3)} 08:00:00", 5, True),
+         (card['flashcard_id'], f"{utc_day(3)} 21:00:00", 1, False),
+         (card['flashcard_id'], f"{utc_day(1)} 12:00:00", 4, True)]
+    )
+    await test_db.commit()
+    async with test_db.execute("SELECT * FROM daily_stats ORDER BY day") as cursor:
+        expected = [tuple(row) for row in await cursor.fetchall()]
+    await close_connection()
+
+    conn = sqlite3.connect(tmp_path / "test.db")
+    for trigger in ("review", "new_card", "new_word", "status_transition",
+                    "review_deleted", "card_deleted", "word_deleted"):
+        conn.execute(f"DROP TRIGGER daily_stats_{trigger}")
+    conn.execute("DROP TABLE daily_stats")
+
+    spec = importlib.util.spec_from_file_location("add_daily_stats", MIGRATION_PATH)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    migration.migrate(conn)
+    migration.migrate(conn)   # re-running is a no-op
+    conn.commit()
+
+    assert conn.execute("SELECT * FROM daily_stats ORDER BY day").fetchall() == expected
+    triggers = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'daily_stats_%'"
+    ).fetchone()[0]
+    assert triggers == 7
+    conn.close()
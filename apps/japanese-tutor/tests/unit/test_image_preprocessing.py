@@ -1,7 +1,7 @@
 """
 Unit tests for image preprocessing functionality.
 
-Tests the image extraction and temporary file handling for LangGraph Studio images.
+Tests the image extraction and image store handling for LangGraph Studio images.
 """
 
 import pytest
@@ -13,10 +13,7 @@ from langchain_core.messages import HumanMessage, AIMessage
 
 from japanese_agent.graph import (
     extract_base64_from_data_url,
-    determine_file_extension,
-    save_image_to_temp_file,
     preprocess_images,
-    _temp_files,
 )
 
 
@@ -45,20 +42,6 @@ def sample_data_url(sample_image_base64):
     return f"data:image/png;base64,{sample_image_base64}"
 
 
-@pytest.fixture
-def cleanup_temp_files():
-    """Fixture to clean up temp files after tests."""
-    yield
-    # Clean up any temp files created during tests
-    for file_path in _temp_files[:]:
-        try:
-            if os.path.exists(file_path):
-                os.unlink(file_path)
-            _temp_files.remove(file_path)
-        except:
-            pass
-
-
 # ==============================================================================
 # Helper Function Tests
 # ==============================================================================
@@ -92,96 +75,10 @@ class TestExtractBase64FromDataUrl:
             extract_base64_from_data_url("data:image/png")
 
 
-class TestDetermineFileExtension:
-    """Tests for determine_file_extension helper function."""
-
-    def test_png_extension(self):
-        """Test PNG mime type returns .png extension."""
-        assert determine_file_extension("image/png") == ".png"
-
-    def test_jpeg_extension(self):
-        """Test JPEG mime type returns .jpg extension."""
-        assert determine_file_extension("image/jpeg") == ".jpg"
-
-    def test_jpg_extension(self):
-        """Test JPG mime type returns .jpg extension."""
-        assert determine_file_extension("image/jpg") == ".jpg"
-
-    def test_gif_extension(self):
-        """Test GIF mime type returns .gif extension."""
-        assert determine_file_extension("image/gif") == ".gif"
-
-    def test_webp_extension(self):
-        """Test WebP mime type returns .webp extension."""
-        assert determine_file_extension("image/webp") == ".webp"
-
-    def test_case_insensitive(self):
-        """Test mime type matching is case-insensitive."""
-        assert determine_file_extension("IMAGE/PNG") == ".png"
-        assert determine_file_extension("Image/Jpeg") == ".jpg"
-
-    def test_unknown_mime_type(self):
-        """Test unknown mime type defaults to .png."""
-        assert determine_file_extension("image/unknown") == ".png"
-        assert determine_file_extension("application/octet-stream") == ".png"
-
-
-class TestSaveImageToTempFile:
-    """Tests for save_image_to_temp_file helper function."""
-
-    def test_save_png_image(self, sample_image_base64, cleanup_temp_files):
-        """Test saving PNG image to temp file."""
-        file_path = save_image_to_temp_file(sample_image_base64, "image/png")
-
-        # Verify file exists
-        assert os.path.exists(file_path)
-
-        # Verify it's an absolute path
-        assert os.path.isabs(file_path)
-
-        # Verify extension
-        assert file_path.endswith(".png")
-
-        # Verify prefix
-        assert "japanese_agent_screenshot_" in os.path.basename(file_path)
-
-        # Verify file is tracked for cleanup
-        assert file_path in _temp_files
-
-    def test_save_jpeg_image(self, cleanup_temp_files):
-        """Test saving JPEG image to temp file."""
-        # Create a simple base64 JPEG (minimal valid JPEG header)
-        jpeg_base64 = "/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAAgGBgcGBQgHBwcJCQgKDBQNDAsLDBkSEw8UHRofHh0aHBwgJC4nICIsIxwcKDcpLDAxNDQ0Hyc5PTgyPC4zNDL/wAALCAABAAEBAREA/8QAFQABAQAAAAAAAAAAAAAAAAAAAAv/xAAUEAEAAAAAAAAAAAAAAAAAAAAA/9oACAEBAAE/AKp/2Q=="
-
-        file_path = save_image_to_temp_file(jpeg_base64, "image/jpeg")
-
-        assert os.path.exists(file_path)
-        assert file_path.endswith(".jpg")
-
-    def test_invalid_base64_data(self):
-        """Test handling of invalid base64 data."""
-        with pytest.raises(ValueError, match="Failed to save image"):
-            save_image_to_temp_file("not-valid-base64!!!", "image/png")
-
-    def test_file_contains_correct_data(self, sample_image_base64, cleanup_temp_files):
-        """Test that saved file contains correct image data."""
-        file_path = save_image_to_temp_file(sample_image_base64, "image/png")
-
-        # Read the file and verify it matches original data
-        with open(file_path, 'rb') as f:
-            saved_data = base64.b64encode(f.read()).decode('utf-8')
-
-        assert saved_data == sample_image_base64
-
-
-# ==============================================================================
-# Preprocessing Node Tests
-# ==============================================================================
-
 class TestPreprocessImages:
     """Tests for preprocess_images node function."""
 
-    def test_extract_image_from_image_url_format(self, sample_data_url, cleanup_temp_files):
+    def test_extract_image_from_image_url_format(self, sample_data_url):
         """Test extracting image from image_url format message."""
         # Create a HumanMessage with image_url content
         message = HumanMessage(
@@ -207,13 +104,17 @@ class TestPreprocessImages:
         assert "processed_at" in result["current_screenshot"]
         assert result["current_screenshot"]["ocr_method"] == "pending"
 
+        # Only a reference to the stored image goes into state
+        assert "base64_data" not in result["current_screenshot"]
+        assert len(result["current_screenshot"]["image_hash"]) == 64
+
         # Verify AIMessage with file path is added
         assert "messages" in result
         assert len(result["messages"]) == 1
         assert isinstance(result["messages"][0], AIMessage)
         assert result["current_screenshot"]["file_path"] in result["messages"][0].content
 
-    def test_extract_image_from_direct_base64_format(self, sample_image_base64, cleanup_temp_files):
+    def test_extract_image_from_direct_base64_format(self, sample_image_base64):
         """Test extracting image from direct base64 format message."""
         # Create a HumanMessage with direct base64 content
         message = HumanMessage(
@@ -296,7 +197,7 @@ class TestPreprocessImages:
 
         assert result == {}
 
-    def test_multiple_images_uses_first_one(self, sample_data_url, cleanup_temp_files):
+    def test_multiple_images_uses_first_one(self, sample_data_url):
         """Test that when multiple images exist, first one is used."""
         message = HumanMessage(
             content=[
@@ -360,7 +261,7 @@ class TestPreprocessImages:
         # HTTP URLs are not handled yet
         assert result == {}
 
-    def test_processes_last_message_only(self, sample_data_url, cleanup_temp_files):
+    def test_processes_last_message_only(self, sample_data_url):
         """Test that only the last message is processed."""
         old_message = HumanMessage(content="Old message")
         new_message = HumanMessage(
@@ -388,7 +289,7 @@ class TestPreprocessImages:
 class TestImagePreprocessingIntegration:
     """Integration tests for complete image preprocessing workflow."""
 
-    def test_full_workflow_with_state_update(self, sample_data_url, cleanup_temp_files):
+    def test_full_workflow_with_state_update(self, sample_data_url):
         """Test complete workflow from message to state update."""
         # Simulate user attaching image in LangGraph Studio
         user_message = HumanMessage(
@@ -437,7 +338,7 @@ class TestImagePreprocessingIntegration:
         assert isinstance(state_update["messages"][0], AIMessage)
         assert file_path in state_update["messages"][0].content
 
-    def test_workflow_with_mixed_content(self, sample_data_url, cleanup_temp_files):
+    def test_workflow_with_mixed_content(self, sample_data_url):
         """Test workflow with text and image mixed content."""
         message = HumanMessage(
             content=[
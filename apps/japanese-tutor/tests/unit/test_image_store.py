@@ -0,0 +1,250 @@
+"""
+Unit tests for the content-addressed screenshot image store.
+
+Covers storing and memory-mapped reads, the save/UI nodes passing only the
+image reference through state, and the migration of base64 rows.
+"""
+
+import base64
+import importlib.util
+import json
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage, ToolMessage
+
+from japanese_agent.database.connection import close_connection, initialize_database
+from japanese_agent.database.image_store import (
+    hash_image,
+    image_path,
+    open_image,
+    read_image_base64,
+    store_base64_image,
+    store_image,
+)
+from japanese_agent.nodes.save_screenshot_db import save_screenshot_to_db
+from japanese_agent.nodes.screenshot_ui import emit_screenshot_ui
+
+MIGRATIONS_DIR = Path(__file__).parents[2] / "src" / "japanese_agent" / "database" / "migrations"
+
+IMAGE_BYTES = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 64
+
+
+# ==============================================================================
+# Fixtures
+# ==============================================================================
+
+@pytest.fixture
+async def test_db(monkeypatch, tmp_path):
+    """Fresh database in a temp directory."""
+    await close_connection()
+    monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "test.db"))
+    await initialize_database()
+    yield str(tmp_path / "test.db")
+    await close_connection()
+
+
+def analysis_messages():
+    """An AI tool call followed by its screenshot analysis result."""
+    return [
+        AIMessage(content="", tool_calls=[
+            {"name": "hybrid_screenshot_analysis", "args": {}, "id": "call-1"}
+        ]),
+        ToolMessage(
+            content=json.dumps({
+                "extracted_text": [{"text": "こんにちは", "reading": "", "confidence": 0.9}],
+                "translation": "Hello",
+                "ocr_method": "hybrid",
+            }),
+            name="hybrid_screenshot_analysis",
+            tool_call_id="call-1",
+        ),
+    ]
+
+
+# ==============================================================================
+# Image Store Tests
+# ==============================================================================
+
+class TestImageStore:
+    """Tests for storing and reading images by content hash."""
+
+    def test_store_is_content_addressed(self, image_store_path):
+        """Test identical images share one file keyed by their hash."""
+        first = store_image(IMAGE_BYTES, "image/png")
+        second = store_base64_image(base64.b64encode(IMAGE_BYTES).decode(), "image/png")
+
+        assert first == second
+        assert first.image_hash == hash_image(IMAGE_BYTES)
+        assert first.size == len(IMAGE_BYTES)
+        assert Path(first.path) == image_path(first.image_hash, "image/png")
+        assert Path(first.path).read_bytes() == IMAGE_BYTES
+        assert len(list(image_store_path.rglob("*.png"))) == 1
+
+    def test_open_image_maps_file_read_only(self):
+        """Test stored images are read through a read-only memory map."""
+        stored = store_image(IMAGE_BYTES, "image/png")
+
+        with open_image(stored.image_hash, "image/png") as view:
+            assert view.readonly
+            assert view.nbytes == len(IMAGE_BYTES)
+            assert view[:8] == IMAGE_BYTES[:8]
+
+        assert read_image_base64(stored.image_hash) == base64.b64encode(IMAGE_BYTES).decode()
+
+    def test_missing_and_empty_images(self):
+        """Test reading an unknown hash and storing nothing both fail."""
+        with pytest.raises(FileNotFoundError):
+            read_image_base64("0" * 64)
+        with pytest.raises(ValueError):
+            store_image(b"")
+
+    def test_invalid_base64_is_rejected(self, image_store_path):
+        """Test malformed base64 fails instead of storing mangled bytes."""
+        encoded = base64.b64encode(IMAGE_BYTES).decode()
+        for invalid in (encoded[:-1], encoded[:8] + "!?" + encoded[8:], "data:image/png;base64," + encoded):
+            with pytest.raises(ValueError):
+                store_base64_image(invalid)
+        assert not any(path.is_file() for path in image_store_path.rglob("*"))
+
+
+# ==============================================================================
+# Node Tests
+# ==============================================================================
+
+class TestScreenshotNodes:
+    """Tests for saving and displaying screenshots from image references."""
+
+    async def test_save_stores_reference_not_image_data(self, test_db):
+        """Test the screenshots row and state carry the hash, not base64 data."""
+        stored = store_image(IMAGE_BYTES, "image/png")
+        state = {
+            "messages": analysis_messages(),
+            "current_screenshot": {
+                "file_path": stored.path,
+                "image_hash": stored.image_hash,
+                "image_size": stored.size,
+                "mime_type": "image/png",
+            },
+        }
+
+        result = await save_screenshot_to_db(state)
+        again = await save_screenshot_to_db(state)
+
+        screenshot = result["current_screenshot"]
+        assert screenshot["image_hash"] == stored.image_hash
+        assert again["current_screenshot"]["id"] == screenshot["id"]
+
+        conn = sqlite3.connect(test_db)
+        row = conn.execute(
+            "SELECT image_hash, image_size, checksum, base64_data FROM screenshots"
+        ).fetchall()
+        conn.close()
+        assert row == [(stored.image_hash, len(IMAGE_BYTES), stored.image_hash, None)]
+
+    async def test_save_moves_legacy_base64_state_to_store(self, test_db):
+        """Test a checkpoint with base64_data is converted to a reference."""
+        state = {
+            "messages": analysis_messages(),
+            "current_screenshot": {
+                "file_path": "/tmp/gone.png",
+                "base64_data": base64.b64encode(IMAGE_BYTES).decode(),
+                "mime_type": "image/png",
+            },
+        }
+
+        screenshot = (await save_screenshot_to_db(state))["current_screenshot"]
+
+        assert "base64_data" not in screenshot
+        assert screenshot["image_hash"] == hash_image(IMAGE_BYTES)
+        assert Path(screenshot["file_path"]).read_bytes() == IMAGE_BYTES
+
+    def test_ui_reads_image_from_store(self):
+        """Test the screenshot card gets the image encoded from the store."""
+        stored = store_image(IMAGE_BYTES, "image/png")
+        state = {
+            "messages": analysis_messages(),
+            "current_screenshot": {"image_hash": stored.image_hash, "mime_type": "image/png"},
+        }
+
+        with patch("japanese_agent.nodes.screenshot_ui.push_ui_message") as push:
+            assert emit_screenshot_ui(state) == {}
+
+        props = push.call_args.args[1]
+        assert props["image_data"] == base64.b64encode(IMAGE_BYTES).decode()
+        assert props["media_type"] == "image/png"
+
+
+# ==============================================================================
+# Migration Tests
+# ==============================================================================
+
+def load_migration_002():
+    spec = importlib.util.spec_from_file_location(
+        "migration_002", MIGRATIONS_DIR / "002_move_screenshots_to_image_store.py"
+    )
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration
+
+
+def legacy_screenshots_db(path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE screenshots (
+            id INTEGER PRIMARY KEY, file_path TEXT, base64_data TEXT,
+            mime_type TEXT DEFAULT 'image/png', checksum TEXT
+        )
+    """)
+    return conn
+
+
+class TestImageStoreMigration:
+    """Tests for moving base64 screenshots rows to the image store."""
+
+    def test_migration_moves_base64_rows(self, tmp_path, image_store_path):
+        """Test rows get image references and lose their base64 data."""
+        conn = legacy_screenshots_db(tmp_path / "legacy.db")
+        legacy_images = [IMAGE_BYTES, IMAGE_BYTES[::-1], IMAGE_BYTES]
+        conn.executemany(
+            "INSERT INTO screenshots (base64_data, checksum) VALUES (?, 'old')",
+            [(base64.b64encode(data).decode(),) for data in legacy_images]
+        )
+        conn.execute("INSERT INTO screenshots (file_path) VALUES ('/tmp/no_image.png')")
+
+        migration = load_migration_002()
+        migration.migrate(conn)
+        migration.migrate(conn)  # re-running is a no-op
+
+        rows = conn.execute(
+            "SELECT image_hash, checksum, base64_data FROM screenshots ORDER BY id"
+        ).fetchall()
+        conn.close()
+
+        expected = [hash_image(data) for data in legacy_images]
+        assert rows == [(h, h, None) for h in expected] + [(None, None, None)]
+        assert len(list(image_store_path.rglob("*.png"))) == 2
+        assert read_image_base64(expected[1]) == base64.b64encode(IMAGE_BYTES[::-1]).decode()
+
+    def test_migration_clears_undecodable_rows_and_continues(self, tmp_path, image_store_path):
+        """Test empty or malformed base64 rows are cleared instead of aborting the migration."""
+        conn = legacy_screenshots_db(tmp_path / "legacy.db")
+        conn.executemany(
+            "INSERT INTO screenshots (base64_data, checksum) VALUES (?, 'old')",
+            [("",), ("not base64!!",), (base64.b64encode(IMAGE_BYTES).decode(),)]
+        )
+
+        migration = load_migration_002()
+        migration.migrate(conn)
+        migration.migrate(conn)
+
+        rows = conn.execute(
+            "SELECT image_hash, checksum, base64_data FROM screenshots ORDER BY id"
+        ).fetchall()
+        conn.close()
+
+        image_hash = hash_image(IMAGE_BYTES)
+        assert rows == [(None, "old", None), (None, "old", None), (image_hash, image_hash, None)]
+        assert read_image_base64(image_hash) == base64.b64encode(IMAGE_BYTES).decode()
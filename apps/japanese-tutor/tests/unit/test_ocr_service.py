@@ -0,0 +1,189 @@
+"""
+Unit tests for the manga-ocr inference service.
+
+The model is a fake that records batch sizes; the batched path is exercised
+through fake processor/model/tokenizer attributes shaped like MangaOcr's.
+"""
+
+import sys
+import threading
+import types
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from japanese_agent.tools.ocr_service import OcrPreprocessor, OcrService
+from japanese_agent.tools.screenshot_analyzer import analyze_screenshots_manga_ocr
+
+
+# ==============================================================================
+# Fixtures
+# ==============================================================================
+
+class CallableModel:
+    """Model with only MangaOcr.__call__: returns the image size as text."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, image):
+        self.calls += 1
+        return f"{image.size[0]}x{image.size[1]}"
+
+
+class BatchedModel:
+    """Model exposing processor/model/tokenizer like MangaOcr."""
+
+    def __init__(self):
+        self.batch_sizes = []
+        outer = self
+
+        class Pixels:
+            def __init__(self, sizes):
+                self.sizes = sizes
+
+            def to(self, device):
+                return self
+
+        class Processor:
+            def __call__(self, images, return_tensors):
+                assert all(image.mode == "RGB" for image in images)
+                return types.SimpleNamespace(pixel_values=Pixels([image.size for image in images]))
+
+        class Generator:
+            device = "cpu"
+
+            def generate(self, pixel_values, max_length):
+                outer.batch_sizes.append(len(pixel_values.sizes))
+                return types.SimpleNamespace(cpu=lambda: pixel_values.sizes)
+
+        class Tokenizer:
+            def batch_decode(self, token_ids, skip_special_tokens):
+                return [f"{width}x{height}" for width, height in token_ids]
+
+        self.processor = Processor()
+        self.model = Generator()
+        self.tokenizer = Tokenizer()
+
+
+@pytest.fixture
+def fake_torch(monkeypatch):
+    """Minimal torch and manga_ocr.ocr modules for the batched path."""
+    torch = types.ModuleType("torch")
+    torch.inference_mode = lambda: __import__("contextlib").nullcontext()
+    ocr = types.ModuleType("manga_ocr.ocr")
+    ocr.post_process = lambda text: text
+    monkeypatch.setitem(sys.modules, "torch", torch)
+    monkeypatch.setitem(sys.modules, "manga_ocr.ocr", ocr)
+
+
+def crop(width, height, channels=3):
+    rng = np.random.default_rng(width * height)
+    shape = (height, width, channels) if channels else (height, width)
+    return rng.integers(0, 255, shape, dtype=np.uint8)
+
+
+# ==============================================================================
+# Preprocessing Tests
+# ==============================================================================
+
+class TestOcrPreprocessor:
+    """Tests for buffer-reusing preprocessing."""
+
+    def test_matches_unbuffered_pipeline(self):
+        """Test output equals grayscale + CLAHE + 2x cubic upscale."""
+        image = crop(64, 48)
+        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        enhanced = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(gray)
+        expected = cv2.resize(enhanced, (128, 96), interpolation=cv2.INTER_CUBIC)
+
+        result = OcrPreprocessor()(image)
+
+        assert result.mode == "L"
+        assert result.size == (128, 96)
+        np.testing.assert_array_equal(np.asarray(result), expected)
+
+    def test_buffers_are_reused_and_outputs_independent(self):
+        """Test same-sized inputs share buffers without overwriting earlier outputs."""
+        preprocessor = OcrPreprocessor()
+        first = preprocessor(crop(40, 30))
+        first_pixels = np.asarray(first).copy()
+        buffers = preprocessor._buffers_for(30, 40)
+
+        preprocessor(crop(40, 30, channels=4))
+        preprocessor(crop(40, 30, channels=0))
+
+        assert preprocessor._buffers_for(30, 40) is buffers
+        np.testing.assert_array_equal(np.asarray(first), first_pixels)
+
+
+# ==============================================================================
+# Service Tests
+# ==============================================================================
+
+class TestOcrService:
+    """Tests for preloading and batched recognition."""
+
+    def test_background_preload(self):
+        """Test the model loads in a thread and requests wait for it."""
+        release = threading.Event()
+        loads = []
+
+        def load_model():
+            release.wait(5)
+            loads.append(1)
+            return CallableModel()
+
+        service = OcrService(load_model)
+        service.start(background=True)
+        assert not service.is_ready
+
+        release.set()
+        assert service.wait_until_ready(5)
+        assert service.stats()["load_seconds"] is not None
+        assert loads == [1]
+
+    def test_recognize_batches_and_reports_latency(self, fake_torch):
+        """Test crops run in batches of max_batch_size, results in order."""
+        model = BatchedModel()
+        service = OcrService(lambda: model, max_batch_size=4)
+        crops = [crop(20 + i, 10) for i in range(10)]
+
+        results = service.recognize(crops)
+
+        assert [result.text for result in results] == [f"{2 * (20 + i)}x20" for i in range(10)]
+        assert model.batch_sizes == [4, 4, 2]
+        assert all(result.latency_ms > 0 for result in results)
+        assert service.stats()["images"] == 10
+        assert service.stats()["batches"] == 3
+
+    def test_models_without_batch_api_run_per_image(self):
+        """Test a plain callable model still recognizes every image."""
+        model = CallableModel()
+        service = OcrService(lambda: model)
+
+        results = service.recognize([crop(10, 10), Image.new("L", (5, 5))])
+
+        assert [result.text for result in results] == ["20x20", "10x10"]
+        assert model.calls == 2
+
+    def test_batch_tool_reports_missing_files(self, tmp_path, monkeypatch):
+        """Test the tool returns per-image results and errors in order."""
+        import japanese_agent.tools.screenshot_analyzer as sa
+
+        monkeypatch.setattr(sa, "ocr_service", OcrService(CallableModel))
+        paths = []
+        for size in (16, 24):
+            path = tmp_path / f"crop_{size}.png"
+            Image.fromarray(crop(size, size)).save(path)
+            paths.append(str(path))
+
+        result = analyze_screenshots_manga_ocr.func([paths[0], "/missing.png", paths[1]])
+
+        assert "error" not in result
+        texts = [r["extracted_text"][0]["text"] if r["extracted_text"] else None for r in result["results"]]
+        assert texts == ["32x32", None, "48x48"]
+        assert "not found" in result["results"][1]["error"]
+        assert result["results"][0]["latency_ms"] >= 0
@@ -464,19 +464,15 @@ class TestAnalyzeScreenshotMangaOcr:
     """Tests for analyze_screenshot_manga_ocr tool function."""
 
     @patch('japanese_agent.tools.screenshot_analyzer.get_manga_ocr_model')
-    @patch('japanese_agent.tools.screenshot_analyzer.preprocess_image_for_ocr')
-    def test_successful_text_extraction(self, mock_preprocess, mock_get_model, sample_image_path):
+    def test_successful_text_extraction(self, mock_get_model, sample_image_path):
         """Test successful text extraction with mocked manga-ocr."""
-        from PIL import Image
-
-        # Mock preprocessing
-        mock_preprocessed = Image.new('L', (100, 100))
-        mock_preprocess.return_value = mock_preprocessed
+        from japanese_agent.tools.screenshot_analyzer import ocr_service
 
         # Mock manga-ocr model
         mock_model = MagicMock()
         mock_model.return_value = "こんにちは世界"
         mock_get_model.return_value = mock_model
+        images_before = ocr_service.stats()["images"]
 
         # Call the function
         result = analyze_screenshot_manga_ocr.func(sample_image_path)
@@ -494,11 +490,12 @@ class TestAnalyzeScreenshotMangaOcr:
         assert result["extracted_text"][0]["reading"] is None
         assert result["extracted_text"][0]["position"] is None
 
-        # Verify preprocessing was called
-        mock_preprocess.assert_called_once_with(sample_image_path)
-
-        # Verify model was called with preprocessed image
-        mock_model.assert_called_once_with(mock_preprocessed)
+        # The full frame went through the OCR service: preprocessed (grayscale,
+        # 2x upscale) and counted in its stats
+        mock_model.assert_called_once()
+        preprocessed = mock_model.call_args.args[0]
+        assert (preprocessed.mode, preprocessed.size) == ("L", (200, 200))
+        assert ocr_service.stats()["images"] == images_before + 1
 
     def test_file_not_found(self):
         """Test handling of non-existent file."""
@@ -509,24 +506,21 @@ class TestAnalyzeScreenshotMangaOcr:
         assert result["ocr_method"] == "manga-ocr"
         assert result["extracted_text"] == []
 
-    @patch('japanese_agent.tools.screenshot_analyzer.preprocess_image_for_ocr')
-    def test_preprocessing_failure(self, mock_preprocess, sample_image_path):
+    @patch('japanese_agent.tools.screenshot_analyzer.get_manga_ocr_model')
+    def test_preprocessing_failure(self, mock_get_model, tmp_path):
         """Test handling of preprocessing failure."""
-        mock_preprocess.side_effect = ValueError("Preprocessing failed")
+        broken = tmp_path / "broken.png"
+        broken.write_bytes(b"not an image")
 
-        result = analyze_screenshot_manga_ocr.func(sample_image_path)
+        result = analyze_screenshot_manga_ocr.func(str(broken))
 
         assert "error" in result
         assert "preprocessing failed" in result["error"].lower()
         assert result["ocr_method"] == "manga-ocr"
 
     @patch('japanese_agent.tools.screenshot_analyzer.get_manga_ocr_model')
-    @patch('japanese_agent.tools.screenshot_analyzer.preprocess_image_for_ocr')
-    def test_model_initialization_failure(self, mock_preprocess, mock_get_model, sample_image_path):
+    def test_model_initialization_failure(self, mock_get_model, sample_image_path):
         """Test handling of model initialization failure."""
-        from PIL import Image
-
-        mock_preprocess.return_value = Image.new('L', (100, 100))
         mock_get_model.side_effect = Exception("Model loading failed")
 
         result = analyze_screenshot_manga_ocr.func(sample_image_path)
@@ -536,13 +530,8 @@ class TestAnalyzeScreenshotMangaOcr:
         assert result["ocr_method"] == "manga-ocr"
 
     @patch('japanese_agent.tools.screenshot_analyzer.get_manga_ocr_model')
-    @patch('japanese_agent.tools.screenshot_analyzer.preprocess_image_for_ocr')
-    def test_ocr_extraction_failure(self, mock_preprocess, mock_get_model, sample_image_path):
+    def test_ocr_extraction_failure(self, mock_get_model, sample_image_path):
         """Test handling of OCR extraction failure."""
-        from PIL import Image
-
-        mock_preprocess.return_value = Image.new('L', (100, 100))
-
         mock_model = MagicMock()
         mock_model.side_effect = Exception("OCR failed")
         mock_get_model.return_value = mock_model
@@ -554,13 +543,8 @@ class TestAnalyzeScreenshotMangaOcr:
         assert result["ocr_method"] == "manga-ocr"
 
     @patch('japanese_agent.tools.screenshot_analyzer.get_manga_ocr_model')
-    @patch('japanese_agent.tools.screenshot_analyzer.preprocess_image_for_ocr')
-    def test_empty_text_extraction(self, mock_preprocess, mock_get_model, sample_image_path):
+    def test_empty_text_extraction(self, mock_get_model, sample_image_path):
         """Test handling of image with no text."""
-        from PIL import Image
-
-        mock_preprocess.return_value = Image.new('L', (100, 100))
-
         mock_model = MagicMock()
         mock_model.return_value = ""  # No text found
         mock_get_model.return_value = mock_model
@@ -572,13 +556,8 @@ class TestAnalyzeScreenshotMangaOcr:
         assert result["extracted_text"] == []  # Empty list for no text
 
     @patch('japanese_agent.tools.screenshot_analyzer.get_manga_ocr_model')
-    @patch('japanese_agent.tools.screenshot_analyzer.preprocess_image_for_ocr')
-    def test_whitespace_only_text(self, mock_preprocess, mock_get_model, sample_image_path):
+    def test_whitespace_only_text(self, mock_get_model, sample_image_path):
         """Test handling of whitespace-only extraction."""
-        from PIL import Image
-
-        mock_preprocess.return_value = Image.new('L', (100, 100))
-
         mock_model = MagicMock()
         mock_model.return_value = "   \n\t  "  # Only whitespace
         mock_get_model.return_value = mock_model
@@ -721,3 +700,87 @@ class TestHybridScreenshotAnalysis:
         assert "error" in result
         assert "not found" in result["error"].lower()
         assert result["ocr_method"] == "hybrid"
+
+
+class TestConcurrentHybridAnalysis:
+    """Tests for running manga-ocr and Claude Vision side by side."""
+
+    @staticmethod
+    def _steps(seen):
+        """Fake analysis steps that only succeed if they run at the same time."""
+        import threading
+        import time
+
+        both_running = threading.Barrier(2, timeout=2)
+
+        def manga(image_path):
+            both_running.wait()
+            seen["ocr_input_size"] = preprocess_image_for_ocr(image_path).size
+            time.sleep(0.2)
+            return {"extracted_text": [{"text": "こんにちは", "confidence": 0.95}], "ocr_method": "manga-ocr"}
+
+        def claude(image_path):
+            both_running.wait()
+            seen["base64"] = encode_image_to_base64(image_path)[0]
+            time.sleep(0.3)
+            return {"extracted_text": [], "translation": "Hello", "context": "", "vocabulary": [],
+                    "ocr_method": "claude"}
+
+        return manga, claude
+
+    def _check(self, result, seen, sample_image_path, elapsed):
+        import base64
+
+        assert "error" not in result and "partial_errors" not in result
+        assert result["extracted_text"][0]["text"] == "こんにちは"
+        assert result["translation"] == "Hello"
+
+        # Took max(0.2, 0.3), not the sum
+        assert elapsed < 0.45
+        timing = result["timing"]
+        assert timing["manga_ocr_ms"] >= 200 and timing["claude_vision_ms"] >= 300
+        assert timing["total_ms"] < timing["manga_ocr_ms"] + timing["claude_vision_ms"]
+
+        # Both steps used the screenshot loaded once by the hybrid analysis
+        assert seen["base64"] == base64.b64encode(Path(sample_image_path).read_bytes()).decode()
+        assert seen["ocr_input_size"] == (200, 200)
+
+    @patch('japanese_agent.tools.screenshot_analyzer.analyze_screenshot_claude')
+    @patch('japanese_agent.tools.screenshot_analyzer.analyze_screenshot_manga_ocr')
+    def test_sync_runs_steps_concurrently(self, mock_manga_tool, mock_claude_tool, sample_image_path):
+        """Test the sync tool overlaps both steps on a shared image buffer."""
+        import time
+
+        seen = {}
+        mock_manga_tool.func, mock_claude_tool.func = self._steps(seen)
+
+        started = time.perf_counter()
+        result = hybrid_screenshot_analysis.func(sample_image_path)
+
+        self._check(result, seen, sample_image_path, time.perf_counter() - started)
+
+    @patch('japanese_agent.tools.screenshot_analyzer.analyze_screenshot_claude')
+    @patch('japanese_agent.tools.screenshot_analyzer.analyze_screenshot_manga_ocr')
+    async def test_async_runs_steps_concurrently(self, mock_manga_tool, mock_claude_tool, sample_image_path):
+        """Test ainvoke uses the async version without blocking the event loop."""
+        import asyncio
+        import time
+
+        seen = {}
+        mock_manga_tool.func, mock_claude_tool.func = self._steps(seen)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        result = await hybrid_screenshot_analysis.ainvoke({"image_path": sample_image_path})
+        elapsed = time.perf_counter() - started
+        ticking.cancel()
+
+        self._check(result, seen, sample_image_path, elapsed)
+        assert ticks >= 10
@@ -0,0 +1,188 @@
+"""
+Unit tests for the perceptual-hash screenshot analysis cache.
+
+Screenshots are synthetic game frames: a background with shapes and a
+dialogue box with two lines of text.
+"""
+
+import time
+
+import cv2
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+from japanese_agent.tools.screenshot_cache import (
+    compute_fingerprint,
+    find_cached_analysis,
+    get_cache_statistics,
+    hamming_distances,
+    max_tile_differences,
+    save_cached_analysis,
+)
+from japanese_agent.tools.screenshot_analyzer import hybrid_screenshot_analysis
+
+
+# ==============================================================================
+# Fixtures
+# ==============================================================================
+
+def render_screenshot(text: str, scene: int = 0, noise: float = 0.0) -> np.ndarray:
+    """Render a 640x480 BGR game frame with `text` in its dialogue box."""
+    rng = np.random.default_rng(scene)
+    img = np.zeros((480, 640, 3), np.uint8)
+    img[:] = np.linspace(40, 200, 640, dtype=np.uint8)[None, :, None]
+    for _ in range(8):
+        x, y = (int(v) for v in rng.integers(0, 300, 2))
+        color = tuple(int(c) for c in rng.integers(0, 255, 3))
+        cv2.rectangle(img, (x, y), (x + 60, y + 40), color, -1)
+    cv2.rectangle(img, (20, 340), (620, 460), (20, 20, 20), -1)
+    cv2.putText(img, text, (40, 390), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+    cv2.putText(img, "Press A to continue", (40, 430), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+    if noise:
+        jitter = np.random.default_rng(1).normal(0, noise, img.shape)
+        img = np.clip(img + jitter, 0, 255).astype(np.uint8)
+    return img
+
+
+@pytest.fixture
+def screenshot(tmp_path):
+    """Write a rendered screenshot to a PNG file and return its path."""
+    def write(name: str, text: str, **kwargs) -> str:
+        path = tmp_path / name
+        cv2.imwrite(str(path), render_screenshot(text, **kwargs))
+        return str(path)
+    return write
+
+
+@pytest.fixture
+def cache_db(tmp_path, monkeypatch):
+    """Enable the cache on a temporary database."""
+    monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "cache.db"))
+    monkeypatch.setenv("SCREENSHOT_CACHE_ENABLED", "true")
+    monkeypatch.setenv("VISION_ANALYSIS_COST_USD", "0.02")
+
+
+HYBRID_PARTS = {
+    "manga": {"extracted_text": [{"text": "こんにちは", "confidence": 0.95}], "ocr_method": "manga-ocr"},
+    "claude": {"extracted_text": [], "translation": "Hello", "context": "Inn", "vocabulary": [], "ocr_method": "claude"},
+}
+
+
+# ==============================================================================
+# Fingerprint Tests
+# ==============================================================================
+
+class TestFingerprint:
+    """Tests for perceptual hashes and thumbnail comparison."""
+
+    def test_noise_keeps_fingerprint_close(self, screenshot):
+        original = compute_fingerprint(screenshot("a.png", "Hello there traveler"))
+        noisy = compute_fingerprint(screenshot("b.png", "Hello there traveler", noise=8))
+
+        assert hamming_distances(original.dhash, [noisy.dhash])[0] <= 15
+        assert hamming_distances(original.phash, [noisy.phash])[0] <= 10
+        assert max_tile_differences(original.thumbnail, [noisy.thumbnail])[0] <= 10
+
+    def test_one_changed_character_is_caught_by_thumbnail(self, screenshot):
+        original = compute_fingerprint(screenshot("a.png", "Hello there traveler"))
+        changed = compute_fingerprint(screenshot("b.png", "Hello there travelers"))
+
+        # Whole-frame hashes cannot tell the lines apart; the tiles can
+        assert hamming_distances(original.dhash, [changed.dhash])[0] <= 15
+        assert max_tile_differences(original.thumbnail, [changed.thumbnail])[0] > 10
+
+    def test_hamming_distances_are_vectorized(self):
+        query = bytes([0b11110000, 0])
+        candidates = [bytes([0b11110000, 0]), bytes([0b11110001, 0]), bytes([0b00001111, 255])]
+
+        assert hamming_distances(query, candidates).tolist() == [0, 1, 16]
+
+
+# ==============================================================================
+# Cache Lookup Tests
+# ==============================================================================
+
+class TestCacheLookup:
+    """Tests for storing and finding near-duplicate analyses."""
+
+    def test_near_duplicate_hits(self, cache_db, screenshot):
+        stored = compute_fingerprint(screenshot("a.png", "Hello there traveler"))
+        cache_id = save_cached_analysis(stored, "hybrid", {"translation": "Hello"}, 12.5)
+
+        hit = find_cached_analysis(compute_fingerprint(screenshot("b.png", "Hello there traveler", noise=8)), "hybrid")
+
+        assert hit["cache_id"] == cache_id
+        assert hit["result"] == {"translation": "Hello"}
+        assert hit["saved_seconds"] == 12.5
+
+    def test_different_dialogue_scene_or_method_misses(self, cache_db, screenshot):
+        stored = compute_fingerprint(screenshot("a.png", "Hello there traveler"))
+        save_cached_analysis(stored, "hybrid", {"translation": "Hello"}, 1.0)
+
+        assert find_cached_analysis(compute_fingerprint(screenshot("b.png", "Welcome to the inn")), "hybrid") is None
+        assert find_cached_analysis(compute_fingerprint(screenshot("c.png", "Hello there traveler.")), "hybrid") is None
+        assert find_cached_analysis(compute_fingerprint(screenshot("d.png", "Hello there traveler", scene=5)), "hybrid") is None
+        assert find_cached_analysis(stored, "claude") is None
+
+    def test_lookup_among_many_entries_is_fast(self, cache_db, screenshot):
+        rng = np.random.default_rng(0)
+        for i in range(2000):
+            gray = rng.integers(0, 255, (120, 160), dtype=np.uint8)
+            save_cached_analysis(compute_fingerprint(gray), "hybrid", {"n": i}, 1.0)
+        target = compute_fingerprint(screenshot("a.png", "Hello there traveler"))
+        save_cached_analysis(target, "hybrid", {"n": "target"}, 1.0)
+
+        start = time.perf_counter()
+        hit = find_cached_analysis(target, "hybrid")
+        elapsed = time.perf_counter() - start
+
+        assert hit["result"] == {"n": "target"}
+        assert elapsed < 0.05
+
+
+# ==============================================================================
+# Hybrid Analysis Integration Tests
+# ==============================================================================
+
+class TestHybridAnalysisCache:
+    """Tests for the cache in hybrid_screenshot_analysis."""
+
+    @patch('japanese_agent.tools.screenshot_analyzer.analyze_screenshot_claude')
+    @patch('japanese_agent.tools.screenshot_analyzer.analyze_screenshot_manga_ocr')
+    def test_repeat_screenshot_skips_analysis(self, mock_manga_tool, mock_claude_tool, cache_db, screenshot):
+        mock_manga_tool.func.return_value = HYBRID_PARTS["manga"]
+        mock_claude_tool.func.return_value = HYBRID_PARTS["claude"]
+
+        first = hybrid_screenshot_analysis.func(screenshot("a.png", "Hello there traveler"))
+        repeat_path = screenshot("b.png", "Hello there traveler", noise=5)
+        repeat = hybrid_screenshot_analysis.func(repeat_path)
+
+        assert "cache" not in first
+        assert repeat["cache"]["hit"] is True
+        assert repeat["file_path"] == repeat_path
+        assert repeat["translation"] == "Hello"
+        assert repeat["extracted_text"] == first["extracted_text"]
+        assert mock_claude_tool.func.call_count == 1
+        assert mock_manga_tool.func.call_count == 1
+
+        stats = get_cache_statistics()
+        assert stats["analyses"] == 1
+        assert stats["hits"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["cost_saved_usd"] == 0.02
+
+    @patch('japanese_agent.tools.screenshot_analyzer.analyze_screenshot_claude')
+    @patch('japanese_agent.tools.screenshot_analyzer.analyze_screenshot_manga_ocr')
+    def test_partial_failures_are_not_cached(self, mock_manga_tool, mock_claude_tool, cache_db, screenshot):
+        mock_manga_tool.func.return_value = HYBRID_PARTS["manga"]
+        mock_claude_tool.func.return_value = {"error": "rate limited"}
+        path = screenshot("a.png", "Hello there traveler")
+
+        hybrid_screenshot_analysis.func(path)
+        mock_claude_tool.func.return_value = HYBRID_PARTS["claude"]
+        result = hybrid_screenshot_analysis.func(path)
+
+        assert "cache" not in result
+        assert result["translation"] == "Hello"
+        assert mock_claude_tool.func.call_count == 2
@@ -0,0 +1,236 @@
+"""
+Unit tests for the screenshot watcher pipeline.
+
+Tests duplicate-event filtering, the file stability check, queue overflow
+handling and worker recovery after Claude Code SDK client failures. The SDK
+client is replaced by a fake; no Claude Code process is started.
+"""
+
+import asyncio
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+APP_DIR = Path(__file__).resolve().parents[2]
+
+
+class FakeClient:
+    """Stands in for ClaudeSDKClient; fails to connect or answer on demand."""
+
+    connect_failures = 0
+    query_failures = 0
+    connects = 0
+    prompts = []
+
+    def __init__(self, options=None):
+        self.options = options
+
+    async def __aenter__(self):
+        if FakeClient.connect_failures:
+            FakeClient.connect_failures -= 1
+            raise ConnectionError("CLI not reachable")
+        FakeClient.connects += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def query(self, prompt, session_id=None):
+        if FakeClient.query_failures:
+            FakeClient.query_failures -= 1
+            raise RuntimeError("client went away")
+        FakeClient.prompts.append(prompt)
+
+    async def receive_response(self):
+        yield types.SimpleNamespace(content=[types.SimpleNamespace(text="翻訳")])
+
+
+@pytest.fixture
+def watcher(monkeypatch):
+    """screenshot_watcher imported against a fake claude_code_sdk."""
+    sdk = types.ModuleType("claude_code_sdk")
+    sdk.ClaudeSDKClient = FakeClient
+    sdk.ClaudeCodeOptions = lambda **options: options
+    monkeypatch.setitem(sys.modules, "claude_code_sdk", sdk)
+    monkeypatch.syspath_prepend(str(APP_DIR))
+    monkeypatch.delitem(sys.modules, "screenshot_watcher", raising=False)
+    module = importlib.import_module("screenshot_watcher")
+
+    monkeypatch.setattr(FakeClient, "connect_failures", 0)
+    monkeypatch.setattr(FakeClient, "query_failures", 0)
+    monkeypatch.setattr(FakeClient, "connects", 0)
+    monkeypatch.setattr(FakeClient, "prompts", [])
+    yield module
+    sys.modules.pop("screenshot_watcher", None)
+
+
+def make_pipeline(watcher, tmp_path, **settings):
+    command = tmp_path / "analyze.md"
+    command.write_text("Analyze $ARGUMENTS", encoding="utf-8")
+    pipeline = watcher.ScreenshotPipeline({"watcher": {
+        "stable_checks": 1, "stable_interval": 0.01, "stable_timeout": 1.0,
+        "reconnect_delay": 0.01, **settings,
+    }})
+    pipeline.slash_command_path = command
+    return pipeline
+
+
+def screenshot(tmp_path, name: str) -> str:
+    path = tmp_path / name
+    path.write_bytes(b"\x89PNG fake image")
+    return str(path)
+
+
+# ==============================================================================
+# Intake Tests
+# ==============================================================================
+
+class TestSeenPaths:
+    """Tests for the bounded set of recently seen paths."""
+
+    def test_duplicates_are_rejected(self, watcher):
+        """Test a path is only admitted once."""
+        seen = watcher.SeenPaths(8)
+
+        assert seen.add("a.png") is True
+        assert seen.add("a.png") is False
+        assert len(seen) == 1
+
+    def test_least_recently_seen_path_is_forgotten(self, watcher):
+        """Test the oldest path is evicted and a repeat refreshes its position."""
+        seen = watcher.SeenPaths(2)
+        seen.add("a.png")
+        seen.add("b.png")
+        seen.add("a.png")   # a is now the most recent
+        seen.add("c.png")   # evicts b
+
+        assert len(seen) == 2
+        assert seen.add("a.png") is False
+        assert seen.add("b.png") is True
+
+
+class TestWaitUntilStable:
+    """Tests for the file stability check."""
+
+    @pytest.mark.asyncio
+    async def test_written_file_is_stable(self, watcher, tmp_path):
+        """Test an unchanged, non-empty file is stable."""
+        path = screenshot(tmp_path, "shot.png")
+
+        assert await watcher.wait_until_stable(path, checks=2, interval=0.01, timeout=1.0) is True
+
+    @pytest.mark.asyncio
+    async def test_missing_and_empty_files_are_not_stable(self, watcher, tmp_path):
+        """Test a missing file fails at once and an empty one times out."""
+        empty = tmp_path / "empty.png"
+        empty.write_bytes(b"")
+
+        assert await watcher.wait_until_stable(str(tmp_path / "gone.png"), 2, 0.01, 1.0) is False
+        assert await watcher.wait_until_stable(str(empty), 2, 0.01, 0.1) is False
+
+    @pytest.mark.asyncio
+    async def test_growing_file_waits_until_written(self, watcher, tmp_path):
+        """Test a file still being written is only stable once writes stop."""
+        path = tmp_path / "shot.png"
+        path.write_bytes(b"x")
+
+        async def keep_writing():
+            for _ in range(5):
+                await asyncio.sleep(0.02)
+                with open(path, "ab") as f:
+                    f.write(b"x")
+
+        writer = asyncio.create_task(keep_writing())
+        assert await watcher.wait_until_stable(str(path), 3, 0.02, 0.05) is False
+        assert await watcher.wait_until_stable(str(path), 3, 0.02, 2.0) is True
+        await writer
+        assert path.stat().st_size == 6
+
+
+class TestQueueOverflow:
+    """Tests for a full queue with "coalesce" and "block" overflow."""
+
+    @pytest.mark.asyncio
+    async def test_coalesce_keeps_latest_screenshot(self, watcher, tmp_path):
+        """Test the oldest waiting screenshot is dropped for the newest."""
+        pipeline = make_pipeline(watcher, tmp_path, queue_size=1, overflow="coalesce")
+        first, second = screenshot(tmp_path, "1.png"), screenshot(tmp_path, "2.png")
+
+        await pipeline._admit(first)
+        await pipeline._admit(second)
+
+        assert pipeline.coalesced == 1
+        assert pipeline.queue.qsize() == 1
+        assert pipeline.queue.get_nowait() == second
+
+    @pytest.mark.asyncio
+    async def test_block_waits_for_a_free_slot(self, watcher, tmp_path):
+        """Test admission waits instead of dropping screenshots."""
+        pipeline = make_pipeline(watcher, tmp_path, queue_size=1, overflow="block")
+        first, second = screenshot(tmp_path, "1.png"), screenshot(tmp_path, "2.png")
+
+        await pipeline._admit(first)
+        waiting = asyncio.create_task(pipeline._admit(second))
+        await asyncio.sleep(0.1)
+        assert not waiting.done()
+
+        assert pipeline.queue.get_nowait() == first
+        await asyncio.wait_for(waiting, timeout=1.0)
+        assert pipeline.queue.get_nowait() == second
+        assert pipeline.coalesced == 0
+
+
+# ==============================================================================
+# Worker Tests
+# ==============================================================================
+
+class TestWorkerRecovery:
+    """Tests for workers surviving Claude Code SDK client failures."""
+
+    @pytest.mark.asyncio
+    async def test_worker_reconnects_after_connect_failure(self, watcher, tmp_path):
+        """Test failed connects are retried and queued screenshots still processed."""
+        FakeClient.connect_failures = 2
+        pipeline = make_pipeline(watcher, tmp_path, workers=1)
+        path = screenshot(tmp_path, "shot.png")
+
+        pipeline.start()
+        try:
+            pipeline.submit(path)
+            await asyncio.wait_for(asyncio.gather(*pipeline._pending), timeout=2.0)
+            await asyncio.wait_for(pipeline.queue.join(), timeout=2.0)
+            assert not pipeline._workers[0].done()
+        finally:
+            await pipeline.stop()
+
+        assert pipeline.processed == 1
+        assert FakeClient.connects == 1
+        assert FakeClient.prompts == [f"Analyze {path}"]
+
+    @pytest.mark.asyncio
+    async def test_failed_screenshot_gets_a_fresh_client(self, watcher, tmp_path):
+        """Test the next screenshot after a client error runs on a new client."""
+        FakeClient.query_failures = 1
+        pipeline = make_pipeline(watcher, tmp_path, workers=1)
+        paths = [screenshot(tmp_path, f"{i}.png") for i in range(2)]
+
+        pipeline.start()
+        try:
+            for path in paths:
+                await pipeline.queue.put(path)
+            await asyncio.wait_for(pipeline.queue.join(), timeout=2.0)
+        finally:
+            await pipeline.stop()
+
+        assert (pipeline.failed, pipeline.processed) == (1, 1)
+        assert FakeClient.connects == 2
+        assert FakeClient.prompts == [f"Analyze {paths[1]}"]
+
+    def test_reconnect_delay_backs_off(self, watcher, tmp_path):
+        """Test the delay doubles per failure up to the maximum."""
+        pipeline = make_pipeline(watcher, tmp_path, reconnect_delay=1.0, reconnect_max_delay=5.0)
+
+        assert [pipeline._reconnect_delay(n) for n in range(1, 5)] == [1.0, 2.0, 4.0, 5.0]
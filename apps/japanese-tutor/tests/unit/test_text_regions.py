@@ -0,0 +1,194 @@
+"""
+Unit tests for text-region detection and region-only manga-ocr.
+
+Screenshots are synthetic game frames: a background with shapes and a
+dialogue box with two lines of text.
+"""
+
+import cv2
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+import japanese_agent.tools.screenshot_analyzer as sa
+from japanese_agent.tools.ocr_service import OcrService
+from japanese_agent.tools.text_regions import (
+    TextRegion,
+    detect_text_regions,
+    find_text_regions,
+    game_key,
+    region_cache,
+)
+
+
+# ==============================================================================
+# Fixtures
+# ==============================================================================
+
+def render_frame(box_top: int = 340, scene: int = 0) -> np.ndarray:
+    """Render a 640x480 RGB game frame with a two-line dialogue box."""
+    rng = np.random.default_rng(scene)
+    img = np.zeros((480, 640, 3), np.uint8)
+    img[:] = np.linspace(40, 200, 640, dtype=np.uint8)[None, :, None]
+    for _ in range(8):
+        x, y = (int(v) for v in rng.integers(0, 250, 2))
+        color = tuple(int(c) for c in rng.integers(0, 255, 3))
+        cv2.rectangle(img, (x, y), (x + 60, y + 40), color, -1)
+    cv2.rectangle(img, (20, box_top), (620, box_top + 120), (20, 20, 20), -1)
+    cv2.putText(img, "Hello there traveler", (40, box_top + 50), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+    cv2.putText(img, "Press A to continue", (40, box_top + 90), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+    return img
+
+
+class CropModel:
+    """Fake manga-ocr model: "text" for crops with bright glyphs, records crop sizes."""
+
+    def __init__(self):
+        self.sizes = []
+
+    def __call__(self, image):
+        self.sizes.append(image.size)
+        return "こんにちは" if np.asarray(image).max() > 200 else ""
+
+
+@pytest.fixture(autouse=True)
+def isolated_regions(tmp_path, monkeypatch):
+    """Empty region cache and a config with one game template."""
+    config = tmp_path / "config.yaml"
+    config.write_text(
+        "text_regions:\n"
+        "  games:\n"
+        "    crystal:\n"
+        "      match: \"Pokemon - Crystal\"\n"
+        "      regions:\n"
+        "        - [0.0, 0.5, 1.0, 0.5]\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("JAPANESE_TUTOR_CONFIG", str(config))
+    region_cache.clear()
+    yield
+    region_cache.clear()
+
+
+@pytest.fixture
+def model(monkeypatch):
+    crop_model = CropModel()
+    monkeypatch.setattr(sa, "ocr_service", OcrService(lambda: crop_model))
+    return crop_model
+
+
+def write_frame(tmp_path, name: str, frame: np.ndarray) -> str:
+    path = tmp_path / name
+    cv2.imwrite(str(path), cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+    return str(path)
+
+
+# ==============================================================================
+# Detection Tests
+# ==============================================================================
+
+class TestDetectTextRegions:
+    """Tests for OpenCV text-block detection."""
+
+    def test_finds_dialogue_text_only(self):
+        """Test both dialogue lines form one block and scenery is ignored."""
+        gray = cv2.cvtColor(render_frame(), cv2.COLOR_RGB2GRAY)
+
+        regions = detect_text_regions(gray)
+
+        assert len(regions) == 1
+        x, y, width, height = regions[0]
+        assert 340 <= y <= 370 and 420 <= y + height <= 460
+        assert 20 <= x <= 45 and width < 320
+        # A fraction of the frame is OCR'd
+        assert width * height < 0.15 * 640 * 480
+
+    def test_blank_frame_has_no_regions(self):
+        """Test frames without text return no regions."""
+        assert detect_text_regions(np.full((240, 320), 255, np.uint8)) == []
+
+
+class TestFindTextRegions:
+    """Tests for templates and the per-game region cache."""
+
+    def test_game_key_ignores_capture_timestamp(self):
+        """Test screenshots of one game share a key."""
+        first = game_key("/shots/Dragon Quest (Japan)-241018-101112.png", (480, 640, 3))
+        second = game_key("/shots/Dragon Quest (Japan)-241018-101530.png", (480, 640, 3))
+
+        assert first == second == "Dragon Quest (Japan)@640x480"
+        assert game_key("/shots/Dragon Quest (Japan)-241018-101530.png", (240, 320)) != first
+
+    def test_config_template_skips_detection(self):
+        """Test a matching game template is used without detection."""
+        with patch("japanese_agent.tools.text_regions.detect_text_regions") as detect:
+            regions, source = find_text_regions("/shots/Pokemon - Crystal (Japan)-1.png", render_frame())
+
+        detect.assert_not_called()
+        assert source == "template"
+        assert regions == [TextRegion(0, 240, 640, 240)]
+
+    def test_regions_are_cached_per_game(self):
+        """Test later screenshots of a game reuse the detected regions."""
+        frame = render_frame()
+        with patch("japanese_agent.tools.text_regions.detect_text_regions",
+                   wraps=detect_text_regions) as detect:
+            first, first_source = find_text_regions("/shots/Mother (Japan)-241018-101112.png", frame)
+            second, second_source = find_text_regions("/shots/Mother (Japan)-241018-101530.png", frame)
+            _, other_source = find_text_regions("/shots/Zelda (Japan)-241018-101112.png", frame)
+
+        assert (first_source, second_source, other_source) == ("detected", "cached", "detected")
+        assert first == second
+        assert detect.call_count == 2
+
+    def test_generic_screenshot_names_are_not_cached(self):
+        """Test default capture names don't share regions across games."""
+        names = ["/shots/Screenshot 2025-10-18 101112.png", "/shots/Screenshot 2025-10-18 101530.png",
+                 "/shots/IMG_0042.png", "/shots/IMG_0043.png"]
+        assert {game_key(name, (480, 640, 3)) for name in names} == {None}
+
+        first, first_source = find_text_regions(names[0], render_frame(box_top=340))
+        second, second_source = find_text_regions(names[1], render_frame(box_top=20, scene=99))
+
+        assert (first_source, second_source) == ("detected", "detected")
+        assert first[0].y > 300 and second[0].y < 100
+        assert region_cache.detections == 0
+
+    def test_disabled_by_environment(self, monkeypatch):
+        """Test OCR_TEXT_REGIONS=false turns detection off."""
+        monkeypatch.setenv("OCR_TEXT_REGIONS", "false")
+
+        assert find_text_regions("/shots/a.png", render_frame()) == ([], "disabled")
+
+
+# ==============================================================================
+# Region OCR Tests
+# ==============================================================================
+
+class TestRegionOcr:
+    """Tests for manga-ocr on text regions only."""
+
+    def test_only_regions_are_upscaled_and_recognized(self, tmp_path, model):
+        """Test the dialogue crop, not the frame, goes through manga-ocr."""
+        path = write_frame(tmp_path, "Mother (Japan)-241018-101112.png", render_frame())
+
+        result = sa.analyze_screenshot_manga_ocr.func(path)
+
+        assert "error" not in result
+        assert result["text_regions"]["source"] == "detected"
+        assert [segment["text"] for segment in result["extracted_text"]] == ["こんにちは"]
+        position = result["extracted_text"][0]["position"]
+        # The crop was upscaled 2x, the 1280x960 full frame never was
+        assert model.sizes == [(position["width"] * 2, position["height"] * 2)]
+
+    def test_moved_dialogue_box_is_detected_again(self, tmp_path, model):
+        """Test cached regions that read no text are refreshed."""
+        sa.analyze_screenshot_manga_ocr.func(
+            write_frame(tmp_path, "Mother (Japan)-241018-101112.png", render_frame(box_top=340))
+        )
+        result = sa.analyze_screenshot_manga_ocr.func(
+            write_frame(tmp_path, "Mother (Japan)-241018-101530.png", render_frame(box_top=20, scene=99))
+        )
+
+        assert result["text_regions"]["source"] == "detected"
+        assert result["extracted_text"][0]["position"]["y"] < 100
@@ -8,6 +8,8 @@ This example demonstrates how to:
 4. Process the conversation
 """
 
+import asyncio
+
 from src.resume_agent.graphs.conversation import build_conversation_graph
 
 
@@ -57,7 +59,8 @@ def main():
 
     # Invoke the graph with initial state and config
     # The graph will handle the conversation loop internally
-    final_state = app.invoke(initial_state, config=config)
+    # chat_node is async, so the graph must be run with ainvoke
+    final_state = asyncio.run(app.ainvoke(initial_state, config=config))
 
     # Step 5: View final state (optional)
     print("\n" + "=" * 60)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Load test: concurrent graph runs per worker, sync nodes vs async nodes.
+
+Runs N concurrent single-node job analysis graphs on one event loop (one
+LangGraph worker) with a simulated LLM latency:
+
+- before: the node is the blocking ``analyze_job_node_sync`` shim, which
+  LangGraph executes on the worker's thread pool, so concurrency is capped
+  by the number of threads.
+- after: the node is the async ``analyze_job_node``, which awaits the LLM on
+  the event loop, so concurrency is capped only by the LLM.
+
+Usage:
+    python scripts/load_test_async_nodes.py [--runs 100] [--threads 8] [--latency 0.2]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from langgraph.graph import StateGraph, START, END  # noqa: E402
+
+from resume_agent.nodes import job_analysis  # noqa: E402
+from resume_agent.state import JobAnalysisState  # noqa: E402
+
+
+def build_graph(node):
+    graph = StateGraph(JobAnalysisState)
+    graph.add_node("analyze_job", node)
+    graph.add_edge(START, "analyze_job")
+    graph.add_edge("analyze_job", END)
+    return graph.compile()
+
+
+async def run_load(node, runs: int, threads: int, latency: float) -> float:
+    """Run `runs` concurrent graph invocations and return runs/second."""
+    async def fake_llm(messages, system_prompt):
+        await asyncio.sleep(latency)
+        return json.dumps({"company": "Acme", "job_title": "Engineer"})
+
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=threads))
+    graph = build_graph(node)
+
+    with patch.object(job_analysis, "acall_llm", fake_llm):
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            graph.ainvoke({"job_url": f"https://example.com/jobs/{i}", "job_content": "posting", "errors": []})
+            for i in range(runs)
+        ))
+        elapsed = time.perf_counter() - start
+
+    return runs / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=100, help="Concurrent graph runs")
+    parser.add_argument("--threads", type=int, default=8, help="Worker thread pool size")
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated LLM latency (s)")
+    args = parser.parse_args()
+
+    before = asyncio.run(run_load(job_analysis.analyze_job_node_sync, args.runs, args.threads, args.latency))
+    after = asyncio.run(run_load(job_analysis.analyze_job_node, args.runs, args.threads, args.latency))
+
+    print(f"{args.runs} concurrent runs, {args.threads} worker threads, {args.latency * 1000:.0f}ms LLM latency")
+    print(f"  before (sync nodes on thread pool): {before:8.1f} runs/s")
+    print(f"  after  (async nodes on event loop): {after:8.1f} runs/s")
+    print(f"  improvement                       : {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
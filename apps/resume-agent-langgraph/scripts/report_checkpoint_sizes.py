@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Report: checkpoint bytes per step for an analyze -> tailor -> cover letter run.
+
+Runs one ``ResumeAgentState`` thread through the full application workflow
+(load master resume, fetch and analyze the job posting, find portfolio
+examples, tailor the resume, write the cover letter) with canned node outputs
+of realistic size, and reports the bytes each super-step writes to the
+checkpoint database:
+
+- before: every checkpoint is stored whole (``blob_threshold=None``)
+- after: large channels are stored once by content hash and referenced
+  (``SqliteCheckpointer`` default)
+
+Usage:
+    python scripts/report_checkpoint_sizes.py [--posting-kb 16] [--resume-kb 8]
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from cernji_checkpoint import SqliteCheckpointer  # noqa: E402
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+from langgraph.graph import END, START, StateGraph  # noqa: E402
+
+from resume_agent.state import ResumeAgentState, create_initial_state  # noqa: E402
+
+
+def _text(label: str, kb: int) -> str:
+    """Deterministic filler text of roughly kb kilobytes."""
+    sentence = f"{label}: designed, built and operated production services in Python and TypeScript. "
+    return sentence * max(1, kb * 1024 // len(sentence))
+
+
+def build_graph(posting_kb: int, resume_kb: int) -> StateGraph:
+    """Application workflow with canned node outputs."""
+
+    def load_resume(state: ResumeAgentState) -> dict:
+        employment = [
+            {
+                "company": f"Company {i}",
+                "position": "Senior Engineer",
+                "description": _text(f"role {i}", resume_kb // 4),
+                "technologies": ["Python", "TypeScript", "PostgreSQL", "AWS"],
+            }
+            for i in range(4)
+        ]
+        return {
+            "master_resume": {
+                "personal_info": {"name": "Alex Example", "title": "Software Engineer"},
+                "about_me": _text("about", 1),
+                "employment_history": employment,
+            },
+            "messages": [AIMessage(content="Loaded your master resume.")],
+        }
+
+    def fetch_job(state: ResumeAgentState) -> dict:
+        return {
+            "job_content": _text("posting", posting_kb),
+            "messages": [AIMessage(content="Fetched the job posting.")],
+        }
+
+    def analyze_job(state: ResumeAgentState) -> dict:
+        return {
+            "job_analysis": {
+                "company": "Acme",
+                "job_title": "Staff Engineer",
+                "required_qualifications": [_text(f"requirement {i}", 0) for i in range(12)],
+                "keywords": [f"keyword-{i}" for i in range(40)],
+                "candidate_profile": _text("profile", 2),
+            },
+            "messages": [AIMessage(content="Analyzed the job: Staff Engineer at Acme.")],
+        }
+
+    def find_portfolio(state: ResumeAgentState) -> dict:
+        return {
+            "portfolio_examples": [
+                {"id": i, "title": f"Example {i}", "content": _text(f"example {i}", 1)}
+                for i in range(3)
+            ],
+            "messages": [AIMessage(content="Found 3 relevant portfolio examples.")],
+        }
+
+    def tailor_resume(state: ResumeAgentState) -> dict:
+        return {
+            "tailored_resume": {"content": _text("tailored", resume_kb), "keywords_used": ["Python"]},
+            "messages": [AIMessage(content="Tailored your resume for Acme.")],
+        }
+
+    def write_cover_letter(state: ResumeAgentState) -> dict:
+        return {
+            "cover_letter": {"content": _text("cover letter", 3), "talking_points": ["impact"]},
+            "messages": [AIMessage(content="Wrote your cover letter.")],
+        }
+
+    steps = [load_resume, fetch_job, analyze_job, find_portfolio, tailor_resume, write_cover_letter]
+    graph = StateGraph(ResumeAgentState)
+    for step in steps:
+        graph.add_node(step.__name__, step)
+    graph.add_edge(START, steps[0].__name__)
+    for current, following in zip(steps, steps[1:]):
+        graph.add_edge(current.__name__, following.__name__)
+    graph.add_edge(steps[-1].__name__, END)
+    return graph
+
+
+def bytes_per_step(db_path: Path) -> list[tuple[str, int]]:
+    """Bytes written by each checkpoint: its row plus blobs it stored first."""
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT checkpoint_id, LENGTH(checkpoint), LENGTH(metadata) FROM checkpoints ORDER BY checkpoint_id"
+    ).fetchall()
+    refs: dict[str, list[str]] = {}
+    for checkpoint_id, hash_ in conn.execute("SELECT checkpoint_id, blob_hash FROM checkpoint_blobs"):
+        refs.setdefault(checkpoint_id, []).append(hash_)
+    blob_sizes = dict(conn.execute("SELECT hash, LENGTH(value) FROM blobs"))
+    conn.close()
+
+    stored: set[str] = set()
+    result = []
+    for checkpoint_id, checkpoint_bytes, metadata_bytes in rows:
+        new_blobs = [h for h in refs.get(checkpoint_id, []) if h not in stored]
+        stored.update(new_blobs)
+        size = checkpoint_bytes + metadata_bytes + sum(blob_sizes[h] for h in new_blobs)
+        result.append((checkpoint_id, size))
+    return result
+
+
+def run(db_path: Path, builder: StateGraph, blob_threshold) -> list[tuple[str, int]]:
+    with SqliteCheckpointer(db_path, blob_threshold=blob_threshold) as saver:
+        graph = builder.compile(checkpointer=saver)
+        config = {"configurable": {"thread_id": "application-1"}}
+        state = create_initial_state()
+        state["messages"] = [HumanMessage(content="Apply to the Acme staff engineer role")]
+        graph.invoke(state, config)
+        # Label each checkpoint with the node whose output it holds, oldest first
+        nodes = list(builder.nodes)
+        labels = []
+        for checkpoint in reversed(list(saver.list(config))):
+            step = checkpoint.metadata["step"]
+            labels.append("input" if step < 0 else "start" if step == 0 else nodes[step - 1])
+    sizes = bytes_per_step(db_path)
+    return [(label, size) for label, (_, size) in zip(labels, sizes)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posting-kb", type=int, default=16, help="Scraped job posting size (KB)")
+    parser.add_argument("--resume-kb", type=int, default=8, help="Master/tailored resume size (KB)")
+    args = parser.parse_args()
+
+    builder = build_graph(args.posting_kb, args.resume_kb)
+    workdir = Path(tempfile.mkdtemp(prefix="checkpoint-sizes-"))
+    before = run(workdir / "whole.db", builder, blob_threshold=None)
+    after = run(workdir / "delta.db", builder, blob_threshold=1024)
+
+    print(f"Checkpoint bytes per step ({args.posting_kb}KB posting, {args.resume_kb}KB resume)")
+    print(f"  {'step':22} {'before':>10} {'after':>10}")
+    for (label, whole), (_, delta) in zip(before, after):
+        print(f"  {label:22} {whole:10,} {delta:10,}")
+    total_before = sum(size for _, size in before)
+    total_after = sum(size for _, size in after)
+    print(f"  {'total':22} {total_before:10,} {total_after:10,}  ({total_before / total_after:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Resume Agent CLI.
 Command-line interface for the Resume Agent.
 """
 
+import asyncio
 import sys
 from datetime import datetime, timezone
 from resume_agent_langgraph import build_conversation_graph, get_settings, get_provider_info
@@ -63,8 +64,8 @@ def main():
         thread_id = f"conversation-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}"
         config = {"configurable": {"thread_id": thread_id}}
 
-        # Start the conversation
-        app.invoke(initial_state, config=config)
+        # Start the conversation (chat_node is async)
+        asyncio.run(app.ainvoke(initial_state, config=config))
 
     except KeyboardInterrupt:
         print("\n\n👋 Conversation interrupted. Goodbye!\n")
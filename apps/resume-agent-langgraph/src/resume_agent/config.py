@@ -1,6 +1,7 @@
 """Configuration management for Resume Agent."""
 
 import os
+from pathlib import Path
 from typing import Literal
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -53,6 +54,22 @@ class Settings(BaseSettings):
         description="Target ATS score"
     )
 
+    # Batch Job Analysis
+    batch_browser_concurrency: int = Field(
+        default=3,
+        description="Maximum concurrent browser sessions during batch job analysis"
+    )
+    batch_llm_concurrency: int = Field(
+        default=5,
+        description="Maximum concurrent LLM calls during batch job analysis"
+    )
+
+    # Checkpointing
+    checkpoint_db_path: str = Field(
+        default=str(Path(__file__).resolve().parents[2] / "data" / "checkpoints.db"),
+        description="SQLite database for durable graph checkpoints (shared cernji-checkpoint store)"
+    )
+
 
 # Global settings instance
 _settings: Settings | None = None
@@ -102,7 +102,7 @@ llm = init_chat_model(model_string)
 # Node Functions
 # ==============================================================================
 
-def chatbot(state: ResumeAgentState) -> Dict[str, Any]:
+async def chatbot(state: ResumeAgentState) -> Dict[str, Any]:
     """Main chatbot node that processes messages and generates responses.
 
     Args:
@@ -113,7 +113,7 @@ def chatbot(state: ResumeAgentState) -> Dict[str, Any]:
     """
     # Bind tools to LLM
     llm_with_tools = llm.bind_tools(tools)
-    message = llm_with_tools.invoke(state["messages"])
+    message = await llm_with_tools.ainvoke(state["messages"])
 
     # Disable parallel tool calling to avoid repeating invocations during interrupts
     assert len(message.tool_calls) <= 1
@@ -5,12 +5,14 @@
 
 # from .conversation import build_conversation_graph  # Needs chat_node implementation
 from .job_analysis import build_job_analysis_graph
+from .batch_job_analysis import build_batch_job_analysis_graph
 # from .resume_tailor import build_resume_tailoring_graph  # Needs load_resume_node and ResumeTailoringState
 # from .cover_letter import build_cover_letter_graph  # Needs dependencies
 
 __all__ = [
     # "build_conversation_graph",
     "build_job_analysis_graph",
+    "build_batch_job_analysis_graph",
     # "build_resume_tailoring_graph",
     # "build_cover_letter_graph",
 ]
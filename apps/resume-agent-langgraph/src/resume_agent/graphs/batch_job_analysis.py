@@ -0,0 +1,294 @@
+"""Batch job analysis workflow graph.
+
+Analyzes many job postings in parallel using LangGraph ``Send`` fan-out:
+
+    START -> dedupe_jobs -> (Send per pending URL) analyze_single_job -> summarize_batch -> END
+
+- URLs are deduplicated within the batch and against the job analysis cache,
+  so cached postings never open a browser or call the LLM.
+- Fetching is bounded by a browser semaphore (``batch_browser_concurrency``)
+  and analysis by an LLM semaphore (``batch_llm_concurrency``), so a batch of
+  50 URLs does not launch 50 Chromium instances at once.
+- Every finished job is emitted on the ``custom`` stream as soon as it
+  completes; use ``astream_batch_job_analysis`` to consume results in
+  completion order.
+- ``summarize_batch`` reports per-stage throughput in ``stage_stats``.
+"""
+
+import asyncio
+import time
+import weakref
+from typing import Any, AsyncIterator, Dict, List
+
+from langgraph.config import get_stream_writer
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
+
+# Use absolute imports (required for LangGraph server)
+from resume_agent.config import get_settings
+from resume_agent.state import BatchJobAnalysisState
+from resume_agent.nodes import check_cache_node, fetch_job_node, analyze_job_node
+
+
+# Semaphores are bound to the event loop they are first awaited on, so keep
+# one pair per running loop (LangGraph server and tests use different loops).
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_semaphores() -> Dict[str, asyncio.Semaphore]:
+    """Return the browser/LLM semaphores for the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphores = _semaphores.get(loop)
+    if semaphores is None:
+        settings = get_settings()
+        semaphores = {
+            "browser": asyncio.Semaphore(max(1, settings.batch_browser_concurrency)),
+            "llm": asyncio.Semaphore(max(1, settings.batch_llm_concurrency)),
+        }
+        _semaphores[loop] = semaphores
+    return semaphores
+
+
+def _emit(event: Dict[str, Any]) -> None:
+    """Write an event to the custom stream (no-op outside a streaming run)."""
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        return
+    writer(event)
+
+
+def _timing(stage: str, started_at: float, ok: bool) -> Dict[str, Any]:
+    """Build a stage timing record."""
+    ended_at = time.time()
+    return {
+        "stage": stage,
+        "started_at": started_at,
+        "ended_at": ended_at,
+        "duration_ms": (ended_at - started_at) * 1000,
+        "ok": ok,
+    }
+
+
+def dedupe_jobs_node(state: BatchJobAnalysisState) -> dict:
+    """
+    Deduplicate the batch and resolve cache hits.
+
+    Duplicate URLs (after whitespace stripping) are collapsed, preserving the
+    first occurrence's order. Cache hits are returned immediately as results
+    and streamed to the caller; only misses are left in ``pending_urls``.
+
+    Args:
+        state: Batch state containing job_urls
+
+    Returns:
+        Partial state update with pending_urls, cached results and timings
+    """
+    started_at = time.time()
+
+    unique_urls: List[str] = []
+    seen = set()
+    for url in state.get("job_urls", []):
+        url = (url or "").strip()
+        if url and url not in seen:
+            seen.add(url)
+            unique_urls.append(url)
+
+    pending_urls: List[str] = []
+    results: List[Dict[str, Any]] = []
+    for url in unique_urls:
+        cache_state = check_cache_node({"job_url": url})
+        if cache_state.get("cached"):
+            result = {
+                "job_url": url,
+                "job_analysis": cache_state["job_analysis"],
+                "cached": True,
+                "errors": [],
+            }
+            results.append(result)
+            _emit({"type": "job_result", **result})
+        else:
+            pending_urls.append(url)
+
+    print(
+        f"\n[BATCH] {len(state.get('job_urls', []))} URLs -> {len(unique_urls)} unique, "
+        f"{len(results)} cached, {len(pending_urls)} to analyze"
+    )
+
+    return {
+        "pending_urls": pending_urls,
+        "results": results,
+        "stage_timings": [_timing("dedupe", started_at, True)],
+    }
+
+
+def fan_out_jobs(state: BatchJobAnalysisState) -> List[Send] | str:
+    """
+    Dispatch one ``analyze_single_job`` branch per pending URL.
+
+    Args:
+        state: Batch state after deduplication
+
+    Returns:
+        List of Send packets, or "summarize_batch" when nothing is pending
+    """
+    pending_urls = state.get("pending_urls", [])
+    if not pending_urls:
+        return "summarize_batch"
+    return [Send("analyze_single_job", {"job_url": url}) for url in pending_urls]
+
+
+async def analyze_single_job_node(state: Dict[str, Any]) -> dict:
+    """
+    Fetch and analyze a single job posting under the batch concurrency limits.
+
+    Reuses the single-job ``fetch_job_node`` and ``analyze_job_node`` so the
+    batch path shares caching and error handling with the one-URL workflow.
+
+    Args:
+        state: Branch state containing job_url (sent by fan_out_jobs)
+
+    Returns:
+        Partial batch state update with one result and its stage timings
+    """
+    job_url = state["job_url"]
+    semaphores = _get_semaphores()
+    job_state: Dict[str, Any] = {"job_url": job_url, "errors": []}
+    timings: List[Dict[str, Any]] = []
+
+    async with semaphores["browser"]:
+        started_at = time.time()
+        job_state.update(await fetch_job_node(job_state))
+        timings.append(_timing("fetch", started_at, bool(job_state.get("job_content"))))
+
+    if job_state.get("job_content"):
+        async with semaphores["llm"]:
+            started_at = time.time()
+            job_state.update(await analyze_job_node(job_state))
+            timings.append(_timing("analyze", started_at, bool(job_state.get("job_analysis"))))
+
+    result = {
+        "job_url": job_url,
+        "job_analysis": job_state.get("job_analysis"),
+        "cached": False,
+        "errors": job_state.get("errors", []),
+    }
+    _emit({"type": "job_result", **result})
+
+    return {"results": [result], "stage_timings": timings}
+
+
+def summarize_stage_timings(timings: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Aggregate raw stage timings into per-stage throughput stats.
+
+    Throughput is measured over the stage's wall-clock window (first start to
+    last end), so it reflects the effective parallelism of the stage.
+
+    Args:
+        timings: Stage timing records from the batch run
+
+    Returns:
+        Mapping of stage name to {count, failed, total_ms, avg_ms, max_ms,
+        wall_ms, throughput_per_sec}
+    """
+    by_stage: Dict[str, List[Dict[str, Any]]] = {}
+    for record in timings:
+        by_stage.setdefault(record["stage"], []).append(record)
+
+    stats: Dict[str, Dict[str, float]] = {}
+    for stage, records in by_stage.items():
+        durations = [r["duration_ms"] for r in records]
+        wall_ms = (max(r["ended_at"] for r in records) - min(r["started_at"] for r in records)) * 1000
+        stats[stage] = {
+            "count": len(records),
+            "failed": sum(1 for r in records if not r["ok"]),
+            "total_ms": round(sum(durations), 2),
+            "avg_ms": round(sum(durations) / len(durations), 2),
+            "max_ms": round(max(durations), 2),
+            "wall_ms": round(wall_ms, 2),
+            "throughput_per_sec": round(len(records) / (wall_ms / 1000), 2) if wall_ms > 0 else 0.0,
+        }
+    return stats
+
+
+def summarize_batch_node(state: BatchJobAnalysisState) -> dict:
+    """
+    Compute per-stage throughput stats once every branch has finished.
+
+    Args:
+        state: Batch state with all results and stage timings
+
+    Returns:
+        Partial state update with stage_stats
+    """
+    stage_stats = summarize_stage_timings(state.get("stage_timings", []))
+
+    for stage, stats in stage_stats.items():
+        print(
+            f"[STATS] {stage}: {stats['count']:.0f} jobs, avg {stats['avg_ms']:.0f}ms, "
+            f"{stats['throughput_per_sec']:.2f} jobs/s"
+        )
+
+    _emit({"type": "batch_stats", "stage_stats": stage_stats})
+    return {"stage_stats": stage_stats}
+
+
+def build_batch_job_analysis_graph() -> StateGraph:
+    """
+    Build the batch job analysis workflow.
+
+    Flow:
+    1. START -> dedupe_jobs: Collapse duplicates and resolve cache hits
+    2. dedupe_jobs -> (Send fan-out): one analyze_single_job per pending URL,
+       or straight to summarize_batch when everything was cached
+    3. analyze_single_job -> summarize_batch: Aggregate throughput stats
+    4. summarize_batch -> END
+
+    Returns:
+        Compiled StateGraph
+    """
+    graph = StateGraph(BatchJobAnalysisState)
+
+    graph.add_node("dedupe_jobs", dedupe_jobs_node)
+    graph.add_node("analyze_single_job", analyze_single_job_node)
+    graph.add_node("summarize_batch", summarize_batch_node)
+
+    graph.add_edge(START, "dedupe_jobs")
+    graph.add_conditional_edges(
+        "dedupe_jobs",
+        fan_out_jobs,
+        ["analyze_single_job", "summarize_batch"]
+    )
+    graph.add_edge("analyze_single_job", "summarize_batch")
+    graph.add_edge("summarize_batch", END)
+
+    # Compile (LangGraph server provides automatic persistence)
+    return graph.compile()
+
+
+async def astream_batch_job_analysis(job_urls: List[str]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Analyze a batch of job URLs, yielding each result as soon as it finishes.
+
+    Yields ``{"type": "job_result", ...}`` events in completion order, followed
+    by a final ``{"type": "batch_stats", "stage_stats": {...}}`` event.
+
+    Args:
+        job_urls: Job posting URLs to analyze
+
+    Yields:
+        Result and stats events from the custom stream
+    """
+    async for event in graph.astream({"job_urls": job_urls}, stream_mode="custom"):
+        yield event
+
+
+# ==============================================================================
+# Export (Required for LangGraph Server)
+# ==============================================================================
+
+# Export compiled graph for langgraph.json to discover this agent
+graph = build_batch_job_analysis_graph()
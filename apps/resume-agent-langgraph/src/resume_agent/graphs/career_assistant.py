@@ -18,6 +18,7 @@ from resume_agent.tools import (
     load_master_resume,
     extract_skills_from_resume,
     calculate_ats_score,
+    rank_saved_jobs,
 )
 
 load_dotenv()
@@ -46,13 +47,14 @@ tools = [
     load_master_resume,            # Load user's resume
     extract_skills_from_resume,    # Extract skills from resume
     calculate_ats_score,           # Calculate ATS compatibility
+    rank_saved_jobs,               # Rank all saved jobs against the resume
 ]
 
 # ==============================================================================
 # Nodes
 # ==============================================================================
 
-def chatbot_node(state: ResumeAgentState) -> Dict[str, Any]:
+async def chatbot_node(state: ResumeAgentState) -> Dict[str, Any]:
     """Main chatbot node with tool calling.
 
     Args:
@@ -68,7 +70,7 @@ def chatbot_node(state: ResumeAgentState) -> Dict[str, Any]:
     messages = state["messages"]
 
     # Invoke LLM
-    response = llm_with_tools.invoke(messages)
+    response = await llm_with_tools.ainvoke(messages)
 
     return {"messages": [response]}
 
@@ -1,8 +1,9 @@
 """Cover letter generation workflow graph."""
 
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
+from cernji_checkpoint import get_checkpointer
 
+from ..config import get_settings
 from ..state import ResumeAgentState
 from ..nodes import (
     prepare_cover_letter_context_node,
@@ -70,7 +71,7 @@ def build_cover_letter_graph() -> StateGraph:
     - Performance tracking via duration_ms
 
     Returns:
-        Compiled StateGraph with MemorySaver checkpointer for persistence
+        Compiled StateGraph with the durable SQLite checkpointer
     """
     # Create graph
     graph = StateGraph(ResumeAgentState)
@@ -99,8 +100,8 @@ def build_cover_letter_graph() -> StateGraph:
     #     }
     # )
 
-    # Compile with memory checkpointer
-    checkpointer = MemorySaver()
+    # Compile with the shared durable checkpointer (survives restarts)
+    checkpointer = get_checkpointer(get_settings().checkpoint_db_path)
     app = graph.compile(checkpointer=checkpointer)
 
     return app
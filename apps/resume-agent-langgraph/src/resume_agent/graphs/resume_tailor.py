@@ -1,8 +1,9 @@
 """Resume tailoring workflow graph."""
 
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
+from cernji_checkpoint import get_checkpointer
 
+from ..config import get_settings
 from ..state import ResumeAgentState
 from ..nodes import (
     load_resume_node,
@@ -35,7 +36,7 @@ def build_resume_tailoring_graph() -> StateGraph:
     Each node returns partial state updates following LangGraph conventions.
 
     Returns:
-        Compiled StateGraph with MemorySaver checkpointer for persistence
+        Compiled StateGraph with the durable SQLite checkpointer
     """
     # Create graph
     graph = StateGraph(ResumeAgentState)
@@ -55,8 +56,8 @@ def build_resume_tailoring_graph() -> StateGraph:
     graph.add_edge("tailor_resume", "validate_tailoring")
     graph.add_edge("validate_tailoring", END)
 
-    # Compile with memory checkpointer
-    checkpointer = MemorySaver()
+    # Compile with the shared durable checkpointer (survives restarts)
+    checkpointer = get_checkpointer(get_settings().checkpoint_db_path)
     app = graph.compile(checkpointer=checkpointer)
 
     return app
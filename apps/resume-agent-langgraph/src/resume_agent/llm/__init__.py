@@ -1,6 +1,14 @@
 """LLM provider abstraction."""
 
-from .providers import call_llm, get_provider_info
+from .providers import call_llm, acall_llm, get_provider_info
 from .messages import convert_langgraph_messages_to_api_format
+from .streaming import JsonFieldStreamer, emit_custom_event
 
-__all__ = ["call_llm", "get_provider_info", "convert_langgraph_messages_to_api_format"]
+__all__ = [
+    "call_llm",
+    "acall_llm",
+    "get_provider_info",
+    "convert_langgraph_messages_to_api_format",
+    "JsonFieldStreamer",
+    "emit_custom_event",
+]
@@ -1,10 +1,123 @@
-"""LLM provider abstraction for Claude and OpenAI."""
+"""LLM provider abstraction for Claude and OpenAI.
+
+``acall_llm`` is the primary entry point for graph nodes: it uses the async
+SDK clients, so a node awaiting the LLM does not hold a worker thread.
+``call_llm`` is the blocking equivalent kept for scripts and sync callers.
+"""
+
+import asyncio
+import weakref
+from typing import Callable, Optional
 
 import anthropic
 import openai
 from ..config import get_settings
 
 
+# Async clients hold an httpx connection pool bound to the event loop that
+# created it, so cache one client per (loop, provider, api key).
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+
+
+def _get_async_client(provider: str, api_key: str):
+    """Return a cached async SDK client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    key = (provider, api_key)
+    client = clients.get(key)
+    if client is None:
+        if provider == "openai":
+            client = openai.AsyncOpenAI(api_key=api_key)
+        else:
+            client = anthropic.AsyncAnthropic(api_key=api_key)
+        clients[key] = client
+    return client
+
+
+async def aclose_async_clients() -> None:
+    """
+    Close the async clients cached for the running event loop.
+
+    Call before a short-lived loop (e.g. one made by asyncio.run) exits, so
+    its connection pools are released instead of leaked.
+    """
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.close()
+
+
+async def acall_llm(
+    messages: list[dict],
+    system_prompt: str,
+    on_text: Optional[Callable[[str], None]] = None
+) -> str:
+    """
+    Call the configured LLM provider (Claude or OpenAI) without blocking.
+
+    Args:
+        messages: List of message dicts with role and content
+        system_prompt: System prompt to guide the LLM
+        on_text: Optional callback; when given the response is streamed and
+            each text chunk is passed to it as it arrives
+
+    Returns:
+        Assistant's full response text
+
+    Raises:
+        Exception: If LLM call fails
+    """
+    settings = get_settings()
+
+    if settings.llm_provider == "openai":
+        client = _get_async_client("openai", settings.openai_api_key)
+
+        # OpenAI format includes system message in messages array
+        api_messages = [{"role": "system", "content": system_prompt}] + messages
+
+        request = dict(
+            model=settings.openai_model,
+            messages=api_messages,
+            max_tokens=settings.max_tokens,
+            temperature=settings.temperature
+        )
+
+        if on_text is None:
+            response = await client.chat.completions.create(**request)
+            return response.choices[0].message.content
+
+        parts = []
+        stream = await client.chat.completions.create(**request, stream=True)
+        async for chunk in stream:
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            if text:
+                parts.append(text)
+                on_text(text)
+        return "".join(parts)
+
+    else:
+        client = _get_async_client("claude", settings.anthropic_api_key)
+
+        # Claude uses separate system parameter
+        request = dict(
+            model=settings.claude_model,
+            max_tokens=settings.max_tokens,
+            system=system_prompt,
+            messages=messages,
+            temperature=settings.temperature
+        )
+
+        if on_text is None:
+            response = await client.messages.create(**request)
+            return response.content[0].text
+
+        parts = []
+        async with client.messages.stream(**request) as stream:
+            async for text in stream.text_stream:
+                parts.append(text)
+                on_text(text)
+        return "".join(parts)
+
+
 def call_llm(messages: list[dict], system_prompt: str) -> str:
     """
     Call the configured LLM provider (Claude or OpenAI).
@@ -0,0 +1,160 @@
+"""Incremental streaming helpers for LLM JSON responses.
+
+Nodes that ask the LLM for a JSON object (e.g. ``{"tailored_resume": "..."}``)
+can only ``json.loads`` the response once it is complete. ``JsonFieldStreamer``
+extracts one string field *while tokens arrive*, so the node can forward
+partial text to the UI as custom stream events and still parse the full
+response at the end exactly as before.
+"""
+
+import json
+import re
+from typing import Any, Callable, Optional
+
+from langgraph.config import get_stream_writer
+
+# Incomplete \uXXXX escape at the end of a chunk (wait for more text)
+_PARTIAL_UNICODE_ESCAPE = re.compile(r"\\(u[0-9a-fA-F]{0,3})?")
+_UNICODE_ESCAPE = re.compile(r"\\u[0-9a-fA-F]{4}")
+_LOW_SURROGATE_ESCAPE = re.compile(r"\\u[dD][c-fC-F][0-9a-fA-F]{2}")
+# Valid JSON escapes, for decoding text that also contains invalid ones
+_VALID_ESCAPE = re.compile(r'\\(?:u[0-9a-fA-F]{4}|["\\/bfnrt])')
+
+
+def emit_custom_event(event: dict[str, Any]) -> None:
+    """
+    Write an event to the graph's ``custom`` stream.
+
+    No-op when called outside a graph run (e.g. node called directly in a test).
+    """
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        return
+    writer(event)
+
+
+class JsonFieldStreamer:
+    """
+    Incrementally decode the value of one JSON string field from a token stream.
+
+    Feed raw response chunks with ``feed``; every newly decoded piece of the
+    field's value is passed to ``on_delta`` (and returned). Markdown code
+    fences and text before the object are ignored. JSON escapes split across
+    chunks (``\\n``, ``\\"``, ``\\uXXXX`` and surrogate pairs) are held back until
+    complete, so deltas are always valid text. Invalid escapes in the model
+    output are passed through as literal text rather than raising.
+
+    Example:
+        >>> streamer = JsonFieldStreamer("cover_letter")
+        >>> streamer.feed('{"cover_letter": "Dear ')
+        'Dear '
+        >>> streamer.feed('Team,\\\\nI')
+        'Team,\\nI'
+    """
+
+    _SEARCHING, _IN_VALUE, _DONE = range(3)
+
+    def __init__(self, field: str, on_delta: Optional[Callable[[str], None]] = None):
+        self.field = field
+        self.on_delta = on_delta
+        self.text = ""  # decoded value so far
+        self._key_re = re.compile(r'"' + re.escape(field) + r'"\s*:\s*"')
+        self._state = self._SEARCHING
+        self._scan = ""  # raw text seen while searching for the key
+        self._pending = ""  # raw (still escaped) value text not yet decoded
+        self._escaped = False
+
+    @property
+    def done(self) -> bool:
+        """True once the field's closing quote has been seen."""
+        return self._state == self._DONE
+
+    def feed(self, chunk: str) -> str:
+        """
+        Consume a raw response chunk.
+
+        Args:
+            chunk: Next piece of the LLM response text
+
+        Returns:
+            Newly decoded text of the field value ("" if none)
+        """
+        if self._state == self._DONE or not chunk:
+            return ""
+
+        if self._state == self._SEARCHING:
+            self._scan += chunk
+            match = self._key_re.search(self._scan)
+            if not match:
+                return ""
+            chunk = self._scan[match.end():]
+            self._scan = ""
+            self._state = self._IN_VALUE
+
+        closing = self._find_closing_quote(chunk)
+        if closing >= 0:
+            self._pending += chunk[:closing]
+            self._state = self._DONE
+            delta = self._decode(len(self._pending))
+        else:
+            self._pending += chunk
+            delta = self._decode(self._safe_length())
+
+        if delta:
+            self.text += delta
+            if self.on_delta:
+                self.on_delta(delta)
+        return delta
+
+    def _find_closing_quote(self, chunk: str) -> int:
+        """Index of the unescaped closing quote in chunk, or -1."""
+        for i, ch in enumerate(chunk):
+            if self._escaped:
+                self._escaped = False
+            elif ch == "\\":
+                self._escaped = True
+            elif ch == '"':
+                return i
+        return -1
+
+    def _safe_length(self) -> int:
+        """Length of the pending prefix that ends on a complete escape sequence."""
+        raw = self._pending
+        i = 0
+        while i < len(raw):
+            if raw[i] != "\\":
+                i += 1
+                continue
+            if i + 1 >= len(raw):
+                return i
+            if raw[i + 1] != "u":
+                i += 2
+                continue
+            escape = raw[i:i + 6]
+            if _PARTIAL_UNICODE_ESCAPE.fullmatch(escape):
+                return i
+            if not _UNICODE_ESCAPE.fullmatch(escape):
+                # Invalid escape: nothing to wait for, _decode keeps it literally
+                i += 2
+                continue
+            # High surrogate must be decoded together with its low surrogate
+            if 0xD800 <= int(escape[2:], 16) <= 0xDBFF:
+                low = raw[i + 6:i + 12]
+                if not low or _PARTIAL_UNICODE_ESCAPE.fullmatch(low):
+                    return i
+                i += 12 if _LOW_SURROGATE_ESCAPE.fullmatch(low) else 6
+            else:
+                i += 6
+        return len(raw)
+
+    def _decode(self, length: int) -> str:
+        """Decode and drop the first `length` raw characters of pending."""
+        if length <= 0:
+            return ""
+        raw, self._pending = self._pending[:length], self._pending[length:]
+        try:
+            return json.loads('"' + raw + '"', strict=False)
+        except ValueError:
+            # Invalid escape from the model: decode the valid ones, keep the rest as is
+            return _VALID_ESCAPE.sub(lambda m: json.loads('"' + m.group() + '"'), raw)
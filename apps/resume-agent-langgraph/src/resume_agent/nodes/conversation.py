@@ -1,11 +1,12 @@
 """Conversation nodes for chat functionality."""
 
 from ..state import ResumeAgentState
-from ..llm import call_llm, get_provider_info, convert_langgraph_messages_to_api_format
+from ..llm import acall_llm, get_provider_info, convert_langgraph_messages_to_api_format
 from ..prompts import CONVERSATION_SYSTEM
+from .sync import sync_node
 
 
-def chat_node(state: ResumeAgentState) -> dict:
+async def chat_node(state: ResumeAgentState) -> dict:
     """
     Process user message with LLM and return response.
 
@@ -24,7 +25,7 @@ def chat_node(state: ResumeAgentState) -> dict:
         api_messages = convert_langgraph_messages_to_api_format(state["messages"])
 
         # Call LLM
-        assistant_message = call_llm(api_messages, CONVERSATION_SYSTEM)
+        assistant_message = await acall_llm(api_messages, CONVERSATION_SYSTEM)
 
         # Return assistant message (will be appended to state)
         return {
@@ -83,3 +84,7 @@ def get_user_input_node(state: ResumeAgentState) -> dict:
             "content": user_input
         }]
     }
+
+
+# Sync shim for scripts and tests that call the node directly
+chat_node_sync = sync_node(chat_node)
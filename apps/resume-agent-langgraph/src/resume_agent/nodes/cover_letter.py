@@ -13,8 +13,9 @@ import time
 import re
 
 from ..state import ResumeAgentState
-from ..llm import call_llm
+from ..llm import acall_llm, JsonFieldStreamer, emit_custom_event
 from ..prompts import COVER_LETTER_PROMPT, COVER_LETTER_REVIEW_PROMPT
+from .sync import sync_node
 
 
 def prepare_cover_letter_context_node(state: ResumeAgentState) -> dict:
@@ -125,7 +126,7 @@ def prepare_cover_letter_context_node(state: ResumeAgentState) -> dict:
         }
 
 
-def generate_cover_letter_node(state: ResumeAgentState) -> dict:
+async def generate_cover_letter_node(state: ResumeAgentState) -> dict:
     """
     Generate personalized cover letter using LLM.
 
@@ -175,7 +176,16 @@ def generate_cover_letter_node(state: ResumeAgentState) -> dict:
 
         system_prompt = "You are an expert cover letter writer. Return only valid JSON."
 
-        llm_response = call_llm(messages, system_prompt)
+        # Stream the cover_letter text to the UI as tokens arrive
+        # (stream_mode="custom"); the full response is still parsed below
+        streamer = JsonFieldStreamer(
+            "cover_letter",
+            on_delta=lambda delta: emit_custom_event({
+                "type": "cover_letter_delta",
+                "delta": delta
+            })
+        )
+        llm_response = await acall_llm(messages, system_prompt, on_text=streamer.feed)
 
         # Parse JSON response
         # Remove markdown code blocks if present
@@ -221,7 +231,7 @@ def generate_cover_letter_node(state: ResumeAgentState) -> dict:
         }
 
 
-def review_cover_letter_node(state: ResumeAgentState) -> dict:
+async def review_cover_letter_node(state: ResumeAgentState) -> dict:
     """
     Review generated cover letter for quality and provide suggestions.
 
@@ -279,7 +289,7 @@ def review_cover_letter_node(state: ResumeAgentState) -> dict:
 
         system_prompt = "You are an expert career coach. Return only valid JSON."
 
-        llm_response = call_llm(messages, system_prompt)
+        llm_response = await acall_llm(messages, system_prompt)
 
         # Parse JSON response
         # Remove markdown code blocks if present
@@ -333,3 +343,8 @@ def review_cover_letter_node(state: ResumeAgentState) -> dict:
         return {
             "errors": state.get("errors", []) + [error_msg]
         }
+
+
+# Sync shims for scripts and tests that call nodes directly
+generate_cover_letter_node_sync = sync_node(generate_cover_letter_node)
+review_cover_letter_node_sync = sync_node(review_cover_letter_node)
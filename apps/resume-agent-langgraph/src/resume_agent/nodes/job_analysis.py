@@ -8,14 +8,16 @@ License: Experimental
 """
 
 import json
+import sys
 import time
 import asyncio
 from datetime import datetime
 
 from ..state import JobAnalysisState
-from ..llm import call_llm
+from ..llm import acall_llm
 from ..prompts import JOB_ANALYSIS_PROMPT
 from ..tools.browser_automation import scrape_job_posting
+from .sync import sync_node
 
 
 # In-memory cache for job analyses (simple implementation for MVP)
@@ -64,8 +66,9 @@ async def fetch_job_node(state: JobAnalysisState) -> dict:
     JavaScript-heavy websites. Automatically detects site type (japan-dev,
     recruit, or generic) and uses appropriate scraper.
 
-    IMPORTANT: On Windows, runs browser automation in thread pool to avoid
-    asyncio subprocess limitations (NotImplementedError with ProactorEventLoop).
+    Runs on the caller's event loop. Only when the running loop cannot spawn
+    subprocesses (SelectorEventLoop on Windows) does it fall back to a worker
+    thread with its own Proactor loop.
 
     Args:
         state: Current job analysis state containing job_url
@@ -90,23 +93,21 @@ async def fetch_job_node(state: JobAnalysisState) -> dict:
         else:
             site_type = "generic"
 
-        # Run browser automation in thread pool (Windows workaround)
-        # Windows ProactorEventLoop doesn't support subprocess pipes
-        import sys
-        if sys.platform == "win32":
-            # Windows: Run in thread pool with its own event loop
-            job_data = await asyncio.to_thread(
-                _scrape_job_sync,
+        if _loop_supports_subprocesses():
+            # Playwright runs directly on the graph's event loop
+            job_data = await scrape_job_posting(
                 job_url,
-                site_type,
+                site_type=site_type,
                 max_retries=3,
                 timeout_seconds=60
             )
         else:
-            # Unix: Can use async directly
-            job_data = await scrape_job_posting(
+            # Windows SelectorEventLoop can't spawn the browser subprocess:
+            # run the scraper on a Proactor loop in a worker thread
+            job_data = await asyncio.to_thread(
+                _scrape_job_sync,
                 job_url,
-                site_type=site_type,
+                site_type,
                 max_retries=3,
                 timeout_seconds=60
             )
@@ -133,12 +134,19 @@ async def fetch_job_node(state: JobAnalysisState) -> dict:
         }
 
 
+def _loop_supports_subprocesses() -> bool:
+    """Return False when the running loop can't spawn subprocesses (Windows selector loop)."""
+    if sys.platform != "win32":
+        return True
+    return not isinstance(asyncio.get_running_loop(), asyncio.SelectorEventLoop)
+
+
 def _scrape_job_sync(url: str, site_type: str, max_retries: int = 3, timeout_seconds: int = 60):
     """
-    Synchronous wrapper for browser scraping (thread pool execution on Windows).
+    Synchronous wrapper for browser scraping (fallback for Windows selector loops).
 
     Creates a new event loop in the thread to run async Playwright operations,
-    avoiding Windows asyncio subprocess limitations with ProactorEventLoop.
+    avoiding Windows asyncio subprocess limitations with SelectorEventLoop.
 
     Args:
         url: Job posting URL
@@ -213,7 +221,7 @@ def _format_job_data_as_text(job_data: dict, job_url: str) -> str:
     return "\n".join(parts)
 
 
-def analyze_job_node(state: JobAnalysisState) -> dict:
+async def analyze_job_node(state: JobAnalysisState) -> dict:
     """
     Analyze job posting content using LLM.
 
@@ -259,7 +267,7 @@ def analyze_job_node(state: JobAnalysisState) -> dict:
         # Use minimal system prompt since instructions are in user message
         system_prompt = "You are an expert job posting analyzer. Extract information and return only valid JSON."
 
-        llm_response = call_llm(messages, system_prompt)
+        llm_response = await acall_llm(messages, system_prompt)
 
         # Parse JSON response
         # Remove markdown code blocks if present
@@ -300,3 +308,8 @@ def analyze_job_node(state: JobAnalysisState) -> dict:
         return {
             "errors": state.get("errors", []) + [error_msg]
         }
+
+
+# Sync shims for scripts and tests that call nodes directly
+fetch_job_node_sync = sync_node(fetch_job_node)
+analyze_job_node_sync = sync_node(analyze_job_node)
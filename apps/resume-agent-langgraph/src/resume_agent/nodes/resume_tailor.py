@@ -13,9 +13,12 @@ import time
 from pathlib import Path
 
 from ..state import ResumeAgentState
-from ..llm import call_llm
+from ..llm import acall_llm, JsonFieldStreamer, emit_custom_event
 from ..prompts import RESUME_TAILORING_PROMPT
-from ..tools import load_master_resume, calculate_keyword_match, calculate_ats_score
+from ..tools import load_master_resume
+from ..tools.ats_engine import compile_keywords, get_resume_profile
+from ..tools.ats_scorer import score_profile
+from .sync import sync_node
 
 
 # Default master resume location (shared with original resume-agent)
@@ -108,40 +111,19 @@ def analyze_requirements_node(state: ResumeAgentState) -> dict:
         skills = job_analysis.get("skills", [])
         all_keywords = list(set(keywords + skills))  # Combine and deduplicate
 
-        # Convert master resume to text for keyword matching
-        # Simple text extraction - just concatenate all string values
-        resume_text_parts = []
-
-        def extract_text(obj, depth=0):
-            """Recursively extract text from nested dict/list structures."""
-            if depth > 10:  # Prevent infinite recursion
-                return
-
-            if isinstance(obj, dict):
-                for value in obj.values():
-                    extract_text(value, depth + 1)
-            elif isinstance(obj, list):
-                for item in obj:
-                    extract_text(item, depth + 1)
-            elif isinstance(obj, str):
-                resume_text_parts.append(obj)
-
-        extract_text(master_resume)
-        resume_text = " ".join(resume_text_parts)
+        # Index the master resume once (cached across runs by content hash)
+        profile = get_resume_profile(master_resume)
 
         # Calculate keyword match
-        keyword_match = calculate_keyword_match(resume_text, all_keywords)
+        keyword_match = compile_keywords(all_keywords).match(profile.content)
 
         # Calculate overall ATS score
         # Prepare resume data dict for ATS scorer
         resume_data_for_ats = {
-            "content": resume_text,
+            "content": profile.content.text,
             "skills": master_resume.get("skills", [])
         }
-        ats_score = calculate_ats_score(
-            resume_data=resume_data_for_ats,
-            job_analysis=job_analysis
-        )
+        ats_score = score_profile(profile, resume_data_for_ats, job_analysis)
 
         initial_score = {
             "keyword_match": keyword_match,
@@ -169,7 +151,7 @@ def analyze_requirements_node(state: ResumeAgentState) -> dict:
         }
 
 
-def tailor_resume_node(state: ResumeAgentState) -> dict:
+async def tailor_resume_node(state: ResumeAgentState) -> dict:
     """
     Tailor resume content for specific job using LLM.
 
@@ -232,7 +214,16 @@ def tailor_resume_node(state: ResumeAgentState) -> dict:
 
         system_prompt = "You are an expert resume writer specializing in ATS optimization. Return only valid JSON."
 
-        llm_response = call_llm(messages, system_prompt)
+        # Stream the tailored_resume text to the UI as tokens arrive
+        # (stream_mode="custom"); the full response is still parsed below
+        streamer = JsonFieldStreamer(
+            "tailored_resume",
+            on_delta=lambda delta: emit_custom_event({
+                "type": "tailored_resume_delta",
+                "delta": delta
+            })
+        )
+        llm_response = await acall_llm(messages, system_prompt, on_text=streamer.feed)
 
         # Parse JSON response
         # Remove markdown code blocks if present
@@ -313,21 +304,20 @@ def validate_tailoring_node(state: ResumeAgentState) -> dict:
         skills = job_analysis.get("skills", [])
         all_keywords = list(set(keywords + skills))
 
-        # Calculate keyword match for tailored resume
-        keyword_match = calculate_keyword_match(tailored_resume, all_keywords)
-
-        # Calculate overall ATS score
-        # Prepare resume data dict for ATS scorer
+        # Index the tailored resume once for both keyword match and ATS score
         # Extract skills from tailored resume text (simplified - just use keywords integrated)
         keywords_integrated = state.get("keywords_integrated", [])
         resume_data_for_ats = {
             "content": tailored_resume,
             "skills": keywords_integrated
         }
-        ats_score = calculate_ats_score(
-            resume_data=resume_data_for_ats,
-            job_analysis=job_analysis
-        )
+        profile = get_resume_profile(resume_data_for_ats)
+
+        # Calculate keyword match for tailored resume
+        keyword_match = compile_keywords(all_keywords).match(profile.content)
+
+        # Calculate overall ATS score
+        ats_score = score_profile(profile, resume_data_for_ats, job_analysis)
 
         final_score = {
             "keyword_match": keyword_match,
@@ -363,3 +353,7 @@ def validate_tailoring_node(state: ResumeAgentState) -> dict:
         return {
             "errors": state.get("errors", []) + [error_msg]
         }
+
+
+# Sync shims for scripts and tests that call nodes directly
+tailor_resume_node_sync = sync_node(tailor_resume_node)
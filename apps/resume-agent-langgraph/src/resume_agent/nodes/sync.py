@@ -0,0 +1,48 @@
+"""Synchronous shims for async graph nodes.
+
+Graph nodes are async so LangGraph can run many graph runs on one event
+loop. Scripts and sync tests that call a node directly can use the
+``*_sync`` variants built here instead. Each call runs on a fresh event
+loop, so the async LLM clients cached for that loop are closed before it
+exits.
+"""
+
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable
+
+from ..llm.providers import aclose_async_clients
+
+
+def sync_node(node: Callable[[Any], Awaitable[dict]]) -> Callable[[Any], dict]:
+    """
+    Wrap an async node so it can be called from synchronous code.
+
+    Args:
+        node: Async node function taking a state dict
+
+    Returns:
+        Sync function with the same signature that runs the node to completion
+
+    Raises:
+        RuntimeError: If called while an event loop is already running
+    """
+    async def run(state: Any) -> dict:
+        try:
+            return await node(state)
+        finally:
+            await aclose_async_clients()
+
+    @functools.wraps(node)
+    def wrapper(state: Any) -> dict:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(run(state))
+        raise RuntimeError(
+            f"{node.__name__}_sync called inside a running event loop; await {node.__name__} instead"
+        )
+
+    wrapper.__name__ = f"{node.__name__}_sync"
+    wrapper.__qualname__ = wrapper.__name__
+    return wrapper
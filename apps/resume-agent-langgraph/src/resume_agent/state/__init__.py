@@ -26,6 +26,7 @@ from .schemas import (
     WorkflowIntent,
     WorkflowProgress,
     JobAnalysisState,
+    BatchJobAnalysisState,
 
     # Reducers
     append_unique_examples,
@@ -60,6 +61,7 @@ __all__ = [
     "WorkflowIntent",
     "WorkflowProgress",
     "JobAnalysisState",
+    "BatchJobAnalysisState",
 
     # Reducers
     "append_unique_examples",
@@ -7,6 +7,7 @@ The state persists across conversation turns via checkpointing.
 Based on Pydantic models from apps/resume-agent/resume_agent.py
 """
 
+import operator
 from typing import TypedDict, Annotated, Optional, List, Dict, Any, Literal
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
@@ -229,6 +230,30 @@ class JobAnalysisState(TypedDict, total=False):
     duration_ms: float
 
 
+class BatchJobAnalysisState(TypedDict, total=False):
+    """
+    State schema for the batch job analysis workflow.
+
+    Each pending URL is analyzed in its own branch (LangGraph ``Send``), and
+    branches append to the list fields below, so those fields use additive
+    reducers.
+
+    Fields:
+        job_urls: Job posting URLs to analyze (input, may contain duplicates)
+        pending_urls: Deduplicated URLs that missed the cache
+        results: One result per unique URL ({job_url, job_analysis, cached, errors})
+        stage_timings: Raw timing records ({stage, started_at, ended_at, duration_ms, ok})
+        stage_stats: Per-stage throughput summary computed at the end of the batch
+        errors: Batch-level error messages
+    """
+    job_urls: List[str]
+    pending_urls: List[str]
+    results: Annotated[List[Dict[str, Any]], operator.add]
+    stage_timings: Annotated[List[Dict[str, Any]], operator.add]
+    stage_stats: Dict[str, Dict[str, float]]
+    errors: Annotated[List[str], operator.add]
+
+
 # ============================================================================
 # MAIN STATE SCHEMA
 # ============================================================================
@@ -471,6 +496,8 @@ __all__ = [
     # Workflow control
     "WorkflowIntent",
     "WorkflowProgress",
+    "JobAnalysisState",
+    "BatchJobAnalysisState",
 
     # Reducers
     "append_unique_examples",
@@ -6,6 +6,8 @@ from .ats_scorer import (
     calculate_ats_score,
     suggest_improvements
 )
+from .ats_engine import score_resume_against_jobs
+from .job_ranker import rank_job_analyses, rank_saved_jobs
 from .resume_parser import (
     load_master_resume,
     extract_skills_from_resume,
@@ -17,6 +19,9 @@ __all__ = [
     "calculate_keyword_match",
     "calculate_ats_score",
     "suggest_improvements",
+    "score_resume_against_jobs",
+    "rank_job_analyses",
+    "rank_saved_jobs",
     "load_master_resume",
     "extract_skills_from_resume",
     "extract_achievements_from_resume",
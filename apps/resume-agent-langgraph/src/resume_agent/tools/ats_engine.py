@@ -0,0 +1,320 @@
+"""Precompiled ATS scoring engine.
+
+The ATS tools used to rescan the raw resume text once per keyword (and
+re-lowercase it once per requirement term). This module splits scoring into
+two compile steps so the expensive work happens once:
+
+- ``ResumeIndex``: the resume is normalized and tokenized once into a set of
+  token n-grams, so every keyword lookup is a set membership test.
+- ``KeywordSet``: job keywords are normalized into token tuples once and
+  cached, so the same job analysis is never re-parsed.
+
+Matching is word-boundary aware: "Java" no longer matches "JavaScript" and
+"Go" no longer matches "Google". Tokens keep ``+``, ``#``, ``.`` and ``-``
+(so "C++", "C#", "Node.js" and "CI/CD" behave), and keywords containing CJK
+text fall back to substring matching because Japanese has no word spaces.
+
+``score_resume_against_jobs`` scores one resume against many job analyses
+with a single resume index.
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Any, Iterable
+
+
+# Token: word characters plus +/# (C++, C#), joined by . or - (Node.js, front-end).
+# "/" is a separator so "CI/CD" tokenizes to ("ci", "cd") on both sides.
+_TOKEN_RE = re.compile(r"[\w+#]+(?:[.\-][\w+#]+)*")
+_COMPONENT_SPLIT_RE = re.compile(r"[.\-]")
+_WHITESPACE_RE = re.compile(r"\s+")
+_CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uff66-\uff9f]")
+_REQUIREMENT_TERM_RE = re.compile(r"\b\w+\b")
+
+# Longest keyword phrase (in tokens) indexed as an n-gram; longer phrases
+# fall back to a boundary-aware search of the normalized text.
+MAX_NGRAM = 5
+
+# Scoring weights (keyword 40%, skills 30%, experience 30%)
+KEYWORD_WEIGHT = 0.4
+SKILLS_WEIGHT = 0.3
+EXPERIENCE_WEIGHT = 0.3
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for matching (NFKC, lowercase, collapsed whitespace)."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", text).lower()).strip()
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into normalized match tokens."""
+    return _TOKEN_RE.findall(normalize_text(text))
+
+
+def extract_resume_text(obj: Any, max_depth: int = 10) -> str:
+    """
+    Concatenate every string value in a nested resume structure.
+
+    Iterative replacement for the recursive ``extract_text`` helper that
+    used to live in ``analyze_requirements_node``.
+
+    Args:
+        obj: Resume dict/list/str
+        max_depth: Maximum nesting depth to descend into
+
+    Returns:
+        Space-joined text of all string leaves, in document order
+    """
+    parts: list[str] = []
+    stack: list[tuple[Any, int]] = [(obj, 0)]
+    while stack:
+        value, depth = stack.pop()
+        if isinstance(value, str):
+            parts.append(value)
+        elif depth <= max_depth and isinstance(value, dict):
+            stack.extend((item, depth + 1) for item in reversed(list(value.values())))
+        elif depth <= max_depth and isinstance(value, list):
+            stack.extend((item, depth + 1) for item in reversed(value))
+    return " ".join(parts)
+
+
+@dataclass(frozen=True)
+class ResumeIndex:
+    """Normalized, tokenized form of a piece of resume text."""
+
+    text: str
+    ngrams: frozenset[tuple[str, ...]]
+
+    @classmethod
+    def from_text(cls, text: str) -> "ResumeIndex":
+        """Tokenize text once and index all token n-grams up to MAX_NGRAM."""
+        normalized = normalize_text(text or "")
+        tokens = _TOKEN_RE.findall(normalized)
+
+        ngrams: set[tuple[str, ...]] = set()
+        for i in range(len(tokens)):
+            for n in range(1, min(MAX_NGRAM, len(tokens) - i) + 1):
+                ngrams.add(tuple(tokens[i:i + n]))
+
+        # Components of compound tokens ("node.js" -> "node", "js")
+        for token in set(tokens):
+            if "." in token or "-" in token:
+                ngrams.update((part,) for part in _COMPONENT_SPLIT_RE.split(token) if part)
+
+        return cls(text=normalized, ngrams=frozenset(ngrams))
+
+    @property
+    def tokens(self) -> frozenset[str]:
+        """Unigram token set."""
+        return frozenset(gram[0] for gram in self.ngrams if len(gram) == 1)
+
+    def contains(self, key: "CompiledKeyword") -> bool:
+        """Return True if the compiled keyword occurs in this resume text."""
+        if key.substring:
+            return key.normalized in self.text
+        if not key.tokens:
+            return False
+        if len(key.tokens) <= MAX_NGRAM:
+            return key.tokens in self.ngrams
+        return key.pattern.search(self.text) is not None
+
+
+@dataclass(frozen=True)
+class CompiledKeyword:
+    """A job keyword normalized for matching."""
+
+    keyword: str
+    normalized: str
+    tokens: tuple[str, ...]
+    substring: bool
+
+    @cached_property
+    def pattern(self) -> re.Pattern:
+        """Boundary-aware regex for phrases longer than MAX_NGRAM."""
+        body = r"\W+".join(re.escape(token) for token in self.tokens)
+        return re.compile(rf"(?<![\w+#]){body}(?![\w+#])")
+
+
+@lru_cache(maxsize=4096)
+def compile_keyword(keyword: str) -> CompiledKeyword:
+    """Normalize a single keyword (cached across calls and jobs)."""
+    normalized = normalize_text(keyword)
+    return CompiledKeyword(
+        keyword=keyword,
+        normalized=normalized,
+        tokens=tuple(_TOKEN_RE.findall(normalized)),
+        substring=bool(_CJK_RE.search(normalized)),
+    )
+
+
+@dataclass(frozen=True)
+class KeywordSet:
+    """Compiled list of job keywords, preserving the caller's order."""
+
+    keywords: tuple[CompiledKeyword, ...]
+
+    def match(self, index: ResumeIndex) -> dict[str, Any]:
+        """
+        Match every keyword against a resume index.
+
+        Returns:
+            Dictionary with matched_keywords, missing_keywords, match_score,
+            match_count, and total_keywords (same shape as
+            ``calculate_keyword_match``).
+        """
+        matched: list[str] = []
+        missing: list[str] = []
+        for key in self.keywords:
+            (matched if index.contains(key) else missing).append(key.keyword)
+
+        total = len(self.keywords)
+        match_score = (len(matched) / total * 100) if total > 0 else 0.0
+        return {
+            "matched_keywords": matched,
+            "missing_keywords": missing,
+            "match_score": round(match_score, 2),
+            "match_count": len(matched),
+            "total_keywords": total,
+        }
+
+
+def compile_keywords(keywords: Iterable[str]) -> KeywordSet:
+    """Compile a keyword list (duplicates are kept, as the tools always did)."""
+    return _compile_keywords(tuple(keywords or ()))
+
+
+@lru_cache(maxsize=1024)
+def _compile_keywords(keywords: tuple[str, ...]) -> KeywordSet:
+    return KeywordSet(keywords=tuple(compile_keyword(keyword) for keyword in keywords))
+
+
+@lru_cache(maxsize=1024)
+def requirement_terms(requirement: str) -> tuple[CompiledKeyword, ...]:
+    """Extract the significant (>3 chars) terms of a requirement once."""
+    terms = _REQUIREMENT_TERM_RE.findall(requirement.lower())
+    return tuple(compile_keyword(term) for term in dict.fromkeys(terms) if len(term) > 3)
+
+
+@dataclass(frozen=True)
+class ResumeProfile:
+    """Indexed resume: full content plus the skills list."""
+
+    content: ResumeIndex
+    skills: ResumeIndex
+
+    @classmethod
+    def from_resume_data(cls, resume_data: dict[str, Any]) -> "ResumeProfile":
+        """
+        Build a profile from ``{"content", "skills"}`` or a master resume dict.
+
+        When ``content`` is absent, every string in the resume is used as
+        content (the master resume case).
+        """
+        content = resume_data.get("content")
+        if not isinstance(content, str):
+            content = extract_resume_text(resume_data)
+        skills = extract_resume_text(resume_data.get("skills", []))
+        return cls(content=ResumeIndex.from_text(content), skills=ResumeIndex.from_text(skills))
+
+
+# Small LRU of resume profiles keyed by content hash, so graph nodes that see
+# the same master resume on every run do not re-tokenize it.
+_PROFILE_CACHE_SIZE = 32
+_profile_cache: "OrderedDict[str, ResumeProfile]" = OrderedDict()
+
+
+def get_resume_profile(resume_data: dict[str, Any]) -> ResumeProfile:
+    """Return a (cached) ResumeProfile for resume_data."""
+    key = hashlib.sha256(
+        json.dumps(resume_data, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+    profile = _profile_cache.get(key)
+    if profile is not None:
+        _profile_cache.move_to_end(key)
+        return profile
+
+    profile = ResumeProfile.from_resume_data(resume_data)
+    _profile_cache[key] = profile
+    if len(_profile_cache) > _PROFILE_CACHE_SIZE:
+        _profile_cache.popitem(last=False)
+    return profile
+
+
+def experience_score(index: ResumeIndex, requirements: list[str]) -> int:
+    """
+    Percentage of requirements with at least one significant term in the resume.
+
+    Args:
+        index: Indexed resume content
+        requirements: Requirement strings from the job analysis
+
+    Returns:
+        Integer score 0-100 (0 when there are no requirements)
+    """
+    if not requirements:
+        return 0
+    with_evidence = sum(
+        1 for requirement in requirements
+        if any(index.contains(term) for term in requirement_terms(requirement))
+    )
+    return int(with_evidence / len(requirements) * 100)
+
+
+def score_resume(profile: ResumeProfile, job_analysis: dict[str, Any]) -> dict[str, Any]:
+    """
+    Score an indexed resume against one job analysis.
+
+    Returns:
+        Dictionary with overall_score, keyword_score, skills_score,
+        experience_score, and keyword_match (without recommendations).
+    """
+    keyword_match = compile_keywords(job_analysis.get("keywords", [])).match(profile.content)
+    keyword_score = int(keyword_match["match_score"])
+
+    job_skills = job_analysis.get("skills", [])
+    skills_score = (
+        int(compile_keywords(job_skills).match(profile.skills)["match_score"]) if job_skills else 0
+    )
+
+    exp_score = experience_score(profile.content, job_analysis.get("requirements", []))
+
+    overall_score = int(
+        (keyword_score * KEYWORD_WEIGHT) +
+        (skills_score * SKILLS_WEIGHT) +
+        (exp_score * EXPERIENCE_WEIGHT)
+    )
+
+    return {
+        "overall_score": overall_score,
+        "keyword_score": keyword_score,
+        "skills_score": skills_score,
+        "experience_score": exp_score,
+        "keyword_match": keyword_match,
+    }
+
+
+def score_resume_against_jobs(
+    resume_data: dict[str, Any],
+    job_analyses: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """
+    Score one resume against many job analyses in a single pass.
+
+    The resume is indexed once; each job's keyword lists are compiled once
+    (and cached), so the per-job cost is only set lookups.
+
+    Args:
+        resume_data: ``{"content", "skills"}`` dict or a master resume dict
+        job_analyses: Job analysis dicts with keywords/skills/requirements
+
+    Returns:
+        One score dict per job analysis, in input order
+    """
+    profile = get_resume_profile(resume_data)
+    return [score_resume(profile, job_analysis) for job_analysis in job_analyses]
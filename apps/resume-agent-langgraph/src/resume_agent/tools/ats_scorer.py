@@ -1,10 +1,17 @@
 """ATS scorer tool for evaluating resume match against job requirements."""
 
-import re
 from typing import Any
 
 from langchain_core.tools import tool
 
+from .ats_engine import (
+    ResumeIndex,
+    ResumeProfile,
+    compile_keywords,
+    get_resume_profile,
+    score_resume,
+)
+
 
 @tool
 def calculate_keyword_match(resume_text: str, job_keywords: list[str]) -> dict[str, Any]:
@@ -17,39 +24,8 @@ def calculate_keyword_match(resume_text: str, job_keywords: list[str]) -> dict[s
     Returns:
         Dictionary with matched_keywords, missing_keywords, match_score, match_count, and total_keywords.
     """
-    if not job_keywords:
-        return {
-            "matched_keywords": [],
-            "missing_keywords": [],
-            "match_score": 0.0,
-            "match_count": 0,
-            "total_keywords": 0
-        }
-
-    # Normalize resume text for matching (lowercase, remove extra whitespace)
-    normalized_resume = re.sub(r'\s+', ' ', resume_text.lower()).strip()
-
-    matched_keywords: list[str] = []
-    missing_keywords: list[str] = []
-
-    for keyword in job_keywords:
-        # Case-insensitive substring match
-        if keyword.lower() in normalized_resume:
-            matched_keywords.append(keyword)
-        else:
-            missing_keywords.append(keyword)
-
-    match_count = len(matched_keywords)
-    total_keywords = len(job_keywords)
-    match_score = (match_count / total_keywords * 100) if total_keywords > 0 else 0.0
-
-    return {
-        "matched_keywords": matched_keywords,
-        "missing_keywords": missing_keywords,
-        "match_score": round(match_score, 2),
-        "match_count": match_count,
-        "total_keywords": total_keywords
-    }
+    # Word-boundary aware match against a tokenized index of the resume
+    return compile_keywords(job_keywords).match(ResumeIndex.from_text(resume_text))
 
 
 @tool
@@ -63,76 +39,43 @@ def calculate_ats_score(resume_data: dict[str, Any], job_analysis: dict[str, Any
     Returns:
         Dictionary with overall_score, keyword_score, skills_score, experience_score, and recommendations.
     """
-    # Extract resume content and skills
-    resume_content = resume_data.get("content", "")
-    resume_skills = resume_data.get("skills", [])
-
-    # Extract job requirements
-    job_keywords = job_analysis.get("keywords", [])
-    job_skills = job_analysis.get("skills", [])
-    job_requirements = job_analysis.get("requirements", [])
-
-    # 1. Calculate keyword score (40% weight)
-    keyword_match = calculate_keyword_match(resume_content, job_keywords)
-    keyword_score = int(keyword_match["match_score"])
-
-    # 2. Calculate skills score (30% weight)
-    if job_skills:
-        skills_match = calculate_keyword_match(
-            " ".join(resume_skills),
-            job_skills
-        )
-        skills_score = int(skills_match["match_score"])
-    else:
-        skills_score = 0
-
-    # 3. Calculate experience score (30% weight)
-    # Simple heuristic: check if resume mentions key requirement terms
-    experience_keywords = [
-        "years", "experience", "led", "managed", "developed",
-        "implemented", "designed", "architected", "built"
-    ]
-
-    if job_requirements:
-        # Count how many requirements have matching experience indicators
-        requirements_with_evidence = 0
-        for requirement in job_requirements:
-            # Extract key terms from requirement
-            requirement_terms = re.findall(r'\b\w+\b', requirement.lower())
-            # Check if resume has evidence of this requirement
-            has_evidence = any(
-                term in resume_content.lower()
-                for term in requirement_terms
-                if len(term) > 3  # Skip short words
-            )
-            if has_evidence:
-                requirements_with_evidence += 1
+    # Resume is tokenized once (and cached), keyword lists are precompiled
+    return score_profile(get_resume_profile(resume_data), resume_data, job_analysis)
 
-        experience_score = int(
-            (requirements_with_evidence / len(job_requirements) * 100)
-        )
-    else:
-        experience_score = 0
 
-    # Calculate weighted overall score
-    overall_score = int(
-        (keyword_score * 0.4) +
-        (skills_score * 0.3) +
-        (experience_score * 0.3)
-    )
+def score_profile(
+    profile: ResumeProfile,
+    resume_data: dict[str, Any],
+    job_analysis: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    Score an already-indexed resume and attach recommendations.
+
+    Shared by ``calculate_ats_score`` and the resume tailoring nodes so the
+    resume index built for keyword matching is reused for the ATS score.
+
+    Args:
+        profile: Indexed resume (see ``ats_engine.get_resume_profile``)
+        resume_data: Dictionary with 'content' (str) and 'skills' (list[str])
+        job_analysis: Dictionary with 'keywords', 'skills', and 'requirements' lists
+
+    Returns:
+        Dictionary with overall_score, keyword_score, skills_score, experience_score, and recommendations.
+    """
+    score = score_resume(profile, job_analysis)
 
     # Generate recommendations
     recommendations = suggest_improvements(resume_data, job_analysis, {
-        "keyword_match": keyword_match,
-        "skills_score": skills_score,
-        "experience_score": experience_score
+        "keyword_match": score["keyword_match"],
+        "skills_score": score["skills_score"],
+        "experience_score": score["experience_score"]
     })
 
     return {
-        "overall_score": overall_score,
-        "keyword_score": keyword_score,
-        "skills_score": skills_score,
-        "experience_score": experience_score,
+        "overall_score": score["overall_score"],
+        "keyword_score": score["keyword_score"],
+        "skills_score": score["skills_score"],
+        "experience_score": score["experience_score"],
         "recommendations": recommendations
     }
 
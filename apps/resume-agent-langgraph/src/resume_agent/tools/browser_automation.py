@@ -156,9 +156,10 @@ async def create_scraper_agent(browser, use_checkpointing: bool = False):
     # Note: Page objects are not serializable, so checkpointing should only be used
     # if browser session persists across invocations
     if use_checkpointing:
-        from langgraph.checkpoint.memory import MemorySaver
+        from cernji_checkpoint import get_checkpointer
+        from ..config import get_settings
 
-        checkpointer = MemorySaver()
+        checkpointer = get_checkpointer(get_settings().checkpoint_db_path)
         agent = create_react_agent(model=llm, tools=tools, checkpointer=checkpointer)
     else:
         # Default: No checkpointing (recommended for most use cases)
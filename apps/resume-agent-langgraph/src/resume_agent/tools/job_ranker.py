@@ -0,0 +1,357 @@
+"""Rank every stored job analysis against the master resume.
+
+Scores the master resume against all saved job analyses in one vectorized
+pass and returns them ordered by overall ATS score, so choosing which of
+hundreds of saved postings to apply to first is a single call.
+
+How the pass works:
+1. All stored analyses are loaded with a single SQL query (child rows are
+   aggregated with ``json_group_array``).
+2. Every distinct keyword / requirement term across all jobs is compiled once
+   (``ats_engine.compile_keyword``) and checked against the resume index
+   once, giving a boolean hit vector over the shared vocabulary.
+3. Jobs are encoded as sparse incidence lists (job id, vocabulary id); per-job
+   match counts are ``np.bincount`` over the hit vector, so cost is linear in
+   the total number of keywords rather than jobs x keywords x resume length.
+
+Scores use the same weights and rounding as ``calculate_ats_score``.
+
+Usage (CLI):
+    python -m resume_agent.tools.job_ranker --top 20
+    python -m resume_agent.tools.job_ranker --resume resume.json --db path/to/resume_agent.db
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+from langchain_core.tools import tool
+
+from .ats_engine import (
+    EXPERIENCE_WEIGHT,
+    KEYWORD_WEIGHT,
+    SKILLS_WEIGHT,
+    CompiledKeyword,
+    ResumeIndex,
+    compile_keyword,
+    get_resume_profile,
+    requirement_terms,
+)
+
+
+# Shared database written by the resume-agent MCP server
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent.parent.parent
+DEFAULT_DB_PATH = PROJECT_ROOT / "apps" / "resume-agent" / "data" / "resume_agent.db"
+
+# Same aggregation as the resume-agent repository's bulk hydration: children
+# are aggregated from ORDER BY id subqueries so list order is deterministic
+_LOAD_JOB_ANALYSES_SQL = """
+SELECT
+    ja.id,
+    ja.url,
+    ja.company,
+    ja.job_title,
+    ja.location,
+    ja.salary_range,
+    ja.fetched_at,
+    (SELECT json_group_array(keyword) FROM (
+        SELECT keyword FROM job_keywords WHERE job_id = ja.id ORDER BY id
+    )),
+    (SELECT json_group_array(description) FROM (
+        SELECT description FROM job_qualifications
+        WHERE job_id = ja.id AND qualification_type = 'required' ORDER BY id
+    )),
+    (SELECT json_group_array(description) FROM (
+        SELECT description FROM job_qualifications
+        WHERE job_id = ja.id AND qualification_type = 'preferred' ORDER BY id
+    )),
+    (SELECT json_group_array(description) FROM (
+        SELECT description FROM job_responsibilities WHERE job_id = ja.id ORDER BY id
+    ))
+FROM job_applications ja
+WHERE ja.user_id = ?
+ORDER BY ja.id
+"""
+
+
+def get_database_path() -> Path:
+    """Resolve the shared SQLite database path (SQLITE_DATABASE_PATH overrides)."""
+    return Path(os.getenv("SQLITE_DATABASE_PATH", str(DEFAULT_DB_PATH)))
+
+
+def load_stored_job_analyses(
+    db_path: Optional[str | Path] = None,
+    user_id: Optional[str] = None
+) -> list[dict[str, Any]]:
+    """
+    Load every stored job analysis for a user with a single query.
+
+    Args:
+        db_path: SQLite database path (defaults to get_database_path())
+        user_id: Owner of the analyses (defaults to USER_ID env var or "default")
+
+    Returns:
+        List of job analysis dicts in the shape returned by data_read_job_analysis
+    """
+    db_path = Path(db_path) if db_path else get_database_path()
+    user_id = user_id or os.getenv("USER_ID", "default")
+
+    if not db_path.exists():
+        return []
+
+    # as_uri() percent-encodes ?, # and % and handles Windows drive paths
+    conn = sqlite3.connect(db_path.resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        rows = conn.execute(_LOAD_JOB_ANALYSES_SQL, (user_id,)).fetchall()
+    finally:
+        conn.close()
+
+    return [
+        {
+            "id": row[0],
+            "url": row[1],
+            "company": row[2],
+            "job_title": row[3],
+            "location": row[4],
+            "salary_range": row[5],
+            "fetched_at": row[6],
+            "keywords": json.loads(row[7]),
+            "required_qualifications": json.loads(row[8]),
+            "preferred_qualifications": json.loads(row[9]),
+            "responsibilities": json.loads(row[10]),
+        }
+        for row in rows
+    ]
+
+
+def _scoring_fields(job_analysis: dict[str, Any]) -> tuple[list[str], list[str], list[str]]:
+    """
+    Map a job analysis onto the (keywords, skills, requirements) scoring inputs.
+
+    Stored analyses have no separate skills list or requirements field, so
+    skills fall back to the ATS keywords and requirements to the required +
+    preferred qualifications.
+    """
+    keywords = job_analysis.get("keywords") or []
+    skills = job_analysis.get("skills") or keywords
+    requirements = job_analysis.get("requirements") or (
+        (job_analysis.get("required_qualifications") or []) +
+        (job_analysis.get("preferred_qualifications") or [])
+    )
+    return keywords, skills, requirements
+
+
+class _Vocabulary:
+    """Shared vocabulary of compiled keywords with one resume lookup each."""
+
+    def __init__(self) -> None:
+        self.ids: dict[str, int] = {}
+        self.keys: list[CompiledKeyword] = []
+
+    def add(self, key: CompiledKeyword) -> int:
+        # Keywords differing only in case/spacing share one vocabulary entry
+        vocab_id = self.ids.get(key.normalized)
+        if vocab_id is None:
+            vocab_id = self.ids[key.normalized] = len(self.keys)
+            self.keys.append(key)
+        return vocab_id
+
+    def hits(self, index: ResumeIndex) -> np.ndarray:
+        return np.fromiter((index.contains(key) for key in self.keys), dtype=bool, count=len(self.keys))
+
+
+def _incidence(rows: list[list[int]]) -> tuple[np.ndarray, np.ndarray]:
+    """Flatten per-row vocabulary ids into sparse (row_ids, col_ids) arrays."""
+    lengths = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+    row_ids = np.repeat(np.arange(len(rows)), lengths)
+    col_ids = np.fromiter((col for row in rows for col in row), dtype=np.int64, count=int(lengths.sum()))
+    return row_ids, col_ids
+
+
+def _percent(matched: np.ndarray, total: np.ndarray) -> np.ndarray:
+    """int(round(matched / total * 100, 2)) per element, 0 where total == 0."""
+    ratio = np.divide(matched * 100.0, total, out=np.zeros(len(total)), where=total > 0)
+    return np.floor(np.round(ratio, 2)).astype(int)
+
+
+def rank_job_analyses(
+    resume_data: dict[str, Any],
+    job_analyses: list[dict[str, Any]],
+    top_k: Optional[int] = None
+) -> list[dict[str, Any]]:
+    """
+    Score a resume against many job analyses at once and rank them.
+
+    Args:
+        resume_data: ``{"content", "skills"}`` dict or a master resume dict
+        job_analyses: Job analysis dicts (stored or freshly analyzed)
+        top_k: Return only the best top_k jobs (all when None)
+
+    Returns:
+        Ranked list of {rank, company, job_title, url, overall_score,
+        keyword_score, skills_score, experience_score, matched_keywords,
+        missing_keywords}, best match first
+    """
+    if not job_analyses:
+        return []
+
+    profile = get_resume_profile(resume_data)
+    vocab = _Vocabulary()
+
+    keyword_rows: list[list[int]] = []
+    skill_rows: list[list[int]] = []
+    requirement_rows: list[list[int]] = []  # per requirement: vocab ids of its terms
+    requirement_job_ids: list[int] = []
+    requirement_counts: list[int] = []
+
+    for job_id, job_analysis in enumerate(job_analyses):
+        keywords, skills, requirements = _scoring_fields(job_analysis)
+        keyword_rows.append([vocab.add(compile_keyword(k)) for k in keywords])
+        skill_rows.append([vocab.add(compile_keyword(s)) for s in skills])
+        for requirement in requirements:
+            requirement_rows.append([vocab.add(term) for term in requirement_terms(requirement)])
+            requirement_job_ids.append(job_id)
+        requirement_counts.append(len(requirements))
+
+    n_jobs = len(job_analyses)
+    content_hits = vocab.hits(profile.content)
+    skills_hits = vocab.hits(profile.skills)
+
+    # Keyword and skills dimensions: hit counts per job over sparse incidence
+    kw_rows, kw_cols = _incidence(keyword_rows)
+    keyword_total = np.bincount(kw_rows, minlength=n_jobs)
+    keyword_matched = np.bincount(kw_rows, weights=content_hits[kw_cols], minlength=n_jobs)
+
+    sk_rows, sk_cols = _incidence(skill_rows)
+    skills_total = np.bincount(sk_rows, minlength=n_jobs)
+    skills_matched = np.bincount(sk_rows, weights=skills_hits[sk_cols], minlength=n_jobs)
+
+    # Experience dimension: a requirement has evidence if any of its terms hit
+    rq_rows, rq_cols = _incidence(requirement_rows)
+    term_hits = np.bincount(rq_rows, weights=content_hits[rq_cols], minlength=len(requirement_rows))
+    requirement_job_ids_arr = np.asarray(requirement_job_ids, dtype=np.int64)
+    experience_matched = np.bincount(
+        requirement_job_ids_arr, weights=(term_hits > 0), minlength=n_jobs
+    )
+    experience_total = np.asarray(requirement_counts)
+
+    keyword_scores = _percent(keyword_matched, keyword_total)
+    skills_scores = _percent(skills_matched, skills_total)
+    experience_scores = _percent(experience_matched, experience_total)
+    overall_scores = np.floor(
+        keyword_scores * KEYWORD_WEIGHT +
+        skills_scores * SKILLS_WEIGHT +
+        experience_scores * EXPERIENCE_WEIGHT
+    ).astype(int)
+
+    # Best overall first; ties broken by keyword score, then input order
+    order = np.lexsort((np.arange(n_jobs), -keyword_scores, -overall_scores))
+    if top_k is not None:
+        order = order[:top_k]
+
+    ranked = []
+    for rank, job_id in enumerate(order.tolist(), start=1):
+        job_analysis = job_analyses[job_id]
+        keywords = _scoring_fields(job_analysis)[0]
+        hits = content_hits[keyword_rows[job_id]] if keyword_rows[job_id] else []
+        ranked.append({
+            "rank": rank,
+            "company": job_analysis.get("company"),
+            "job_title": job_analysis.get("job_title"),
+            "url": job_analysis.get("url") or job_analysis.get("job_url"),
+            "overall_score": int(overall_scores[job_id]),
+            "keyword_score": int(keyword_scores[job_id]),
+            "skills_score": int(skills_scores[job_id]),
+            "experience_score": int(experience_scores[job_id]),
+            "matched_keywords": [k for k, hit in zip(keywords, hits) if hit],
+            "missing_keywords": [k for k, hit in zip(keywords, hits) if not hit],
+        })
+    return ranked
+
+
+@tool
+def rank_saved_jobs(top_k: int = 10) -> dict[str, Any]:
+    """Rank all saved job analyses by how well the master resume matches them.
+
+    Scores the master resume against every stored job analysis (keyword 40%,
+    skills 30%, experience 30%) and returns the best matches first.
+
+    Args:
+        top_k: Number of top-ranked jobs to return
+
+    Returns:
+        Dictionary with status, total_jobs, duration_ms and a ranked list of jobs
+        with per-dimension scores and missing keywords.
+    """
+    from .resume_parser import load_master_resume
+
+    start_time = time.time()
+
+    resume_result = load_master_resume.invoke({})
+    if resume_result.get("status") != "success":
+        return {"status": "error", "error": resume_result.get("error", "Master resume not available")}
+
+    try:
+        job_analyses = load_stored_job_analyses()
+    except sqlite3.Error as e:
+        return {"status": "error", "error": f"Failed to load saved job analyses: {str(e)}"}
+
+    ranked = rank_job_analyses(resume_result["data"], job_analyses, top_k=top_k)
+
+    return {
+        "status": "success",
+        "total_jobs": len(job_analyses),
+        "ranked_jobs": ranked,
+        "duration_ms": round((time.time() - start_time) * 1000, 2),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """CLI entry point: print saved jobs ranked against the master resume."""
+    parser = argparse.ArgumentParser(description="Rank saved job analyses against the master resume")
+    parser.add_argument("--db", help="SQLite database path (default: SQLITE_DATABASE_PATH or shared db)")
+    parser.add_argument("--user-id", help="User ID (default: USER_ID or 'default')")
+    parser.add_argument("--resume", help="Resume JSON file (default: master resume from the database)")
+    parser.add_argument("--top", type=int, default=20, help="Number of jobs to show")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    if args.resume:
+        resume_data = json.loads(Path(args.resume).read_text(encoding="utf-8"))
+    else:
+        from .resume_parser import load_master_resume
+
+        resume_result = load_master_resume.invoke({})
+        if resume_result.get("status") != "success":
+            print(f"[ERROR] {resume_result.get('error')}", file=sys.stderr)
+            return 1
+        resume_data = resume_result["data"]
+
+    start_time = time.time()
+    job_analyses = load_stored_job_analyses(args.db, args.user_id)
+    ranked = rank_job_analyses(resume_data, job_analyses, top_k=args.top)
+    duration_ms = (time.time() - start_time) * 1000
+
+    if args.json:
+        print(json.dumps(ranked, indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"Ranked {len(job_analyses)} saved jobs in {duration_ms:.0f}ms\n")
+    print(f"{'#':>3}  {'ATS':>3}  {'KW':>3}  {'SK':>3}  {'EXP':>3}  Job")
+    for job in ranked:
+        print(
+            f"{job['rank']:>3}  {job['overall_score']:>3}  {job['keyword_score']:>3}  "
+            f"{job['skills_score']:>3}  {job['experience_score']:>3}  "
+            f"{job['company']} - {job['job_title']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Integration tests for async-native graph nodes.
+
+Verifies that LLM-bound nodes await the async client instead of blocking a
+worker thread, so many graph runs share one event loop, and that the sync
+shims still work for scripts and sync tests.
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from resume_agent.nodes import job_analysis
+from resume_agent.llm import providers
+from resume_agent.nodes.sync import sync_node
+
+
+LATENCY = 0.1
+
+
+async def fake_llm(messages, system_prompt):
+    await asyncio.sleep(LATENCY)
+    return json.dumps({"company": "Acme", "job_title": "Engineer"})
+
+
+def _state(i: int) -> dict:
+    return {"job_url": f"https://example.com/jobs/{i}", "job_content": "posting", "errors": []}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_share_event_loop(monkeypatch):
+    """50 concurrent analyses with 100ms LLM latency finish in ~one latency."""
+    monkeypatch.setattr(job_analysis, "_job_cache", {})
+
+    with patch.object(job_analysis, "acall_llm", fake_llm):
+        start = time.perf_counter()
+        results = await asyncio.gather(*(job_analysis.analyze_job_node(_state(i)) for i in range(50)))
+        elapsed = time.perf_counter() - start
+
+    assert all(r["job_analysis"]["company"] == "Acme" for r in results)
+    assert elapsed < LATENCY * 5  # sequential would take 50 x LATENCY
+
+
+def test_sync_shim_runs_node(monkeypatch):
+    monkeypatch.setattr(job_analysis, "_job_cache", {})
+
+    with patch.object(job_analysis, "acall_llm", fake_llm):
+        result = job_analysis.analyze_job_node_sync(_state(1))
+
+    assert result["job_analysis"]["job_title"] == "Engineer"
+    assert job_analysis.analyze_job_node_sync.__name__ == "analyze_job_node_sync"
+
+
+def test_sync_shim_closes_loop_clients():
+    """Clients cached for a sync call's event loop are closed when it ends."""
+    class FakeClient:
+        closed = False
+
+        async def close(self):
+            self.closed = True
+
+    clients = []
+
+    async def node(state):
+        client = FakeClient()
+        providers._async_clients.setdefault(asyncio.get_running_loop(), {})[("openai", "key")] = client
+        clients.append(client)
+        return {}
+
+    sync_node(node)({})
+    sync_node(node)({})
+
+    assert [client.closed for client in clients] == [True, True]
+    assert len(providers._async_clients) == 0
+
+
+@pytest.mark.asyncio
+async def test_sync_shim_rejects_running_loop():
+    async def node(state):
+        return {}
+
+    with pytest.raises(RuntimeError, match="await node"):
+        sync_node(node)({})
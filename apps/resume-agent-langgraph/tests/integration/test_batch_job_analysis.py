@@ -0,0 +1,107 @@
+"""
+Integration tests for the batch job analysis workflow.
+
+The fetch/analyze nodes are patched so these tests exercise the fan-out,
+deduplication, concurrency limits and streaming without a browser or LLM.
+"""
+
+import asyncio
+
+import pytest
+
+from resume_agent.config import get_settings, reset_settings
+from resume_agent.graphs import batch_job_analysis
+from resume_agent.nodes import job_analysis as job_analysis_nodes
+
+
+@pytest.fixture
+def patched_nodes(monkeypatch):
+    """Patch fetch/analyze nodes and track peak concurrency per stage."""
+    active = {"fetch": 0, "analyze": 0}
+    peak = {"fetch": 0, "analyze": 0}
+    calls = []
+
+    async def fake_fetch(state):
+        active["fetch"] += 1
+        peak["fetch"] = max(peak["fetch"], active["fetch"])
+        calls.append(state["job_url"])
+        await asyncio.sleep(0.02)
+        active["fetch"] -= 1
+        if "broken" in state["job_url"]:
+            return {"errors": state.get("errors", []) + ["Failed to fetch job posting: 404"]}
+        return {"job_content": f"content for {state['job_url']}"}
+
+    async def fake_analyze(state):
+        active["analyze"] += 1
+        peak["analyze"] = max(peak["analyze"], active["analyze"])
+        await asyncio.sleep(0.02)
+        active["analyze"] -= 1
+        return {"job_analysis": {"url": state["job_url"], "job_title": "Engineer"}}
+
+    monkeypatch.setattr(batch_job_analysis, "fetch_job_node", fake_fetch)
+    monkeypatch.setattr(batch_job_analysis, "analyze_job_node", fake_analyze)
+    monkeypatch.setattr(job_analysis_nodes, "_job_cache", {})
+    monkeypatch.setattr(batch_job_analysis, "_semaphores", batch_job_analysis.weakref.WeakKeyDictionary())
+
+    reset_settings()
+    settings = get_settings()
+    monkeypatch.setattr(settings, "batch_browser_concurrency", 2)
+    monkeypatch.setattr(settings, "batch_llm_concurrency", 3)
+    yield {"peak": peak, "calls": calls}
+    reset_settings()
+
+
+@pytest.mark.asyncio
+async def test_batch_dedupes_and_respects_concurrency(patched_nodes):
+    urls = [f"https://example.com/jobs/{i}" for i in range(8)]
+    job_analysis_nodes._job_cache[urls[0]] = {"job_title": "Cached"}
+
+    graph = batch_job_analysis.build_batch_job_analysis_graph()
+    result = await graph.ainvoke({"job_urls": urls + [urls[1], f" {urls[2]} "]})
+
+    # One result per unique URL, cache hit never fetched
+    assert sorted(r["job_url"] for r in result["results"]) == sorted(urls)
+    assert urls[0] not in patched_nodes["calls"]
+    assert len(patched_nodes["calls"]) == 7
+
+    cached = [r for r in result["results"] if r["cached"]]
+    assert [r["job_url"] for r in cached] == [urls[0]]
+
+    assert patched_nodes["peak"]["fetch"] <= 2
+    assert patched_nodes["peak"]["analyze"] <= 3
+
+    stats = result["stage_stats"]
+    assert stats["fetch"]["count"] == 7
+    assert stats["analyze"]["count"] == 7
+    assert stats["fetch"]["throughput_per_sec"] > 0
+
+
+@pytest.mark.asyncio
+async def test_batch_streams_results_and_keeps_partial_failures(patched_nodes, monkeypatch):
+    graph = batch_job_analysis.build_batch_job_analysis_graph()
+    monkeypatch.setattr(batch_job_analysis, "graph", graph)
+
+    urls = ["https://example.com/jobs/ok", "https://example.com/jobs/broken"]
+    events = [event async for event in batch_job_analysis.astream_batch_job_analysis(urls)]
+
+    job_events = [e for e in events if e["type"] == "job_result"]
+    assert {e["job_url"] for e in job_events} == set(urls)
+    assert events[-1]["type"] == "batch_stats"
+
+    broken = next(e for e in job_events if e["job_url"].endswith("broken"))
+    assert broken["job_analysis"] is None
+    assert broken["errors"]
+    assert events[-1]["stage_stats"]["fetch"]["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_all_cached_skips_fan_out(patched_nodes):
+    url = "https://example.com/jobs/cached"
+    job_analysis_nodes._job_cache[url] = {"job_title": "Cached"}
+
+    graph = batch_job_analysis.build_batch_job_analysis_graph()
+    result = await graph.ainvoke({"job_urls": [url]})
+
+    assert patched_nodes["calls"] == []
+    assert result["results"][0]["cached"] is True
+    assert "fetch" not in result["stage_stats"]
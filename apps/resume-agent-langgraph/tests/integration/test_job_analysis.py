@@ -18,7 +18,7 @@ License: Experimental
 
 import json
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from datetime import datetime
 
 # Import tool functions
@@ -33,6 +33,7 @@ from src.resume_agent.nodes.job_analysis import (
     check_cache_node,
     fetch_job_node,
     analyze_job_node,
+    analyze_job_node_sync,
     _job_cache
 )
 
@@ -498,7 +499,7 @@ class TestFetchJobNode:
 class TestAnalyzeJobNode:
     """Tests for analyze_job_node()."""
 
-    @patch('src.resume_agent.nodes.job_analysis.call_llm')
+    @patch('src.resume_agent.nodes.job_analysis.acall_llm', new_callable=AsyncMock)
     def test_analyze_success(self, mock_llm, initial_state, sample_llm_response):
         """Test successful job analysis."""
         # Setup state with job content
@@ -511,7 +512,7 @@ class TestAnalyzeJobNode:
         mock_llm.return_value = sample_llm_response
 
         # Execute
-        result = analyze_job_node(state)
+        result = analyze_job_node_sync(state)
 
         # Verify result
         assert "job_analysis" in result
@@ -523,7 +524,7 @@ class TestAnalyzeJobNode:
         # Verify LLM was called
         mock_llm.assert_called_once()
 
-    @patch('src.resume_agent.nodes.job_analysis.call_llm')
+    @patch('src.resume_agent.nodes.job_analysis.acall_llm', new_callable=AsyncMock)
     def test_analyze_with_markdown_json(self, mock_llm, initial_state):
         """Test parsing JSON wrapped in markdown code blocks."""
         state = {
@@ -536,24 +537,24 @@ class TestAnalyzeJobNode:
         mock_llm.return_value = llm_response
 
         # Execute
-        result = analyze_job_node(state)
+        result = analyze_job_node_sync(state)
 
         # Verify parsing succeeded
         assert "job_analysis" in result
         assert result["job_analysis"]["company"] == "Test"
 
-    @patch('src.resume_agent.nodes.job_analysis.call_llm')
+    @patch('src.resume_agent.nodes.job_analysis.acall_llm', new_callable=AsyncMock)
     def test_analyze_no_content(self, mock_llm, initial_state):
         """Test error when no job content available."""
         # Execute with empty content
-        result = analyze_job_node(initial_state)
+        result = analyze_job_node_sync(initial_state)
 
         # Verify error recorded
         assert "errors" in result
         assert len(result["errors"]) > 0
         assert "No job content" in result["errors"][0]
 
-    @patch('src.resume_agent.nodes.job_analysis.call_llm')
+    @patch('src.resume_agent.nodes.job_analysis.acall_llm', new_callable=AsyncMock)
     def test_analyze_invalid_json(self, mock_llm, initial_state):
         """Test error handling for invalid JSON response."""
         state = {
@@ -565,14 +566,14 @@ class TestAnalyzeJobNode:
         mock_llm.return_value = "This is not valid JSON"
 
         # Execute
-        result = analyze_job_node(state)
+        result = analyze_job_node_sync(state)
 
         # Verify error recorded
         assert "errors" in result
         assert len(result["errors"]) > 0
         assert "Failed to parse" in result["errors"][0]
 
-    @patch('src.resume_agent.nodes.job_analysis.call_llm')
+    @patch('src.resume_agent.nodes.job_analysis.acall_llm', new_callable=AsyncMock)
     def test_analyze_caches_result(self, mock_llm, initial_state, sample_llm_response):
         """Test that successful analysis is cached."""
         state = {
@@ -583,14 +584,14 @@ class TestAnalyzeJobNode:
         mock_llm.return_value = sample_llm_response
 
         # Execute
-        result = analyze_job_node(state)
+        result = analyze_job_node_sync(state)
 
         # Verify result was cached
         job_url = state["job_url"]
         assert job_url in _job_cache
         assert _job_cache[job_url] == result["job_analysis"]
 
-    @patch('src.resume_agent.nodes.job_analysis.call_llm')
+    @patch('src.resume_agent.nodes.job_analysis.acall_llm', new_callable=AsyncMock)
     def test_analyze_llm_exception(self, mock_llm, initial_state):
         """Test error handling when LLM call fails."""
         state = {
@@ -602,7 +603,7 @@ class TestAnalyzeJobNode:
         mock_llm.side_effect = Exception("LLM API error")
 
         # Execute
-        result = analyze_job_node(state)
+        result = analyze_job_node_sync(state)
 
         # Verify error recorded
         assert "errors" in result
@@ -654,7 +655,7 @@ class TestShouldFetch:
 class TestJobAnalysisGraph:
     """Integration tests for complete job analysis workflow."""
 
-    @patch('src.resume_agent.nodes.job_analysis.call_llm')
+    @patch('src.resume_agent.nodes.job_analysis.acall_llm', new_callable=AsyncMock)
     def test_full_workflow_cache_miss(self, mock_llm, initial_state, sample_llm_response):
         """Test complete workflow from URL to analysis (cache miss)."""
         # Setup
@@ -694,7 +695,7 @@ class TestJobAnalysisGraph:
         # Verify fetch/analyze were skipped (no job_content)
         assert result["job_content"] is None
 
-    @patch('src.resume_agent.nodes.job_analysis.call_llm')
+    @patch('src.resume_agent.nodes.job_analysis.acall_llm', new_callable=AsyncMock)
     def test_workflow_error_accumulation(self, mock_llm, initial_state):
         """Test that errors are accumulated during workflow."""
         # Setup failing LLM
@@ -710,7 +711,7 @@ class TestJobAnalysisGraph:
         # Verify errors were accumulated
         assert len(result.get("errors", [])) > 0
 
-    @patch('src.resume_agent.nodes.job_analysis.call_llm')
+    @patch('src.resume_agent.nodes.job_analysis.acall_llm', new_callable=AsyncMock)
     def test_workflow_multiple_runs(self, mock_llm, sample_llm_response):
         """Test multiple workflow runs with same thread_id."""
         mock_llm.return_value = sample_llm_response
@@ -826,7 +827,7 @@ class TestJobAnalysisState:
 class TestPerformance:
     """Performance-related tests."""
 
-    @patch('src.resume_agent.nodes.job_analysis.call_llm')
+    @patch('src.resume_agent.nodes.job_analysis.acall_llm', new_callable=AsyncMock)
     def test_timing_tracked(self, mock_llm, initial_state, sample_llm_response):
         """Test that duration_ms is tracked."""
         state = {
@@ -5,7 +5,7 @@ This module tests checkpoint save/load/resume operations with real checkpoint sa
 to ensure graph state can be persisted and recovered correctly.
 
 Key Testing Strategy:
-- Use MemorySaver for in-memory checkpointing (SqliteSaver requires langgraph-checkpoint-sqlite)
+- Use the durable cernji-checkpoint SqliteCheckpointer on a temporary database
 - Test checkpoint lifecycle (save, load, resume)
 - Verify thread_id-based state recovery
 - Test checkpoint listing and retrieval
@@ -16,8 +16,8 @@ References:
 - LangGraph Docs: ai_docs/ai-ml/langgraph/official-docs/checkpointing.md
 - LangGraph Examples: ai_docs/ai-ml/langgraph/github-repo/memory-persistence.md
 
-Note: SqliteSaver is available via `pip install langgraph-checkpoint-sqlite` (optional dependency)
-For now, we use MemorySaver which provides the same checkpoint interface.
+Note: SqliteCheckpointer (libs/cernji-checkpoint-py) is the same checkpointer the
+graphs use in production, so these tests exercise real SQLite persistence.
 """
 
 import pytest
@@ -26,7 +26,7 @@ from pathlib import Path
 from typing import Annotated
 from typing_extensions import TypedDict
 
-from langgraph.checkpoint.memory import MemorySaver
+from cernji_checkpoint import SqliteCheckpointer
 from langgraph.graph import StateGraph, START, END
 from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
 
@@ -95,9 +95,11 @@ def data_node(state: CheckpointTestState) -> dict:
 
 
 @pytest.fixture
-def checkpointer():
-    """Create in-memory checkpointer for testing."""
-    return MemorySaver()
+def checkpointer(tmp_path):
+    """Create a durable SQLite checkpointer on a temporary database."""
+    saver = SqliteCheckpointer(tmp_path / "checkpoints.db")
+    yield saver
+    saver.close()
 
 
 @pytest.fixture
@@ -418,6 +420,21 @@ def test_checkpoint_in_memory_persistence(checkpointer, simple_graph):
     assert cp_dict["channel_values"]["counter"] == 43
 
 
+def test_checkpoint_survives_restart(tmp_path, simple_graph):
+    """Test that checkpoints survive closing and reopening the database."""
+    db_path = tmp_path / "restart.db"
+    config = {"configurable": {"thread_id": "restart-test"}}
+
+    with SqliteCheckpointer(db_path) as saver:
+        graph = simple_graph.compile(checkpointer=saver)
+        graph.invoke({"messages": [], "counter": 7}, config=config)
+
+    # New process-equivalent: fresh checkpointer on the same file
+    with SqliteCheckpointer(db_path) as saver:
+        graph = simple_graph.compile(checkpointer=saver)
+        assert graph.get_state(config).values["counter"] == 8
+
+
 # ============================================================================
 # TEST COMPLEX STATE WITH NESTED DATA
 # ============================================================================
@@ -19,7 +19,7 @@ License: Experimental
 
 import json
 import pytest
-from unittest.mock import Mock, patch, mock_open, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, mock_open, MagicMock
 from pathlib import Path
 
 # Import tool functions
@@ -40,6 +40,7 @@ from src.resume_agent.nodes.resume_tailor import (
     load_resume_node,
     analyze_requirements_node,
     tailor_resume_node,
+    tailor_resume_node_sync,
     validate_tailoring_node
 )
 
@@ -828,7 +829,7 @@ class TestAnalyzeRequirementsNode:
 class TestTailorResumeNode:
     """Tests for tailor_resume_node()."""
 
-    @patch('src.resume_agent.nodes.resume_tailor.call_llm')
+    @patch('src.resume_agent.nodes.resume_tailor.acall_llm', new_callable=AsyncMock)
     def test_tailor_resume_node_success(self, mock_llm, sample_master_resume, sample_job_analysis):
         """Test successful resume tailoring."""
         llm_response = json.dumps({
@@ -844,14 +845,14 @@ class TestTailorResumeNode:
             "errors": []
         }
 
-        result = tailor_resume_node(state)
+        result = tailor_resume_node_sync(state)
 
         assert "tailored_resume" in result
         assert "keywords_integrated" in result
         assert len(result["keywords_integrated"]) == 3
         assert "errors" not in result or result.get("errors") == []
 
-    @patch('src.resume_agent.nodes.resume_tailor.call_llm')
+    @patch('src.resume_agent.nodes.resume_tailor.acall_llm', new_callable=AsyncMock)
     def test_tailor_resume_node_markdown_json(self, mock_llm, sample_master_resume, sample_job_analysis):
         """Test parsing JSON wrapped in markdown code blocks."""
         llm_response = "```json\n" + json.dumps({
@@ -866,12 +867,12 @@ class TestTailorResumeNode:
             "errors": []
         }
 
-        result = tailor_resume_node(state)
+        result = tailor_resume_node_sync(state)
 
         assert "tailored_resume" in result
         assert result["tailored_resume"] == "Resume content"
 
-    @patch('src.resume_agent.nodes.resume_tailor.call_llm')
+    @patch('src.resume_agent.nodes.resume_tailor.acall_llm', new_callable=AsyncMock)
     def test_tailor_resume_node_invalid_json(self, mock_llm, sample_master_resume, sample_job_analysis):
         """Test error handling for invalid JSON response."""
         mock_llm.return_value = "This is not valid JSON"
@@ -882,7 +883,7 @@ class TestTailorResumeNode:
             "errors": []
         }
 
-        result = tailor_resume_node(state)
+        result = tailor_resume_node_sync(state)
 
         assert "errors" in result
         assert len(result["errors"]) == 1
@@ -896,7 +897,7 @@ class TestTailorResumeNode:
             "errors": []
         }
 
-        result = tailor_resume_node(state)
+        result = tailor_resume_node_sync(state)
 
         assert "errors" in result
         assert "No master resume" in result["errors"][0]
@@ -909,12 +910,12 @@ class TestTailorResumeNode:
             "errors": []
         }
 
-        result = tailor_resume_node(state)
+        result = tailor_resume_node_sync(state)
 
         assert "errors" in result
         assert "No job analysis" in result["errors"][0]
 
-    @patch('src.resume_agent.nodes.resume_tailor.call_llm')
+    @patch('src.resume_agent.nodes.resume_tailor.acall_llm', new_callable=AsyncMock)
     def test_tailor_resume_node_llm_exception(self, mock_llm, sample_master_resume, sample_job_analysis):
         """Test error handling when LLM call fails."""
         mock_llm.side_effect = Exception("LLM API error")
@@ -925,7 +926,7 @@ class TestTailorResumeNode:
             "errors": []
         }
 
-        result = tailor_resume_node(state)
+        result = tailor_resume_node_sync(state)
 
         assert "errors" in result
         assert "Failed to tailor resume" in result["errors"][0]
@@ -1038,7 +1039,7 @@ class TestResumeTailoringWorkflow:
     """Integration tests for complete resume tailoring workflow."""
 
     @patch('src.resume_agent.nodes.resume_tailor.load_master_resume')
-    @patch('src.resume_agent.nodes.resume_tailor.call_llm')
+    @patch('src.resume_agent.nodes.resume_tailor.acall_llm', new_callable=AsyncMock)
     def test_full_workflow_success(
         self,
         mock_llm,
@@ -1084,7 +1085,7 @@ class TestResumeTailoringWorkflow:
         assert len(state.get("errors", [])) == 0
 
         # 3. Tailor resume
-        state.update(tailor_resume_node(state))
+        state.update(tailor_resume_node_sync(state))
         assert state["tailored_resume"] is not None
         assert len(state["keywords_integrated"]) > 0
         assert len(state.get("errors", [])) == 0
@@ -1127,7 +1128,7 @@ class TestResumeTailoringWorkflow:
         assert "No" in state["errors"][1]  # "No job analysis" or "No master resume"
 
     @patch('src.resume_agent.nodes.resume_tailor.load_master_resume')
-    @patch('src.resume_agent.nodes.resume_tailor.call_llm')
+    @patch('src.resume_agent.nodes.resume_tailor.acall_llm', new_callable=AsyncMock)
     def test_workflow_ats_score_improvement(
         self,
         mock_llm,
@@ -1173,7 +1174,7 @@ class TestResumeTailoringWorkflow:
         state.update(analyze_requirements_node(state))
         initial_score = state["initial_ats_score"]["match_percentage"]
 
-        state.update(tailor_resume_node(state))
+        state.update(tailor_resume_node_sync(state))
         state.update(validate_tailoring_node(state))
         final_score = state["final_ats_score"]["match_percentage"]
 
@@ -0,0 +1,96 @@
+"""
+Integration tests for token streaming from tailoring and cover-letter nodes.
+
+The LLM is replaced by a fake that feeds the response to ``on_text`` in small
+chunks; the graph is consumed with stream_mode=["custom", "values"] to check
+that deltas arrive before the node finishes and that final state is unchanged.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+import pytest
+from langgraph.graph import StateGraph, START, END
+
+from src.resume_agent.nodes import cover_letter, resume_tailor
+from src.resume_agent.state import ResumeAgentState
+
+
+class StreamingTestState(ResumeAgentState, total=False):
+    """Agent state plus the node-local keys both nodes read and write."""
+    context: Optional[Dict[str, Any]]
+    keywords_integrated: List[str]
+    errors: List[str]
+
+
+def _fake_llm(response: str, chunk_size: int = 5):
+    async def fake(messages, system_prompt, on_text=None):
+        if on_text:
+            for i in range(0, len(response), chunk_size):
+                on_text(response[i:i + chunk_size])
+        return response
+    return fake
+
+
+def _single_node_graph(name, node):
+    # Wrap the node so LangGraph reads its input schema from StreamingTestState
+    # rather than the node's ResumeAgentState annotation (which drops "context")
+    async def run(state: StreamingTestState) -> dict:
+        return await node(state)
+
+    graph = StateGraph(StreamingTestState)
+    graph.add_node(name, run)
+    graph.add_edge(START, name)
+    graph.add_edge(name, END)
+    return graph.compile()
+
+
+async def _run(graph, state):
+    deltas, final = [], None
+    async for mode, chunk in graph.astream(state, stream_mode=["custom", "values"]):
+        if mode == "custom":
+            deltas.append(chunk)
+        else:
+            final = chunk
+    return deltas, final
+
+
+@pytest.mark.asyncio
+async def test_tailor_resume_streams_deltas(sample_resume_data, sample_job_analysis):
+    tailored = "# Jane Doe\n\nSenior engineer with \"Python\" and AWS.\n- Built things"
+    response = "```json\n" + json.dumps({
+        "tailored_resume": tailored,
+        "keywords_integrated": ["Python", "AWS"],
+    }) + "\n```"
+
+    graph = _single_node_graph("tailor_resume", resume_tailor.tailor_resume_node)
+    with patch.object(resume_tailor, "acall_llm", _fake_llm(response)):
+        deltas, final = await _run(graph, {
+            "master_resume": sample_resume_data,
+            "job_analysis": sample_job_analysis,
+            "errors": [],
+        })
+
+    assert len(deltas) > 1
+    assert {d["type"] for d in deltas} == {"tailored_resume_delta"}
+    assert "".join(d["delta"] for d in deltas) == tailored
+    assert final["tailored_resume"] == tailored
+    assert final["keywords_integrated"] == ["Python", "AWS"]
+
+
+@pytest.mark.asyncio
+async def test_cover_letter_streams_deltas():
+    letter = "Dear Hiring Team,\n\nI built RAG pipelines at scale.\n\nBest,\nJane"
+    response = json.dumps({"cover_letter": letter, "word_count": 12, "key_themes": ["RAG"]})
+    context = {
+        "company": "Acme", "job_title": "Engineer", "requirements": "- Python",
+        "skills": "Python", "culture": "", "relevant_experience": "", "skills_to_highlight": "",
+    }
+
+    graph = _single_node_graph("generate_letter", cover_letter.generate_cover_letter_node)
+    with patch.object(cover_letter, "acall_llm", _fake_llm(response, chunk_size=3)):
+        deltas, final = await _run(graph, {"context": context, "errors": []})
+
+    assert "".join(d["delta"] for d in deltas) == letter
+    assert final["cover_letter"] == letter
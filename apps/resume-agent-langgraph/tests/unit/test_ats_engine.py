@@ -0,0 +1,89 @@
+"""Unit tests for the precompiled ATS scoring engine."""
+
+import pytest
+
+from resume_agent.tools.ats_engine import (
+    ResumeIndex,
+    compile_keywords,
+    extract_resume_text,
+    get_resume_profile,
+    score_resume,
+    score_resume_against_jobs,
+    tokenize,
+)
+
+
+def test_tokenize_keeps_technical_tokens():
+    assert tokenize("C++, C# and Node.js on CI/CD") == ["c++", "c#", "and", "node.js", "on", "ci", "cd"]
+
+
+def test_word_boundary_matching():
+    index = ResumeIndex.from_text("Built JavaScript apps at Google using Node.js")
+    result = compile_keywords(["Java", "JavaScript", "Go", "Node.js", "Node"]).match(index)
+
+    assert result["matched_keywords"] == ["JavaScript", "Node.js", "Node"]
+    assert result["missing_keywords"] == ["Java", "Go"]
+    assert result["match_score"] == 60.0
+
+
+def test_multiword_and_punctuation_insensitive():
+    index = ResumeIndex.from_text("Experience with Machine   Learning, CI/CD pipelines.")
+    result = compile_keywords(["machine learning", "CI/CD", "pipelines", "deep learning"]).match(index)
+
+    assert result["match_count"] == 3
+    assert result["missing_keywords"] == ["deep learning"]
+
+
+def test_long_phrase_falls_back_to_regex():
+    index = ResumeIndex.from_text("Designed a highly available low latency event driven trading platform")
+    phrase = "highly available low latency event driven trading"
+    assert compile_keywords([phrase]).match(index)["match_count"] == 1
+    assert compile_keywords(["highly available low latency event driven bank"]).match(index)["match_count"] == 0
+
+
+def test_cjk_keywords_use_substring_match():
+    index = ResumeIndex.from_text("日本語能力試験N2を取得。Python開発経験5年")
+    result = compile_keywords(["日本語", "Python開発"]).match(index)
+    assert result["match_count"] == 2
+
+
+def test_extract_resume_text_preserves_order():
+    resume = {"name": "Jane", "jobs": [{"title": "Engineer", "tags": ["Python", 3]}], "summary": "Builder"}
+    assert extract_resume_text(resume) == "Jane Engineer Python Builder"
+
+
+def test_get_resume_profile_is_cached():
+    resume = {"content": "Python developer", "skills": ["Python"]}
+    assert get_resume_profile(resume) is get_resume_profile(dict(resume))
+
+
+def test_score_resume_weights():
+    profile = get_resume_profile({
+        "content": "Python AWS Docker experience developed implemented",
+        "skills": ["Python"],
+    })
+    score = score_resume(profile, {
+        "keywords": ["Python", "AWS", "Docker"],
+        "skills": ["Python", "React"],
+        "requirements": ["experience", "developed"],
+    })
+
+    assert score["keyword_score"] == 100
+    assert score["skills_score"] == 50
+    assert score["experience_score"] == 100
+    assert score["overall_score"] == int(100 * 0.4 + 50 * 0.3 + 100 * 0.3)
+
+
+def test_batch_scores_in_input_order():
+    resume = {"content": "Python developer with Django and AWS", "skills": ["Python", "Django"]}
+    jobs = [
+        {"keywords": ["Python", "Django"], "skills": ["Python"], "requirements": []},
+        {"keywords": ["Rust"], "skills": ["Rust"], "requirements": []},
+        {},
+    ]
+
+    scores = score_resume_against_jobs(resume, jobs)
+
+    assert [s["keyword_score"] for s in scores] == [100, 0, 0]
+    assert scores[0]["overall_score"] > scores[1]["overall_score"]
+    assert scores[2]["overall_score"] == 0
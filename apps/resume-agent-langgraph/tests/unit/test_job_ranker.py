@@ -0,0 +1,133 @@
+"""Unit tests for multi-job ranking."""
+
+import sqlite3
+
+import pytest
+
+from resume_agent.tools.ats_engine import score_resume_against_jobs
+from resume_agent.tools.job_ranker import load_stored_job_analyses, rank_job_analyses
+
+
+RESUME = {
+    "content": "Senior Python engineer. Built Django and FastAPI services on AWS with Docker. "
+               "Led a team of 5 and designed distributed systems.",
+    "skills": ["Python", "Django", "AWS", "Docker"],
+}
+
+JOBS = [
+    {"company": "Rustacean", "job_title": "Systems Engineer",
+     "keywords": ["Rust", "Tokio"], "skills": ["Rust"], "requirements": ["5 years Rust"]},
+    {"company": "PyCorp", "job_title": "Backend Engineer",
+     "keywords": ["Python", "Django", "AWS"], "skills": ["Python", "Docker"],
+     "requirements": ["Experience with distributed systems", "Team leadership"]},
+    {"company": "Mixed", "job_title": "Full Stack",
+     "keywords": ["Python", "React", "TypeScript"], "skills": ["python", "React"],
+     "requirements": ["Frontend frameworks", "Python services"]},
+    {"company": "Empty", "job_title": "Unknown"},
+]
+
+
+def test_rank_matches_per_job_scores():
+    ranked = rank_job_analyses(RESUME, JOBS)
+    expected = score_resume_against_jobs(RESUME, JOBS)
+
+    by_company = {job["company"]: job for job in ranked}
+    for job, score in zip(JOBS, expected):
+        row = by_company[job["company"]]
+        for dimension in ("overall_score", "keyword_score", "skills_score", "experience_score"):
+            assert row[dimension] == score[dimension], (job["company"], dimension)
+
+
+def test_rank_orders_best_first_and_respects_top_k():
+    ranked = rank_job_analyses(RESUME, JOBS, top_k=2)
+
+    assert [job["company"] for job in ranked] == ["PyCorp", "Mixed"]
+    assert [job["rank"] for job in ranked] == [1, 2]
+    assert ranked[1]["missing_keywords"] == ["React", "TypeScript"]
+    assert rank_job_analyses(RESUME, []) == []
+
+
+@pytest.fixture
+def job_db(tmp_path):
+    db_path = tmp_path / "resume_agent.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE job_applications (
+            id INTEGER PRIMARY KEY, user_id TEXT, url TEXT, company TEXT, job_title TEXT,
+            location TEXT, salary_range TEXT, candidate_profile TEXT, raw_description TEXT,
+            fetched_at TEXT
+        );
+        CREATE TABLE job_qualifications (
+            id INTEGER PRIMARY KEY, job_id INTEGER, qualification_type TEXT, description TEXT
+        );
+        CREATE TABLE job_responsibilities (id INTEGER PRIMARY KEY, job_id INTEGER, description TEXT);
+        CREATE TABLE job_keywords (id INTEGER PRIMARY KEY, job_id INTEGER, keyword TEXT);
+
+        INSERT INTO job_applications VALUES
+            (1, 'default', 'https://a', 'PyCorp', 'Backend', 'Tokyo', NULL, '', '', '2025-01-01'),
+            (2, 'default', 'https://b', 'Rustacean', 'Systems', 'Remote', NULL, '', '', '2025-01-02'),
+            (3, 'other', 'https://c', 'Hidden', 'Other user', 'Osaka', NULL, '', '', '2025-01-03');
+        INSERT INTO job_keywords (job_id, keyword) VALUES
+            (1, 'Python'), (1, 'AWS'), (2, 'Rust'), (3, 'Python');
+        INSERT INTO job_qualifications (job_id, qualification_type, description) VALUES
+            (1, 'required', 'Distributed systems experience'),
+            (1, 'preferred', 'Docker'),
+            (2, 'required', 'Systems programming');
+        INSERT INTO job_responsibilities (job_id, description) VALUES (1, 'Build APIs');
+    """)
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def test_load_stored_job_analyses_single_user(job_db):
+    analyses = load_stored_job_analyses(job_db, "default")
+
+    assert [a["company"] for a in analyses] == ["PyCorp", "Rustacean"]
+    assert analyses[0]["keywords"] == ["Python", "AWS"]
+    assert analyses[0]["required_qualifications"] == ["Distributed systems experience"]
+    assert analyses[0]["preferred_qualifications"] == ["Docker"]
+    assert analyses[0]["responsibilities"] == ["Build APIs"]
+    assert analyses[1]["responsibilities"] == []
+
+
+def test_load_stored_job_analyses_keeps_child_order(job_db):
+    conn = sqlite3.connect(job_db)
+    # Inserted out of id order, e.g. after rows were deleted and ids reused
+    conn.executescript("""
+        INSERT INTO job_keywords (id, job_id, keyword) VALUES (90, 2, 'Tokio'), (50, 2, 'Async');
+        INSERT INTO job_responsibilities (id, job_id, description) VALUES
+            (90, 2, 'Review code'), (50, 2, 'Write drivers');
+    """)
+    conn.commit()
+    conn.close()
+
+    rustacean = load_stored_job_analyses(job_db, "default")[1]
+
+    assert rustacean["keywords"] == ["Rust", "Async", "Tokio"]
+    assert rustacean["responsibilities"] == ["Write drivers", "Review code"]
+
+
+def test_rank_stored_analyses(job_db):
+    ranked = rank_job_analyses(RESUME, load_stored_job_analyses(job_db, "default"))
+
+    assert ranked[0]["company"] == "PyCorp"
+    assert ranked[0]["keyword_score"] == 100
+    # Stored analyses have no skills list: keywords are used as skills
+    assert ranked[0]["skills_score"] == 100
+    assert ranked[1]["keyword_score"] == 0
+    # Requirements come from required + preferred qualifications
+    assert ranked[1]["experience_score"] == 100
+
+
+def test_missing_database_returns_empty(tmp_path):
+    assert load_stored_job_analyses(tmp_path / "missing.db") == []
+
+
+@pytest.mark.parametrize("folder", ["jobs #1", "100% done", "why?"])
+def test_load_stored_job_analyses_path_with_uri_characters(job_db, tmp_path, folder):
+    moved = tmp_path / folder / job_db.name
+    moved.parent.mkdir()
+    job_db.rename(moved)
+
+    assert [a["company"] for a in load_stored_job_analyses(moved, "default")] == ["PyCorp", "Rustacean"]
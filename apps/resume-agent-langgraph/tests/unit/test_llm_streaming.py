@@ -0,0 +1,87 @@
+"""Unit tests for incremental JSON field streaming."""
+
+import json
+import random
+
+import pytest
+
+from src.resume_agent.llm.streaming import JsonFieldStreamer, emit_custom_event
+
+
+VALUE = 'Dear Team,\n\n"Quoted" text \\ backslash, tab\tend, 日本語, emoji 🚀 and é.'
+RESPONSE = "```json\n" + json.dumps(
+    {"keywords_integrated": ["Python"], "tailored_resume": VALUE, "notes": "done"},
+    ensure_ascii=True,
+) + "\n```"
+
+
+def _chunks(text, seed):
+    rng = random.Random(seed)
+    i = 0
+    while i < len(text):
+        n = rng.randint(1, 7)
+        yield text[i:i + n]
+        i += n
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_chunking_reconstructs_value(seed):
+    deltas = []
+    streamer = JsonFieldStreamer("tailored_resume", on_delta=deltas.append)
+
+    for chunk in _chunks(RESPONSE, seed):
+        streamer.feed(chunk)
+
+    assert "".join(deltas) == VALUE
+    assert streamer.text == VALUE
+    assert streamer.done
+
+
+def test_single_character_chunks_never_split_escapes():
+    streamer = JsonFieldStreamer("tailored_resume")
+    deltas = [streamer.feed(ch) for ch in RESPONSE]
+
+    assert "".join(deltas) == VALUE
+    # Every emitted delta must be valid text (encoding fails on lone surrogates)
+    for delta in deltas:
+        delta.encode("utf-8")
+
+
+def test_emits_before_response_is_complete():
+    streamer = JsonFieldStreamer("cover_letter")
+
+    assert streamer.feed('{"word_count": 3, "cover_') == ""
+    assert streamer.feed('letter": "Hello') == "Hello"
+    assert streamer.feed(' world') == " world"
+    assert not streamer.done
+    assert streamer.feed('", "key_themes": []}') == ""
+    assert streamer.done
+    assert streamer.feed('ignored') == ""
+
+
+def test_chunk_ending_mid_unicode_escape_is_held_back():
+    streamer = JsonFieldStreamer("cover_letter")
+
+    assert streamer.feed('{"cover_letter": "caf\\u00') == "caf"
+    assert streamer.feed('e9 ok \\ud83d') == "\u00e9 ok "
+    assert streamer.feed('\\ude80"}') == "\U0001f680"
+    assert streamer.text == "caf\u00e9 ok \U0001f680"
+
+
+def test_invalid_escapes_pass_through_as_text():
+    streamer = JsonFieldStreamer("cover_letter")
+
+    assert streamer.feed('{"cover_letter": "bad \\uZZZZ and \\q, ') == "bad \\uZZZZ and \\q, "
+    assert streamer.feed('short \\u12G4 then \\u00e9') == "short \\u12G4 then \u00e9"
+    assert streamer.feed('"}') == ""
+    assert streamer.done
+
+
+def test_missing_field_emits_nothing():
+    streamer = JsonFieldStreamer("cover_letter")
+    assert streamer.feed('{"other": "value"}') == ""
+    assert streamer.text == ""
+
+
+def test_emit_custom_event_outside_graph_is_noop():
+    emit_custom_event({"type": "noop"})
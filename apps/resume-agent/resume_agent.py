@@ -1,7 +1,7 @@
 #!/usr/bin/env -S uv run
 # /// script
 # dependencies = [
-#   "fastmcp>=2.0",
+#   "fastmcp>=2.9",
 #   "pyyaml>=6.0",
 #   "httpx>=0.28.0",
 #   "sqlmodel>=0.0.22",
@@ -10,8 +10,14 @@
 #   "sentence-transformers>=3.0.0",
 #   "langchain-text-splitters>=0.3.0",
 #   "qdrant-client>=1.7.0",
+#   "numpy>=1.26",
+#   # Structured tool spans (optional: falls back to stdlib logging)
+#   "cernji-logging",
 # ]
 # requires-python = ">=3.10"
+#
+# [tool.uv.sources]
+# cernji-logging = { path = "../../libs/cernji-logging-py", editable = true }
 # ///
 
 """
@@ -45,26 +51,35 @@ For HTTP server (production):
 """
 
 import asyncio
+import collections
+import contextlib
+import contextvars
+import hashlib
 import json
 import logging
+import math
 import os
 import re
+import signal
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Literal
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Literal
 
 import yaml
 from dotenv import load_dotenv
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
+from fastmcp.server.middleware import Middleware, MiddlewareContext
 from pydantic import BaseModel, Field
-from sqlmodel import Session, SQLModel, create_engine, select, Field as SQLField, Relationship
+from sqlalchemy import bindparam, event
+from sqlmodel import Session, SQLModel, create_engine, select, text, Field as SQLField, Index, Relationship
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Logging is configured in main() so importing this module has no global side effects
 logger = logging.getLogger(__name__)
 
 # Load environment variables
@@ -433,6 +448,11 @@ class DBEmployment(SQLModel, table=True):
 class DBJobApplication(SQLModel, table=True):
     """Job application database table"""
     __tablename__ = "job_applications"
+    __table_args__ = (
+        # One application per (user, company, title); serves every lookup below
+        Index("ux_job_applications_user_company_title", "user_id", "company", "job_title", unique=True),
+        Index("ix_job_applications_user_url", "user_id", "url"),
+    )
 
     id: Optional[int] = SQLField(default=None, primary_key=True)
     user_id: str = SQLField(index=True, default="default")
@@ -512,6 +532,20 @@ class DBPortfolioExamples(SQLModel, table=True):
     created_at: datetime = SQLField(default_factory=datetime.utcnow)
 
 
+class DBArtifactInput(SQLModel, table=True):
+    """Hash of the inputs an application artifact was generated from"""
+    __tablename__ = "artifact_inputs"
+    __table_args__ = (
+        Index("ux_artifact_inputs_job_artifact", "job_id", "artifact", unique=True),
+    )
+
+    id: Optional[int] = SQLField(default=None, primary_key=True)
+    job_id: int = SQLField(foreign_key="job_applications.id")
+    artifact: str  # "tailored_resume", "cover_letter", "portfolio_examples"
+    input_hash: str
+    updated_at: datetime = SQLField(default_factory=datetime.utcnow)
+
+
 class DBPortfolioLibrary(SQLModel, table=True):
     """Job-agnostic portfolio library for code examples"""
     __tablename__ = "portfolio_library"
@@ -526,6 +560,8 @@ class DBPortfolioLibrary(SQLModel, table=True):
     technologies_json: Optional[str] = None  # JSON array: ["RAG", "Redis", "Supabase"]
     file_paths_json: Optional[str] = None  # JSON array: ["backend/services/matching.py:536"]
     source_repo: Optional[str] = None  # GitHub URL
+    embedding: Optional[bytes] = None  # float32 vector, L2-normalized
+    embedding_model: Optional[str] = None  # Model that produced the embedding
     created_at: datetime = SQLField(default_factory=datetime.utcnow)
     updated_at: datetime = SQLField(default_factory=datetime.utcnow)
 
@@ -580,6 +616,13 @@ class JobApplicationRepository(ABC):
         """Get job analysis for application"""
         pass
 
+    @abstractmethod
+    def get_job_analyses(
+        self, user_id: str, keys: List[tuple[str, str]]
+    ) -> Dict[tuple[str, str], Dict[str, Any]]:
+        """Get many job analyses keyed by (company, job_title); missing keys are omitted"""
+        pass
+
     @abstractmethod
     def save_job_analysis(self, user_id: str, job_data: Dict[str, Any]) -> None:
         """Save job analysis"""
@@ -630,6 +673,37 @@ class JobApplicationRepository(ABC):
         """Get application directory/identifier"""
         pass
 
+    @abstractmethod
+    def find_application_by_url(self, user_id: str, url: str) -> Optional[tuple[str, str]]:
+        """Get (company, job_title) of the latest application for a job URL"""
+        pass
+
+    @abstractmethod
+    def get_artifact_input_hashes(self, user_id: str, company: str, job_title: str) -> Dict[str, str]:
+        """Get {artifact: input_hash} recorded for an application"""
+        pass
+
+    @abstractmethod
+    def set_artifact_input_hash(
+        self, user_id: str, company: str, job_title: str, artifact: str, input_hash: str
+    ) -> None:
+        """Record the hash of the inputs an artifact was generated from"""
+        pass
+
+    @abstractmethod
+    def import_applications(self, user_id: str, records: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Upsert a batch of applications (job analysis plus optional tailored_resume,
+        cover_letter and portfolio_examples documents) in one transaction.
+        Returns counts of inserted and updated applications.
+        """
+        pass
+
+    @abstractmethod
+    def export_applications(self, user_id: str, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Stream all applications in the import_applications record format"""
+        pass
+
 
 class PortfolioLibraryRepository(ABC):
     """Abstract repository for portfolio library operations"""
@@ -680,20 +754,88 @@ class PortfolioLibraryRepository(ABC):
         """Delete portfolio example"""
         pass
 
+    @abstractmethod
+    def set_example_embedding(self, user_id: str, example_id: int, embedding: bytes, model: str) -> None:
+        """Store the embedding of a portfolio example (does not change updated_at)"""
+        pass
+
+    @abstractmethod
+    def list_example_embeddings(
+        self, user_id: str, updated_since: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """List id, embedding, embedding_model and updated_at of examples updated after updated_since"""
+        pass
+
+    @abstractmethod
+    def list_example_ids(self, user_id: str) -> List[int]:
+        """List the IDs of all portfolio examples"""
+        pass
+
+    @abstractmethod
+    def import_examples(self, user_id: str, records: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Upsert a batch of portfolio examples, matched on (title, company), in one
+        transaction. Returns counts of inserted and updated examples.
+        """
+        pass
+
+    @abstractmethod
+    def export_examples(self, user_id: str, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Stream all portfolio examples in the import_examples record format"""
+        pass
+
 
 # ============================================================================
 # SQLITE BACKEND IMPLEMENTATION
 # ============================================================================
 
+_engines: Dict[str, Any] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(db_path: str):
+    """
+    Get the shared SQLAlchemy engine for a database file.
+
+    All SQLite repositories share one engine (and connection pool) per file,
+    and the schema is created once per engine instead of once per repository.
+
+    Args:
+        db_path: SQLite database file path
+
+    Returns:
+        SQLAlchemy engine
+    """
+    with _engines_lock:
+        engine = _engines.get(db_path)
+        if engine is None:
+            engine = create_engine(f"sqlite:///{db_path}")
+            # Statement time counts toward the "sql" stage of the current tool call
+            event.listen(engine, "before_cursor_execute", _sql_started)
+            event.listen(engine, "after_cursor_execute", _sql_finished)
+            event.listen(engine, "handle_error", _sql_failed)
+            # Create tables if they don't exist
+            SQLModel.metadata.create_all(engine)
+            _engines[db_path] = engine
+        return engine
+
+
+def _db_timestamp() -> str:
+    """Current UTC time as SQLAlchemy stores DateTime columns in SQLite (for raw SQL)."""
+    return datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _json_list(value: Optional[str]) -> List[Any]:
+    return json.loads(value) if value else []
+
+
 class SQLiteResumeRepository(ResumeRepository):
     """SQLite implementation of resume repository"""
 
     def __init__(self, db_path: str, user_id: str):
         self.db_path = db_path
         self.user_id = user_id
-        self.engine = create_engine(f"sqlite:///{db_path}")
-        # Create tables if they don't exist
-        SQLModel.metadata.create_all(self.engine)
+        self.engine = get_engine(db_path)
 
     def get_master_resume(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get master resume from database"""
@@ -797,7 +939,7 @@ class SQLiteCareerHistoryRepository(CareerHistoryRepository):
     def __init__(self, db_path: str, user_id: str):
         self.db_path = db_path
         self.user_id = user_id
-        self.engine = create_engine(f"sqlite:///{db_path}")
+        self.engine = get_engine(db_path)
 
     def get_career_history(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get career history from database (includes achievements)"""
@@ -938,60 +1080,121 @@ class SQLiteCareerHistoryRepository(CareerHistoryRepository):
 class SQLiteJobApplicationRepository(JobApplicationRepository):
     """SQLite implementation of job application repository"""
 
+    # Row values (company, job_title) IN (VALUES ...) need SQLite >= 3.15; two
+    # bound parameters per key keeps batches under the 999-variable limit
+    HYDRATE_BATCH_SIZE = 400
+
+    _HYDRATE_SQL = """
+        SELECT
+            ja.url, ja.fetched_at, ja.company, ja.job_title, ja.location,
+            ja.salary_range, ja.candidate_profile, ja.raw_description,
+            (SELECT json_group_array(description) FROM (
+                SELECT description FROM job_qualifications
+                WHERE job_id = ja.id AND qualification_type = 'required' ORDER BY id
+            )) AS required_json,
+            (SELECT json_group_array(description) FROM (
+                SELECT description FROM job_qualifications
+                WHERE job_id = ja.id AND qualification_type = 'preferred' ORDER BY id
+            )) AS preferred_json,
+            (SELECT json_group_array(description) FROM (
+                SELECT description FROM job_responsibilities WHERE job_id = ja.id ORDER BY id
+            )) AS responsibilities_json,
+            (SELECT json_group_array(keyword) FROM (
+                SELECT keyword FROM job_keywords WHERE job_id = ja.id ORDER BY id
+            )) AS keywords_json
+        FROM job_applications ja
+        WHERE ja.user_id = :user_id
+          AND (ja.company, ja.job_title) IN (VALUES {keys})
+    """
+
     def __init__(self, db_path: str, user_id: str):
         self.db_path = db_path
         self.user_id = user_id
-        self.engine = create_engine(f"sqlite:///{db_path}")
-        SQLModel.metadata.create_all(self.engine)
+        self.engine = get_engine(db_path)
+        self._ensure_lookup_index()
+
+    def _ensure_lookup_index(self) -> None:
+        """
+        Add the composite (user_id, company, job_title) and (user_id, url)
+        indexes to databases created before they existed (create_all skips
+        existing tables).
+        """
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_job_applications_user_url "
+                "ON job_applications (user_id, url)"
+            ))
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS ux_job_applications_user_company_title "
+                    "ON job_applications (user_id, company, job_title)"
+                ))
+        except Exception as e:
+            # Pre-existing duplicate applications block the unique index;
+            # lookups still work, just without the composite index
+            logger.warning(f"Could not create job application lookup index: {e}")
 
     def get_job_analysis(self, user_id: str, company: str, job_title: str) -> Optional[Dict[str, Any]]:
         """Get job analysis for application"""
-        with Session(self.engine) as session:
-            job_app = session.exec(
-                select(DBJobApplication)
-                .where(DBJobApplication.user_id == user_id)
-                .where(DBJobApplication.company == company)
-                .where(DBJobApplication.job_title == job_title)
-            ).first()
+        return self.get_job_analyses(user_id, [(company, job_title)]).get((company, job_title))
 
-            if not job_app:
-                return None
+    def get_job_analyses(
+        self, user_id: str, keys: List[tuple[str, str]]
+    ) -> Dict[tuple[str, str], Dict[str, Any]]:
+        """
+        Get many job analyses in one round trip per batch of keys.
 
-            # Get related data
-            required_quals = session.exec(
-                select(DBJobQualification)
-                .where(DBJobQualification.job_id == job_app.id)
-                .where(DBJobQualification.qualification_type == "required")
-            ).all()
+        Qualifications, responsibilities and keywords are aggregated with
+        json_group_array in correlated subqueries, so each application is
+        hydrated by a single indexed row instead of five queries.
 
-            preferred_quals = session.exec(
-                select(DBJobQualification)
-                .where(DBJobQualification.job_id == job_app.id)
-                .where(DBJobQualification.qualification_type == "preferred")
-            ).all()
+        Args:
+            user_id: Owner of the applications
+            keys: (company, job_title) pairs to load
 
-            responsibilities = session.exec(
-                select(DBJobResponsibility).where(DBJobResponsibility.job_id == job_app.id)
-            ).all()
+        Returns:
+            Dict mapping (company, job_title) to job analysis; missing keys are omitted
+        """
+        unique_keys = list(dict.fromkeys((company, job_title) for company, job_title in keys))
+        results: Dict[tuple[str, str], Dict[str, Any]] = {}
+
+        with self.engine.connect() as conn:
+            for start in range(0, len(unique_keys), self.HYDRATE_BATCH_SIZE):
+                batch = unique_keys[start:start + self.HYDRATE_BATCH_SIZE]
+                params: Dict[str, Any] = {"user_id": user_id}
+                values = []
+                for i, (company, job_title) in enumerate(batch):
+                    params[f"c{i}"] = company
+                    params[f"t{i}"] = job_title
+                    values.append(f"(:c{i}, :t{i})")
+
+                rows = conn.execute(
+                    text(self._HYDRATE_SQL.format(keys=", ".join(values))), params
+                ).mappings()
+
+                for row in rows:
+                    results[(row["company"], row["job_title"])] = self._row_to_job_analysis(row)
 
-            keywords = session.exec(
-                select(DBJobKeyword).where(DBJobKeyword.job_id == job_app.id)
-            ).all()
+        return results
 
-            return {
-                "url": job_app.url,
-                "fetched_at": job_app.fetched_at,
-                "company": job_app.company,
-                "job_title": job_app.job_title,
-                "location": job_app.location,
-                "salary_range": job_app.salary_range,
-                "required_qualifications": [q.description for q in required_quals],
-                "preferred_qualifications": [q.description for q in preferred_quals],
-                "responsibilities": [r.description for r in responsibilities],
-                "keywords": [k.keyword for k in keywords],
-                "candidate_profile": job_app.candidate_profile,
-                "raw_description": job_app.raw_description
-            }
+    @staticmethod
+    def _row_to_job_analysis(row: Any) -> Dict[str, Any]:
+        """Convert a hydrated job_applications row into a job analysis dict"""
+        return {
+            "url": row["url"],
+            "fetched_at": row["fetched_at"],
+            "company": row["company"],
+            "job_title": row["job_title"],
+            "location": row["location"],
+            "salary_range": row["salary_range"],
+            "required_qualifications": json.loads(row["required_json"]),
+            "preferred_qualifications": json.loads(row["preferred_json"]),
+            "responsibilities": json.loads(row["responsibilities_json"]),
+            "keywords": json.loads(row["keywords_json"]),
+            "candidate_profile": row["candidate_profile"],
+            "raw_description": row["raw_description"]
+        }
 
     def save_job_analysis(self, user_id: str, job_data: Dict[str, Any]) -> None:
         """Save job analysis"""
@@ -1004,23 +1207,31 @@ class SQLiteJobApplicationRepository(JobApplicationRepository):
                 .where(DBJobApplication.job_title == job_data["job_title"])
             ).first()
 
+            fields = {
+                "url": job_data["url"],
+                "company": job_data["company"],
+                "job_title": job_data["job_title"],
+                "location": job_data["location"],
+                "salary_range": job_data.get("salary_range"),
+                "candidate_profile": job_data["candidate_profile"],
+                "raw_description": job_data["raw_description"],
+                "fetched_at": job_data["fetched_at"],
+            }
+
             if existing:
-                # Delete and recreate (simpler than updating related records)
-                session.delete(existing)
-                session.commit()
+                # Update in place, like import_applications: the id stays, so
+                # documents and artifact hashes keep pointing at this
+                # application, and the analysis children are replaced
+                for model in (DBJobQualification, DBJobResponsibility, DBJobKeyword):
+                    for child in session.exec(select(model).where(model.job_id == existing.id)).all():
+                        session.delete(child)
+                job_app = existing
+                for name, value in fields.items():
+                    setattr(job_app, name, value)
+                job_app.updated_at = datetime.utcnow()
+            else:
+                job_app = DBJobApplication(user_id=user_id, **fields)
 
-            # Create job application
-            job_app = DBJobApplication(
-                user_id=user_id,
-                url=job_data["url"],
-                company=job_data["company"],
-                job_title=job_data["job_title"],
-                location=job_data["location"],
-                salary_range=job_data.get("salary_range"),
-                candidate_profile=job_data["candidate_profile"],
-                raw_description=job_data["raw_description"],
-                fetched_at=job_data["fetched_at"]
-            )
             session.add(job_app)
             session.flush()
 
@@ -1046,24 +1257,15 @@ class SQLiteJobApplicationRepository(JobApplicationRepository):
     def get_tailored_resume(self, user_id: str, company: str, job_title: str) -> Optional[str]:
         """Get tailored resume content"""
         with Session(self.engine) as session:
-            # Find job application
-            job_app = session.exec(
-                select(DBJobApplication)
+            # Single join through the composite application index
+            return session.exec(
+                select(DBTailoredResume.content)
+                .join(DBJobApplication, DBJobApplication.id == DBTailoredResume.job_id)
                 .where(DBJobApplication.user_id == user_id)
                 .where(DBJobApplication.company == company)
                 .where(DBJobApplication.job_title == job_title)
             ).first()
 
-            if not job_app:
-                return None
-
-            # Get tailored resume
-            resume = session.exec(
-                select(DBTailoredResume).where(DBTailoredResume.job_id == job_app.id)
-            ).first()
-
-            return resume.content if resume else None
-
     def save_tailored_resume(
         self, user_id: str, company: str, job_title: str,
         content: str, metadata: Optional[Dict[str, Any]] = None
@@ -1108,22 +1310,15 @@ class SQLiteJobApplicationRepository(JobApplicationRepository):
     def get_cover_letter(self, user_id: str, company: str, job_title: str) -> Optional[str]:
         """Get cover letter content"""
         with Session(self.engine) as session:
-            job_app = session.exec(
-                select(DBJobApplication)
+            # Single join through the composite application index
+            return session.exec(
+                select(DBCoverLetter.content)
+                .join(DBJobApplication, DBJobApplication.id == DBCoverLetter.job_id)
                 .where(DBJobApplication.user_id == user_id)
                 .where(DBJobApplication.company == company)
                 .where(DBJobApplication.job_title == job_title)
             ).first()
 
-            if not job_app:
-                return None
-
-            cover = session.exec(
-                select(DBCoverLetter).where(DBCoverLetter.job_id == job_app.id)
-            ).first()
-
-            return cover.content if cover else None
-
     def save_cover_letter(
         self, user_id: str, company: str, job_title: str,
         content: str, metadata: Optional[Dict[str, Any]] = None
@@ -1248,6 +1443,263 @@ class SQLiteJobApplicationRepository(JobApplicationRepository):
             "exists": exists
         }
 
+    def find_application_by_url(self, user_id: str, url: str) -> Optional[tuple[str, str]]:
+        """Get (company, job_title) of the latest application for a job URL"""
+        # Match with or without a trailing slash
+        urls = list(dict.fromkeys([url, url.rstrip("/"), url.rstrip("/") + "/"]))
+        with Session(self.engine) as session:
+            row = session.exec(
+                select(DBJobApplication.company, DBJobApplication.job_title)
+                .where(DBJobApplication.user_id == user_id)
+                .where(DBJobApplication.url.in_(urls))
+                .order_by(DBJobApplication.updated_at.desc())
+            ).first()
+            return (row[0], row[1]) if row else None
+
+    def get_artifact_input_hashes(self, user_id: str, company: str, job_title: str) -> Dict[str, str]:
+        """Get {artifact: input_hash} recorded for an application"""
+        with Session(self.engine) as session:
+            rows = session.exec(
+                select(DBArtifactInput.artifact, DBArtifactInput.input_hash)
+                .join(DBJobApplication, DBJobApplication.id == DBArtifactInput.job_id)
+                .where(DBJobApplication.user_id == user_id)
+                .where(DBJobApplication.company == company)
+                .where(DBJobApplication.job_title == job_title)
+            ).all()
+            return {artifact: input_hash for artifact, input_hash in rows}
+
+    def set_artifact_input_hash(
+        self, user_id: str, company: str, job_title: str, artifact: str, input_hash: str
+    ) -> None:
+        """Record the hash of the inputs an artifact was generated from"""
+        with Session(self.engine) as session:
+            job_app = session.exec(
+                select(DBJobApplication)
+                .where(DBJobApplication.user_id == user_id)
+                .where(DBJobApplication.company == company)
+                .where(DBJobApplication.job_title == job_title)
+            ).first()
+
+            if not job_app:
+                raise ValueError(f"Job application not found: {company} - {job_title}")
+
+            existing = session.exec(
+                select(DBArtifactInput)
+                .where(DBArtifactInput.job_id == job_app.id)
+                .where(DBArtifactInput.artifact == artifact)
+            ).first()
+
+            if existing:
+                existing.input_hash = input_hash
+                existing.updated_at = datetime.utcnow()
+            else:
+                session.add(DBArtifactInput(job_id=job_app.id, artifact=artifact, input_hash=input_hash))
+
+            session.commit()
+
+    # Bulk import/export runs Core SQL with executemany: one statement per
+    # table per batch instead of an ORM session and commit per record.
+
+    _APPLICATION_COLUMNS = (
+        "url", "company", "job_title", "location", "salary_range",
+        "candidate_profile", "raw_description", "fetched_at",
+    )
+
+    # (table, columns besides job_id/content, record keys stored as JSON)
+    _DOCUMENT_TABLES = {
+        "tailored_resume": ("tailored_resumes", ("keywords_used", "changes_from_master")),
+        "cover_letter": ("cover_letters", ("talking_points",)),
+        "portfolio_examples": ("portfolio_examples", ("examples",)),
+    }
+
+    def _application_ids(
+        self, conn: Any, user_id: str, keys: List[tuple[str, str]]
+    ) -> Dict[tuple[str, str], int]:
+        """Map (company, job_title) to application id for the keys that exist"""
+        ids: Dict[tuple[str, str], int] = {}
+        for start in range(0, len(keys), self.HYDRATE_BATCH_SIZE):
+            batch = keys[start:start + self.HYDRATE_BATCH_SIZE]
+            params: Dict[str, Any] = {"user_id": user_id}
+            values = []
+            for i, (company, job_title) in enumerate(batch):
+                params[f"c{i}"] = company
+                params[f"t{i}"] = job_title
+                values.append(f"(:c{i}, :t{i})")
+            rows = conn.execute(text(
+                "SELECT id, company, job_title FROM job_applications "
+                f"WHERE user_id = :user_id AND (company, job_title) IN (VALUES {', '.join(values)})"
+            ), params)
+            ids.update({(company, job_title): id_ for id_, company, job_title in rows})
+        return ids
+
+    def import_applications(self, user_id: str, records: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Upsert a batch of applications in one transaction.
+
+        Each record is a job analysis plus optional "tailored_resume",
+        "cover_letter" and "portfolio_examples" documents ({"content": ...,
+        plus metadata}). An existing (company, job_title) application keeps
+        its id; its qualifications, responsibilities and keywords are replaced
+        and any documents in the record are upserted.
+
+        Returns:
+            {"inserted": n, "updated": n}
+        """
+        # Later records for the same application win
+        by_key = {(r["company"], r["job_title"]): r for r in records}
+        now = _db_timestamp()
+
+        with self.engine.begin() as conn:
+            ids = self._application_ids(conn, user_id, list(by_key))
+            new_keys = [key for key in by_key if key not in ids]
+
+            columns = self._APPLICATION_COLUMNS
+            if ids:
+                conn.execute(
+                    text(
+                        f"UPDATE job_applications SET {', '.join(f'{c} = :{c}' for c in columns)}, "
+                        "updated_at = :now WHERE id = :id"
+                    ),
+                    [{**{c: by_key[key].get(c) for c in columns}, "now": now, "id": id_} for key, id_ in ids.items()],
+                )
+                job_ids = [{"job_id": id_} for id_ in ids.values()]
+                for table in ("job_qualifications", "job_responsibilities", "job_keywords"):
+                    conn.execute(text(f"DELETE FROM {table} WHERE job_id = :job_id"), job_ids)
+
+            if new_keys:
+                conn.execute(
+                    text(
+                        f"INSERT INTO job_applications (user_id, {', '.join(columns)}, created_at, updated_at) "
+                        f"VALUES (:user_id, {', '.join(f':{c}' for c in columns)}, :now, :now)"
+                    ),
+                    [{**{c: by_key[key].get(c) for c in columns}, "user_id": user_id, "now": now} for key in new_keys],
+                )
+                ids.update(self._application_ids(conn, user_id, new_keys))
+
+            qualifications, responsibilities, keywords = [], [], []
+            documents: Dict[str, List[Dict[str, Any]]] = {name: [] for name in self._DOCUMENT_TABLES}
+            for key, record in by_key.items():
+                job_id = ids[key]
+                for qualification_type in ("required", "preferred"):
+                    qualifications.extend(
+                        {"job_id": job_id, "type": qualification_type, "description": description}
+                        for description in record.get(f"{qualification_type}_qualifications") or []
+                    )
+                responsibilities.extend(
+                    {"job_id": job_id, "description": description}
+                    for description in record.get("responsibilities") or []
+                )
+                keywords.extend({"job_id": job_id, "keyword": keyword} for keyword in record.get("keywords") or [])
+
+                for name, (_, json_keys) in self._DOCUMENT_TABLES.items():
+                    document = record.get(name)
+                    if document:
+                        documents[name].append({
+                            "job_id": job_id,
+                            "content": document["content"],
+                            "now": now,
+                            **{f"{k}_json": json.dumps(document[k]) if k in document else None for k in json_keys},
+                        })
+
+            if qualifications:
+                conn.execute(text(
+                    "INSERT INTO job_qualifications (job_id, qualification_type, description) "
+                    "VALUES (:job_id, :type, :description)"
+                ), qualifications)
+            if responsibilities:
+                conn.execute(text(
+                    "INSERT INTO job_responsibilities (job_id, description) VALUES (:job_id, :description)"
+                ), responsibilities)
+            if keywords:
+                conn.execute(text(
+                    "INSERT INTO job_keywords (job_id, keyword) VALUES (:job_id, :keyword)"
+                ), keywords)
+
+            for name, rows in documents.items():
+                if not rows:
+                    continue
+                table, json_keys = self._DOCUMENT_TABLES[name]
+                json_columns = [f"{k}_json" for k in json_keys]
+                timestamps = ["created_at"] + (["updated_at"] if table != "portfolio_examples" else [])
+                conn.execute(
+                    text(
+                        f"INSERT INTO {table} (job_id, content, {', '.join(json_columns + timestamps)}) "
+                        f"VALUES (:job_id, :content, {', '.join([f':{c}' for c in json_columns] + [':now'] * len(timestamps))}) "
+                        "ON CONFLICT (job_id) DO UPDATE SET content = excluded.content, "
+                        + ", ".join(
+                            [f"{c} = COALESCE(excluded.{c}, {c})" for c in json_columns]
+                            + (["updated_at = excluded.updated_at"] if "updated_at" in timestamps else [])
+                        )
+                    ),
+                    rows,
+                )
+
+        return {"inserted": len(new_keys), "updated": len(by_key) - len(new_keys)}
+
+    def export_applications(self, user_id: str, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Stream all applications in the import_applications record format.
+
+        Applications are read with yield_per; the child rows and documents of
+        each batch are loaded with one IN query per table, so memory stays
+        bounded by batch_size regardless of how many applications exist.
+        """
+        # Each batch of ids is bound as parameters: stay under SQLite's 999 limit
+        batch_size = max(1, min(batch_size, 900))
+
+        def in_ids(sql: str):
+            return text(sql).bindparams(bindparam("ids", expanding=True))
+
+        with self.engine.connect() as conn:
+            result = conn.execution_options(yield_per=batch_size).execute(
+                text(
+                    f"SELECT id, {', '.join(self._APPLICATION_COLUMNS)} FROM job_applications "
+                    "WHERE user_id = :user_id ORDER BY id"
+                ),
+                {"user_id": user_id},
+            )
+            for partition in result.mappings().partitions(batch_size):
+                ids = [row["id"] for row in partition]
+                lists: Dict[int, Dict[str, List[str]]] = {id_: collections.defaultdict(list) for id_ in ids}
+
+                for job_id, qualification_type, description in conn.execute(in_ids(
+                    "SELECT job_id, qualification_type, description FROM job_qualifications "
+                    "WHERE job_id IN :ids ORDER BY id"
+                ), {"ids": ids}):
+                    lists[job_id][f"{qualification_type}_qualifications"].append(description)
+                for job_id, description in conn.execute(in_ids(
+                    "SELECT job_id, description FROM job_responsibilities WHERE job_id IN :ids ORDER BY id"
+                ), {"ids": ids}):
+                    lists[job_id]["responsibilities"].append(description)
+                for job_id, keyword in conn.execute(in_ids(
+                    "SELECT job_id, keyword FROM job_keywords WHERE job_id IN :ids ORDER BY id"
+                ), {"ids": ids}):
+                    lists[job_id]["keywords"].append(keyword)
+
+                documents: Dict[int, Dict[str, Any]] = {id_: {} for id_ in ids}
+                for name, (table, json_keys) in self._DOCUMENT_TABLES.items():
+                    json_columns = [f"{k}_json" for k in json_keys]
+                    rows = conn.execute(in_ids(
+                        f"SELECT job_id, content, {', '.join(json_columns)} FROM {table} WHERE job_id IN :ids"
+                    ), {"ids": ids}).mappings()
+                    for row in rows:
+                        document = {"content": row["content"]}
+                        for k in json_keys:
+                            if row[f"{k}_json"] is not None:
+                                document[k] = json.loads(row[f"{k}_json"])
+                        documents[row["job_id"]][name] = document
+
+                for row in partition:
+                    job_lists = lists[row["id"]]
+                    yield {
+                        **{c: row[c] for c in self._APPLICATION_COLUMNS},
+                        "required_qualifications": job_lists["required_qualifications"],
+                        "preferred_qualifications": job_lists["preferred_qualifications"],
+                        "responsibilities": job_lists["responsibilities"],
+                        "keywords": job_lists["keywords"],
+                        **documents[row["id"]],
+                    }
+
 
 class SQLitePortfolioLibraryRepository(PortfolioLibraryRepository):
     """SQLite implementation of portfolio library repository"""
@@ -1255,8 +1707,20 @@ class SQLitePortfolioLibraryRepository(PortfolioLibraryRepository):
     def __init__(self, db_path: str, user_id: str):
         self.db_path = db_path
         self.user_id = user_id
-        self.engine = create_engine(f"sqlite:///{db_path}")
-        SQLModel.metadata.create_all(self.engine)
+        self.engine = get_engine(db_path)
+        self._ensure_embedding_columns()
+
+    def _ensure_embedding_columns(self) -> None:
+        """
+        Add the embedding columns to databases created before they existed
+        (create_all skips existing tables).
+        """
+        with self.engine.begin() as conn:
+            columns = {row[1] for row in conn.execute(text("PRAGMA table_info(portfolio_library)"))}
+            if "embedding" not in columns:
+                conn.execute(text("ALTER TABLE portfolio_library ADD COLUMN embedding BLOB"))
+            if "embedding_model" not in columns:
+                conn.execute(text("ALTER TABLE portfolio_library ADD COLUMN embedding_model VARCHAR"))
 
     def add_example(
         self, user_id: str, title: str, content: str,
@@ -1426,6 +1890,11 @@ class SQLitePortfolioLibraryRepository(PortfolioLibraryRepository):
             if source_repo is not None:
                 example.source_repo = source_repo
 
+            # A stale vector is worse than none: it is recomputed on the next index refresh
+            if any(field is not None for field in (title, content, description, technologies)):
+                example.embedding = None
+                example.embedding_model = None
+
             example.updated_at = datetime.utcnow()
             session.commit()
 
@@ -1444,6 +1913,138 @@ class SQLitePortfolioLibraryRepository(PortfolioLibraryRepository):
             session.delete(example)
             session.commit()
 
+    def set_example_embedding(self, user_id: str, example_id: int, embedding: bytes, model: str) -> None:
+        """Store the embedding of a portfolio example (does not change updated_at)"""
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    "UPDATE portfolio_library SET embedding = :embedding, embedding_model = :model "
+                    "WHERE user_id = :user_id AND id = :id"
+                ),
+                {"embedding": embedding, "model": model, "user_id": user_id, "id": example_id},
+            )
+
+    def list_example_embeddings(
+        self, user_id: str, updated_since: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """List id, embedding, embedding_model and updated_at of examples updated after updated_since"""
+        with Session(self.engine) as session:
+            # Only the vector columns: example content is never loaded to build the index
+            query = select(
+                DBPortfolioLibrary.id,
+                DBPortfolioLibrary.embedding,
+                DBPortfolioLibrary.embedding_model,
+                DBPortfolioLibrary.updated_at,
+            ).where(DBPortfolioLibrary.user_id == user_id)
+            if updated_since is not None:
+                query = query.where(DBPortfolioLibrary.updated_at > updated_since)
+
+            return [
+                {"id": id_, "embedding": embedding, "embedding_model": model, "updated_at": updated_at}
+                for id_, embedding, model, updated_at in session.exec(query).all()
+            ]
+
+    def list_example_ids(self, user_id: str) -> List[int]:
+        """List the IDs of all portfolio examples"""
+        with Session(self.engine) as session:
+            return list(session.exec(
+                select(DBPortfolioLibrary.id).where(DBPortfolioLibrary.user_id == user_id)
+            ).all())
+
+    _EXAMPLE_COLUMNS = (
+        "title", "company", "project", "description", "content",
+        "technologies_json", "file_paths_json", "source_repo",
+    )
+
+    def import_examples(self, user_id: str, records: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Upsert a batch of portfolio examples, matched on (title, company), in one transaction.
+
+        Updated examples keep their embedding unless the embedded text
+        (title, description, technologies, content) changed; otherwise it is
+        cleared and recomputed on the next semantic search.
+
+        Returns:
+            {"inserted": n, "updated": n}
+        """
+        rows = {}
+        for record in records:
+            rows[(record["title"], record.get("company"))] = {
+                "title": record["title"],
+                "company": record.get("company"),
+                "project": record.get("project"),
+                "description": record.get("description"),
+                "content": record["content"],
+                "technologies_json": json.dumps(record["technologies"]) if record.get("technologies") else None,
+                "file_paths_json": json.dumps(record["file_paths"]) if record.get("file_paths") else None,
+                "source_repo": record.get("source_repo"),
+            }
+        now = _db_timestamp()
+
+        with self.engine.begin() as conn:
+            titles = list({title for title, _ in rows})
+            existing: Dict[tuple[str, Optional[str]], int] = {}
+            for start in range(0, len(titles), 900):
+                for id_, title, company in conn.execute(
+                    text(
+                        "SELECT id, title, company FROM portfolio_library "
+                        "WHERE user_id = :user_id AND title IN :titles"
+                    ).bindparams(bindparam("titles", expanding=True)),
+                    {"user_id": user_id, "titles": titles[start:start + 900]},
+                ):
+                    existing.setdefault((title, company), id_)
+
+            updates = [{**row, "id": existing[key], "now": now} for key, row in rows.items() if key in existing]
+            inserts = [{**row, "user_id": user_id, "now": now} for key, row in rows.items() if key not in existing]
+
+            columns = self._EXAMPLE_COLUMNS
+            if updates:
+                # SET expressions see the old row, so unchanged text keeps its embedding
+                unchanged = " AND ".join(
+                    f"{c} IS :{c}" for c in ("title", "description", "content", "technologies_json")
+                )
+                conn.execute(
+                    text(
+                        f"UPDATE portfolio_library SET {', '.join(f'{c} = :{c}' for c in columns)}, "
+                        f"embedding = CASE WHEN {unchanged} THEN embedding END, "
+                        f"embedding_model = CASE WHEN {unchanged} THEN embedding_model END, "
+                        "updated_at = :now WHERE id = :id"
+                    ),
+                    updates,
+                )
+            if inserts:
+                conn.execute(
+                    text(
+                        f"INSERT INTO portfolio_library (user_id, {', '.join(columns)}, created_at, updated_at) "
+                        f"VALUES (:user_id, {', '.join(f':{c}' for c in columns)}, :now, :now)"
+                    ),
+                    inserts,
+                )
+
+        return {"inserted": len(inserts), "updated": len(updates)}
+
+    def export_examples(self, user_id: str, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Stream all portfolio examples in the import_examples record format (read with yield_per)"""
+        with self.engine.connect() as conn:
+            result = conn.execution_options(yield_per=batch_size).execute(
+                text(
+                    f"SELECT {', '.join(self._EXAMPLE_COLUMNS)} FROM portfolio_library "
+                    "WHERE user_id = :user_id ORDER BY id"
+                ),
+                {"user_id": user_id},
+            )
+            for row in result.mappings():
+                yield {
+                    "title": row["title"],
+                    "company": row["company"],
+                    "project": row["project"],
+                    "description": row["description"],
+                    "content": row["content"],
+                    "technologies": _json_list(row["technologies_json"]),
+                    "file_paths": _json_list(row["file_paths_json"]),
+                    "source_repo": row["source_repo"],
+                }
+
 
 # ============================================================================
 # FILE BACKEND IMPLEMENTATION (Fallback/Default)
@@ -1556,10 +2157,14 @@ def get_storage_backend() -> tuple[ResumeRepository, CareerHistoryRepository, Jo
     - "sqlite": Use SQLite database
     - "file" (default): Use current YAML file system
 
+    The repositories are shared by all users: every method takes the user_id
+    of the request it serves (see current_user_id()).
+
     Returns:
         Tuple of (ResumeRepository, CareerHistoryRepository, JobApplicationRepository, PortfolioLibraryRepository)
     """
     backend_type = os.getenv("STORAGE_BACKEND", "file")
+    # Default user only; repositories do not filter on it
     user_id = os.getenv("USER_ID", "default")
 
     logger.info(f"Initializing storage backend: {backend_type}")
@@ -1585,9 +2190,6 @@ def get_storage_backend() -> tuple[ResumeRepository, CareerHistoryRepository, Jo
         raise NotImplementedError("File backend for job applications not yet implemented. Please use STORAGE_BACKEND=sqlite")
 
 
-# Initialize repositories
-resume_repo, career_repo, job_app_repo, portfolio_repo = get_storage_backend()
-
 
 # ============================================================================
 # QDRANT VECTOR STORE
@@ -1663,10 +2265,11 @@ class QdrantVectorStore:
                 payload=payload
             ))
 
-        self.client.upsert(
-            collection_name=self.collection_name,
-            points=points
-        )
+        with stage("qdrant"):
+            self.client.upsert(
+                collection_name=self.collection_name,
+                points=points
+            )
 
         logger.info(f"Stored {len(points)} embeddings in Qdrant")
 
@@ -1687,12 +2290,13 @@ class QdrantVectorStore:
         Returns:
             List of dicts with keys: chunk_id, score, metadata
         """
-        search_result = self.client.search(
-            collection_name=self.collection_name,
-            query_vector=query_embedding,
-            limit=limit,
-            score_threshold=score_threshold
-        )
+        with stage("qdrant"):
+            search_result = self.client.search(
+                collection_name=self.collection_name,
+                query_vector=query_embedding,
+                limit=limit,
+                score_threshold=score_threshold
+            )
 
         results = []
         for hit in search_result:
@@ -1713,31 +2317,818 @@ class QdrantVectorStore:
         """
         from qdrant_client.models import PointIdsList
 
-        self.client.delete(
-            collection_name=self.collection_name,
-            points_selector=PointIdsList(
-                points=chunk_ids
+        with stage("qdrant"):
+            self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=PointIdsList(
+                    points=chunk_ids
+                )
             )
-        )
 
         logger.info(f"Deleted {len(chunk_ids)} vectors from Qdrant")
 
 
-# Initialize Qdrant vector store
-try:
-    qdrant_url = os.getenv("QDRANT_URL", "http://localhost:6333")
-    qdrant_collection = os.getenv("QDRANT_COLLECTION", "resume-agent-chunks")
-    vector_store = QdrantVectorStore(url=qdrant_url, collection_name=qdrant_collection)
-    logger.info(f"Qdrant vector store initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize Qdrant vector store: {e}")
-    vector_store = None
+# ============================================================================
+# SERVER METRICS
+# ============================================================================
+
+# Latest calls per tool (and per tool stage) the percentiles are computed over
+METRICS_WINDOW = int(os.getenv("METRICS_WINDOW", "1000"))
+METRICS_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class ToolSpan:
+    """
+    Timing of one tool call: total duration plus time attributed to stages.
+
+    Stages are recorded by `stage()` blocks anywhere below the tool (SQL
+    statements, embedding, Qdrant, HTTP fetches, slash commands). Stages of
+    concurrent work overlap, so they can add up to more than the total.
+    """
+
+    def __init__(self, tool: str, correlation_id: str):
+        self.tool = tool
+        self.correlation_id = correlation_id
+        self.stages: Dict[str, float] = {}  # stage -> seconds
+        self.stage_calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+            self.stage_calls[name] = self.stage_calls.get(name, 0) + 1
+
+
+# Span of the tool call being executed (copied into threads and tasks it starts)
+_current_span: contextvars.ContextVar[Optional[ToolSpan]] = contextvars.ContextVar("tool_span", default=None)
+
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Attribute the time spent in the block to a stage of the current tool call."""
+    span = _current_span.get()
+    if span is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        span.add(name, time.perf_counter() - start)
+
+
+def _percentiles(values: Iterable[float]) -> Dict[str, float]:
+    """Nearest-rank p50/p95/p99 of durations in seconds, as milliseconds."""
+    ordered = sorted(values)
+    if not ordered:
+        return {}
+    return {
+        f"p{int(q * 100)}_ms": round(ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))] * 1000, 3)
+        for q in METRICS_QUANTILES
+    }
+
+
+class ToolMetrics:
+    """Rolling latency windows, call/error counters and stage timings per tool."""
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started_at = time.time()
+            self._latencies: Dict[str, collections.deque] = {}
+            self._finished_at: Dict[str, collections.deque] = {}
+            self._stages: Dict[tuple[str, str], collections.deque] = {}
+            self._calls: collections.Counter = collections.Counter()
+            self._errors: collections.Counter = collections.Counter()
+            self._seconds: Dict[str, float] = collections.defaultdict(float)
+
+    def _window(self, windows: Dict[Any, collections.deque], key: Any) -> collections.deque:
+        if key not in windows:
+            windows[key] = collections.deque(maxlen=self.window)
+        return windows[key]
+
+    def record(self, span: ToolSpan, seconds: float, error: bool) -> None:
+        """Add a finished tool call."""
+        with self._lock:
+            self._window(self._latencies, span.tool).append(seconds)
+            self._window(self._finished_at, span.tool).append(time.monotonic())
+            self._calls[span.tool] += 1
+            self._seconds[span.tool] += seconds
+            if error:
+                self._errors[span.tool] += 1
+            for name, stage_seconds in span.stages.items():
+                self._window(self._stages, (span.tool, name)).append(stage_seconds)
+
+    def snapshot(self, tool: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-tool metrics: call and error counts, calls in the last minute,
+        p50/p95/p99 latency over the window, and the same per stage.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tools = [tool] if tool else sorted(self._calls)
+            result = {}
+            for name in tools:
+                if name not in self._calls:
+                    continue
+                result[name] = {
+                    "calls": self._calls[name],
+                    "errors": self._errors[name],
+                    "calls_last_minute": sum(1 for t in self._finished_at[name] if now - t <= 60),
+                    "mean_ms": round(self._seconds[name] / self._calls[name] * 1000, 3),
+                    **_percentiles(self._latencies[name]),
+                    "stages": {
+                        stage_name: {"calls": len(values), **_percentiles(values)}
+                        for (tool_name, stage_name), values in sorted(self._stages.items())
+                        if tool_name == name
+                    },
+                }
+            return result
+
+    def prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format (summaries per tool and stage)."""
+        with self._lock:
+            latencies = {tool: sorted(values) for tool, values in self._latencies.items()}
+            stages = {key: sorted(values) for key, values in self._stages.items()}
+            calls, errors, seconds = dict(self._calls), dict(self._errors), dict(self._seconds)
+
+        def quantile(values: List[float], q: float) -> float:
+            return values[min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))]
+
+        def labels(**pairs: str) -> str:
+            return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs.items()) + "}"
+
+        lines = [
+            "# HELP resume_agent_tool_duration_seconds MCP tool call latency over the recent window",
+            "# TYPE resume_agent_tool_duration_seconds summary",
+        ]
+        for tool, values in sorted(latencies.items()):
+            for q in METRICS_QUANTILES:
+                lines.append(f"resume_agent_tool_duration_seconds{labels(tool=tool, quantile=str(q))} {quantile(values, q)}")
+            lines.append(f"resume_agent_tool_duration_seconds_sum{labels(tool=tool)} {seconds[tool]}")
+            lines.append(f"resume_agent_tool_duration_seconds_count{labels(tool=tool)} {calls[tool]}")
+
+        lines += [
+            "# HELP resume_agent_tool_errors_total MCP tool calls that raised or returned an error status",
+            "# TYPE resume_agent_tool_errors_total counter",
+        ]
+        for tool in sorted(calls):
+            lines.append(f"resume_agent_tool_errors_total{labels(tool=tool)} {errors.get(tool, 0)}")
+
+        lines += [
+            "# HELP resume_agent_stage_duration_seconds Time per tool call spent in a stage (sql, embed, qdrant, fetch, command)",
+            "# TYPE resume_agent_stage_duration_seconds summary",
+        ]
+        for (tool, name), values in sorted(stages.items()):
+            for q in METRICS_QUANTILES:
+                lines.append(
+                    f"resume_agent_stage_duration_seconds{labels(tool=tool, stage=name, quantile=str(q))} {quantile(values, q)}"
+                )
+            lines.append(f"resume_agent_stage_duration_seconds_sum{labels(tool=tool, stage=name)} {sum(values)}")
+            lines.append(f"resume_agent_stage_duration_seconds_count{labels(tool=tool, stage=name)} {len(values)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+tool_metrics = ToolMetrics()
+
+_structured_logging: Any = None
+
+
+def _span_logging() -> Any:
+    """cernji_logging, or None if it is not installed (imported on the first tool call)."""
+    global _structured_logging
+    if _structured_logging is None:
+        try:
+            import cernji_logging
+        except ImportError:
+            _structured_logging = False
+        else:
+            # Its basicConfig(stdout) is a no-op here: main() has already set up
+            # stderr logging, which keeps spans off the stdio MCP stream
+            os.environ.setdefault("SERVICE_NAME", "resume-agent")
+            _structured_logging = cernji_logging
+    return _structured_logging or None
+
+
+def _is_error_result(result: Any) -> bool:
+    """Tools report failures as {"status": "error", ...} rather than raising."""
+    content = getattr(result, "structured_content", None)
+    if isinstance(content, dict) and "result" in content and len(content) == 1:
+        content = content["result"]
+    return isinstance(content, dict) and content.get("status") == "error"
+
+
+class ToolMetricsMiddleware(Middleware):
+    """
+    Times every MCP tool call and its stages under a correlation ID.
+
+    Each call runs inside `cernji_logging.with_correlation_id` (reusing the
+    caller's ID if one is set) and a ToolSpan; when it finishes the span is
+    added to `tool_metrics` and logged as a structured "tool span" event.
+    Without cernji-logging installed, spans are logged with the stdlib logger.
+    """
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next: Any) -> Any:
+        structured = _span_logging()
+        if structured:
+            correlation = structured.with_correlation_id(structured.get_correlation_id())
+        else:
+            correlation = contextlib.nullcontext(str(uuid.uuid4()))
+
+        with correlation as correlation_id:
+            span = ToolSpan(context.message.name, correlation_id)
+            token = _current_span.set(span)
+            start = time.perf_counter()
+            error = True
+            try:
+                result = await call_next(context)
+                error = _is_error_result(result)
+                return result
+            finally:
+                seconds = time.perf_counter() - start
+                _current_span.reset(token)
+                tool_metrics.record(span, seconds, error)
+                _log_span(structured, span, seconds, error)
+
+
+def _log_span(structured: Any, span: ToolSpan, seconds: float, error: bool) -> None:
+    stages_ms = {name: round(value * 1000, 3) for name, value in span.stages.items()}
+    if structured:
+        structured.get_logger("resume_agent.spans").info(
+            "tool span",
+            tool=span.tool,
+            duration_ms=round(seconds * 1000, 3),
+            stages_ms=stages_ms,
+            stage_calls=span.stage_calls,
+            error=error,
+        )
+    else:
+        logger.info(
+            f"tool span {span.tool} {seconds * 1000:.1f}ms stages={stages_ms} "
+            f"error={error} correlation_id={span.correlation_id}"
+        )
+
+
+mcp.add_middleware(ToolMetricsMiddleware())
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def prometheus_metrics(request: Any) -> Any:
+    """Prometheus scrape endpoint (HTTP transport only; enable with METRICS_ENDPOINT=true)."""
+    from starlette.responses import PlainTextResponse
+
+    if os.getenv("METRICS_ENDPOINT", "false").lower() not in ("1", "true", "yes"):
+        return PlainTextResponse("metrics endpoint disabled (set METRICS_ENDPOINT=true)\n", status_code=404)
+    return PlainTextResponse(tool_metrics.prometheus(), media_type="text/plain; version=0.0.4")
+
+
+# The start time lives on the statement's execution context, so a statement
+# that raises leaves nothing behind on the (pooled) connection
+
+def _sql_started(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _record_sql_time(context: Any) -> None:
+    started = getattr(context, "_query_start", None)
+    if started is None:
+        return
+    context._query_start = None
+    span = _current_span.get()
+    if span is not None:
+        span.add("sql", time.perf_counter() - started)
+
+
+def _sql_finished(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    _record_sql_time(context)
+
+
+def _sql_failed(exception_context: Any) -> None:
+    # A failed statement still spent its time in SQL
+    _record_sql_time(exception_context.execution_context)
+
+
+class TimedCursor(sqlite3.Cursor):
+    """sqlite3 cursor whose statements count toward the "sql" stage."""
+
+    def execute(self, *args: Any) -> "TimedCursor":
+        with stage("sql"):
+            return super().execute(*args)
+
+    def executemany(self, *args: Any) -> "TimedCursor":
+        with stage("sql"):
+            return super().executemany(*args)
+
+    def fetchall(self) -> List[Any]:
+        with stage("sql"):
+            return super().fetchall()
+
+
+class TimedConnection(sqlite3.Connection):
+    """sqlite3 connection handing out TimedCursors."""
+
+    def cursor(self, factory: Any = TimedCursor) -> Any:
+        return super().cursor(factory)
+
+    def execute(self, *args: Any) -> TimedCursor:
+        return self.cursor().execute(*args)
+
+
+# ============================================================================
+# USER CONTEXT
+# ============================================================================
+
+USER_ID_PATTERN = re.compile(r"[A-Za-z0-9_.@-]{1,128}")
+
+# User bound by user_context() (scripts, tests); takes precedence over the request
+_user_override: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("user_override", default=None)
+
+
+@contextlib.contextmanager
+def user_context(user_id: str) -> Iterator[str]:
+    """Run the block (and threads/tasks it starts) as `user_id`."""
+    token = _user_override.set(_valid_user_id(user_id, "user_context"))
+    try:
+        yield user_id
+    finally:
+        _user_override.reset(token)
+
+
+def _valid_user_id(user_id: Any, source: str) -> str:
+    if not isinstance(user_id, str) or not USER_ID_PATTERN.fullmatch(user_id):
+        raise ValueError(f"Invalid user ID from {source}")
+    return user_id
+
+
+def current_user_id() -> str:
+    """
+    User the current tool call acts for.
+
+    Resolved per request, in order:
+    1. user_context() override
+    2. the authenticated MCP access token ("sub" claim, else client ID)
+    3. the USER_ID_HEADER request header, if that variable is set (HTTP
+       transport behind a trusted proxy)
+    4. USER_ID from the environment (default: "default")
+    """
+    user_id = _user_override.get()
+    if user_id is not None:
+        return user_id
+
+    from fastmcp.server.dependencies import get_access_token, get_http_headers
+
+    access_token = get_access_token()
+    if access_token is not None:
+        claims = getattr(access_token, "claims", None) or {}
+        return _valid_user_id(claims.get("sub") or access_token.client_id, "access token")
+
+    header = os.getenv("USER_ID_HEADER")
+    if header:
+        value = get_http_headers().get(header.lower())
+        if value is not None:
+            return _valid_user_id(value.strip(), f"{header} header")
+
+    return os.getenv("USER_ID", "default")
+
+
+class UserCache:
+    """
+    Hydrated per-user objects (master resume, career history, application
+    lists), kept for the most recently active `max_users` users.
+
+    Entries are keyed by (kind, *args) and dropped by kind when a write
+    changes them. A load that overlaps a write to the same user is returned
+    but not cached, so a stale read never outlives the invalidation. Cached
+    values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_users: int = 256):
+        self.max_users = max_users
+        self.hits = 0
+        self.misses = 0
+        self._users: "collections.OrderedDict[str, Dict[str, Any]]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, kind: str, loader: Callable[..., Any], *args: Any) -> Any:
+        """Cached `loader(user_id, *args)`; None results are not cached."""
+        key = (kind, *args)
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                entry = self._users[user_id] = {"generation": 0, "values": {}}
+                while len(self._users) > self.max_users:
+                    self._users.popitem(last=False)
+            else:
+                self._users.move_to_end(user_id)
+            if key in entry["values"]:
+                self.hits += 1
+                return entry["values"][key]
+            self.misses += 1
+            generation = entry["generation"]
+
+        value = loader(user_id, *args)
+
+        with self._lock:
+            if value is not None and self._users.get(user_id) is entry and entry["generation"] == generation:
+                entry["values"][key] = value
+        return value
+
+    def invalidate(self, user_id: str, *kinds: str) -> None:
+        """Drop the user's cached `kinds` (all of them if none are given)."""
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                return
+            entry["generation"] += 1
+            if kinds:
+                entry["values"] = {key: value for key, value in entry["values"].items() if key[0] not in kinds}
+            else:
+                entry["values"] = {}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "users": len(self._users),
+                "max_users": self.max_users,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+# ============================================================================
+# APPLICATION CONTEXT
+# ============================================================================
+
+EMBEDDING_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+
+
+class AppContext:
+    """
+    Storage, Qdrant and embedding components, each initialized on first use.
+
+    Importing this module creates no database engines, opens no Qdrant
+    connection and loads no embedding model, so an MCP client's `initialize`
+    returns immediately. Each component is created (once, thread-safely) the
+    first time a tool needs it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._repositories: Optional[tuple] = None
+        self._vector_store: Optional[QdrantVectorStore] = None
+        self._vector_store_loaded = False
+        self._embedding_model = None
+        self._portfolio_index: Optional["PortfolioEmbeddingIndex"] = None
+        self._command_executor: Optional["SlashCommandExecutor"] = None
+        self._user_cache: Optional[UserCache] = None
+
+    @property
+    def repositories(self) -> tuple[ResumeRepository, CareerHistoryRepository, JobApplicationRepository, PortfolioLibraryRepository]:
+        """All repositories, created from STORAGE_BACKEND on first access."""
+        if self._repositories is None:
+            with self._lock:
+                if self._repositories is None:
+                    self._repositories = get_storage_backend()
+        return self._repositories
+
+    @property
+    def resume_repo(self) -> ResumeRepository:
+        return self.repositories[0]
+
+    @property
+    def career_repo(self) -> CareerHistoryRepository:
+        return self.repositories[1]
+
+    @property
+    def job_app_repo(self) -> JobApplicationRepository:
+        return self.repositories[2]
+
+    @property
+    def portfolio_repo(self) -> PortfolioLibraryRepository:
+        return self.repositories[3]
+
+    @property
+    def vector_store(self) -> Optional[QdrantVectorStore]:
+        """Qdrant vector store, or None if Qdrant is unavailable (tried once)."""
+        if not self._vector_store_loaded:
+            with self._lock:
+                if not self._vector_store_loaded:
+                    try:
+                        qdrant_url = os.getenv("QDRANT_URL", "http://localhost:6333")
+                        qdrant_collection = os.getenv("QDRANT_COLLECTION", "resume-agent-chunks")
+                        self._vector_store = QdrantVectorStore(url=qdrant_url, collection_name=qdrant_collection)
+                        logger.info(f"Qdrant vector store initialized successfully")
+                    except Exception as e:
+                        logger.error(f"Failed to initialize Qdrant vector store: {e}")
+                        self._vector_store = None
+                    self._vector_store_loaded = True
+        return self._vector_store
+
+    @property
+    def embedding_model(self):
+        """Sentence-transformers model, loaded once on first access."""
+        if self._embedding_model is None:
+            with self._lock:
+                if self._embedding_model is None:
+                    try:
+                        from sentence_transformers import SentenceTransformer
+                    except ImportError:
+                        raise ImportError(
+                            "sentence-transformers not installed. "
+                            "Run: uv pip install sentence-transformers>=3.0.0"
+                        )
+                    logger.info(f"Loading embedding model: {EMBEDDING_MODEL}")
+                    self._embedding_model = SentenceTransformer(EMBEDDING_MODEL)
+        return self._embedding_model
+
+    @property
+    def portfolio_index(self) -> "PortfolioEmbeddingIndex":
+        """In-memory embedding index over the portfolio library (vectors load on first search)."""
+        if self._portfolio_index is None:
+            with self._lock:
+                if self._portfolio_index is None:
+                    self._portfolio_index = PortfolioEmbeddingIndex(self)
+        return self._portfolio_index
+
+    @property
+    def command_executor(self) -> "SlashCommandExecutor":
+        """Slash command executor (SLASH_COMMAND_CONCURRENCY, SLASH_COMMAND_TIMEOUT seconds)."""
+        if self._command_executor is None:
+            with self._lock:
+                if self._command_executor is None:
+                    self._command_executor = SlashCommandExecutor(
+                        max_concurrent=int(os.getenv("SLASH_COMMAND_CONCURRENCY", "2")),
+                        timeout=float(os.getenv("SLASH_COMMAND_TIMEOUT", "900")),
+                    )
+        return self._command_executor
+
+    @property
+    def user_cache(self) -> UserCache:
+        """Per-user cache of hydrated repository reads (USER_CACHE_SIZE users)."""
+        if self._user_cache is None:
+            with self._lock:
+                if self._user_cache is None:
+                    self._user_cache = UserCache(max_users=int(os.getenv("USER_CACHE_SIZE", "256")))
+        return self._user_cache
+
+    def reset(self) -> None:
+        """Drop all initialized components (e.g. after changing configuration)."""
+        with self._lock:
+            self._user_cache = None
+            self._command_executor = None
+            self._portfolio_index = None
+            self._repositories = None
+            self._vector_store = None
+            self._vector_store_loaded = False
+            self._embedding_model = None
+
+
+app_context = AppContext()
+
+_CONTEXT_ATTRIBUTES = {"resume_repo", "career_repo", "job_app_repo", "portfolio_repo", "vector_store"}
+
+
+def __getattr__(name: str) -> Any:
+    """Keep `from resume_agent import job_app_repo` working (resolved lazily)."""
+    if name in _CONTEXT_ATTRIBUTES:
+        return getattr(app_context, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ============================================================================
+# PORTFOLIO EMBEDDING INDEX
+# ============================================================================
+
+def portfolio_embedding_text(example: Dict[str, Any]) -> str:
+    """Text a portfolio example is embedded from (title, description, technologies, content)."""
+    parts = [example.get("title") or "", example.get("description") or ""]
+    if example.get("technologies"):
+        parts.append("Technologies: " + ", ".join(example["technologies"]))
+    parts.append(example.get("content") or "")
+    return "\n".join(part for part in parts if part)
+
+
+def job_analysis_embedding_text(analysis: Dict[str, Any]) -> str:
+    """Query text for a job analysis (title, keywords, qualifications, responsibilities, profile)."""
+    parts = [analysis.get("job_title") or ""]
+    if analysis.get("keywords"):
+        parts.append("Keywords: " + ", ".join(analysis["keywords"]))
+    parts.extend(analysis.get("required_qualifications") or [])
+    parts.extend(analysis.get("preferred_qualifications") or [])
+    parts.extend(analysis.get("responsibilities") or [])
+    parts.append(analysis.get("candidate_profile") or "")
+    return "\n".join(part for part in parts if part)
+
+
+class _VectorMatrix:
+    """Row-per-example matrix of unit vectors with O(1) upsert and remove."""
+
+    def __init__(self):
+        self.ids: List[int] = []
+        self.rows: Dict[int, int] = {}
+        self.vectors = None  # (capacity, dim) float32, first len(ids) rows in use
+
+    def upsert(self, example_id: int, vector) -> None:
+        import numpy as np
+
+        if self.vectors is None or self.vectors.shape[1] != vector.shape[0]:
+            # First vector, or the embedding model changed dimension
+            self.ids, self.rows = [], {}
+            self.vectors = np.empty((16, vector.shape[0]), dtype=np.float32)
+
+        row = self.rows.get(example_id)
+        if row is None:
+            if len(self.ids) == self.vectors.shape[0]:
+                grown = np.empty((2 * self.vectors.shape[0], self.vectors.shape[1]), dtype=np.float32)
+                grown[:len(self.ids)] = self.vectors
+                self.vectors = grown
+            row = len(self.ids)
+            self.ids.append(example_id)
+            self.rows[example_id] = row
+        self.vectors[row] = vector
+
+    def remove(self, example_id: int) -> None:
+        row = self.rows.pop(example_id, None)
+        if row is None:
+            return
+        # Move the last row into the gap
+        last_id = self.ids.pop()
+        if last_id != example_id:
+            self.vectors[row] = self.vectors[len(self.ids)]
+            self.ids[row] = last_id
+            self.rows[last_id] = row
+
+    def top_k(self, query, k: int) -> List[tuple[int, float]]:
+        import numpy as np
+
+        if not self.ids or k <= 0:
+            return []
+        scores = self.vectors[:len(self.ids)] @ query
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(self.ids[row], float(scores[row])) for row in best]
+
+
+class PortfolioEmbeddingIndex:
+    """
+    In-memory cosine similarity index over the portfolio library.
+
+    Examples are embedded when they are written (`index_example`) and the
+    vectors are stored with the rows, so building the index only reads the
+    vector columns. Each user's vectors live in one float32 matrix and a
+    search is a single matrix-vector product. Before searching, the index
+    refreshes incrementally: only rows updated since the last load are read,
+    rows missing an embedding (or embedded by another model) are embedded in
+    one batch, and deleted rows are dropped.
+    """
+
+    def __init__(self, context: "AppContext", model_name: str = EMBEDDING_MODEL):
+        self._context = context
+        self.model_name = model_name
+        self._lock = threading.Lock()
+        self._matrices: Dict[str, _VectorMatrix] = {}
+        self._watermarks: Dict[str, Optional[datetime]] = {}
+
+    def embed(self, texts: List[str]):
+        """Unit-length float32 embeddings, one row per text."""
+        import numpy as np
+
+        with stage("embed"):
+            vectors = self._context.embedding_model.encode(
+                texts, convert_to_numpy=True, show_progress_bar=False
+            )
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def index_example(self, user_id: str, example_id: int) -> None:
+        """Embed one example, store its vector and update the loaded matrix."""
+        example = self._context.portfolio_repo.get_example(user_id=user_id, example_id=example_id)
+        if example is None:
+            self.remove(user_id, example_id)
+            return
+        vector = self.embed([portfolio_embedding_text(example)])[0]
+        self._context.portfolio_repo.set_example_embedding(
+            user_id, example_id, vector.tobytes(), self.model_name
+        )
+        with self._lock:
+            if user_id in self._matrices:
+                self._matrices[user_id].upsert(example_id, vector)
+
+    def remove(self, user_id: str, example_id: int) -> None:
+        """Drop an example from the loaded matrix."""
+        with self._lock:
+            if user_id in self._matrices:
+                self._matrices[user_id].remove(example_id)
+
+    def refresh(self, user_id: str) -> int:
+        """
+        Load vectors changed since the last refresh.
+
+        The database reads and embedding run without the lock, so searches
+        and writes for other users are not blocked by a refresh; the lock is
+        only held to apply the changes to the loaded matrix.
+
+        Returns:
+            Number of examples that had to be embedded
+        """
+        import numpy as np
+
+        repo = self._context.portfolio_repo
+        with self._lock:
+            matrix = self._matrices.get(user_id)
+            watermark = self._watermarks.get(user_id) if matrix is not None else None
+            known = set(matrix.ids) if matrix is not None else set()
+
+        rows = repo.list_example_embeddings(user_id, updated_since=watermark)
+        updates = []
+        missing = []
+        for row in rows:
+            if row["embedding"] is None or row["embedding_model"] != self.model_name:
+                missing.append(row["id"])
+            else:
+                updates.append((row["id"], np.frombuffer(row["embedding"], dtype=np.float32)))
+
+        if missing:
+            examples = [repo.get_example(user_id=user_id, example_id=id_) for id_ in missing]
+            examples = [example for example in examples if example is not None]
+            logger.info(f"Embedding {len(examples)} portfolio examples for user {user_id}")
+            if examples:
+                vectors = self.embed([portfolio_embedding_text(example) for example in examples])
+                for example, vector in zip(examples, vectors):
+                    repo.set_example_embedding(user_id, example["id"], vector.tobytes(), self.model_name)
+                    updates.append((example["id"], vector))
+
+        # Examples deleted since the last refresh (by any process); ids indexed
+        # by index_example meanwhile are in neither set and are kept
+        deleted = (known | {id_ for id_, _ in updates}) - set(repo.list_example_ids(user_id))
+
+        with self._lock:
+            if matrix is not None and self._matrices.get(user_id) is not matrix:
+                # reset() ran meanwhile: these changes are relative to a
+                # dropped matrix, the next refresh reloads everything
+                return len(missing)
+            matrix = self._matrices.setdefault(user_id, _VectorMatrix())
+            for id_, vector in updates:
+                matrix.upsert(id_, vector)
+            for id_ in deleted:
+                matrix.remove(id_)
+
+            if rows:
+                latest = max(row["updated_at"] for row in rows)
+                current = self._watermarks.get(user_id)
+                self._watermarks[user_id] = latest if current is None else max(current, latest)
+        return len(missing)
+
+    def search(self, user_id: str, text: str, top_k: int = 5) -> List[tuple[int, float]]:
+        """
+        Top-k examples most similar to text.
+
+        Returns:
+            (example_id, cosine similarity) pairs, best first
+        """
+        self.refresh(user_id)
+        query = self.embed([text])[0]
+        with self._lock:
+            matrix = self._matrices.get(user_id)
+            return matrix.top_k(query, top_k) if matrix is not None else []
+
+    def reset(self) -> None:
+        """Forget all loaded vectors (they are reloaded on the next search)."""
+        with self._lock:
+            self._matrices.clear()
+            self._watermarks.clear()
 
 
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
 
+def load_master_resume(user_id: str) -> Optional[MasterResume]:
+    """Master resume hydrated from the repository and validated (None if missing)."""
+    resume_data = app_context.resume_repo.get_master_resume(user_id)
+    return MasterResume(**resume_data) if resume_data is not None else None
+
+
+def load_career_history(user_id: str) -> Optional[CareerHistory]:
+    """Career history hydrated from the repository and validated (None if missing)."""
+    history_data = app_context.career_repo.get_career_history(user_id)
+    return CareerHistory(**history_data) if history_data is not None else None
+
+
 def sanitize_filename(text: str) -> str:
     """Convert text to filesystem-safe name."""
     # Remove or replace problematic characters
@@ -1757,19 +3148,221 @@ def get_application_directory_name(company: str, job_title: str) -> str:
 def load_command_prompt(command_path: str) -> str:
     """Load slash command prompt from .claude/commands/ directory.
 
-    Args:
-        command_path: Path relative to .claude/commands/ (e.g., "career/analyze-job")
-    """
-    command_file = COMMANDS_DIR / f"{command_path}.md"
-    if not command_file.exists():
-        logger.warning(f"Command file not found: {command_file}")
-        raise FileNotFoundError(f"Command not found: {command_path}")
+    Args:
+        command_path: Path relative to .claude/commands/ (e.g., "career/analyze-job")
+    """
+    command_file = COMMANDS_DIR / f"{command_path}.md"
+    if not command_file.exists():
+        logger.warning(f"Command file not found: {command_file}")
+        raise FileNotFoundError(f"Command not found: {command_path}")
+
+    with open(command_file, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+# Callback receiving (line_number, line) for each stdout line of a command run
+OutputListener = Callable[[int, str], Awaitable[None]]
+
+
+class _CommandRun:
+    """One in-flight slash command run, shared by every caller that requested it."""
+
+    def __init__(self, key: tuple):
+        self.key = key
+        self.lines: List[str] = []
+        self.listeners: List[OutputListener] = []
+        self.task: Optional[asyncio.Task] = None
+
+    async def emit(self, line: str) -> None:
+        self.lines.append(line)
+        for listener in list(self.listeners):
+            try:
+                await listener(len(self.lines), line)
+            except Exception as e:
+                # A disconnected client must not break the run for the others
+                logger.debug(f"Progress listener failed: {e}")
+
+
+class SlashCommandExecutor:
+    """
+    Managed executor for slash command runs (`claude` CLI subprocesses).
+
+    - At most `max_concurrent` runs execute at once; further requests wait
+    - Each run is killed (with its child processes) after `timeout` seconds
+    - Identical in-flight requests (same user, command, arguments and
+      variables) share one run, so two clients analyzing the same URL spawn
+      one process
+    - The CLI runs with USER_ID set to the requesting user, so the artifacts
+      its MCP server saves belong to that user
+    - Output is collected line by line and streamed to progress listeners
+
+    State is kept per event loop, so the executor is safe to share across
+    `asyncio.run` calls (tests, scripts).
+    """
+
+    def __init__(self, max_concurrent: int = 2, timeout: float = 900.0):
+        self.max_concurrent = max(1, max_concurrent)
+        self.timeout = timeout
+        # event loop -> (semaphore, in-flight runs by request key)
+        self._loop_state: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]" = weakref.WeakKeyDictionary()
+
+    def _state(self) -> tuple[asyncio.Semaphore, Dict[tuple, _CommandRun]]:
+        loop = asyncio.get_running_loop()
+        state = self._loop_state.get(loop)
+        if state is None:
+            state = (asyncio.Semaphore(self.max_concurrent), {})
+            self._loop_state[loop] = state
+        return state
+
+    def in_flight(self) -> int:
+        """Number of distinct runs in flight on the current event loop."""
+        return len(self._state()[1])
+
+    async def run(
+        self,
+        command_path: str,
+        arguments: str = "",
+        variables: Optional[Dict[str, str]] = None,
+        on_output: Optional[OutputListener] = None,
+        user_id: Optional[str] = None,
+    ) -> str:
+        """
+        Run a slash command, or join the identical run already in flight.
+
+        Args:
+            command_path: Path relative to .claude/commands/ (e.g., "career/analyze-job")
+            arguments: String passed as CLI args
+            variables: Template variables (part of the deduplication key)
+            on_output: Async callback for each stdout line
+            user_id: User the command acts for (default: current_user_id())
+
+        Returns:
+            The command's stdout as text
+        """
+        user_id = user_id or current_user_id()
+        key = (user_id, command_path, arguments, tuple(sorted((variables or {}).items())))
+        semaphore, runs = self._state()
+
+        command_run = runs.get(key)
+        if command_run is None:
+            command_run = _CommandRun(key)
+            runs[key] = command_run
+            command_run.task = asyncio.create_task(self._execute(command_run, semaphore))
+            command_run.task.add_done_callback(lambda _: runs.pop(key, None))
+        else:
+            logger.info(f"Joining in-flight run of {command_path} {arguments}")
+
+        if on_output is not None:
+            command_run.listeners.append(on_output)
+        try:
+            # Shielded: a caller going away must not cancel a run others share
+            return await asyncio.shield(command_run.task)
+        finally:
+            if on_output is not None:
+                command_run.listeners.remove(on_output)
+
+    async def _execute(self, command_run: _CommandRun, semaphore: asyncio.Semaphore) -> str:
+        user_id, command_path, arguments, _ = command_run.key
+
+        # Get Claude CLI path from environment or use default
+        claude_cli = os.getenv("CLAUDE_CODE_PATH", "claude")
+
+        # Build command: claude --dangerously-skip-permissions -- /command:name args
+        slash_cmd = command_path.replace("/", ":")
+        cmd = [claude_cli, "--dangerously-skip-permissions", "--", f"/{slash_cmd}"]
+
+        # Add arguments if provided
+        if arguments:
+            cmd.append(arguments)
+
+        # Build command string for shell execution (required for .cmd files on Windows)
+        cmd_str = ' '.join(f'"{arg}"' if ' ' in arg else arg for arg in cmd)
+
+        # The CLI's MCP server reads and writes data for USER_ID
+        env = os.environ.copy()
+        env["USER_ID"] = user_id
+
+        async with semaphore:
+            logger.info(f"Executing slash command via subprocess for user {user_id}: {cmd_str}")
+            logger.debug(f"Working directory: {PROJECT_ROOT}")
+
+            # Use create_subprocess_shell on Windows to support .cmd files
+            # This allows execution of claude.cmd which is the npm-installed CLI.
+            # On POSIX the shell gets its own process group so a timeout kills the CLI too.
+            process = await asyncio.create_subprocess_shell(
+                cmd_str,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=str(PROJECT_ROOT),
+                env=env,
+                start_new_session=(os.name != "nt"),
+            )
+
+            # Last stderr lines, for error messages
+            stderr_tail: collections.deque[str] = collections.deque(maxlen=20)
+
+            async def read_stdout():
+                while line := await process.stdout.readline():
+                    decoded = line.decode('utf-8', errors='replace').rstrip()
+                    if decoded:
+                        logger.debug(f"[stdout] {decoded}")
+                        await command_run.emit(decoded)
+
+            async def read_stderr():
+                while line := await process.stderr.readline():
+                    decoded = line.decode('utf-8', errors='replace').rstrip()
+                    if decoded:
+                        logger.debug(f"[stderr] {decoded}")
+                        stderr_tail.append(decoded)
+
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(read_stdout(), read_stderr(), process.wait()),
+                    timeout=self.timeout,
+                )
+            except asyncio.TimeoutError:
+                await _kill_process_tree(process)
+                logger.error(f"Slash command {command_path} timed out after {self.timeout:.0f}s")
+                raise TimeoutError(f"Claude CLI timed out after {self.timeout:.0f}s")
+            except BaseException:
+                await _kill_process_tree(process)
+                raise
+
+        if process.returncode != 0:
+            logger.warning(f"Process exited with code {process.returncode}")
+            detail = f": {stderr_tail[-1]}" if stderr_tail else ""
+            raise RuntimeError(f"Claude CLI exited with code {process.returncode}{detail}")
+
+        logger.info(f"Slash command completed successfully")
+        return "\n".join(command_run.lines).strip()
+
 
-    with open(command_file, 'r', encoding='utf-8') as f:
-        return f.read()
+async def _kill_process_tree(process: asyncio.subprocess.Process) -> None:
+    """Kill a shell subprocess and the CLI it started."""
+    if process.returncode is not None:
+        return
+    try:
+        if os.name == "nt":
+            killer = await asyncio.create_subprocess_exec(
+                "taskkill", "/F", "/T", "/PID", str(process.pid),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            await killer.wait()
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    await process.wait()
 
 
-async def invoke_slash_command(command_path: str, arguments: str = "", variables: dict[str, str] = None) -> str:
+async def invoke_slash_command(
+    command_path: str,
+    arguments: str = "",
+    variables: dict[str, str] = None,
+    on_output: Optional[OutputListener] = None,
+    user_id: Optional[str] = None,
+) -> str:
     """
     Execute a slash command using Claude CLI subprocess (uses MAX subscription).
 
@@ -1777,85 +3370,38 @@ async def invoke_slash_command(command_path: str, arguments: str = "", variables
     MAX subscription instead of requiring ANTHROPIC_API_KEY. This saves API costs
     during development.
 
-    Supports both patterns:
-    - $ARGUMENTS replacement (Claude Code native pattern)
-    - [[VARIABLE]] replacement (agentic-drop-zones pattern)
+    Runs go through the shared SlashCommandExecutor (bounded concurrency,
+    timeout, deduplication of identical in-flight requests).
 
     Args:
         command_path: Path to command relative to .claude/commands/ (e.g., "career/analyze-job")
-        arguments: String to replace $ARGUMENTS placeholder OR passed as CLI args
-        variables: Dictionary of variables to replace (e.g., {"FILE_PATH": "/path/to/file"})
+        arguments: String passed as CLI args
+        variables: Dictionary of variables (e.g., {"FILE_PATH": "/path/to/file"})
+        on_output: Optional async callback receiving (line_number, line) for progress
+        user_id: User the command acts for (default: current_user_id())
 
     Returns:
         Claude's response as text
     """
-    if variables is None:
-        variables = {}
-
-    # Get Claude CLI path from environment or use default
-    claude_cli = os.getenv("CLAUDE_CODE_PATH", "claude")
-
-    # Build command: claude --dangerously-skip-permissions -- /command:name args
-    slash_cmd = command_path.replace("/", ":")
-    cmd = [claude_cli, "--dangerously-skip-permissions", "--", f"/{slash_cmd}"]
-
-    # Add arguments if provided
-    if arguments:
-        cmd.append(arguments)
-
-    # Build command string for shell execution (required for .cmd files on Windows)
-    cmd_str = ' '.join(f'"{arg}"' if ' ' in arg else arg for arg in cmd)
-
-    logger.info(f"Executing slash command via subprocess: {cmd_str}")
-    logger.debug(f"Working directory: {PROJECT_ROOT}")
-
     try:
-        # Use create_subprocess_shell on Windows to support .cmd files
-        # This allows execution of claude.cmd which is the npm-installed CLI
-        process = await asyncio.create_subprocess_shell(
-            cmd_str,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=str(PROJECT_ROOT),
-            env=os.environ.copy()  # Pass environment variables
-        )
-
-        # Collect output
-        response_text = ""
-
-        async def read_stream(stream, is_stderr=False):
-            """Read and collect stream output."""
-            nonlocal response_text
-            while True:
-                line = await stream.readline()
-                if not line:
-                    break
-
-                decoded = line.decode('utf-8', errors='replace').rstrip()
-                if decoded:
-                    if not is_stderr:
-                        response_text += decoded + "\n"
-                    logger.debug(f"{'[stderr]' if is_stderr else '[stdout]'} {decoded}")
-
-        # Handle both streams concurrently
-        await asyncio.gather(
-            read_stream(process.stdout, is_stderr=False),
-            read_stream(process.stderr, is_stderr=True)
-        )
+        with stage("command"):
+            return await app_context.command_executor.run(
+                command_path, arguments, variables, on_output=on_output, user_id=user_id
+            )
+    except Exception as e:
+        logger.error(f"Error executing slash command {command_path}: {e}")
+        raise
 
-        # Wait for process to complete
-        return_code = await process.wait()
 
-        if return_code != 0:
-            logger.warning(f"Process exited with code {return_code}")
-            raise RuntimeError(f"Claude CLI exited with code {return_code}")
+def progress_reporter(ctx: Optional[Context]) -> Optional[OutputListener]:
+    """Forward command output lines to the MCP client as progress notifications."""
+    if ctx is None:
+        return None
 
-        logger.info(f"Slash command completed successfully")
-        return response_text.strip()
+    async def report(line_number: int, line: str) -> None:
+        await ctx.report_progress(progress=line_number, message=line[:200])
 
-    except Exception as e:
-        logger.error(f"Error executing slash command {command_path}: {e}")
-        raise
+    return report
 
 
 # ============================================================================
@@ -1879,19 +3425,12 @@ def generate_embeddings(texts: List[str]) -> List[List[float]]:
         - ~1000 sentences/sec on CPU
         - Model download: ~420MB (one-time only)
     """
-    try:
-        from sentence_transformers import SentenceTransformer
-    except ImportError:
-        raise ImportError(
-            "sentence-transformers not installed. "
-            "Run: uv pip install sentence-transformers>=3.0.0"
-        )
-
-    # Initialize model (cached after first load)
-    model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
+    # Model is loaded once per process by the application context
+    model = app_context.embedding_model
 
     # Generate embeddings (batched for performance)
-    embeddings = model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
+    with stage("embed"):
+        embeddings = model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
 
     return embeddings.tolist()
 
@@ -2015,6 +3554,137 @@ def detect_language(text: str) -> Literal["en", "ja", "mixed"]:
         return "en"
 
 
+# ============================================================================
+# BULK IMPORT / EXPORT (NDJSON)
+# ============================================================================
+
+# One JSON object per line, tagged with "type":
+#   {"type": "application", <job analysis fields>, "tailored_resume": {"content": ...},
+#    "cover_letter": {"content": ...}, "portfolio_examples": {"content": ...}}
+#   {"type": "portfolio_example", "title": ..., "content": ..., "technologies": [...], ...}
+NDJSON_RECORD_TYPES = ("application", "portfolio_example")
+
+# Records per repository transaction
+BULK_BATCH_SIZE = 1000
+
+
+def _application_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate an application record; documents may be given as plain strings."""
+    analysis = JobAnalysis(**{k: v for k, v in record.items() if k in JobAnalysis.model_fields})
+    result = analysis.model_dump()
+    for name in ("tailored_resume", "cover_letter", "portfolio_examples"):
+        document = record.get(name)
+        if isinstance(document, str):
+            document = {"content": document}
+        if document is not None:
+            if not isinstance(document, dict) or not isinstance(document.get("content"), str):
+                raise ValueError(f"{name} must be a string or an object with a 'content' string")
+            result[name] = document
+    return result
+
+
+def _portfolio_example_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate a portfolio example record."""
+    for field in ("title", "content"):
+        if not isinstance(record.get(field), str) or not record[field]:
+            raise ValueError(f"portfolio_example requires a non-empty '{field}' string")
+    for field in ("technologies", "file_paths"):
+        if record.get(field) is not None and not isinstance(record[field], list):
+            raise ValueError(f"'{field}' must be a list")
+    return record
+
+
+def import_ndjson(
+    lines: Iterable[str], user_id: str, batch_size: int = BULK_BATCH_SIZE, max_errors: int = 100
+) -> Dict[str, Any]:
+    """
+    Upsert applications and portfolio examples from NDJSON lines.
+
+    Lines are validated and buffered per record type; every batch_size
+    records are written in one repository transaction. Invalid lines are
+    skipped and reported (first max_errors) without aborting the import.
+
+    Args:
+        lines: NDJSON lines (e.g. an open file)
+        user_id: Owner of the imported records
+        batch_size: Records per transaction
+        max_errors: Maximum number of line errors to report
+
+    Returns:
+        Dict with inserted/updated counts per record type and line errors
+    """
+    parsers = {"application": _application_record, "portfolio_example": _portfolio_example_record}
+    importers = {
+        "application": app_context.job_app_repo.import_applications,
+        "portfolio_example": app_context.portfolio_repo.import_examples,
+    }
+    counts = {kind: {"inserted": 0, "updated": 0} for kind in NDJSON_RECORD_TYPES}
+    batches: Dict[str, List[Dict[str, Any]]] = {kind: [] for kind in NDJSON_RECORD_TYPES}
+    errors: List[Dict[str, Any]] = []
+    error_count = 0
+
+    def flush(kind: str) -> None:
+        if batches[kind]:
+            for key, value in importers[kind](user_id, batches[kind]).items():
+                counts[kind][key] += value
+            batches[kind] = []
+            if kind == "application":
+                app_context.user_cache.invalidate(user_id, "applications")
+
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("line is not a JSON object")
+            kind = record.get("type")
+            if kind not in parsers:
+                raise ValueError(f"unknown record type {kind!r} (expected one of {', '.join(NDJSON_RECORD_TYPES)})")
+            batches[kind].append(parsers[kind](record))
+        except ValueError as e:
+            # json.JSONDecodeError and pydantic.ValidationError are ValueErrors
+            error_count += 1
+            if len(errors) < max_errors:
+                errors.append({"line": line_number, "error": str(e)})
+            continue
+        if len(batches[kind]) >= batch_size:
+            flush(kind)
+
+    for kind in NDJSON_RECORD_TYPES:
+        flush(kind)
+
+    return {"counts": counts, "error_count": error_count, "errors": errors}
+
+
+def export_ndjson(
+    user_id: str, record_types: Iterable[str] = NDJSON_RECORD_TYPES, batch_size: int = BULK_BATCH_SIZE
+) -> Iterator[str]:
+    """
+    Stream applications and/or portfolio examples as NDJSON lines (with trailing newline).
+
+    Rows are read from the repositories in batches of batch_size, so the
+    export never holds more than one batch in memory.
+    """
+    exporters = {
+        "application": app_context.job_app_repo.export_applications,
+        "portfolio_example": app_context.portfolio_repo.export_examples,
+    }
+    for kind in record_types:
+        if kind not in exporters:
+            raise ValueError(f"unknown record type {kind!r} (expected one of {', '.join(NDJSON_RECORD_TYPES)})")
+    for kind in record_types:
+        for record in exporters[kind](user_id, batch_size=batch_size):
+            yield json.dumps({"type": kind, **record}, ensure_ascii=False) + "\n"
+
+
+def resolve_data_path(path: str) -> Path:
+    """Resolve a user-supplied file path; relative paths are relative to the repository root."""
+    resolved = Path(path).expanduser()
+    return resolved if resolved.is_absolute() else PROJECT_ROOT / resolved
+
+
 # ============================================================================
 # MCP TOOLS - DATA ACCESS (Read Operations)
 # ============================================================================
@@ -2030,21 +3700,18 @@ def data_read_master_resume() -> dict[str, Any]:
     logger.info("Reading master resume")
 
     try:
-        # Get current user ID from config
-        user_id = os.getenv("USER_ID", "default")
+        # User this request acts for
+        user_id = current_user_id()
 
-        # Use repository (abstracts storage backend)
-        resume_data = resume_repo.get_master_resume(user_id)
+        # Hydrated and validated once per user until the resume is written
+        master_resume = app_context.user_cache.get(user_id, "master_resume", load_master_resume)
 
-        if resume_data is None:
+        if master_resume is None:
             return {
                 "status": "error",
                 "error": "Master resume not found"
             }
 
-        # Validate with Pydantic
-        master_resume = MasterResume(**resume_data)
-
         return {
             "status": "success",
             "data": master_resume.model_dump()
@@ -2069,21 +3736,18 @@ def data_read_career_history() -> dict[str, Any]:
     logger.info("Reading career history")
 
     try:
-        # Get current user ID from config
-        user_id = os.getenv("USER_ID", "default")
+        # User this request acts for
+        user_id = current_user_id()
 
-        # Use repository (abstracts storage backend)
-        history_data = career_repo.get_career_history(user_id)
+        # Hydrated and validated once per user until the history is written
+        career_history = app_context.user_cache.get(user_id, "career_history", load_career_history)
 
-        if history_data is None:
+        if career_history is None:
             return {
                 "status": "error",
                 "error": "Career history not found"
             }
 
-        # Validate with Pydantic
-        career_history = CareerHistory(**history_data)
-
         return {
             "status": "success",
             "data": career_history.model_dump()
@@ -2112,11 +3776,11 @@ def data_read_job_analysis(company: str, job_title: str) -> dict[str, Any]:
     logger.info(f"Reading job analysis for {company} - {job_title}")
 
     try:
-        # Get current user ID from config
-        user_id = os.getenv("USER_ID", "default")
+        # User this request acts for
+        user_id = current_user_id()
 
         # Use repository (abstracts storage backend)
-        analysis_data = job_app_repo.get_job_analysis(user_id, company, job_title)
+        analysis_data = app_context.job_app_repo.get_job_analysis(user_id, company, job_title)
 
         if analysis_data is None:
             return {
@@ -2140,6 +3804,49 @@ def data_read_job_analysis(company: str, job_title: str) -> dict[str, Any]:
         }
 
 
+@mcp.tool()
+def data_read_job_analyses(applications: List[Dict[str, str]]) -> dict[str, Any]:
+    """
+    Read job analysis data for many applications in one call.
+
+    Args:
+        applications: List of {"company": ..., "job_title": ...} identifiers
+
+    Returns:
+        Validated job analyses (in request order) plus identifiers not found
+    """
+    logger.info(f"Reading {len(applications)} job analyses")
+
+    try:
+        user_id = current_user_id()
+
+        keys = [(app["company"], app["job_title"]) for app in applications]
+        analyses = app_context.job_app_repo.get_job_analyses(user_id, keys)
+
+        found = []
+        missing = []
+        for company, job_title in dict.fromkeys(keys):
+            analysis_data = analyses.get((company, job_title))
+            if analysis_data is None:
+                missing.append({"company": company, "job_title": job_title})
+            else:
+                found.append(JobAnalysis(**analysis_data).model_dump())
+
+        return {
+            "status": "success",
+            "data": found,
+            "count": len(found),
+            "missing": missing
+        }
+
+    except Exception as e:
+        logger.error(f"Error reading job analyses: {e}")
+        return {
+            "status": "error",
+            "error": str(e)
+        }
+
+
 @mcp.tool()
 def data_read_tailored_resume(company: str, job_title: str) -> dict[str, Any]:
     """
@@ -2155,11 +3862,11 @@ def data_read_tailored_resume(company: str, job_title: str) -> dict[str, Any]:
     logger.info(f"Reading tailored resume for {company} - {job_title}")
 
     try:
-        # Get current user ID from config
-        user_id = os.getenv("USER_ID", "default")
+        # User this request acts for
+        user_id = current_user_id()
 
         # Use repository (abstracts storage backend)
-        content = job_app_repo.get_tailored_resume(user_id, company, job_title)
+        content = app_context.job_app_repo.get_tailored_resume(user_id, company, job_title)
 
         if content is None:
             return {
@@ -2195,11 +3902,11 @@ def data_read_cover_letter(company: str, job_title: str) -> dict[str, Any]:
     logger.info(f"Reading cover letter for {company} - {job_title}")
 
     try:
-        # Get current user ID from config
-        user_id = os.getenv("USER_ID", "default")
+        # User this request acts for
+        user_id = current_user_id()
 
         # Use repository (abstracts storage backend)
-        content = job_app_repo.get_cover_letter(user_id, company, job_title)
+        content = app_context.job_app_repo.get_cover_letter(user_id, company, job_title)
 
         if content is None:
             return {
@@ -2234,8 +3941,10 @@ def data_list_applications(limit: int = 10) -> dict[str, Any]:
     logger.info(f"Listing applications (limit: {limit})")
 
     try:
-        user_id = os.getenv("USER_ID", "default")
-        applications = job_app_repo.list_applications(user_id, limit)
+        user_id = current_user_id()
+        applications = app_context.user_cache.get(
+            user_id, "applications", app_context.job_app_repo.list_applications, limit
+        )
 
         return {
             "status": "success",
@@ -2274,11 +3983,12 @@ def data_write_job_analysis(company: str, job_title: str, job_data: dict) -> dic
         # Validate data with Pydantic
         job_analysis = JobAnalysis(**job_data)
 
-        # Get current user ID from config
-        user_id = os.getenv("USER_ID", "default")
+        # User this request acts for
+        user_id = current_user_id()
 
         # Use repository (abstracts storage backend)
-        job_app_repo.save_job_analysis(user_id, job_analysis.model_dump())
+        app_context.job_app_repo.save_job_analysis(user_id, job_analysis.model_dump())
+        app_context.user_cache.invalidate(user_id, "applications")
 
         logger.info(f"Job analysis saved for {company} - {job_title}")
 
@@ -2312,11 +4022,12 @@ def data_write_tailored_resume(company: str, job_title: str, content: str, metad
     logger.info(f"Writing tailored resume for {company} - {job_title}")
 
     try:
-        # Get current user ID from config
-        user_id = os.getenv("USER_ID", "default")
+        # User this request acts for
+        user_id = current_user_id()
 
         # Use repository (abstracts storage backend)
-        job_app_repo.save_tailored_resume(user_id, company, job_title, content, metadata)
+        app_context.job_app_repo.save_tailored_resume(user_id, company, job_title, content, metadata)
+        app_context.user_cache.invalidate(user_id, "applications")
 
         logger.info(f"Tailored resume saved for {company} - {job_title}")
 
@@ -2350,11 +4061,12 @@ def data_write_cover_letter(company: str, job_title: str, content: str, metadata
     logger.info(f"Writing cover letter for {company} - {job_title}")
 
     try:
-        # Get current user ID from config
-        user_id = os.getenv("USER_ID", "default")
+        # User this request acts for
+        user_id = current_user_id()
 
         # Use repository (abstracts storage backend)
-        job_app_repo.save_cover_letter(user_id, company, job_title, content, metadata)
+        app_context.job_app_repo.save_cover_letter(user_id, company, job_title, content, metadata)
+        app_context.user_cache.invalidate(user_id, "applications")
 
         logger.info(f"Cover letter saved for {company} - {job_title}")
 
@@ -2387,11 +4099,12 @@ def data_write_portfolio_examples(company: str, job_title: str, content: str) ->
     logger.info(f"Writing portfolio examples for {company} - {job_title}")
 
     try:
-        # Get current user ID from config
-        user_id = os.getenv("USER_ID", "default")
+        # User this request acts for
+        user_id = current_user_id()
 
         # Use repository (abstracts storage backend)
-        job_app_repo.save_portfolio_examples(user_id, company, job_title, content)
+        app_context.job_app_repo.save_portfolio_examples(user_id, company, job_title, content)
+        app_context.user_cache.invalidate(user_id, "applications")
 
         logger.info(f"Portfolio examples saved for {company} - {job_title}")
 
@@ -2425,11 +4138,12 @@ def data_write_master_resume(resume_data: dict) -> dict[str, Any]:
         # Validate data with Pydantic
         master_resume = MasterResume(**resume_data)
 
-        # Get current user ID from config
-        user_id = os.getenv("USER_ID", "default")
+        # User this request acts for
+        user_id = current_user_id()
 
         # Use repository (abstracts storage backend)
-        resume_repo.save_master_resume(user_id, master_resume.model_dump())
+        app_context.resume_repo.save_master_resume(user_id, master_resume.model_dump())
+        app_context.user_cache.invalidate(user_id, "master_resume")
 
         logger.info("Master resume written successfully")
 
@@ -2463,11 +4177,12 @@ def data_write_career_history(history_data: dict) -> dict[str, Any]:
         # Validate data with Pydantic
         career_history = CareerHistory(**history_data)
 
-        # Get current user ID from config
-        user_id = os.getenv("USER_ID", "default")
+        # User this request acts for
+        user_id = current_user_id()
 
         # Use repository (abstracts storage backend)
-        career_repo.save_career_history(user_id, career_history.model_dump())
+        app_context.career_repo.save_career_history(user_id, career_history.model_dump())
+        app_context.user_cache.invalidate(user_id, "career_history")
 
         logger.info("Career history written successfully")
 
@@ -2500,8 +4215,8 @@ def data_add_achievement(company: str, achievement_description: str, metric: str
     logger.info(f"Adding achievement to {company}")
 
     try:
-        # Get current user ID from config
-        user_id = os.getenv("USER_ID", "default")
+        # User this request acts for
+        user_id = current_user_id()
 
         # Build achievement object
         achievement = {
@@ -2511,7 +4226,8 @@ def data_add_achievement(company: str, achievement_description: str, metric: str
             achievement["metric"] = metric
 
         # Use repository (abstracts storage backend)
-        career_repo.add_achievement(user_id, company, achievement)
+        app_context.career_repo.add_achievement(user_id, company, achievement)
+        app_context.user_cache.invalidate(user_id, "career_history")
 
         logger.info(f"Achievement added to {company}")
 
@@ -2546,11 +4262,12 @@ def data_add_technology(company: str, technologies: List[str]) -> dict[str, Any]
     logger.info(f"Adding technologies to {company}: {technologies}")
 
     try:
-        # Get current user ID from config
-        user_id = os.getenv("USER_ID", "default")
+        # User this request acts for
+        user_id = current_user_id()
 
         # Use repository (abstracts storage backend)
-        career_repo.add_technology(user_id, company, technologies)
+        app_context.career_repo.add_technology(user_id, company, technologies)
+        app_context.user_cache.invalidate(user_id, "career_history")
 
         logger.info(f"Technologies added to {company}")
 
@@ -2589,8 +4306,8 @@ def data_get_application_path(company: str, job_title: str, ensure_exists: bool
     logger.info(f"Getting application path for {company} - {job_title}")
 
     try:
-        user_id = os.getenv("USER_ID", "default")
-        result = job_app_repo.get_application_path(user_id, company, job_title, ensure_exists)
+        user_id = current_user_id()
+        result = app_context.job_app_repo.get_application_path(user_id, company, job_title, ensure_exists)
 
         return {
             "status": "success",
@@ -2624,14 +4341,17 @@ def data_add_portfolio_example(
         file_paths: List of relevant file paths (e.g., ["backend/services/matching.py:536"])
         source_repo: GitHub repository URL (optional)
 
+    The example is embedded for data_semantic_search_portfolio_examples; if
+    the embedding model is unavailable it is embedded on the next search.
+
     Returns:
-        Dict with status and created example ID
+        Dict with status, created example ID and whether it was embedded
     """
     logger.info(f"Adding portfolio example: {title}")
 
     try:
-        user_id = os.getenv("USER_ID", "default")
-        example_id = portfolio_repo.add_example(
+        user_id = current_user_id()
+        example_id = app_context.portfolio_repo.add_example(
             user_id=user_id,
             title=title,
             content=content,
@@ -2647,6 +4367,7 @@ def data_add_portfolio_example(
             "status": "success",
             "example_id": example_id,
             "title": title,
+            "embedded": _embed_portfolio_example(user_id, example_id),
             "message": f"Portfolio example '{title}' added successfully"
         }
 
@@ -2676,8 +4397,8 @@ def data_list_portfolio_examples(
     logger.info(f"Listing portfolio examples (limit={limit}, tech={technology_filter}, company={company_filter})")
 
     try:
-        user_id = os.getenv("USER_ID", "default")
-        examples = portfolio_repo.list_examples(
+        user_id = current_user_id()
+        examples = app_context.portfolio_repo.list_examples(
             user_id=user_id,
             limit=limit,
             technology_filter=technology_filter,
@@ -2713,8 +4434,8 @@ def data_search_portfolio_examples(query: str, technologies: List[str] = None) -
     logger.info(f"Searching portfolio for: {query}")
 
     try:
-        user_id = os.getenv("USER_ID", "default")
-        examples = portfolio_repo.search_examples(
+        user_id = current_user_id()
+        examples = app_context.portfolio_repo.search_examples(
             user_id=user_id,
             query=query,
             technologies=technologies
@@ -2735,6 +4456,89 @@ def data_search_portfolio_examples(query: str, technologies: List[str] = None) -
         }
 
 
+@mcp.tool()
+def data_semantic_search_portfolio_examples(
+    query: str = None, company: str = None, job_title: str = None, top_k: int = 5
+) -> dict[str, Any]:
+    """
+    Find the portfolio examples most similar in meaning to a job or free text.
+
+    Compares the query embedding against precomputed example embeddings in
+    memory (no LLM calls, no keyword guessing). Pass either free text, or the
+    company and job title of a stored job analysis to match against its
+    title, keywords, qualifications and responsibilities.
+
+    Args:
+        query: Free text to match (e.g., a job description)
+        company: Company of a stored job analysis (with job_title)
+        job_title: Job title of a stored job analysis (with company)
+        top_k: Number of examples to return (default: 5)
+
+    Returns:
+        Dict with status and examples ranked by similarity score (cosine, -1 to 1)
+    """
+    logger.info(f"Semantic portfolio search (query={bool(query)}, company={company}, job_title={job_title})")
+
+    try:
+        user_id = current_user_id()
+
+        if company and job_title:
+            analysis = app_context.job_app_repo.get_job_analysis(user_id, company, job_title)
+            if not analysis:
+                return {
+                    "status": "error",
+                    "error": f"Job analysis not found for {company} - {job_title}"
+                }
+            text = job_analysis_embedding_text(analysis)
+            if query:
+                text = f"{query}\n{text}"
+        elif query:
+            text = query
+        else:
+            return {
+                "status": "error",
+                "error": "Provide a query, or company and job_title of a job analysis"
+            }
+
+        start = time.perf_counter()
+        matches = app_context.portfolio_index.search(user_id, text, top_k=top_k)
+        search_ms = (time.perf_counter() - start) * 1000
+
+        examples = []
+        for example_id, score in matches:
+            example = app_context.portfolio_repo.get_example(user_id=user_id, example_id=example_id)
+            if not example:
+                continue
+            content = example.pop("content")
+            example["content_preview"] = content[:200] + "..." if len(content) > 200 else content
+            example["score"] = round(score, 4)
+            examples.append(example)
+
+        return {
+            "status": "success",
+            "count": len(examples),
+            "search_ms": round(search_ms, 2),
+            "examples": examples
+        }
+
+    except Exception as e:
+        logger.error(f"Error in semantic portfolio search: {e}")
+        return {
+            "status": "error",
+            "error": str(e)
+        }
+
+
+def _embed_portfolio_example(user_id: str, example_id: int) -> bool:
+    """Embed a portfolio example at write time; on failure it is embedded on the next search."""
+    try:
+        app_context.portfolio_index.index_example(user_id, example_id)
+        return True
+    except Exception as e:
+        logger.warning(f"Could not embed portfolio example {example_id} (will retry on search): {e}")
+        return False
+
+
 @mcp.tool()
 def data_get_portfolio_example(example_id: int) -> dict[str, Any]:
     """
@@ -2749,8 +4553,8 @@ def data_get_portfolio_example(example_id: int) -> dict[str, Any]:
     logger.info(f"Getting portfolio example: {example_id}")
 
     try:
-        user_id = os.getenv("USER_ID", "default")
-        example = portfolio_repo.get_example(user_id=user_id, example_id=example_id)
+        user_id = current_user_id()
+        example = app_context.portfolio_repo.get_example(user_id=user_id, example_id=example_id)
 
         if not example:
             return {
@@ -2792,14 +4596,17 @@ def data_update_portfolio_example(
         file_paths: New file paths list (optional)
         source_repo: New source repo URL (optional)
 
+    Changing the title, content, description or technologies re-embeds the
+    example for data_semantic_search_portfolio_examples.
+
     Returns:
-        Dict with status
+        Dict with status and whether the example was re-embedded
     """
     logger.info(f"Updating portfolio example: {example_id}")
 
     try:
-        user_id = os.getenv("USER_ID", "default")
-        portfolio_repo.update_example(
+        user_id = current_user_id()
+        app_context.portfolio_repo.update_example(
             user_id=user_id,
             example_id=example_id,
             title=title,
@@ -2812,11 +4619,18 @@ def data_update_portfolio_example(
             source_repo=source_repo
         )
 
-        return {
+        embedded = None
+        if any(field is not None for field in (title, content, description, technologies)):
+            embedded = _embed_portfolio_example(user_id, example_id)
+
+        result = {
             "status": "success",
             "example_id": example_id,
             "message": f"Portfolio example {example_id} updated successfully"
         }
+        if embedded is not None:
+            result["embedded"] = embedded
+        return result
 
     except Exception as e:
         logger.error(f"Error updating portfolio example: {e}")
@@ -2840,8 +4654,9 @@ def data_delete_portfolio_example(example_id: int) -> dict[str, Any]:
     logger.info(f"Deleting portfolio example: {example_id}")
 
     try:
-        user_id = os.getenv("USER_ID", "default")
-        portfolio_repo.delete_example(user_id=user_id, example_id=example_id)
+        user_id = current_user_id()
+        app_context.portfolio_repo.delete_example(user_id=user_id, example_id=example_id)
+        app_context.portfolio_index.remove(user_id, example_id)
 
         return {
             "status": "success",
@@ -2857,6 +4672,99 @@ def data_delete_portfolio_example(example_id: int) -> dict[str, Any]:
         }
 
 
+@mcp.tool()
+def data_import_ndjson(path: str, batch_size: int = BULK_BATCH_SIZE) -> dict[str, Any]:
+    """
+    Bulk import applications and portfolio examples from an NDJSON file.
+
+    Each line is a JSON object with "type": "application" (a job analysis,
+    optionally with "tailored_resume", "cover_letter" and "portfolio_examples"
+    documents) or "portfolio_example" (portfolio library fields). Existing
+    records are updated: applications match on company and job title,
+    portfolio examples on title and company. The file is streamed and written
+    in transactions of batch_size records.
+
+    Args:
+        path: NDJSON file (relative paths are relative to the repository root)
+        batch_size: Records per transaction (default: 1000)
+
+    Returns:
+        Dict with inserted/updated counts per record type and any line errors
+    """
+    logger.info(f"Importing NDJSON from {path}")
+
+    try:
+        user_id = current_user_id()
+        source = resolve_data_path(path)
+        start = time.perf_counter()
+        # Imported portfolio examples are embedded on the next semantic search
+        with open(source, "r", encoding="utf-8") as f:
+            result = import_ndjson(f, user_id, batch_size=batch_size)
+
+        return {
+            "status": "success",
+            "path": str(source),
+            **result,
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+
+    except Exception as e:
+        logger.error(f"Error importing NDJSON: {e}")
+        return {
+            "status": "error",
+            "error": str(e)
+        }
+
+
+@mcp.tool()
+def data_export_ndjson(path: str, record_types: List[str] = None) -> dict[str, Any]:
+    """
+    Bulk export applications and/or portfolio examples to an NDJSON file.
+
+    Writes the data_import_ndjson format, streaming rows from the database
+    in batches. The file is replaced atomically when the export completes.
+
+    Args:
+        path: Output file (relative paths are relative to the repository root)
+        record_types: "application" and/or "portfolio_example" (default: both)
+
+    Returns:
+        Dict with status, path and number of records written per type
+    """
+    logger.info(f"Exporting NDJSON to {path}")
+
+    try:
+        user_id = current_user_id()
+        record_types = record_types or list(NDJSON_RECORD_TYPES)
+        target = resolve_data_path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(target.name + ".partial")
+
+        counts = {kind: 0 for kind in record_types}
+        try:
+            with open(partial, "w", encoding="utf-8") as f:
+                for kind in record_types:
+                    for line in export_ndjson(user_id, [kind]):
+                        f.write(line)
+                        counts[kind] += 1
+            os.replace(partial, target)
+        finally:
+            partial.unlink(missing_ok=True)
+
+        return {
+            "status": "success",
+            "path": str(target),
+            "counts": counts
+        }
+
+    except Exception as e:
+        logger.error(f"Error exporting NDJSON: {e}")
+        return {
+            "status": "error",
+            "error": str(e)
+        }
+
+
 # ============================================================================
 # MCP TOOLS - RAG PIPELINE (Website Processing)
 # ============================================================================
@@ -2905,7 +4813,7 @@ async def rag_process_website(
 
         # Connect to database
         db_path = DATA_DIR / "resume_agent.db"
-        conn = sqlite3.connect(db_path)
+        conn = sqlite3.connect(db_path, factory=TimedConnection)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -2940,10 +4848,10 @@ async def rag_process_website(
             old_chunk_ids = [row[0] for row in cursor.fetchall()]
 
             # Delete old vectors from Qdrant
-            if vector_store is not None and old_chunk_ids:
+            if app_context.vector_store is not None and old_chunk_ids:
                 try:
                     logger.info(f"Deleting {len(old_chunk_ids)} old vectors from Qdrant")
-                    vector_store.delete_by_chunk_ids(old_chunk_ids)
+                    app_context.vector_store.delete_by_chunk_ids(old_chunk_ids)
                 except Exception as e:
                     logger.error(f"Failed to delete old vectors from Qdrant: {e}")
 
@@ -2969,10 +4877,11 @@ async def rag_process_website(
         # For now, use httpx as a placeholder
         try:
             import httpx
-            async with httpx.AsyncClient(follow_redirects=True, timeout=30.0) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                raw_html = response.text
+            with stage("fetch"):
+                async with httpx.AsyncClient(follow_redirects=True, timeout=30.0) as client:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                    raw_html = response.text
         except Exception as e:
             cursor.execute(
                 "UPDATE website_sources SET processing_status = 'failed', error_message = ? WHERE id = ?",
@@ -3063,7 +4972,7 @@ async def rag_process_website(
             })
 
         # Generate embeddings and store in Qdrant
-        if vector_store is not None and chunks_data:
+        if app_context.vector_store is not None and chunks_data:
             try:
                 logger.info(f"Generating embeddings for {len(chunks_data)} chunks")
                 chunk_texts = [c["content"] for c in chunks_data]
@@ -3073,7 +4982,7 @@ async def rag_process_website(
                 chunk_ids = [c["chunk_id"] for c in chunks_data]
                 chunk_metadata = [c["metadata"] for c in chunks_data]
 
-                vector_store.store_embeddings(
+                app_context.vector_store.store_embeddings(
                     chunk_ids=chunk_ids,
                     embeddings=embeddings,
                     metadata=chunk_metadata
@@ -3135,7 +5044,7 @@ def rag_get_website_status(source_id: int) -> dict[str, Any]:
         import sqlite3
 
         db_path = DATA_DIR / "resume_agent.db"
-        conn = sqlite3.connect(db_path)
+        conn = sqlite3.connect(db_path, factory=TimedConnection)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -3232,7 +5141,7 @@ async def rag_query_websites(
 
         # Connect to database
         db_path = DATA_DIR / "resume_agent.db"
-        conn = sqlite3.connect(db_path)
+        conn = sqlite3.connect(db_path, factory=TimedConnection)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -3248,10 +5157,10 @@ async def rag_query_websites(
 
         # Perform vector search using Qdrant
         vector_results = {}
-        if vector_store is not None:
+        if app_context.vector_store is not None:
             try:
                 logger.info(f"Performing vector search in Qdrant")
-                vector_hits = vector_store.search_similar(
+                vector_hits = app_context.vector_store.search_similar(
                     query_embedding=query_embedding,
                     limit=20
                 )
@@ -3417,7 +5326,7 @@ def rag_list_websites(
     try:
         # Connect to database
         db_path = DATA_DIR / "resume_agent.db"
-        conn = sqlite3.connect(db_path)
+        conn = sqlite3.connect(db_path, factory=TimedConnection)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -3534,7 +5443,7 @@ async def rag_refresh_website(source_id: int) -> dict[str, Any]:
     try:
         # Connect to database
         db_path = DATA_DIR / "resume_agent.db"
-        conn = sqlite3.connect(db_path)
+        conn = sqlite3.connect(db_path, factory=TimedConnection)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -3592,7 +5501,7 @@ def rag_delete_website(source_id: int) -> dict[str, Any]:
     try:
         # Connect to database
         db_path = DATA_DIR / "resume_agent.db"
-        conn = sqlite3.connect(db_path)
+        conn = sqlite3.connect(db_path, factory=TimedConnection)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
@@ -3616,10 +5525,10 @@ def rag_delete_website(source_id: int) -> dict[str, Any]:
         chunk_count = len(chunk_ids)
 
         # Delete vectors from Qdrant
-        if vector_store is not None and chunk_ids:
+        if app_context.vector_store is not None and chunk_ids:
             try:
                 logger.info(f"Deleting {len(chunk_ids)} vectors from Qdrant")
-                vector_store.delete_by_chunk_ids(chunk_ids)
+                app_context.vector_store.delete_by_chunk_ids(chunk_ids)
             except Exception as e:
                 logger.error(f"Failed to delete vectors from Qdrant: {e}")
 
@@ -3658,12 +5567,241 @@ def rag_delete_website(source_id: int) -> dict[str, Any]:
         }
 
 
+# ============================================================================
+# APPLICATION PIPELINE
+# ============================================================================
+
+# Slash commands run by the apply_to_job pipeline stages
+PIPELINE_COMMANDS = {
+    "analysis": "career/analyze-job",
+    "tailored_resume": "career/tailor-resume",
+    "cover_letter": "career/cover-letter",
+}
+
+# Portfolio examples attached to an application by the pipeline
+PIPELINE_PORTFOLIO_LIMIT = 5
+
+
+def input_hash(*inputs: Any) -> str:
+    """Stable hash of JSON-serializable stage inputs."""
+    payload = json.dumps(inputs, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ApplyPipeline:
+    """
+    Orchestrated job application: analysis -> tailored resume -> (cover letter || portfolio).
+
+    Each stage reuses the artifact already stored in job_app_repo when the
+    inputs it was generated from are unchanged (tracked as input hashes in
+    the artifact_inputs table), and only runs its slash command otherwise.
+    Cover letter generation and portfolio example search depend only on the
+    analysis and tailored resume, so they run concurrently.
+
+    Args:
+        job_url: URL to the job posting
+        user_id: Owner of the application
+        include_cover_letter: Whether to generate a cover letter
+        refresh: Regenerate every artifact even when inputs are unchanged
+        on_output: Async callback receiving slash command output lines
+        notify: Async callback receiving stage status messages
+    """
+
+    def __init__(
+        self,
+        job_url: str,
+        user_id: str,
+        include_cover_letter: bool = True,
+        refresh: bool = False,
+        on_output: Optional[OutputListener] = None,
+        notify: Optional[Callable[[str], Awaitable[None]]] = None,
+    ):
+        self.job_url = job_url
+        self.user_id = user_id
+        self.include_cover_letter = include_cover_letter
+        self.refresh = refresh
+        self.on_output = on_output
+        self.notify = notify
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        # (company, job_title) of the application, and the inputs of later stages
+        self.key: Optional[tuple[str, str]] = None
+        self.analysis: Dict[str, Any] = {}
+        self.tailored_resume = ""
+
+    async def _stage(self, name: str, run: Callable[[], Awaitable[str]]) -> None:
+        """Run one stage, recording its status ("reused"/"generated") and duration."""
+        if self.notify:
+            await self.notify(f"{name}: started")
+        start = time.perf_counter()
+        try:
+            status = await run()
+        except Exception as e:
+            self.stages[name] = {"status": "error", "error": str(e), "seconds": round(time.perf_counter() - start, 3)}
+            raise
+        self.stages[name] = {"status": status, "seconds": round(time.perf_counter() - start, 3)}
+        if self.notify:
+            await self.notify(f"{name}: {status} in {self.stages[name]['seconds']:.1f}s")
+
+    async def _generate(self, stage: str) -> None:
+        await invoke_slash_command(
+            PIPELINE_COMMANDS[stage], arguments=self.job_url, on_output=self.on_output, user_id=self.user_id
+        )
+
+    async def run(self) -> Dict[str, Any]:
+        """Run the pipeline and return the application key, stage results and timings."""
+        repo = app_context.job_app_repo
+        started = time.perf_counter()
+
+        async def analysis_stage() -> str:
+            self.key = await asyncio.to_thread(repo.find_application_by_url, self.user_id, self.job_url)
+            status = "reused"
+            if self.key is None or self.refresh:
+                await self._generate("analysis")
+                self.key = await asyncio.to_thread(repo.find_application_by_url, self.user_id, self.job_url)
+                status = "generated"
+            if self.key is None:
+                raise RuntimeError(f"No job analysis was saved for {self.job_url}")
+            self.analysis = await asyncio.to_thread(repo.get_job_analysis, self.user_id, *self.key)
+            return status
+
+        async def tailored_resume_stage() -> str:
+            master_resume = await asyncio.to_thread(app_context.resume_repo.get_master_resume, self.user_id)
+            if master_resume is None:
+                raise RuntimeError("Master resume not found")
+            expected = input_hash(self._analysis_inputs(), master_resume)
+            status, self.tailored_resume = await self._reuse_or_generate(
+                "tailored_resume", expected, repo.get_tailored_resume, lambda: self._generate("tailored_resume")
+            )
+            return status
+
+        async def cover_letter_stage() -> str:
+            expected = input_hash(self._analysis_inputs(), self.tailored_resume)
+            status, _ = await self._reuse_or_generate(
+                "cover_letter", expected, repo.get_cover_letter, lambda: self._generate("cover_letter")
+            )
+            return status
+
+        async def portfolio_stage() -> str:
+            expected = input_hash(self._analysis_inputs(), self.tailored_resume)
+            hashes = await asyncio.to_thread(repo.get_artifact_input_hashes, self.user_id, *self.key)
+            if hashes.get("portfolio_examples") == expected and not self.refresh:
+                return "reused"
+            await asyncio.to_thread(self._select_portfolio_examples)
+            await asyncio.to_thread(
+                repo.set_artifact_input_hash, self.user_id, *self.key, "portfolio_examples", expected
+            )
+            return "generated"
+
+        try:
+            await self._stage("analysis", analysis_stage)
+            await self._stage("tailored_resume", tailored_resume_stage)
+
+            parallel = [self._stage("portfolio_examples", portfolio_stage)]
+            if self.include_cover_letter:
+                parallel.append(self._stage("cover_letter", cover_letter_stage))
+            else:
+                self.stages["cover_letter"] = {"status": "skipped", "seconds": 0.0}
+            results = await asyncio.gather(*parallel, return_exceptions=True)
+            errors = [str(r) for r in results if isinstance(r, Exception)]
+            error = "; ".join(errors) if errors else None
+        except Exception as e:
+            error = str(e)
+
+        result: Dict[str, Any] = {
+            "status": "error" if error else "success",
+            "job_url": self.job_url,
+            "include_cover_letter": self.include_cover_letter,
+            "stages": self.stages,
+            "total_seconds": round(time.perf_counter() - started, 3),
+        }
+        if self.key:
+            result["company"], result["job_title"] = self.key
+        if error:
+            result["error"] = error
+        return result
+
+    def _analysis_inputs(self) -> Dict[str, Any]:
+        """Job analysis fields that drive downstream artifacts (fetch time excluded)."""
+        return {k: v for k, v in self.analysis.items() if k != "fetched_at"}
+
+    async def _reuse_or_generate(
+        self,
+        artifact: str,
+        expected_hash: str,
+        read: Callable[[str, str, str], Optional[str]],
+        generate: Callable[[], Awaitable[None]],
+    ) -> tuple[str, str]:
+        """Reuse a stored artifact generated from the same inputs, or regenerate it.
+
+        Returns:
+            (status, artifact content)
+        """
+        repo = app_context.job_app_repo
+        content = await asyncio.to_thread(read, self.user_id, *self.key)
+        hashes = await asyncio.to_thread(repo.get_artifact_input_hashes, self.user_id, *self.key)
+        status = "reused"
+        if content is None or hashes.get(artifact) != expected_hash or self.refresh:
+            await generate()
+            content = await asyncio.to_thread(read, self.user_id, *self.key)
+            if content is None:
+                raise RuntimeError(f"No {artifact.replace('_', ' ')} was saved for {self.key[0]} - {self.key[1]}")
+            await asyncio.to_thread(
+                repo.set_artifact_input_hash, self.user_id, *self.key, artifact, expected_hash
+            )
+            status = "generated"
+        return status, content
+
+    def _select_portfolio_examples(self) -> None:
+        """Pick library examples matching the job's keywords and save them to the application."""
+        keywords = self.analysis.get("keywords", [])
+        scores: Dict[int, int] = {}
+        examples: Dict[int, Dict[str, Any]] = {}
+        for keyword in keywords:
+            for example in app_context.portfolio_repo.search_examples(self.user_id, keyword):
+                examples[example["id"]] = example
+                scores[example["id"]] = scores.get(example["id"], 0) + 1
+
+        ranked = sorted(examples.values(), key=lambda ex: (-scores[ex["id"]], ex["title"]))
+        selected = ranked[:PIPELINE_PORTFOLIO_LIMIT]
+        lines = [f"# Portfolio Examples: {self.key[0]} - {self.key[1]}", ""]
+        for example in selected:
+            technologies = ", ".join(example.get("technologies") or [])
+            lines.append(f"## {example['title']}")
+            if example.get("description"):
+                lines.append(example["description"])
+            if technologies:
+                lines.append(f"Technologies: {technologies}")
+            if example.get("source_repo"):
+                lines.append(f"Source: {example['source_repo']}")
+            lines.append(f"Matched keywords: {scores[example['id']]}")
+            lines.append("")
+        if not selected:
+            lines.append("No matching portfolio examples in the library.")
+
+        app_context.job_app_repo.save_portfolio_examples(self.user_id, *self.key, "\n".join(lines).strip())
+        app_context.user_cache.invalidate(self.user_id, "applications")
+
+
+def log_notifier(ctx: Optional[Context]) -> Optional[Callable[[str], Awaitable[None]]]:
+    """Forward pipeline stage messages to the MCP client as log notifications."""
+    if ctx is None:
+        return None
+
+    async def notify(message: str) -> None:
+        try:
+            await ctx.info(message)
+        except Exception as e:
+            logger.debug(f"Stage notification failed: {e}")
+
+    return notify
+
+
 # ============================================================================
 # MCP TOOLS (Actions the server can perform)
 # ============================================================================
 
 @mcp.tool()
-async def analyze_job(job_url: str) -> dict[str, Any]:
+async def analyze_job(job_url: str, ctx: Context = None) -> dict[str, Any]:
     """
     Analyze a job posting and extract structured requirements.
 
@@ -3673,6 +5811,9 @@ async def analyze_job(job_url: str) -> dict[str, Any]:
     - Assesses match with your master resume
     - Provides application recommendations
 
+    Identical concurrent requests share one run; progress is streamed to
+    the client as the command produces output.
+
     Args:
         job_url: URL to the job posting (e.g., https://japan-dev.com/jobs/...)
 
@@ -3685,7 +5826,8 @@ async def analyze_job(job_url: str) -> dict[str, Any]:
         # Execute the career:analyze-job slash command
         result_text = await invoke_slash_command(
             "career/analyze-job",
-            arguments=job_url
+            arguments=job_url,
+            on_output=progress_reporter(ctx)
         )
 
         logger.info(f"Job analysis complete")
@@ -3705,7 +5847,7 @@ async def analyze_job(job_url: str) -> dict[str, Any]:
 
 
 @mcp.tool()
-async def tailor_resume(job_url: str) -> dict[str, Any]:
+async def tailor_resume(job_url: str, ctx: Context = None) -> dict[str, Any]:
     """
     Tailor your resume for a specific job opportunity.
 
@@ -3728,7 +5870,8 @@ async def tailor_resume(job_url: str) -> dict[str, Any]:
         # Execute the career:tailor-resume slash command
         result_text = await invoke_slash_command(
             "career/tailor-resume",
-            arguments=job_url
+            arguments=job_url,
+            on_output=progress_reporter(ctx)
         )
 
         logger.info(f"Resume tailoring complete")
@@ -3748,51 +5891,84 @@ async def tailor_resume(job_url: str) -> dict[str, Any]:
 
 
 @mcp.tool()
-async def apply_to_job(job_url: str, include_cover_letter: bool = True) -> dict[str, Any]:
+async def apply_to_job(
+    job_url: str,
+    include_cover_letter: bool = True,
+    refresh: bool = False,
+    ctx: Context = None
+) -> dict[str, Any]:
     """
     Complete end-to-end job application workflow.
 
-    Executes the /career:apply slash command which orchestrates:
-    1. Job posting analysis
-    2. GitHub portfolio search for relevant code examples
-    3. Resume tailoring with project highlights
-    4. Cover letter generation (if requested)
-    5. Saves all artifacts to job-applications directory
+    Runs the application pipeline:
+    1. Job posting analysis (/career:analyze-job)
+    2. Resume tailoring (/career:tailor-resume)
+    3. In parallel: cover letter generation (/career:cover-letter, if requested)
+       and portfolio example selection from the portfolio library
+    All artifacts are saved to the database.
+
+    Stages whose stored artifact was generated from unchanged inputs (same
+    job analysis, master resume and tailored resume) are reused instead of
+    re-run, so re-applying to a job only regenerates what changed.
 
     This is the primary tool - it handles the complete application process.
 
     Args:
         job_url: URL to the job posting
         include_cover_letter: Whether to generate a cover letter (default: True)
+        refresh: Regenerate every artifact even if inputs are unchanged (default: False)
 
     Returns:
-        Complete application package with all generated files
+        Application key, per-stage status ("reused", "generated", "skipped",
+        "error") and per-stage timings in seconds
     """
     logger.info(f"Starting complete application workflow for: {job_url}")
 
-    try:
-        # Execute the career:apply slash command
-        # This handles the full workflow end-to-end
-        result_text = await invoke_slash_command(
-            "career/apply",
-            arguments=job_url
-        )
+    pipeline = ApplyPipeline(
+        job_url,
+        user_id=current_user_id(),
+        include_cover_letter=include_cover_letter,
+        refresh=refresh,
+        on_output=progress_reporter(ctx),
+        notify=log_notifier(ctx),
+    )
+    result = await pipeline.run()
 
-        logger.info(f"Application workflow complete")
-        return {
-            "status": "success",
-            "job_url": job_url,
-            "include_cover_letter": include_cover_letter,
-            "result": result_text
-        }
+    if result["status"] == "success":
+        logger.info(f"Application workflow complete in {result['total_seconds']:.1f}s: {result['stages']}")
+    else:
+        logger.error(f"Application workflow failed: {result['error']}")
+    return result
 
-    except Exception as e:
-        logger.error(f"Application workflow failed: {e}")
-        return {
-            "status": "error",
-            "error": str(e),
-            "job_url": job_url
-        }
+
+@mcp.tool()
+def server_metrics(tool: str = None, reset: bool = False) -> dict[str, Any]:
+    """
+    Latency and throughput of this server's MCP tools.
+
+    For each tool: call and error counts, calls in the last minute, mean and
+    p50/p95/p99 latency over its latest calls, and the same percentiles for
+    the time each call spent per stage (sql, embed, qdrant, fetch, command).
+
+    Args:
+        tool: Only report this tool (optional)
+        reset: Clear all metrics after reporting them
+
+    Returns:
+        Dict with status, uptime, per-tool metrics and per-user cache hit rates
+    """
+    tools = tool_metrics.snapshot(tool)
+    uptime = time.time() - tool_metrics.started_at
+    if reset:
+        tool_metrics.reset()
+
+    return {
+        "status": "success",
+        "window": tool_metrics.window,
+        "uptime_seconds": round(uptime, 1),
+        "tools": tools,
+        "user_cache": app_context.user_cache.stats()
+    }
 
 
 # ============================================================================
@@ -4006,7 +6182,9 @@ Job URL: {job_url}
 
 Please:
 1. Analyze the job's technical requirements (use analyze_job tool)
-2. Search my GitHub repositories for matching projects
+2. Find matching examples in my portfolio library with
+   data_semantic_search_portfolio_examples(company, job_title), then search
+   my GitHub repositories for anything the library is missing
 3. Identify code examples that demonstrate:
    - Required technologies/frameworks
    - Similar problem domains
@@ -4123,6 +6301,11 @@ def main():
 
     args = parser.parse_args()
 
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
     logger.info(f"Starting Resume Agent MCP Server")
     logger.info(f"Transport: {args.transport}")
 
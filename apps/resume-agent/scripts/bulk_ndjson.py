@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Bulk NDJSON import/export for job applications and the portfolio library.
+
+Streams records in and out of the resume-agent SQLite database using the same
+code paths as the data_import_ndjson / data_export_ndjson MCP tools: imports
+are upserted in large transactions, exports stream rows in batches.
+
+Record format (one JSON object per line):
+    {"type": "application", "url": ..., "company": ..., "job_title": ..., ...,
+     "tailored_resume": {"content": ...}, "cover_letter": {"content": ...}}
+    {"type": "portfolio_example", "title": ..., "content": ..., "technologies": [...]}
+
+Usage:
+    uv run apps/resume-agent/scripts/bulk_ndjson.py import applications.ndjson
+    uv run apps/resume-agent/scripts/bulk_ndjson.py export backup.ndjson
+    uv run apps/resume-agent/scripts/bulk_ndjson.py export - --type portfolio_example > portfolio.ndjson
+
+Use "-" for stdin/stdout. The database is SQLITE_DATABASE_PATH (default
+apps/resume-agent/data/resume_agent.db) and records belong to USER_ID.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Bulk operations need the SQLite backend
+os.environ.setdefault("STORAGE_BACKEND", "sqlite")
+
+import resume_agent  # noqa: E402
+
+
+def import_command(args: argparse.Namespace) -> int:
+    start = time.perf_counter()
+    if args.file == "-":
+        result = resume_agent.import_ndjson(sys.stdin, args.user_id, batch_size=args.batch_size)
+    else:
+        with open(args.file, "r", encoding="utf-8") as f:
+            result = resume_agent.import_ndjson(f, args.user_id, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+
+    for kind, counts in result["counts"].items():
+        print(f"{kind}: {counts['inserted']} inserted, {counts['updated']} updated", file=sys.stderr)
+    for error in result["errors"]:
+        print(f"line {error['line']}: {error['error']}", file=sys.stderr)
+    print(f"{result['error_count']} errors, {elapsed:.2f}s", file=sys.stderr)
+    return 1 if result["error_count"] else 0
+
+
+def export_command(args: argparse.Namespace) -> int:
+    record_types = args.type or list(resume_agent.NDJSON_RECORD_TYPES)
+    start = time.perf_counter()
+    count = 0
+    out = sys.stdout if args.file == "-" else open(args.file, "w", encoding="utf-8")
+    try:
+        for line in resume_agent.export_ndjson(args.user_id, record_types, batch_size=args.batch_size):
+            out.write(line)
+            count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{count} records, {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--user-id", default=os.getenv("USER_ID", "default"), help="Owner of the records")
+    parser.add_argument(
+        "--batch-size", type=int, default=resume_agent.BULK_BATCH_SIZE, help="Records per transaction/read batch"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Upsert records from an NDJSON file")
+    import_parser.add_argument("file", help='NDJSON file, or "-" for stdin')
+    import_parser.set_defaults(func=import_command)
+
+    export_parser = commands.add_parser("export", help="Write records to an NDJSON file")
+    export_parser.add_argument("file", help='Output file, or "-" for stdout')
+    export_parser.add_argument(
+        "--type", action="append", choices=resume_agent.NDJSON_RECORD_TYPES,
+        help="Record type to export (repeatable; default: all)"
+    )
+    export_parser.set_defaults(func=export_command)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
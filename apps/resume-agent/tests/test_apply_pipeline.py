@@ -0,0 +1,185 @@
+"""Tests for the apply_to_job pipeline (artifact reuse, parallel stages, timings).
+
+Slash commands are replaced by a fake that saves the artifact the real
+command would save, and the repositories by in-memory implementations.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import resume_agent  # noqa: E402
+from resume_agent import ApplyPipeline  # noqa: E402
+
+JOB_URL = "https://jobs.example.com/acme/backend"
+KEY = ("Acme", "Backend Engineer")
+
+
+class MemoryResumeRepo:
+    def __init__(self):
+        self.resume = {"personal_info": {"name": "Alex"}, "about_me": "Engineer"}
+
+    def get_master_resume(self, user_id):
+        return self.resume
+
+
+class MemoryJobApplicationRepo:
+    def __init__(self):
+        self.analyses = {}
+        self.documents = {}
+        self.hashes = {}
+
+    def find_application_by_url(self, user_id, url):
+        for key, analysis in self.analyses.items():
+            if analysis["url"].rstrip("/") == url.rstrip("/"):
+                return key
+        return None
+
+    def get_job_analysis(self, user_id, company, job_title):
+        return self.analyses.get((company, job_title))
+
+    def get_tailored_resume(self, user_id, company, job_title):
+        return self.documents.get(("tailored_resume", company, job_title))
+
+    def get_cover_letter(self, user_id, company, job_title):
+        return self.documents.get(("cover_letter", company, job_title))
+
+    def save_portfolio_examples(self, user_id, company, job_title, content):
+        self.documents[("portfolio_examples", company, job_title)] = content
+
+    def get_artifact_input_hashes(self, user_id, company, job_title):
+        return dict(self.hashes.get((company, job_title), {}))
+
+    def set_artifact_input_hash(self, user_id, company, job_title, artifact, input_hash):
+        self.hashes.setdefault((company, job_title), {})[artifact] = input_hash
+
+
+class MemoryPortfolioRepo:
+    delay = 0.0
+
+    def search_examples(self, user_id, query, technologies=None):
+        time.sleep(self.delay)
+        if query == "Python":
+            return [{"id": 1, "title": "RAG pipeline", "description": "Hybrid search", "technologies": ["Python"]}]
+        return []
+
+
+@pytest.fixture
+def repos(monkeypatch):
+    resume_repo = MemoryResumeRepo()
+    job_repo = MemoryJobApplicationRepo()
+    portfolio_repo = MemoryPortfolioRepo()
+    monkeypatch.setattr(resume_agent.app_context, "_repositories", (resume_repo, None, job_repo, portfolio_repo))
+    return resume_repo, job_repo, portfolio_repo
+
+
+class CommandCalls(list):
+    """Slash commands run, plus per-command simulated durations."""
+
+    def __init__(self):
+        super().__init__()
+        self.delays = {}
+
+
+@pytest.fixture
+def commands(monkeypatch, repos):
+    """Fake slash commands; returns the list of commands run."""
+    _, job_repo, _ = repos
+    calls = CommandCalls()
+
+    async def fake_invoke(command_path, arguments="", variables=None, on_output=None, user_id=None):
+        calls.append(command_path)
+        await asyncio.sleep(calls.delays.get(command_path, 0))
+        if command_path == "career/analyze-job":
+            job_repo.analyses[KEY] = {
+                "url": arguments, "company": KEY[0], "job_title": KEY[1],
+                "keywords": ["Python", "Go"], "fetched_at": time.time(),
+            }
+        elif command_path == "career/tailor-resume":
+            job_repo.documents[("tailored_resume", *KEY)] = f"Tailored resume v{len(calls)}"
+        elif command_path == "career/cover-letter":
+            job_repo.documents[("cover_letter", *KEY)] = "Dear Acme"
+        return "done"
+
+    monkeypatch.setattr(resume_agent, "invoke_slash_command", fake_invoke)
+    return calls
+
+
+def _run(**kwargs):
+    return asyncio.run(ApplyPipeline(JOB_URL, user_id="default", **kwargs).run())
+
+
+def _statuses(result):
+    return {name: stage["status"] for name, stage in result["stages"].items()}
+
+
+def test_first_run_generates_every_artifact(repos, commands):
+    result = _run()
+
+    assert result["status"] == "success"
+    assert (result["company"], result["job_title"]) == KEY
+    assert _statuses(result) == {
+        "analysis": "generated",
+        "tailored_resume": "generated",
+        "portfolio_examples": "generated",
+        "cover_letter": "generated",
+    }
+    assert all(stage["seconds"] >= 0 for stage in result["stages"].values())
+    assert sorted(commands) == ["career/analyze-job", "career/cover-letter", "career/tailor-resume"]
+    assert "RAG pipeline" in repos[1].documents[("portfolio_examples", *KEY)]
+
+
+def test_unchanged_inputs_reuse_artifacts(repos, commands):
+    _run()
+    commands.clear()
+
+    result = _run()
+
+    assert commands == []
+    assert set(_statuses(result).values()) == {"reused"}
+
+
+def test_changed_master_resume_regenerates_downstream(repos, commands):
+    _run()
+    commands.clear()
+    repos[0].resume = {**repos[0].resume, "about_me": "Staff engineer"}
+
+    result = _run()
+
+    assert _statuses(result) == {
+        "analysis": "reused",
+        "tailored_resume": "generated",
+        "portfolio_examples": "generated",
+        "cover_letter": "generated",
+    }
+    assert sorted(commands) == ["career/cover-letter", "career/tailor-resume"]
+
+
+def test_cover_letter_and_portfolio_run_concurrently(repos, commands):
+    commands.delays["career/cover-letter"] = 0.3
+    repos[2].delay = 0.15  # per keyword searched (2 keywords)
+
+    result = _run()
+
+    stages = result["stages"]
+    parallel = stages["cover_letter"]["seconds"] + stages["portfolio_examples"]["seconds"]
+    elapsed_after_tailoring = result["total_seconds"] - stages["analysis"]["seconds"] - stages["tailored_resume"]["seconds"]
+    assert parallel >= 0.6
+    assert elapsed_after_tailoring < 0.5
+
+
+def test_skipped_cover_letter_and_stage_errors(repos, commands):
+    result = _run(include_cover_letter=False)
+    assert result["stages"]["cover_letter"]["status"] == "skipped"
+    assert "career/cover-letter" not in commands
+
+    repos[0].resume = None
+    result = _run(refresh=True)
+    assert result["status"] == "error"
+    assert result["stages"]["tailored_resume"]["status"] == "error"
+    assert "Master resume not found" in result["error"]
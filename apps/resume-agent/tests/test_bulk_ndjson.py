@@ -0,0 +1,157 @@
+"""Tests for bulk NDJSON import/export of applications and the portfolio library."""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+import resume_agent  # noqa: E402
+
+
+def _application(i, **overrides):
+    record = {
+        "type": "application",
+        "url": f"https://jobs.example.com/{i}",
+        "fetched_at": "2025-01-01T00:00:00",
+        "company": f"Company {i}",
+        "job_title": "Backend Engineer",
+        "location": "Remote",
+        "salary_range": None,
+        "required_qualifications": [f"Python {i}", "SQL"],
+        "preferred_qualifications": ["Go"],
+        "responsibilities": ["Build APIs"],
+        "keywords": ["python", "sql", f"k{i}"],
+        "candidate_profile": "Backend engineer",
+        "raw_description": f"Posting {i}",
+    }
+    record.update(overrides)
+    return record
+
+
+def _example(title, **overrides):
+    record = {
+        "type": "portfolio_example", "title": title, "content": f"{title} code",
+        "company": "Acme", "project": None, "description": None,
+        "technologies": ["Python"], "file_paths": [], "source_repo": None,
+    }
+    record.update(overrides)
+    return record
+
+
+def _lines(records):
+    return [json.dumps(record) for record in records]
+
+
+@pytest.fixture
+def repos(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "resume_agent.db")
+    job_repo = resume_agent.SQLiteJobApplicationRepository(db_path, "default")
+    portfolio_repo = resume_agent.SQLitePortfolioLibraryRepository(db_path, "default")
+    monkeypatch.setattr(resume_agent.app_context, "_repositories", (None, None, job_repo, portfolio_repo))
+    return job_repo, portfolio_repo
+
+
+def test_round_trip(repos):
+    records = [
+        _application(1, tailored_resume={"content": "Resume 1", "keywords_used": ["python"]}, cover_letter="Dear 1"),
+        _application(2),
+        _example("RAG pipeline"),
+        _example("Scheduler", company=None, technologies=["Go"]),
+    ]
+
+    result = resume_agent.import_ndjson(_lines(records), "default")
+
+    assert result["counts"] == {
+        "application": {"inserted": 2, "updated": 0},
+        "portfolio_example": {"inserted": 2, "updated": 0},
+    }
+    exported = [json.loads(line) for line in resume_agent.export_ndjson("default")]
+    records[0]["cover_letter"] = {"content": "Dear 1"}
+    assert exported == records
+
+
+def test_reimport_upserts(repos):
+    job_repo, _ = repos
+    resume_agent.import_ndjson(_lines([_application(1, tailored_resume="Resume v1"), _application(2)]), "default")
+
+    changed = _application(1, keywords=["rust"], required_qualifications=["Rust"], tailored_resume="Resume v2")
+    result = resume_agent.import_ndjson(_lines([changed, _application(3)]), "default")
+
+    assert result["counts"]["application"] == {"inserted": 1, "updated": 1}
+    analysis = job_repo.get_job_analysis("default", "Company 1", "Backend Engineer")
+    assert analysis["keywords"] == ["rust"]
+    assert analysis["required_qualifications"] == ["Rust"]
+    assert job_repo.get_tailored_resume("default", "Company 1", "Backend Engineer") == "Resume v2"
+    assert len(list(job_repo.export_applications("default"))) == 3
+
+
+def test_portfolio_upsert_keeps_embedding_unless_text_changed(repos):
+    _, portfolio_repo = repos
+    resume_agent.import_ndjson(_lines([_example("A"), _example("B")]), "default")
+    ids = dict(zip(["A", "B"], portfolio_repo.list_example_ids("default")))
+    for example_id in ids.values():
+        portfolio_repo.set_example_embedding("default", example_id, b"\x00" * 8, "model")
+
+    result = resume_agent.import_ndjson(
+        _lines([_example("A", source_repo="https://github.com/a"), _example("B", content="new code")]), "default"
+    )
+
+    assert result["counts"]["portfolio_example"] == {"inserted": 0, "updated": 2}
+    embeddings = {row["id"]: row["embedding"] for row in portfolio_repo.list_example_embeddings("default")}
+    assert embeddings[ids["A"]] is not None
+    assert embeddings[ids["B"]] is None
+
+
+def test_invalid_lines_are_reported_and_skipped(repos):
+    lines = [
+        json.dumps(_application(1)),
+        "{not json",
+        json.dumps({"type": "application", "company": "Missing fields"}),
+        json.dumps({"type": "resume"}),
+        "",
+        json.dumps(_example("A")),
+    ]
+
+    result = resume_agent.import_ndjson(lines, "default")
+
+    assert result["error_count"] == 3
+    assert [error["line"] for error in result["errors"]] == [2, 3, 4]
+    assert result["counts"]["application"]["inserted"] == 1
+    assert result["counts"]["portfolio_example"]["inserted"] == 1
+
+
+def test_import_10k_applications_in_seconds(repos):
+    lines = _lines(_application(i, tailored_resume=f"Resume {i}") for i in range(10_000))
+
+    start = time.perf_counter()
+    result = resume_agent.import_ndjson(lines, "default")
+    elapsed = time.perf_counter() - start
+
+    assert result["counts"]["application"]["inserted"] == 10_000
+    assert elapsed < 10, f"10k application import took {elapsed:.1f}s"
+    assert sum(1 for _ in resume_agent.export_ndjson("default", ["application"], batch_size=500)) == 10_000
+
+
+def test_export_tool_and_cli(repos, tmp_path):
+    resume_agent.import_ndjson(_lines([_application(1), _example("A")]), "default")
+    export = getattr(resume_agent.data_export_ndjson, "fn", resume_agent.data_export_ndjson)
+
+    result = export(str(tmp_path / "backup.ndjson"))
+
+    assert result["status"] == "success"
+    assert result["counts"] == {"application": 1, "portfolio_example": 1}
+
+    cli = subprocess.run(
+        [sys.executable, str(APP_DIR / "scripts" / "bulk_ndjson.py"), "import", str(tmp_path / "backup.ndjson")],
+        env={**os.environ, "SQLITE_DATABASE_PATH": str(tmp_path / "copy.db")},
+        capture_output=True, text=True, timeout=120,
+    )
+    assert cli.returncode == 0, cli.stderr[-2000:]
+    assert "application: 1 inserted, 0 updated" in cli.stderr
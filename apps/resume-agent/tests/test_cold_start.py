@@ -0,0 +1,87 @@
+"""Cold start tests for the resume-agent MCP server.
+
+Each test imports resume_agent.py in a fresh interpreter (like an MCP client
+launching the stdio server) and checks that importing it stays cheap: no
+storage engines, no Qdrant client, no embedding model and no root DEBUG
+logging until a tool needs them.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+# Self time of the resume_agent module body (excluding its imports), in ms.
+# Registering the MCP tools costs ~200ms; eager Qdrant/storage setup costs seconds.
+IMPORT_BUDGET_MS = int(os.getenv("RESUME_AGENT_IMPORT_BUDGET_MS", "750"))
+
+
+def _run(code: str, tmp_path: Path, *flags: str) -> subprocess.CompletedProcess:
+    env = {
+        **os.environ,
+        "STORAGE_BACKEND": "sqlite",
+        "SQLITE_DATABASE_PATH": str(tmp_path / "resume_agent.db"),
+        "QDRANT_URL": "http://127.0.0.1:9",
+    }
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=APP_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+def _self_time_ms(importtime_output: str, module: str) -> float:
+    """Self time of a module from `python -X importtime` output."""
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        if name.strip() == module:
+            return int(self_us) / 1000
+    raise AssertionError(f"{module} not found in importtime output")
+
+
+def test_import_is_lazy_and_within_budget(tmp_path):
+    code = (
+        "import json, logging, sys; import resume_agent; "
+        "print(json.dumps({"
+        "'heavy': [m for m in ('qdrant_client', 'sentence_transformers', 'torch') if m in sys.modules], "
+        "'engines': len(resume_agent._engines), "
+        "'root_level': logging.getLogger().level}))"
+    )
+    result = _run(code, tmp_path, "-X", "importtime")
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    state = json.loads(result.stdout.strip().splitlines()[-1])
+    assert state["heavy"] == []
+    assert state["engines"] == 0
+    assert state["root_level"] != 10  # logging.DEBUG
+    assert not (tmp_path / "resume_agent.db").exists()
+
+    self_ms = _self_time_ms(result.stderr, "resume_agent")
+    assert self_ms < IMPORT_BUDGET_MS, (
+        f"resume_agent import took {self_ms:.0f}ms (budget {IMPORT_BUDGET_MS}ms); "
+        "keep expensive setup behind AppContext"
+    )
+
+
+def test_storage_initialized_on_first_use(tmp_path):
+    code = (
+        "import resume_agent; "
+        "repo = resume_agent.app_context.job_app_repo; "
+        "assert repo is resume_agent.job_app_repo; "
+        "assert resume_agent.app_context.resume_repo.engine is repo.engine; "
+        "print(len(resume_agent._engines))"
+    )
+    result = _run(code, tmp_path)
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert result.stdout.strip() == "1"
+    assert (tmp_path / "resume_agent.db").exists()
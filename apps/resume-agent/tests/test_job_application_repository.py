@@ -0,0 +1,145 @@
+"""Tests for bulk job analysis hydration in the SQLite job application repository."""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, text
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import resume_agent  # noqa: E402
+
+
+def _analysis(i, **overrides):
+    job_data = {
+        "url": f"https://jobs.example.com/{i}",
+        "fetched_at": "2025-01-01T00:00:00",
+        "company": f"Company {i}",
+        "job_title": "Backend Engineer",
+        "location": "Remote",
+        "salary_range": None,
+        "required_qualifications": [f"Python {i}", "SQL", "Testing"],
+        "preferred_qualifications": ["Go", "Kubernetes"],
+        "responsibilities": ["Build APIs", "Review code", "Mentor"],
+        "keywords": ["python", "sql", f"k{i}", "aws"],
+        "candidate_profile": "Backend engineer",
+        "raw_description": f"Posting {i}",
+    }
+    job_data.update(overrides)
+    return job_data
+
+
+@pytest.fixture
+def job_repo(tmp_path, monkeypatch):
+    repo = resume_agent.SQLiteJobApplicationRepository(str(tmp_path / "resume_agent.db"), "default")
+    monkeypatch.setattr(resume_agent.app_context, "_repositories", (None, None, repo, None))
+    return repo
+
+
+@pytest.fixture
+def hydrate_queries(job_repo):
+    """Count hydration queries run against the repository's engine."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "json_group_array" in statement:
+            statements.append(statement)
+
+    event.listen(job_repo.engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(job_repo.engine, "before_cursor_execute", record)
+
+
+def _orphans(repo):
+    with repo.engine.connect() as conn:
+        return {
+            table: conn.execute(text(
+                f"SELECT COUNT(*) FROM {table} t "
+                "LEFT JOIN job_applications ja ON ja.id = t.job_id WHERE ja.id IS NULL"
+            )).scalar()
+            for table in ("job_qualifications", "job_responsibilities", "job_keywords",
+                          "tailored_resumes", "cover_letters", "artifact_inputs")
+        }
+
+
+def test_get_job_analyses_loads_many_in_one_query(job_repo, hydrate_queries):
+    for i in range(3):
+        job_repo.save_job_analysis("default", _analysis(i))
+
+    keys = [(f"Company {i}", "Backend Engineer") for i in (2, 0, 1)]
+    analyses = job_repo.get_job_analyses("default", keys)
+
+    assert len(hydrate_queries) == 1
+    assert set(analyses) == set(keys)
+    analysis = analyses[("Company 2", "Backend Engineer")]
+    # Children come back in the order they were saved
+    assert analysis["required_qualifications"] == ["Python 2", "SQL", "Testing"]
+    assert analysis["preferred_qualifications"] == ["Go", "Kubernetes"]
+    assert analysis["responsibilities"] == ["Build APIs", "Review code", "Mentor"]
+    assert analysis["keywords"] == ["python", "sql", "k2", "aws"]
+    assert analysis["raw_description"] == "Posting 2"
+
+
+def test_get_job_analyses_omits_missing_and_other_users(job_repo):
+    job_repo.save_job_analysis("default", _analysis(0))
+    job_repo.save_job_analysis("other", _analysis(1))
+
+    analyses = job_repo.get_job_analyses(
+        "default", [("Company 0", "Backend Engineer"), ("Company 1", "Backend Engineer"), ("Nope", "None")]
+    )
+
+    assert list(analyses) == [("Company 0", "Backend Engineer")]
+    assert job_repo.get_job_analysis("default", "Nope", "None") is None
+
+
+def test_data_read_job_analyses_reports_missing_in_request_order(job_repo):
+    for i in range(2):
+        job_repo.save_job_analysis("default", _analysis(i))
+
+    result = getattr(resume_agent.data_read_job_analyses, "fn", resume_agent.data_read_job_analyses)([
+        {"company": "Company 1", "job_title": "Backend Engineer"},
+        {"company": "Missing", "job_title": "Backend Engineer"},
+        {"company": "Company 0", "job_title": "Backend Engineer"},
+        {"company": "Company 1", "job_title": "Backend Engineer"},
+    ])
+
+    assert result["status"] == "success"
+    assert [a["company"] for a in result["data"]] == ["Company 1", "Company 0"]
+    assert result["missing"] == [{"company": "Missing", "job_title": "Backend Engineer"}]
+
+
+def test_get_job_analyses_batches_large_requests(job_repo, hydrate_queries):
+    count = job_repo.HYDRATE_BATCH_SIZE + 50
+    job_repo.import_applications("default", [_analysis(i) for i in range(count)])
+
+    keys = [(f"Company {i}", "Backend Engineer") for i in range(count)]
+    analyses = job_repo.get_job_analyses("default", keys + [("Missing", "Backend Engineer")])
+
+    assert len(hydrate_queries) == 2
+    assert len(analyses) == count
+    assert analyses[keys[-1]]["keywords"] == ["python", "sql", f"k{count - 1}", "aws"]
+
+
+def test_resaving_analysis_leaves_no_orphaned_rows(job_repo):
+    job_repo.save_job_analysis("default", _analysis(0))
+    job_repo.save_job_analysis("default", _analysis(1))
+    job_repo.save_tailored_resume("default", "Company 0", "Backend Engineer", "Tailored")
+    job_repo.set_artifact_input_hash("default", "Company 0", "Backend Engineer", "tailored_resume", "abc")
+
+    job_repo.save_job_analysis("default", _analysis(
+        0, required_qualifications=["Rust"], responsibilities=[], keywords=["rust"]
+    ))
+    job_repo.import_applications("default", [_analysis(1, preferred_qualifications=[])])
+
+    assert _orphans(job_repo) == dict.fromkeys(_orphans(job_repo), 0)
+    analysis = job_repo.get_job_analysis("default", "Company 0", "Backend Engineer")
+    assert analysis["required_qualifications"] == ["Rust"]
+    assert analysis["responsibilities"] == []
+    assert analysis["keywords"] == ["rust"]
+    assert job_repo.get_job_analysis("default", "Company 1", "Backend Engineer")["preferred_qualifications"] == []
+    # Documents and artifact hashes stay with the re-analyzed application
+    assert job_repo.get_tailored_resume("default", "Company 0", "Backend Engineer") == "Tailored"
+    assert job_repo.get_artifact_input_hashes("default", "Company 0", "Backend Engineer") == {
+        "tailored_resume": "abc"
+    }
@@ -0,0 +1,316 @@
+"""Tests for per-request user identity and the per-user repository cache.
+
+Repositories are in-memory implementations keyed by user that count how often
+each user's data is hydrated. The load test drives one server process over
+the streamable HTTP transport with the user in the X-User-ID header.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from starlette.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import resume_agent  # noqa: E402
+from resume_agent import UserCache, current_user_id, user_context  # noqa: E402
+
+MCP_HEADERS = {
+    "accept": "application/json, text/event-stream",
+    "content-type": "application/json",
+    "mcp-protocol-version": "2025-06-18",
+}
+
+
+def _tool(tool):
+    return getattr(tool, "fn", tool)
+
+
+class MemoryResumeRepo:
+    def __init__(self):
+        self.resumes = {}
+        self.loads = {}
+        self._lock = threading.Lock()
+
+    def get_master_resume(self, user_id):
+        with self._lock:
+            self.loads[user_id] = self.loads.get(user_id, 0) + 1
+        time.sleep(0.002)  # hydration across several tables
+        return self.resumes.get(user_id)
+
+    def save_master_resume(self, user_id, resume_data):
+        self.resumes[user_id] = resume_data
+
+
+class MemoryJobApplicationRepo:
+    def __init__(self):
+        self.applications = {}
+
+    def save_job_analysis(self, user_id, job_data):
+        self.applications.setdefault(user_id, []).insert(
+            0, {"company": job_data["company"], "role": job_data["job_title"]}
+        )
+
+    def list_applications(self, user_id, limit=10):
+        return self.applications.get(user_id, [])[:limit]
+
+
+@pytest.fixture
+def repos(monkeypatch):
+    resume_repo = MemoryResumeRepo()
+    job_repo = MemoryJobApplicationRepo()
+    monkeypatch.setattr(resume_agent.app_context, "_repositories", (resume_repo, None, job_repo, None))
+    monkeypatch.setattr(resume_agent.app_context, "_user_cache", UserCache(max_users=256))
+    return resume_repo, job_repo
+
+
+JOB_URL = "https://jobs.example.com/acme"
+
+# Stands in for the claude CLI: "saves" each command's artifact for the
+# user its MCP server would act for (USER_ID)
+FAKE_CLI = """#!/bin/sh
+echo "$USER_ID $3 $4" >> "{store}"
+sleep 0.2
+echo "done"
+"""
+
+
+class CliStoreJobApplicationRepo:
+    """Job applications read back from what the fake CLI saved, per user."""
+
+    def __init__(self, store):
+        self.store = store
+        self.hashes = {}
+        self.portfolio = {}
+
+    def _saved(self, user_id, command):
+        lines = self.store.read_text().splitlines() if self.store.exists() else []
+        return f"{user_id} /{command.replace('/', ':')} {JOB_URL}" in lines
+
+    def find_application_by_url(self, user_id, url):
+        return ("Acme", "Engineer") if self._saved(user_id, "career/analyze-job") else None
+
+    def get_job_analysis(self, user_id, company, job_title):
+        return {"company": company, "job_title": job_title, "keywords": []}
+
+    def get_tailored_resume(self, user_id, company, job_title):
+        return "Tailored" if self._saved(user_id, "career/tailor-resume") else None
+
+    def save_portfolio_examples(self, user_id, company, job_title, content):
+        self.portfolio[user_id] = content
+
+    def get_artifact_input_hashes(self, user_id, company, job_title):
+        return dict(self.hashes.get(user_id, {}))
+
+    def set_artifact_input_hash(self, user_id, company, job_title, artifact, input_hash):
+        self.hashes.setdefault(user_id, {})[artifact] = input_hash
+
+
+@pytest.fixture
+def fake_cli(tmp_path, monkeypatch):
+    store = tmp_path / "saved.txt"
+    cli = tmp_path / "claude"
+    cli.write_text(FAKE_CLI.format(store=store))
+    cli.chmod(0o755)
+    monkeypatch.setenv("CLAUDE_CODE_PATH", str(cli))
+    monkeypatch.setenv("USER_ID", "default")
+
+    resume_repo = MemoryResumeRepo()
+    job_repo = CliStoreJobApplicationRepo(store)
+    monkeypatch.setattr(resume_agent.app_context, "_repositories", (resume_repo, None, job_repo, None))
+    monkeypatch.setattr(resume_agent.app_context, "_user_cache", UserCache(max_users=256))
+    monkeypatch.setattr(resume_agent.app_context, "_command_executor", resume_agent.SlashCommandExecutor())
+    return resume_repo, job_repo, store
+
+
+def _resume(name):
+    return {"personal_info": {"name": name}, "about_me": f"{name}'s resume"}
+
+
+def _analysis(company):
+    return {
+        "url": f"https://jobs.example.com/{company}", "fetched_at": "2025-01-01T00:00:00",
+        "company": company, "job_title": "Engineer", "location": "Remote",
+        "candidate_profile": "Engineer", "raw_description": "...",
+    }
+
+
+def test_user_resolution_order(monkeypatch):
+    monkeypatch.setenv("USER_ID", "env-user")
+    assert current_user_id() == "env-user"
+
+    with user_context("alice"):
+        assert current_user_id() == "alice"
+    assert current_user_id() == "env-user"
+
+    with pytest.raises(ValueError):
+        with user_context("../etc"):
+            pass
+
+
+def test_reads_are_cached_per_user_until_written(repos):
+    resume_repo, _ = repos
+    for user in ("alice", "bob"):
+        with user_context(user):
+            assert _tool(resume_agent.data_write_master_resume)(_resume(user))["status"] == "success"
+
+    for _ in range(3):
+        for user in ("alice", "bob"):
+            with user_context(user):
+                result = _tool(resume_agent.data_read_master_resume)()
+                assert result["data"]["personal_info"]["name"] == user
+    assert resume_repo.loads == {"alice": 1, "bob": 1}
+
+    with user_context("alice"):
+        _tool(resume_agent.data_write_master_resume)(_resume("Alice Smith"))
+        assert _tool(resume_agent.data_read_master_resume)()["data"]["personal_info"]["name"] == "Alice Smith"
+    assert resume_repo.loads == {"alice": 2, "bob": 1}
+
+    with user_context("carol"):
+        assert _tool(resume_agent.data_read_master_resume)()["status"] == "error"
+
+
+def test_application_list_is_invalidated_by_writes(repos):
+    with user_context("alice"):
+        assert _tool(resume_agent.data_list_applications)()["count"] == 0
+        _tool(resume_agent.data_write_job_analysis)("Acme", "Engineer", _analysis("Acme"))
+        applications = _tool(resume_agent.data_list_applications)()["applications"]
+        assert [application["company"] for application in applications] == ["Acme"]
+    with user_context("bob"):
+        assert _tool(resume_agent.data_list_applications)()["count"] == 0
+
+
+def test_cache_is_bounded_by_least_recently_used_user():
+    cache = UserCache(max_users=2)
+    loads = []
+
+    def loader(user_id):
+        loads.append(user_id)
+        return user_id.upper()
+
+    for user in ("alice", "bob", "alice", "carol", "alice", "bob"):
+        assert cache.get(user, "name", loader) == user.upper()
+
+    # carol evicted bob (alice was more recent), then bob evicted carol
+    assert loads == ["alice", "bob", "carol", "bob"]
+    assert cache.stats()["users"] == 2
+
+
+def test_load_overlapping_a_write_is_not_cached():
+    cache = UserCache()
+    value = ["old"]
+
+    def loader(user_id):
+        result = value[0]
+        value[0] = "new"
+        cache.invalidate(user_id, "name")  # a write lands while loading
+        return result
+
+    assert cache.get("alice", "name", loader) == "old"
+    assert cache.get("alice", "name", lambda user_id: value[0]) == "new"
+
+
+def test_header_identifies_user_over_http(repos, monkeypatch):
+    monkeypatch.setenv("USER_ID_HEADER", "X-User-ID")
+    resume_repo, _ = repos
+    resume_repo.resumes.update({"alice": _resume("alice"), "bob": _resume("bob")})
+
+    app = resume_agent.mcp.http_app(stateless_http=True, json_response=True)
+    with TestClient(app) as client:
+        assert _call(client, "data_read_master_resume", {}, "alice")["data"]["personal_info"]["name"] == "alice"
+        assert _call(client, "data_read_master_resume", {}, "bob")["data"]["personal_info"]["name"] == "bob"
+        assert _call(client, "data_read_master_resume", {}, "not a user!")["status"] == "error"
+
+
+def _call(client, tool, arguments, user_id):
+    response = client.post(
+        "/mcp",
+        json={"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": tool, "arguments": arguments}},
+        headers={**MCP_HEADERS, "x-user-id": user_id},
+    )
+    response.raise_for_status()
+    return response.json()["result"]["structuredContent"]
+
+
+def test_100_concurrent_users_in_one_process(repos, monkeypatch):
+    monkeypatch.setenv("USER_ID_HEADER", "X-User-ID")
+    resume_repo, _ = repos
+    users = [f"user-{i}" for i in range(100)]
+    reads_per_user = 5
+
+    app = resume_agent.mcp.http_app(stateless_http=True, json_response=True)
+    with TestClient(app) as client:
+
+        def session(user_id):
+            written = _call(client, "data_write_master_resume", {"resume_data": _resume(user_id)}, user_id)
+            assert written["status"] == "success"
+            _call(client, "data_write_job_analysis", {
+                "company": user_id, "job_title": "Engineer", "job_data": _analysis(user_id)
+            }, user_id)
+            names = {
+                _call(client, "data_read_master_resume", {}, user_id)["data"]["personal_info"]["name"]
+                for _ in range(reads_per_user)
+            }
+            applications = _call(client, "data_list_applications", {}, user_id)["applications"]
+            companies = [application["company"] for application in applications]
+            return names, companies
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(users)) as pool:
+            results = dict(zip(users, pool.map(session, users)))
+        elapsed = time.perf_counter() - start
+
+    # Every user saw only their own data
+    for user_id, (names, companies) in results.items():
+        assert names == {user_id}
+        assert companies == [user_id]
+    # Each user's resume was hydrated once; the other reads were cache hits
+    assert resume_repo.loads == {user_id: 1 for user_id in users}
+    stats = resume_agent.app_context.user_cache.stats()
+    assert stats["users"] == len(users)
+    assert stats["hits"] == len(users) * (reads_per_user - 1)
+    assert elapsed < 30
+
+
+@pytest.mark.skipif(os.name == "nt", reason="fake CLI is a POSIX shell script")
+def test_pipeline_stages_run_as_the_requesting_user(fake_cli):
+    resume_repo, job_repo, store = fake_cli
+    resume_repo.resumes["alice"] = _resume("alice")
+
+    pipeline = resume_agent.ApplyPipeline(JOB_URL, user_id="alice", include_cover_letter=False)
+    result = asyncio.run(pipeline.run())
+
+    assert result["status"] == "success", result
+    assert result["stages"]["analysis"]["status"] == "generated"
+    assert result["stages"]["tailored_resume"]["status"] == "generated"
+    # The CLI saved its artifacts as alice, not the process-wide default user
+    assert store.read_text().split("\n")[:2] == [
+        f"alice /career:analyze-job {JOB_URL}",
+        f"alice /career:tailor-resume {JOB_URL}",
+    ]
+    assert set(job_repo.hashes) == {"alice"}
+
+
+@pytest.mark.skipif(os.name == "nt", reason="fake CLI is a POSIX shell script")
+def test_identical_commands_of_different_users_do_not_share_a_run(fake_cli):
+    _, _, store = fake_cli
+
+    async def analyze(user_id):
+        with user_context(user_id):
+            return await resume_agent.invoke_slash_command("career/analyze-job", JOB_URL)
+
+    async def main():
+        return await asyncio.gather(analyze("alice"), analyze("bob"), analyze("alice"))
+
+    asyncio.run(main())
+
+    assert sorted(store.read_text().splitlines()) == [
+        f"alice /career:analyze-job {JOB_URL}",
+        f"bob /career:analyze-job {JOB_URL}",
+    ]
@@ -0,0 +1,233 @@
+"""Tests for semantic portfolio retrieval (write-time embeddings, in-memory index).
+
+The sentence-transformers model is replaced by a deterministic bag-of-words
+encoder and the portfolio repository by an in-memory implementation.
+"""
+
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import resume_agent  # noqa: E402
+
+
+def _tool(tool):
+    return getattr(tool, "fn", tool)
+
+
+class BagOfWordsModel:
+    """Hashes words into a fixed-size count vector."""
+
+    def __init__(self, dim=64):
+        self.dim = dim
+        self.encoded = 0
+
+    def encode(self, texts, convert_to_numpy=True, show_progress_bar=False):
+        self.encoded += len(texts)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().replace(",", " ").split():
+                vectors[row, zlib.crc32(word.encode()) % self.dim] += 1
+        return vectors
+
+
+class MemoryPortfolioRepo:
+    def __init__(self):
+        self.rows = {}
+        self.next_id = 1
+        self.clock = datetime(2025, 1, 1)
+        self.embedding_reads = 0
+
+    def _tick(self):
+        self.clock += timedelta(seconds=1)
+        return self.clock
+
+    def add_example(self, user_id, title, content, company=None, project=None,
+                    description=None, technologies=None, file_paths=None, source_repo=None):
+        example_id, self.next_id = self.next_id, self.next_id + 1
+        self.rows[example_id] = {
+            "id": example_id, "title": title, "content": content, "company": company,
+            "description": description, "technologies": technologies or [],
+            "embedding": None, "embedding_model": None, "updated_at": self._tick(),
+        }
+        return example_id
+
+    def update_example(self, user_id, example_id, title=None, content=None, **fields):
+        row = self.rows[example_id]
+        if title is not None:
+            row["title"] = title
+        if content is not None:
+            row["content"] = content
+        row["embedding"] = None
+        row["updated_at"] = self._tick()
+
+    def delete_example(self, user_id, example_id):
+        del self.rows[example_id]
+
+    def get_example(self, user_id, example_id):
+        row = self.rows.get(example_id)
+        if row is None:
+            return None
+        return {k: v for k, v in row.items() if k not in ("embedding", "embedding_model")}
+
+    def set_example_embedding(self, user_id, example_id, embedding, model):
+        self.rows[example_id]["embedding"] = embedding
+        self.rows[example_id]["embedding_model"] = model
+
+    def list_example_embeddings(self, user_id, updated_since=None):
+        rows = [
+            {k: row[k] for k in ("id", "embedding", "embedding_model", "updated_at")}
+            for row in self.rows.values()
+            if updated_since is None or row["updated_at"] > updated_since
+        ]
+        self.embedding_reads += len(rows)
+        return rows
+
+    def list_example_ids(self, user_id):
+        return list(self.rows)
+
+
+class MemoryJobApplicationRepo:
+    def get_job_analysis(self, user_id, company, job_title):
+        if (company, job_title) != ("Acme", "Backend Engineer"):
+            return None
+        return {
+            "job_title": "Backend Engineer",
+            "keywords": ["kubernetes", "golang"],
+            "required_qualifications": ["Operate kubernetes clusters"],
+            "candidate_profile": "Infrastructure engineer",
+        }
+
+
+@pytest.fixture
+def context(monkeypatch):
+    repo = MemoryPortfolioRepo()
+    model = BagOfWordsModel()
+    monkeypatch.setattr(resume_agent.app_context, "_repositories", (None, None, MemoryJobApplicationRepo(), repo))
+    monkeypatch.setattr(resume_agent.app_context, "_embedding_model", model)
+    monkeypatch.setattr(resume_agent.app_context, "_portfolio_index", None)
+    return repo, model
+
+
+def _add(title, content, technologies=None):
+    result = _tool(resume_agent.data_add_portfolio_example)(title=title, content=content, technologies=technologies)
+    assert result["status"] == "success"
+    return result
+
+
+def _search(**kwargs):
+    result = _tool(resume_agent.data_semantic_search_portfolio_examples)(**kwargs)
+    assert result["status"] == "success", result
+    return [example["title"] for example in result["examples"]]
+
+
+def test_examples_are_embedded_at_write_time(context):
+    repo, model = context
+
+    result = _add("RAG pipeline", "hybrid vector search with qdrant", ["python", "qdrant"])
+
+    assert result["embedded"] is True
+    stored = np.frombuffer(repo.rows[result["example_id"]]["embedding"], dtype=np.float32)
+    assert stored.shape == (model.dim,)
+    assert np.linalg.norm(stored) == pytest.approx(1.0, abs=1e-5)
+    assert repo.rows[result["example_id"]]["embedding_model"] == resume_agent.EMBEDDING_MODEL
+
+
+def test_search_ranks_by_meaning_of_free_text_and_job_analysis(context):
+    _add("RAG pipeline", "hybrid vector search with qdrant embeddings", ["python", "qdrant"])
+    _add("Cluster autoscaler", "operate kubernetes clusters written in golang", ["golang", "kubernetes"])
+    _add("Checkout UI", "react checkout flow with stripe", ["react", "typescript"])
+
+    assert _search(query="vector search embeddings", top_k=1) == ["RAG pipeline"]
+    assert _search(company="Acme", job_title="Backend Engineer", top_k=2)[0] == "Cluster autoscaler"
+
+    missing = _tool(resume_agent.data_semantic_search_portfolio_examples)(company="Acme", job_title="Designer")
+    assert missing["status"] == "error"
+
+
+def test_index_reloads_incrementally_after_writes(context):
+    repo, model = context
+    ids = [_add(f"Example {i}", f"topic{i} service")["example_id"] for i in range(20)]
+    _search(query="topic3")
+    repo.embedding_reads = 0
+    encoded = model.encoded
+
+    _tool(resume_agent.data_update_portfolio_example)(example_id=ids[0], content="kafka streaming consumer")
+    _tool(resume_agent.data_delete_portfolio_example)(example_id=ids[1])
+
+    assert _search(query="kafka streaming", top_k=1) == ["Example 0"]
+    assert "Example 1" not in _search(query="topic1 service", top_k=20)
+    # Only the updated row was re-read; the example and the queries were embedded
+    assert repo.embedding_reads == 1
+    assert model.encoded - encoded == 3
+
+
+def test_rows_without_embeddings_are_backfilled_once(context):
+    repo, model = context
+    for i in range(5):
+        repo.add_example("default", f"Legacy {i}", f"legacy{i} code")
+
+    assert _search(query="legacy2 code", top_k=1) == ["Legacy 2"]
+    assert all(row["embedding"] is not None for row in repo.rows.values())
+
+    encoded = model.encoded
+    _search(query="legacy4 code")
+    assert model.encoded - encoded == 1  # just the query
+
+
+def test_refresh_embeds_without_holding_the_index_lock(context, monkeypatch):
+    repo, model = context
+    for i in range(3):
+        repo.add_example("default", f"Legacy {i}", f"legacy{i} code")
+    index = resume_agent.app_context.portfolio_index
+    embedding, release = threading.Event(), threading.Event()
+    encode = model.encode
+
+    def slow_encode(texts, **kwargs):
+        embedding.set()
+        assert release.wait(5)
+        return encode(texts, **kwargs)
+
+    monkeypatch.setattr(model, "encode", slow_encode)
+    refresh = threading.Thread(target=index.refresh, args=("default",))
+    refresh.start()
+    try:
+        assert embedding.wait(5)
+        # Other users' searches and writes can take the lock meanwhile
+        assert index._lock.acquire(timeout=1)
+        index._lock.release()
+    finally:
+        release.set()
+        refresh.join(5)
+
+    assert sorted(index._matrices["default"].ids) == sorted(repo.rows)
+
+
+def test_matching_1000_examples_takes_milliseconds(context):
+    repo, _ = context
+    index = resume_agent.app_context.portfolio_index
+    rng = np.random.default_rng(0)
+    for i in range(1000):
+        example_id = repo.add_example("default", f"Example {i}", "content")
+        vector = rng.standard_normal(384).astype(np.float32)
+        repo.set_example_embedding("default", example_id, (vector / np.linalg.norm(vector)).tobytes(),
+                                   resume_agent.EMBEDDING_MODEL)
+    index.refresh("default")
+    query = rng.standard_normal(384).astype(np.float32)
+
+    start = time.perf_counter()
+    for _ in range(100):
+        matches = index._matrices["default"].top_k(query, 5)
+    per_search_ms = (time.perf_counter() - start) * 1000 / 100
+
+    assert len(matches) == 5
+    assert [score for _, score in matches] == sorted((score for _, score in matches), reverse=True)
+    assert per_search_ms < 5
@@ -0,0 +1,111 @@
+"""Tests for the managed slash command executor.
+
+A fake `claude` CLI (shell script) stands in for the real one: it records each
+invocation, prints a few lines and sleeps for FAKE_CLAUDE_SLEEP seconds.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import resume_agent  # noqa: E402
+from resume_agent import SlashCommandExecutor  # noqa: E402
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="fake CLI is a POSIX shell script")
+
+FAKE_CLI = """#!/bin/sh
+echo "$4" >> "{calls}"
+echo "started $3"
+sleep "${{FAKE_CLAUDE_SLEEP:-0.2}}"
+echo "finished $4"
+exit "${{FAKE_CLAUDE_EXIT:-0}}"
+"""
+
+
+@pytest.fixture
+def fake_cli(tmp_path, monkeypatch):
+    calls = tmp_path / "calls.txt"
+    cli = tmp_path / "claude"
+    cli.write_text(FAKE_CLI.format(calls=calls))
+    cli.chmod(0o755)
+    monkeypatch.setenv("CLAUDE_CODE_PATH", str(cli))
+    return calls
+
+
+def _calls(calls: Path) -> list[str]:
+    return calls.read_text().split() if calls.exists() else []
+
+
+def test_returns_output_and_streams_lines(fake_cli):
+    executor = SlashCommandExecutor()
+    seen = []
+
+    async def on_output(line_number, line):
+        seen.append((line_number, line))
+
+    result = asyncio.run(executor.run("career/analyze-job", "https://jobs/1", on_output=on_output))
+
+    assert result == "started /career:analyze-job\nfinished https://jobs/1"
+    assert seen == [(1, "started /career:analyze-job"), (2, "finished https://jobs/1")]
+
+
+def test_identical_requests_share_one_run(fake_cli):
+    executor = SlashCommandExecutor()
+
+    async def main():
+        return await asyncio.gather(
+            executor.run("career/analyze-job", "https://jobs/1"),
+            executor.run("career/analyze-job", "https://jobs/1"),
+            executor.run("career/analyze-job", "https://jobs/2"),
+        )
+
+    first, second, other = asyncio.run(main())
+
+    assert first == second
+    assert "https://jobs/2" in other
+    assert sorted(_calls(fake_cli)) == ["https://jobs/1", "https://jobs/2"]
+
+
+def test_concurrency_is_bounded(fake_cli, monkeypatch):
+    monkeypatch.setenv("FAKE_CLAUDE_SLEEP", "0.3")
+    executor = SlashCommandExecutor(max_concurrent=1)
+
+    async def main():
+        await asyncio.gather(*(executor.run("career/apply", f"https://jobs/{i}") for i in range(3)))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    # Three runs one at a time take at least three sleeps
+    assert time.perf_counter() - start >= 0.9
+
+
+def test_timeout_kills_run(fake_cli, monkeypatch):
+    monkeypatch.setenv("FAKE_CLAUDE_SLEEP", "30")
+    executor = SlashCommandExecutor(timeout=0.5)
+
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        asyncio.run(executor.run("career/apply", "https://jobs/slow"))
+    assert time.perf_counter() - start < 5
+
+
+def test_failed_run_raises_with_exit_code(fake_cli, monkeypatch):
+    monkeypatch.setenv("FAKE_CLAUDE_EXIT", "3")
+    with pytest.raises(RuntimeError, match="exited with code 3"):
+        asyncio.run(SlashCommandExecutor().run("career/tailor-resume", "https://jobs/1"))
+
+
+def test_analyze_job_tool_uses_shared_executor(fake_cli):
+    resume_agent.app_context.reset()
+    fn = getattr(resume_agent.analyze_job, "fn", resume_agent.analyze_job)
+
+    result = asyncio.run(fn("https://jobs/1"))
+
+    assert result["status"] == "success"
+    assert result["analysis"].endswith("finished https://jobs/1")
@@ -0,0 +1,116 @@
+"""Tests for per-tool latency metrics, stage spans and the Prometheus endpoint.
+
+Tools are called through an in-memory fastmcp Client so the metrics
+middleware runs exactly as it does for a real MCP client.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from fastmcp import Client
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import resume_agent  # noqa: E402
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "resume_agent.db")
+    monkeypatch.setattr(resume_agent.app_context, "_repositories", (
+        None,
+        None,
+        resume_agent.SQLiteJobApplicationRepository(db_path, "default"),
+        resume_agent.SQLitePortfolioLibraryRepository(db_path, "default"),
+    ))
+    spans = []
+    monkeypatch.setattr(resume_agent, "_log_span", lambda structured, span, seconds, error: spans.append(span))
+    resume_agent.tool_metrics.reset()
+    yield spans
+    resume_agent.tool_metrics.reset()
+
+
+def _server_metrics(**kwargs):
+    return getattr(resume_agent.server_metrics, "fn", resume_agent.server_metrics)(**kwargs)
+
+
+def _call(*calls):
+    async def main():
+        async with Client(resume_agent.mcp) as client:
+            return [await client.call_tool(name, args, raise_on_error=False) for name, args in calls]
+    return asyncio.run(main())
+
+
+def test_tool_calls_are_timed_with_sql_stage(server):
+    _call(*[("data_list_portfolio_examples", {})] * 5, ("data_get_portfolio_example", {"example_id": 42}))
+
+    metrics = _server_metrics()["tools"]
+
+    listed = metrics["data_list_portfolio_examples"]
+    assert listed["calls"] == 5
+    assert listed["errors"] == 0
+    assert listed["calls_last_minute"] == 5
+    assert 0 < listed["p50_ms"] <= listed["p95_ms"] <= listed["p99_ms"]
+    assert listed["stages"]["sql"]["calls"] == 5
+    assert metrics["data_get_portfolio_example"]["errors"] == 1  # {"status": "error"} result
+
+
+def test_failed_statement_does_not_skew_later_sql_timings(tmp_path):
+    from sqlalchemy import text
+
+    engine = resume_agent.get_engine(str(tmp_path / "timing.db"))
+    span = resume_agent.ToolSpan("timing", "test")
+    token = resume_agent._current_span.set(span)
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(Exception):
+                conn.execute(text("SELECT * FROM no_such_table"))
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+    finally:
+        resume_agent._current_span.reset(token)
+
+    # Both statements are timed, each from its own start
+    assert span.stage_calls["sql"] == 2
+    assert 0 < span.stages["sql"] < 1
+
+
+def test_each_call_gets_its_own_correlation_id(server):
+    _call(("data_list_portfolio_examples", {}), ("data_list_portfolio_examples", {}))
+
+    assert len(server) == 2
+    assert server[0].correlation_id != server[1].correlation_id
+    assert all(span.tool == "data_list_portfolio_examples" for span in server)
+
+
+def test_stage_outside_tool_call_is_a_noop():
+    with resume_agent.stage("embed"):
+        pass  # no current span: nothing recorded, no error
+
+
+def test_prometheus_text_and_endpoint(server, monkeypatch):
+    from starlette.testclient import TestClient
+
+    _call(("data_list_portfolio_examples", {}))
+    text = resume_agent.tool_metrics.prometheus()
+
+    assert '# TYPE resume_agent_tool_duration_seconds summary' in text
+    assert 'resume_agent_tool_duration_seconds{tool="data_list_portfolio_examples",quantile="0.99"}' in text
+    assert 'resume_agent_tool_duration_seconds_count{tool="data_list_portfolio_examples"} 1' in text
+    assert 'resume_agent_stage_duration_seconds_count{tool="data_list_portfolio_examples",stage="sql"} 1' in text
+
+    app = resume_agent.mcp.http_app()
+    with TestClient(app) as client:
+        assert client.get("/metrics").status_code == 404
+        monkeypatch.setenv("METRICS_ENDPOINT", "true")
+        response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "resume_agent_tool_errors_total" in response.text
+
+
+def test_reset_clears_metrics(server):
+    _call(("data_list_portfolio_examples", {}))
+
+    assert _server_metrics(reset=True)["tools"]
+    assert _server_metrics()["tools"] == {}
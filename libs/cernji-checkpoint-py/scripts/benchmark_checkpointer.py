@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Benchmark: checkpoint latency and size for a thread with thousands of steps.
+
+Runs one LangGraph thread for --steps invocations (each invocation writes an
+input and a loop checkpoint plus pending writes) against:
+
+- memory: LangGraph's in-memory ``MemorySaver`` (no durability, RAM grows)
+- sqlite (commit per write): LangGraph's ``SqliteSaver`` if
+  langgraph-checkpoint-sqlite is installed
+- cernji: ``SqliteCheckpointer`` with write batching
+
+and reports per-step latency, latest-state read latency, and database size
+before/after compaction.
+
+Usage:
+    python scripts/benchmark_checkpointer.py [--steps 2000] [--payload 2048] [--keep-last 50]
+"""
+
+import argparse
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import TypedDict
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from langgraph.checkpoint.memory import MemorySaver  # noqa: E402
+from langgraph.graph import END, START, StateGraph  # noqa: E402
+
+from cernji_checkpoint import SqliteCheckpointer  # noqa: E402
+
+
+class BenchState(TypedDict, total=False):
+    step: int
+    last_message: str
+    job_content: str
+
+
+def build_graph(payload: int):
+    job_content = "lorem ipsum " * (payload // 12)
+
+    def respond(state: BenchState) -> dict:
+        step = state.get("step", 0) + 1
+        return {"step": step, "last_message": f"reply {step}", "job_content": job_content}
+
+    graph = StateGraph(BenchState)
+    graph.add_node("respond", respond)
+    graph.add_edge(START, "respond")
+    graph.add_edge("respond", END)
+    return graph
+
+
+def run(name: str, checkpointer, builder, steps: int) -> dict:
+    graph = builder.compile(checkpointer=checkpointer)
+    config = {"configurable": {"thread_id": f"bench-{name}"}}
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(steps):
+        t0 = time.perf_counter()
+        graph.invoke({"last_message": "hello"}, config)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    total = time.perf_counter() - start
+
+    t0 = time.perf_counter()
+    state = graph.get_state(config)
+    read_ms = (time.perf_counter() - t0) * 1000
+    assert state.values["step"] == steps
+
+    latencies.sort()
+    return {
+        "name": name,
+        "total_s": total,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "read_ms": read_ms,
+    }
+
+
+def db_size(path: Path) -> int:
+    """Size of the database plus its WAL file."""
+    return sum(p.stat().st_size for p in (path, Path(f"{path}-wal")) if p.exists())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=2000, help="Invocations on one thread")
+    parser.add_argument("--payload", type=int, default=2048, help="Bytes of state text per checkpoint")
+    parser.add_argument("--keep-last", type=int, default=50, help="Checkpoints kept by compaction")
+    args = parser.parse_args()
+
+    builder = build_graph(args.payload)
+    workdir = Path(tempfile.mkdtemp(prefix="checkpoint-bench-"))
+    results = [run("memory", MemorySaver(), builder, args.steps)]
+
+    try:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError:
+        SqliteSaver = None
+    if SqliteSaver is not None:
+        conn = sqlite3.connect(workdir / "baseline.db", check_same_thread=False)
+        result = run("sqlite (commit per write)", SqliteSaver(conn), builder, args.steps)
+        conn.close()
+        result["db_bytes"] = db_size(workdir / "baseline.db")
+        results.append(result)
+
+    cernji_path = workdir / "cernji.db"
+    with SqliteCheckpointer(cernji_path) as saver:
+        result = run("cernji (batched)", saver, builder, args.steps)
+        saver.flush()
+        result["db_bytes"] = db_size(cernji_path)
+        start = time.perf_counter()
+        deleted = saver.compact(keep_last=args.keep_last)
+        saver.vacuum()
+        compact_s = time.perf_counter() - start
+        result["compacted_bytes"] = db_size(cernji_path)
+        results.append(result)
+
+    print(f"Checkpointing: 1 thread x {args.steps} steps, {args.payload} B payload")
+    print(f"  {'saver':28} {'total':>8} {'p50':>8} {'p95':>8} {'read':>8} {'db size':>10}")
+    for r in results:
+        size = f"{r['db_bytes'] / 1024:8.0f}KB" if "db_bytes" in r else f"{'-':>10}"
+        print(
+            f"  {r['name']:28} {r['total_s']:7.2f}s {r['p50_ms']:6.2f}ms {r['p95_ms']:6.2f}ms "
+            f"{r['read_ms']:6.2f}ms {size}"
+        )
+    cernji = results[-1]
+    print(
+        f"  compaction (keep last {args.keep_last}): deleted {deleted} checkpoints in {compact_s:.2f}s, "
+        f"{cernji['db_bytes'] / 1024:.0f}KB -> {cernji['compacted_bytes'] / 1024:.0f}KB"
+    )
+
+
+if __name__ == "__main__":
+    main()
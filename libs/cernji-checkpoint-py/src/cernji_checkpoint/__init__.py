@@ -0,0 +1,72 @@
+"""Cernji Checkpoint - Durable SQLite checkpointing for Cernji Agents LangGraph graphs."""
+
+import threading
+from pathlib import Path
+
+from .config import CheckpointConfig, get_config
+from .delta import DeltaEncoder
+from .sqlite import SqliteCheckpointer
+
+__version__ = "0.1.0"
+
+__all__ = [
+    "get_checkpointer",
+    "close_checkpointers",
+    "SqliteCheckpointer",
+    "CheckpointConfig",
+    "DeltaEncoder",
+]
+
+DEFAULT_DB_PATH = "checkpoints.db"
+
+_checkpointers: dict[str, SqliteCheckpointer] = {}
+_lock = threading.Lock()
+
+
+def get_checkpointer(db_path: str | Path | None = None) -> SqliteCheckpointer:
+    """Get the shared checkpointer for a database file.
+
+    One ``SqliteCheckpointer`` (and one writer thread) is created per database
+    file and reused by every graph in the process. ``CHECKPOINT_DB_PATH``
+    overrides the app's default path, and batching/retention settings are read
+    from the environment (see ``CheckpointConfig``).
+
+    Args:
+        db_path: App default database path. Defaults to ./checkpoints.db.
+
+    Returns:
+        The shared SqliteCheckpointer for that path.
+
+    Example:
+        ```python
+        from cernji_checkpoint import get_checkpointer
+
+        graph = builder.compile(checkpointer=get_checkpointer("data/checkpoints.db"))
+        ```
+    """
+    config = get_config()
+    path = config.db_path or db_path or DEFAULT_DB_PATH
+    key = str(Path(path).expanduser().resolve()) if str(path) != ":memory:" else ":memory:"
+
+    with _lock:
+        checkpointer = _checkpointers.get(key)
+        if checkpointer is None:
+            checkpointer = SqliteCheckpointer(
+                key,
+                batch_size=config.batch_size,
+                flush_interval=config.flush_interval,
+                keep_last=config.keep_last,
+                thread_ttl=config.thread_ttl_days * 86400 if config.thread_ttl_days else None,
+                blob_threshold=config.blob_threshold,
+            )
+            _checkpointers[key] = checkpointer
+        return checkpointer
+
+
+def close_checkpointers() -> None:
+    """Flush and close every shared checkpointer (e.g. on server shutdown)."""
+    with _lock:
+        checkpointers = list(_checkpointers.values())
+        _checkpointers.clear()
+    for checkpointer in checkpointers:
+        checkpointer.close()
@@ -0,0 +1,43 @@
+"""Configuration management for Cernji Checkpoint."""
+
+import os
+from dataclasses import dataclass
+
+
+def _optional_int(name: str) -> int | None:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else None
+
+
+def _optional_float(name: str) -> float | None:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else None
+
+
+@dataclass
+class CheckpointConfig:
+    """Checkpointer configuration."""
+
+    db_path: str | None
+    batch_size: int
+    flush_interval: float
+    keep_last: int | None
+    thread_ttl_days: float | None
+    blob_threshold: int
+
+    @classmethod
+    def from_env(cls) -> "CheckpointConfig":
+        """Create configuration from environment variables."""
+        return cls(
+            db_path=os.getenv("CHECKPOINT_DB_PATH") or None,
+            batch_size=int(os.getenv("CHECKPOINT_BATCH_SIZE", "64")),
+            flush_interval=float(os.getenv("CHECKPOINT_FLUSH_INTERVAL_MS", "50")) / 1000,
+            keep_last=_optional_int("CHECKPOINT_KEEP_LAST"),
+            thread_ttl_days=_optional_float("CHECKPOINT_THREAD_TTL_DAYS"),
+            blob_threshold=int(os.getenv("CHECKPOINT_BLOB_THRESHOLD", "1024")),
+        )
+
+
+def get_config() -> CheckpointConfig:
+    """Get the current checkpointer configuration."""
+    return CheckpointConfig.from_env()
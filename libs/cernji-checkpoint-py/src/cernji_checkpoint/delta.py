@@ -0,0 +1,141 @@
+"""Delta encoding of checkpoints: large channel values are stored once, by content hash.
+
+LangGraph checkpoints carry every channel value on every step. For agent state
+such as ``ResumeAgentState`` that means re-serializing the master resume, the
+scraped job posting and the generated documents on each super-step even when
+they did not change. ``DeltaEncoder`` splits a checkpoint into:
+
+- a small **skeleton** (the checkpoint with large channel values removed), and
+- **blob references** ``(channel, hash)`` for values of at least ``threshold``
+  serialized bytes. Blob contents are keyed by a hash of their serialized form,
+  so an unchanged value is stored once no matter how many checkpoints (or
+  threads) reference it.
+
+Unchanged channels are detected from ``channel_versions`` before serializing:
+if a channel still has the version last seen for the thread, its previous
+hash is reused without touching the value, so only channels that actually
+changed are serialized and written. The remembered hashes are per process
+while blobs may be deleted by another process sharing the database, so
+reused hashes are reported alongside their values for the writer to
+re-store any blob that has gone missing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from langgraph.checkpoint.base import Checkpoint, SerializerProtocol
+
+DEFAULT_BLOB_THRESHOLD = 1024
+
+
+class EncodedCheckpoint(NamedTuple):
+    """A checkpoint split into its skeleton and blob references."""
+
+    type: str
+    data: bytes
+    # (channel, blob hash) for every channel stored as a blob
+    refs: list[tuple[str, str]]
+    # (blob hash, type, data) for blobs that may not be stored yet
+    blobs: list[tuple[str, str, bytes]]
+    # (blob hash, value) for channels reused unchanged; stored blobs are expected
+    reused: list[tuple[str, Any]]
+
+
+def blob_hash(type_: str, data: bytes) -> str:
+    """Content hash of a serialized value."""
+    return hashlib.blake2b(type_.encode() + b"\0" + data, digest_size=20).hexdigest()
+
+
+class DeltaEncoder:
+    """
+    Split checkpoints into a skeleton plus content-addressed channel blobs.
+
+    Args:
+        serde: Serializer used for the skeleton and for blob values
+        threshold: Serialized size (bytes) from which a channel value is
+            stored as a blob
+        cache_size: ``(thread, namespace, channel)`` entries remembered for
+            skipping unchanged channels
+    """
+
+    def __init__(
+        self,
+        serde: SerializerProtocol,
+        threshold: int = DEFAULT_BLOB_THRESHOLD,
+        cache_size: int = 4096,
+    ) -> None:
+        self.serde = serde
+        self.threshold = threshold
+        self.cache_size = cache_size
+        # (thread_id, checkpoint_ns, channel) -> (channel version, blob hash)
+        self._known: OrderedDict[tuple[str, str, str], tuple[Any, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _is_small(self, value: Any) -> bool:
+        """Cheap check for values that can never reach the threshold."""
+        if value is None or isinstance(value, (bool, int, float)):
+            return True
+        # UTF-8 needs at most 4 bytes per character
+        return isinstance(value, str) and len(value) * 4 < self.threshold
+
+    def encode(self, thread_id: str, checkpoint_ns: str, checkpoint: Checkpoint) -> EncodedCheckpoint:
+        """Serialize a checkpoint, moving large channel values to blobs."""
+        versions = checkpoint.get("channel_versions", {})
+        inline: dict[str, Any] = {}
+        refs: list[tuple[str, str]] = []
+        blobs: list[tuple[str, str, bytes]] = []
+        reused: list[tuple[str, Any]] = []
+
+        for channel, value in checkpoint["channel_values"].items():
+            key = (thread_id, checkpoint_ns, channel)
+            version = versions.get(channel)
+            with self._lock:
+                known = self._known.get(key)
+                if known is not None and version is not None and known[0] == version:
+                    # Unchanged since the last checkpoint: reuse its blob as-is
+                    self._known.move_to_end(key)
+                    refs.append((channel, known[1]))
+                    reused.append((known[1], value))
+                    continue
+
+            if self._is_small(value):
+                inline[channel] = value
+                continue
+            type_, data = self.serde.dumps_typed(value)
+            if len(data) < self.threshold:
+                inline[channel] = value
+                continue
+
+            hash_ = blob_hash(type_, data)
+            refs.append((channel, hash_))
+            blobs.append((hash_, type_, data))
+            if version is not None:
+                with self._lock:
+                    self._known[key] = (version, hash_)
+                    self._known.move_to_end(key)
+                    while len(self._known) > self.cache_size:
+                        self._known.popitem(last=False)
+
+        skeleton = {**checkpoint, "channel_values": inline}
+        type_, data = self.serde.dumps_typed(skeleton)
+        return EncodedCheckpoint(type_, data, refs, blobs, reused)
+
+    def decode(self, type_: str, data: bytes, blobs: dict[str, tuple[str, bytes]]) -> Checkpoint:
+        """Rebuild a checkpoint from its skeleton and ``{channel: (type, data)}`` blobs."""
+        checkpoint = self.serde.loads_typed((type_, data))
+        for channel, blob in blobs.items():
+            checkpoint["channel_values"][channel] = self.serde.loads_typed(blob)
+        return checkpoint
+
+    def forget(self, thread_id: str | None = None) -> None:
+        """Drop remembered channel hashes (for one thread, or all) after deletions."""
+        with self._lock:
+            if thread_id is None:
+                self._known.clear()
+            else:
+                for key in [key for key in self._known if key[0] == thread_id]:
+                    del self._known[key]
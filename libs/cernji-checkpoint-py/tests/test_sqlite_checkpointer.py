@@ -0,0 +1,294 @@
+"""Tests for the durable SQLite checkpointer."""
+
+import asyncio
+import operator
+import time
+from typing import Annotated, TypedDict
+
+import pytest
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.graph import END, START, StateGraph
+
+from cernji_checkpoint import SqliteCheckpointer, close_checkpointers, get_checkpointer
+
+
+class CounterState(TypedDict):
+    steps: Annotated[list[int], operator.add]
+    note: str
+
+
+def _step(state: CounterState) -> dict:
+    return {"steps": [len(state.get("steps", []))], "note": "x" * 500}
+
+
+@pytest.fixture
+def builder():
+    graph = StateGraph(CounterState)
+    graph.add_node("step", _step)
+    graph.add_edge(START, "step")
+    graph.add_edge("step", END)
+    return graph
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "checkpoints.db"
+
+
+def _config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def test_state_survives_restart(builder, db_path):
+    with SqliteCheckpointer(db_path) as saver:
+        graph = builder.compile(checkpointer=saver)
+        for _ in range(3):
+            graph.invoke({"steps": []}, _config("t1"))
+
+    with SqliteCheckpointer(db_path) as saver:
+        graph = builder.compile(checkpointer=saver)
+        assert graph.get_state(_config("t1")).values["steps"] == [0, 1, 2]
+
+
+def test_reads_see_queued_writes(builder, db_path):
+    # A long flush interval means only the read-side flush can make writes visible
+    with SqliteCheckpointer(db_path, flush_interval=60, batch_size=10_000) as saver:
+        graph = builder.compile(checkpointer=saver)
+        graph.invoke({"steps": []}, _config("t1"))
+        graph.invoke({"steps": []}, _config("t1"))
+        assert graph.get_state(_config("t1")).values["steps"] == [0, 1]
+
+
+def test_writes_are_batched(db_path):
+    with SqliteCheckpointer(db_path, flush_interval=60, batch_size=10_000) as saver:
+        config = {"configurable": {"thread_id": "t1", "checkpoint_ns": "", "checkpoint_id": "c1"}}
+        saver.put_writes(config, [("steps", [1])], task_id="task-1")
+        # Nothing committed yet: the row is still in the in-memory batch
+        with saver._db_lock:
+            assert saver._conn.execute("SELECT COUNT(*) FROM writes").fetchone()[0] == 0
+        saver.flush()
+        with saver._db_lock:
+            assert saver._conn.execute("SELECT COUNT(*) FROM writes").fetchone()[0] == 1
+
+
+def test_keep_last_compacts_old_versions(builder, db_path):
+    with SqliteCheckpointer(db_path, keep_last=4) as saver:
+        graph = builder.compile(checkpointer=saver)
+        for _ in range(10):
+            graph.invoke({"steps": []}, _config("t1"))
+
+        history = list(graph.get_state_history(_config("t1")))
+        assert len(history) == 4
+        # Latest state is intact even though old versions are gone
+        assert graph.get_state(_config("t1")).values["steps"] == list(range(10))
+
+
+def test_compact_all_threads(builder, db_path):
+    with SqliteCheckpointer(db_path) as saver:
+        graph = builder.compile(checkpointer=saver)
+        for thread_id in ("a", "b"):
+            for _ in range(5):
+                graph.invoke({"steps": []}, _config(thread_id))
+
+        before = saver.stats()["checkpoints"]
+        deleted = saver.compact(keep_last=2)
+
+        assert deleted == before - 4
+        assert saver.stats()["checkpoints"] == 4
+        assert graph.get_state(_config("b")).values["steps"] == list(range(5))
+
+
+def test_compact_requires_keep_last(db_path):
+    with SqliteCheckpointer(db_path) as saver:
+        with pytest.raises(ValueError):
+            saver.compact()
+
+
+def test_prune_idle_threads(builder, db_path):
+    with SqliteCheckpointer(db_path) as saver:
+        graph = builder.compile(checkpointer=saver)
+        graph.invoke({"steps": []}, _config("old"))
+        saver.flush()
+        time.sleep(0.05)
+        graph.invoke({"steps": []}, _config("new"))
+
+        assert saver.prune_threads(older_than=0.04) == 1
+        assert graph.get_state(_config("old")).values == {}
+        assert graph.get_state(_config("new")).values["steps"] == [0]
+
+
+def test_delete_thread(builder, db_path):
+    with SqliteCheckpointer(db_path) as saver:
+        graph = builder.compile(checkpointer=saver)
+        graph.invoke({"steps": []}, _config("t1"))
+        saver.delete_thread("t1")
+        assert saver.get_tuple(_config("t1")) is None
+        assert saver.stats()["threads"] == 0
+
+
+def test_list_filter_and_limit(builder, db_path):
+    with SqliteCheckpointer(db_path) as saver:
+        graph = builder.compile(checkpointer=saver)
+        for _ in range(3):
+            graph.invoke({"steps": []}, _config("t1"))
+
+        # One "input" checkpoint per invoke
+        inputs = list(saver.list(_config("t1"), filter={"source": "input"}))
+        assert len(inputs) == 3
+        assert all(c.metadata["source"] == "input" for c in inputs)
+
+        newest_two = list(saver.list(_config("t1"), limit=2))
+        assert len(newest_two) == 2
+        before = list(saver.list(_config("t1"), before=newest_two[0].config))
+        assert before[0].config == newest_two[1].config
+
+
+async def test_async_concurrent_threads(builder, db_path):
+    async with SqliteCheckpointer(db_path) as saver:
+        graph = builder.compile(checkpointer=saver)
+        await asyncio.gather(*(
+            graph.ainvoke({"steps": []}, _config(f"t{i}")) for i in range(25)
+        ))
+        await asyncio.gather(*(
+            graph.ainvoke({"steps": []}, _config(f"t{i}")) for i in range(25)
+        ))
+
+        state = await graph.aget_state(_config("t7"))
+        assert state.values["steps"] == [0, 1]
+        assert (await asyncio.to_thread(saver.stats))["threads"] == 25
+
+
+def test_get_checkpointer_is_shared_per_path(db_path, monkeypatch):
+    monkeypatch.delenv("CHECKPOINT_DB_PATH", raising=False)
+    try:
+        assert get_checkpointer(db_path) is get_checkpointer(str(db_path))
+    finally:
+        close_checkpointers()
+
+
+def test_env_overrides_default_path(tmp_path, monkeypatch):
+    override = tmp_path / "override.db"
+    monkeypatch.setenv("CHECKPOINT_DB_PATH", str(override))
+    monkeypatch.setenv("CHECKPOINT_KEEP_LAST", "7")
+    try:
+        saver = get_checkpointer(tmp_path / "default.db")
+        assert saver.db_path == str(override.resolve())
+        assert saver.keep_last == 7
+    finally:
+        close_checkpointers()
+
+
+class DocumentState(TypedDict, total=False):
+    resume: str
+    draft: str
+    step: int
+
+
+def _document_graph():
+    resume = "experience " * 500
+
+    def load(state: DocumentState) -> dict:
+        return {"resume": resume, "step": 1}
+
+    def write(state: DocumentState) -> dict:
+        return {"draft": f"draft {state['step']} " * 300, "step": state["step"] + 1}
+
+    def polish(state: DocumentState) -> dict:
+        return {"step": state["step"] + 1}
+
+    graph = StateGraph(DocumentState)
+    graph.add_node("load", load)
+    graph.add_node("write", write)
+    graph.add_node("polish", polish)
+    graph.add_edge(START, "load")
+    graph.add_edge("load", "write")
+    graph.add_edge("write", "polish")
+    graph.add_edge("polish", END)
+    return graph
+
+
+def test_large_channels_stored_once_by_hash(db_path):
+    with SqliteCheckpointer(db_path) as saver:
+        graph = _document_graph().compile(checkpointer=saver)
+        graph.invoke({}, _config("t1"))
+        graph.invoke({}, _config("t2"))
+
+        stats = saver.stats()
+        # resume is shared by both threads; each thread wrote one draft value
+        assert stats["blobs"] == 2
+        state = graph.get_state(_config("t1")).values
+        assert state["resume"] == "experience " * 500
+        assert state["draft"] == "draft 1 " * 300
+        assert state["step"] == 3
+
+    # Skeletons plus blobs are smaller than whole checkpoints
+    with SqliteCheckpointer(db_path.with_name("whole.db"), blob_threshold=None) as whole:
+        graph = _document_graph().compile(checkpointer=whole)
+        graph.invoke({}, _config("t1"))
+        graph.invoke({}, _config("t2"))
+        whole_bytes = whole.stats()["checkpoint_bytes"]
+        assert whole.stats()["blobs"] == 0
+    assert stats["checkpoint_bytes"] + stats["blob_bytes"] < whole_bytes / 2
+
+
+def test_history_decodes_blobs(db_path):
+    with SqliteCheckpointer(db_path) as saver:
+        graph = _document_graph().compile(checkpointer=saver)
+        graph.invoke({}, _config("t1"))
+        history = list(graph.get_state_history(_config("t1")))
+        assert [h.values.get("step") for h in history][:3] == [3, 2, 1]
+        assert all(h.values["resume"] == "experience " * 500 for h in history[:3])
+
+
+def test_unreferenced_blobs_are_deleted(db_path):
+    with SqliteCheckpointer(db_path) as saver:
+        graph = _document_graph().compile(checkpointer=saver)
+        graph.invoke({}, _config("t1"))
+        graph.invoke({}, _config("t2"))
+
+        saver.delete_thread("t1")
+        # resume is still referenced by t2
+        assert saver.stats()["blobs"] == 2
+        saver.delete_thread("t2")
+        assert saver.stats()["blobs"] == 0
+
+        # Re-running a deleted thread stores its blobs again
+        graph.invoke({}, _config("t1"))
+        assert graph.get_state(_config("t1")).values["resume"] == "experience " * 500
+
+
+
+
+def test_blobs_deleted_by_another_process_are_stored_again(db_path):
+    resume = "experience " * 500
+
+    def checkpoint():
+        cp = empty_checkpoint()
+        cp["channel_values"] = {"resume": resume}
+        cp["channel_versions"] = {"resume": "1"}
+        return cp
+
+    # Two checkpointers on one file stand in for two processes
+    with SqliteCheckpointer(db_path) as writer, SqliteCheckpointer(db_path) as other:
+        writer.put(_config("t1"), checkpoint(), {}, {"resume": "1"})
+        writer.flush()
+
+        # The other process drops the thread and its blobs; writer still
+        # remembers the resume channel's hash and version
+        other.delete_thread("t1")
+        assert other.stats()["blobs"] == 0
+
+        writer.put(_config("t1"), checkpoint(), {}, {})
+        assert writer.get_tuple(_config("t1")).checkpoint["channel_values"] == {"resume": resume}
+
+
+def test_missing_blob_raises_instead_of_dropping_channel(db_path):
+    with SqliteCheckpointer(db_path) as saver:
+        graph = _document_graph().compile(checkpointer=saver)
+        graph.invoke({}, _config("t1"))
+        saver.flush()
+        with saver._db_lock:
+            saver._conn.execute("DELETE FROM blobs")
+
+        with pytest.raises(RuntimeError, match="missing blobs"):
+            graph.get_state(_config("t1"))